@@ -1,16 +1,26 @@
 """
 Agent Telemetry Integration
 Connects AI agents (AGIEM, ASI, Blerina) to Alba/Albi/Jona telemetry pipeline
+
+Agents write through ``TelemetryRouter.queue_all``: it only queues the metrics
+and a ``TelemetryExporter`` ships them in the background, in batches, with one
+sender per destination, so instrumented agent code never waits on
+Alba/Albi/Jona. ``send_all`` is still the blocking call that reports delivery.
 """
 
+import atexit
 import json
+import os
 import time
 import logging
+import threading
 import requests
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from datetime import datetime, timezone
 from dataclasses import dataclass, asdict
 
+from batch_sender import BatchSender
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("AgentTelemetry")
 
@@ -40,6 +50,106 @@ class AgentPulse:
     ts: str
 
 
+class TelemetryDestination(BatchSender):
+    """
+    Batch sender for one of Alba/Albi/Jona. Records are queued as
+    ``AgentMetrics`` and turned into that service's payload when sent; a batch
+    is one POST of a JSON array to ``<endpoint>/batch``.
+    """
+    
+    thread_name = "telemetry-exporter"
+    
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        build: Callable[[AgentMetrics], Dict[str, Any]],
+        timeout: float = 5.0,
+        **kwargs
+    ):
+        super().__init__(name, **kwargs)
+        self.url = url
+        self.build = build
+        self.timeout = timeout
+        self._session = requests.Session()
+    
+    def _send_batch(self, batch: List[AgentMetrics]) -> int:
+        payloads = [self.build(m) for m in batch]
+        return self._session.post(f"{self.url}/batch", json=payloads, timeout=self.timeout).status_code
+    
+    def _send_one(self, metrics: AgentMetrics) -> int:
+        return self._session.post(self.url, json=self.build(metrics), timeout=self.timeout).status_code
+
+
+class TelemetryExporter:
+    """
+    Buffered delivery to Alba, Albi and Jona for one TelemetryRouter.
+    
+    Each service has its own ``TelemetryDestination`` (queue, sender thread,
+    keep-alive session), so one slow or failing service retries and backs off
+    on its own without holding back the other two.
+    """
+    
+    DESTINATIONS = ("alba", "albi", "jona")
+    
+    def __init__(
+        self,
+        router: "TelemetryRouter",
+        max_queue: int = 10000,
+        batch_size: int = 100,
+        flush_interval_ms: float = 250.0,
+        timeout: float = 5.0,
+        backoff_max: float = 30.0
+    ):
+        self.router = router
+        self.destinations: Dict[str, TelemetryDestination] = {}
+        for dest in self.DESTINATIONS:
+            url, build = router.route(dest)
+            self.destinations[dest] = TelemetryDestination(
+                dest,
+                url,
+                build,
+                timeout=timeout,
+                max_queue=max_queue,
+                batch_size=batch_size,
+                flush_interval=flush_interval_ms / 1000.0,
+                backoff_max=backoff_max
+            )
+    
+    def submit(self, metrics: AgentMetrics) -> Dict[str, bool]:
+        """Queue ``metrics`` for every service without blocking; False where a queue was full"""
+        return {dest: sender.submit(metrics) for dest, sender in self.destinations.items()}
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far was delivered (or ``timeout``)"""
+        deadline = time.monotonic() + timeout
+        return all([
+            sender.flush(max(0.0, deadline - time.monotonic()))
+            for sender in self.destinations.values()
+        ])
+    
+    def close(self, timeout: float = 2.0):
+        for sender in self.destinations.values():
+            sender.close(timeout)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        destinations = {dest: sender.snapshot() for dest, sender in self.destinations.items()}
+        return {
+            "pending": sum(snap["queued"] + snap["inflight"] for snap in destinations.values()),
+            "destinations": destinations
+        }
+
+
+_exporters: List[TelemetryExporter] = []
+
+
+@atexit.register
+def _flush_exporters():
+    for exporter in list(_exporters):
+        exporter.flush(timeout=1.0)
+        exporter.close(timeout=1.0)
+
+
 class TelemetryRouter:
     """Routes agent telemetry to Alba/Albi/Jona based on data type"""
     
@@ -60,6 +170,8 @@ class TelemetryRouter:
         self.enabled = enabled
         self.session = requests.Session()
         self.session.headers.update({"Content-Type": "application/json"})
+        self._exporter: Optional[TelemetryExporter] = None
+        self._exporter_lock = threading.Lock()
         
         logger.info(f"TelemetryRouter initialized (enabled={enabled})")
         logger.info(f"  Alba: {self.alba_url}")
@@ -145,24 +257,73 @@ class TelemetryRouter:
     
     # ==================== WRITE OPERATIONS ====================
     
+    @staticmethod
+    def alba_payload(metrics: AgentMetrics) -> Dict[str, Any]:
+        return {
+            "source": metrics.agent_name,
+            "timestamp": metrics.timestamp,
+            "type": "agent_telemetry",
+            "data": asdict(metrics)
+        }
+    
+    @staticmethod
+    def albi_payload(metrics: AgentMetrics) -> Dict[str, Any]:
+        return {
+            "agent": metrics.agent_name,
+            "timestamp": metrics.timestamp,
+            "operation": metrics.operation,
+            "duration_ms": metrics.duration_ms,
+            "tokens": {
+                "input": metrics.input_tokens,
+                "output": metrics.output_tokens
+            },
+            "success": metrics.success,
+            "metadata": metrics.metadata or {}
+        }
+    
+    @staticmethod
+    def jona_payload(metrics: AgentMetrics) -> Dict[str, Any]:
+        return {
+            "agent": metrics.agent_name,
+            "timestamp": metrics.timestamp,
+            "status": metrics.status,
+            "operation": metrics.operation,
+            "success": metrics.success,
+            "error": metrics.error
+        }
+    
+    def route(self, dest: str) -> Tuple[str, Callable[[AgentMetrics], Dict[str, Any]]]:
+        """(endpoint URL, payload builder) for ``alba`` / ``albi`` / ``jona``"""
+        return {
+            "alba": (f"{self.alba_url}/api/telemetry/ingest", self.alba_payload),
+            "albi": (f"{self.albi_url}/api/analytics/agent", self.albi_payload),
+            "jona": (f"{self.jona_url}/api/coordination/event", self.jona_payload),
+        }[dest]
+    
+    @property
+    def exporter(self) -> TelemetryExporter:
+        """Background batch exporter, created on first use"""
+        if self._exporter is None:
+            with self._exporter_lock:
+                if self._exporter is None:
+                    self._exporter = TelemetryExporter(
+                        self,
+                        max_queue=int(os.getenv("TELEMETRY_MAX_QUEUE", "10000")),
+                        batch_size=int(os.getenv("TELEMETRY_BATCH_SIZE", "100")),
+                        flush_interval_ms=float(os.getenv("TELEMETRY_FLUSH_MS", "250")),
+                        backoff_max=float(os.getenv("TELEMETRY_BACKOFF_MAX", "30"))
+                    )
+                    _exporters.append(self._exporter)
+        return self._exporter
+    
     def send_to_alba(self, metrics: AgentMetrics) -> bool:
         """Send raw data collection metrics to Alba"""
         if not self.enabled:
             return True
             
         try:
-            payload = {
-                "source": metrics.agent_name,
-                "timestamp": metrics.timestamp,
-                "type": "agent_telemetry",
-                "data": asdict(metrics)
-            }
-            
-            response = self.session.post(
-                f"{self.alba_url}/api/telemetry/ingest",
-                json=payload,
-                timeout=5
-            )
+            url, build = self.route("alba")
+            response = self.session.post(url, json=build(metrics), timeout=5)
             
             if response.status_code in [200, 201]:
                 logger.debug(f"✓ Alba: {metrics.agent_name} telemetry sent")
@@ -181,24 +342,8 @@ class TelemetryRouter:
             return True
             
         try:
-            payload = {
-                "agent": metrics.agent_name,
-                "timestamp": metrics.timestamp,
-                "operation": metrics.operation,
-                "duration_ms": metrics.duration_ms,
-                "tokens": {
-                    "input": metrics.input_tokens,
-                    "output": metrics.output_tokens
-                },
-                "success": metrics.success,
-                "metadata": metrics.metadata or {}
-            }
-            
-            response = self.session.post(
-                f"{self.albi_url}/api/analytics/agent",
-                json=payload,
-                timeout=5
-            )
+            url, build = self.route("albi")
+            response = self.session.post(url, json=build(metrics), timeout=5)
             
             if response.status_code in [200, 201]:
                 logger.debug(f"✓ Albi: {metrics.agent_name} analytics sent")
@@ -217,20 +362,8 @@ class TelemetryRouter:
             return True
             
         try:
-            payload = {
-                "agent": metrics.agent_name,
-                "timestamp": metrics.timestamp,
-                "status": metrics.status,
-                "operation": metrics.operation,
-                "success": metrics.success,
-                "error": metrics.error
-            }
-            
-            response = self.session.post(
-                f"{self.jona_url}/api/coordination/event",
-                json=payload,
-                timeout=5
-            )
+            url, build = self.route("jona")
+            response = self.session.post(url, json=build(metrics), timeout=5)
             
             if response.status_code in [200, 201]:
                 logger.debug(f"✓ Jona: {metrics.agent_name} event sent")
@@ -287,6 +420,22 @@ class TelemetryRouter:
         )
         
         return results
+    
+    def queue_all(self, metrics: AgentMetrics) -> Dict[str, bool]:
+        """
+        Queue metrics for all three services (fire-and-forget).
+        Returns whether the record was queued for each destination, not
+        whether it was delivered; see ``flush`` and ``exporter.snapshot()``.
+        """
+        if not self.enabled:
+            return {dest: True for dest in TelemetryExporter.DESTINATIONS}
+        return self.exporter.submit(metrics)
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until queued telemetry has been delivered"""
+        if self._exporter is None:
+            return True
+        return self._exporter.flush(timeout)
 
 
 class AgentTelemetryMixin:
@@ -294,8 +443,11 @@ class AgentTelemetryMixin:
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.telemetry = TelemetryRouter(
-            enabled=kwargs.get("telemetry_enabled", True)
+        # One shared router (and exporter thread) for every instrumented agent
+        self.telemetry = (
+            get_telemetry_router()
+            if kwargs.get("telemetry_enabled", True)
+            else TelemetryRouter(enabled=False)
         )
         self._operation_start: Optional[float] = None
         self._current_operation: Optional[str] = None
@@ -333,7 +485,8 @@ class AgentTelemetryMixin:
             metadata=metadata
         )
         
-        self.telemetry.send_all(metrics)
+        # Only queues the record; Alba/Albi/Jona latency stays off this path
+        self.telemetry.queue_all(metrics)
         self._operation_start = None
         self._current_operation = None
 
@@ -363,6 +516,13 @@ def init_telemetry(
     return _global_router
 
 
+def get_telemetry_router() -> TelemetryRouter:
+    """Global router, created with defaults on first use"""
+    if _global_router is None:
+        return init_telemetry()
+    return _global_router
+
+
 def send_agent_telemetry(
     agent_name: str,
     operation: str,
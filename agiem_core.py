@@ -44,8 +44,10 @@ import time
 import threading
 import uuid
 import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass, field
 
 try:
@@ -73,6 +75,11 @@ try:
 except Exception:
     ResearchProposalLab = None
 
+try:
+    from hq_event_relay import get_relay
+except Exception:
+    get_relay = None
+
 # Optional dependencies
 try:
     import requests
@@ -225,13 +232,17 @@ class AGIEMCore:
             ),
         }
         self.started_at = datetime.now(timezone.utc).isoformat()
-        self.logs: List[Dict[str, Any]] = []
+        # Local history is a bounded ring; HQ gets events through the async relay
+        self.logs: deque = deque(maxlen=int(os.getenv("AGIEM_LOG_LIMIT", "5000")))
+        self._hq_relay = get_relay(hq_event_url) if (get_relay and hq_event_url) else None
         self._pipeline: Optional["ReproductionPipeline"] = None
         self.history_limit = 50
         self.reproduction_history: List[Dict[str, Any]] = []
         self.center_stats: Dict[str, Dict[str, Any]] = {}
         self._active_center_counts: Dict[str, int] = {}
         self._cycle_lock = threading.Lock()
+        # Stage notes/metrics are also written from the ALBA ingest threads
+        self._stage_lock = threading.Lock()
 
     # ---------------------------
     # Event logging & HQ relay
@@ -253,12 +264,12 @@ class AGIEMCore:
         else:
             logger.info(f"[{source}] {message}")
 
-        # Best-effort send to HQ (non-blocking posture would be better in prod)
-        if requests is not None and self.hq_event_url:
-            try:
-                requests.post(self.hq_event_url, json=entry, timeout=5)
-            except Exception as exc:
-                logger.debug(f"HQ not reachable ({self.hq_event_url}): {exc}")
+        # Best-effort, non-blocking: queued and batched by the shared HQ relay
+        if self._hq_relay is not None:
+            self._hq_relay.submit(entry)
+
+    def hq_relay_status(self) -> Dict[str, Any]:
+        return self._hq_relay.snapshot() if self._hq_relay is not None else {"enabled": False}
 
     # ---------------------------
     # Health & status helpers
@@ -274,7 +285,8 @@ class AGIEMCore:
         if stage is None:
             self.log_event("AGIEM", f"Unknown stage metric update: {stage_name}.{metric_key}", "WARN")
             return
-        stage.record_metric(metric_key, value)
+        with self._stage_lock:
+            stage.record_metric(metric_key, value)
         self.log_event(stage_name, f"metric {metric_key}={value}", stage=stage_name)
 
     def add_stage_note(self, stage_name: str, message: str, level: str = "INFO") -> None:
@@ -282,7 +294,8 @@ class AGIEMCore:
         if stage is None:
             self.log_event("AGIEM", f"Unknown stage note target: {stage_name}", "WARN")
             return
-        stage.add_note(message, level=level)
+        with self._stage_lock:
+            stage.add_note(message, level=level)
         self.log_event(stage_name, message, level=level, stage=stage_name)
 
     def reproduction_inventory(self) -> List[Dict[str, Any]]:
@@ -291,15 +304,16 @@ class AGIEMCore:
             stage = self.stages.get(stage_key)
             if stage is None:
                 continue
-            ordered.append(
-                {
-                    "name": stage.name,
-                    "role": stage.role,
-                    "description": stage.description,
-                    "metrics": stage.metrics,
-                    "notes": stage.notes,
-                }
-            )
+            with self._stage_lock:
+                ordered.append(
+                    {
+                        "name": stage.name,
+                        "role": stage.role,
+                        "description": stage.description,
+                        "metrics": dict(stage.metrics),
+                        "notes": list(stage.notes),
+                    }
+                )
         return ordered
 
     def record_cycle_result(self, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -476,35 +490,71 @@ class AGIEMCore:
             self._pipeline = ReproductionPipeline(self)
         return self._pipeline
 
+    def close(self) -> None:
+        """Release the pipeline's worker threads; a later cycle starts a new pipeline."""
+        if self._pipeline is not None:
+            self._pipeline.close()
+            self._pipeline = None
+
     def run_reproduction_cycle(
         self,
         *,
         data_root: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
+        return self.run_reproduction_cycles(1, data_root=data_root, metadata=metadata)[0]
+
+    def run_reproduction_cycles(
+        self,
+        count: int,
+        *,
+        data_root: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run ``count`` back-to-back cycles, pipelined (see ``ReproductionPipeline.iter_cycles``).
+
+        A failing cycle is recorded with its error and ends the run.
+        """
         center_key = self._resolve_center_key(metadata or {})
-        start_snapshot = self._register_cycle_start(center_key)
         pipeline = self.get_pipeline()
         if data_root:
             pipeline.set_data_root(data_root)
-        result: Dict[str, Any] = {}
-        mid_snapshot: Optional[Dict[str, Any]] = None
-        try:
-            result = pipeline.run_cycle(metadata)
-            mid_snapshot = self._snapshot_active_counts(center_key)
-        except Exception as exc:
-            self.log_event("AGIEM", f"Cycle execution failed: {exc}", "ERROR")
-            result = {
-                "error": str(exc),
-                "cycle_started": datetime.now(timezone.utc).isoformat(),
-                "cycle_duration_seconds": 0.0,
-                "stages": [],
-                "summary": {},
-                "metadata": metadata,
-            }
-        finally:
-            end_snapshot = self._register_cycle_end(center_key)
-
+        cycles = pipeline.iter_cycles(count, metadata)
+        results: List[Dict[str, Any]] = []
+        for _ in range(max(1, count)):
+            start_snapshot = self._register_cycle_start(center_key)
+            mid_snapshot: Optional[Dict[str, Any]] = None
+            failed = False
+            try:
+                result = next(cycles)
+                mid_snapshot = self._snapshot_active_counts(center_key)
+            except Exception as exc:
+                failed = True
+                self.log_event("AGIEM", f"Cycle execution failed: {exc}", "ERROR")
+                result = {
+                    "error": str(exc),
+                    "cycle_started": datetime.now(timezone.utc).isoformat(),
+                    "cycle_duration_seconds": 0.0,
+                    "stages": [],
+                    "summary": {},
+                    "metadata": metadata,
+                }
+            finally:
+                end_snapshot = self._register_cycle_end(center_key)
+            results.append(self._finish_cycle(center_key, result, start_snapshot, mid_snapshot, end_snapshot))
+            if failed:
+                break
+        cycles.close()
+        return results
+
+    def _finish_cycle(
+        self,
+        center_key: str,
+        result: Dict[str, Any],
+        start_snapshot: Dict[str, Any],
+        mid_snapshot: Optional[Dict[str, Any]],
+        end_snapshot: Dict[str, Any],
+    ) -> Dict[str, Any]:
         multi_tenant_payload = {
             "center": center_key,
             "active_counts": {
@@ -523,7 +573,13 @@ class AGIEMCore:
 class ReproductionPipeline:
     """Runs the ALBA->ALBI->JONA->ASI cycle and records telemetry."""
 
-    def __init__(self, core: AGIEMCore, *, data_root: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        core: AGIEMCore,
+        *,
+        data_root: Optional[str] = None,
+        ingest_workers: Optional[int] = None,
+    ) -> None:
         self.core = core
         self.data_root = Path(data_root) if data_root else Path.cwd() / "data"
         self._alba = AlbaCore(auto_start=True) if AlbaCore else None
@@ -531,6 +587,14 @@ class ReproductionPipeline:
         self._asi = ASICore() if ASICore else None
         self._self_api = SelfGeneratingAPI() if SelfGeneratingAPI else None
         self._proposal_lab = ResearchProposalLab() if ResearchProposalLab else None
+        workers = ingest_workers or int(os.getenv("AGIEM_INGEST_WORKERS", "4"))
+        self._ingest_pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="agiem-ingest")
+        # Runs ALBA for the next cycle while JONA/ASI finish the current one
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="agiem-prefetch")
+        # path -> (mtime_ns, size) of source files already ingested into ALBA
+        self._source_manifest: Dict[str, Tuple[int, int]] = {}
+        self._timing_lock = threading.Lock()
+        self._stage_timings: Dict[str, Dict[str, float]] = {}
 
     def set_data_root(self, root: str | os.PathLike[str]) -> None:
         self.data_root = Path(root)
@@ -592,7 +656,7 @@ class ReproductionPipeline:
                 ingested_count += 1
         return ingested_count
 
-    def _ingest_latest_from_api(self) -> Optional[Any]:
+    def _fetch_latest_api_frame(self) -> Optional[Dict[str, Any]]:
         if self._alba is None or requests is None:
             return None
         alba_api_url = os.getenv("ALBA_API_URL", "http://127.0.0.1:9091/alba/latest")
@@ -616,13 +680,44 @@ class ReproductionPipeline:
                 return None
             frame = payload.get("frame") if "frame" in payload else payload.get("latest")
             if isinstance(frame, dict):
-                result = self._ingest_frame_dict(frame)
-                if result is None:
-                    self.core.add_stage_note("ALBA", "API frame missing sensors or channels", "WARN")
-                return result
+                return frame
         return None
 
-    def run_cycle(self, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _ingest_api_frame(self, frame: Optional[Dict[str, Any]]) -> Optional[Any]:
+        if frame is None:
+            return None
+        result = self._ingest_frame_dict(frame)
+        if result is None:
+            self.core.add_stage_note("ALBA", "API frame missing sensors or channels", "WARN")
+        return result
+
+    def _ingest_latest_from_api(self) -> Optional[Any]:
+        return self._ingest_api_frame(self._fetch_latest_api_frame())
+
+    @staticmethod
+    def _read_source_file(path: Path) -> Tuple[Path, Any, Optional[Exception]]:
+        try:
+            return path, json.loads(path.read_text(encoding="utf-8-sig")), None
+        except Exception as exc:
+            return path, None, exc
+
+    def _changed_source_files(self, source_dir: Path) -> Tuple[List[Tuple[Path, Tuple[int, int]]], int]:
+        """Source files whose mtime/size differ from the manifest, plus a skipped count."""
+        changed: List[Tuple[Path, Tuple[int, int]]] = []
+        skipped = 0
+        for path in sorted(source_dir.glob("*.json")):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._source_manifest.get(str(path)) == signature:
+                skipped += 1
+                continue
+            changed.append((path, signature))
+        return changed, skipped
+
+    def _initial_state(self, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         pipeline_state: Dict[str, Any] = {}
         if metadata:
             pipeline_state["reproduction_meta"] = metadata
@@ -630,31 +725,89 @@ class ReproductionPipeline:
                 for key, value in metadata.items():
                     if key.startswith("state_"):
                         pipeline_state[key] = value
-        stage_reports: List[Dict[str, Any]] = []
-        cycle_started = datetime.now(timezone.utc).isoformat()
-        start_time = time.time()
+        return pipeline_state
 
-        pipeline_state, report = self._run_stage("ALBA", self._run_alba, pipeline_state)
-        stage_reports.append({"stage": "ALBA", **report})
+    def run_cycle(self, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return self.run_cycles(1, metadata)[0]
 
-        pipeline_state, report = self._run_stage("ALBI", self._run_albi, pipeline_state)
-        stage_reports.append({"stage": "ALBI", **report})
+    def run_cycles(self, count: int, metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        return list(self.iter_cycles(count, metadata))
 
-        pipeline_state, report = self._run_stage("JONA", self._run_jona, pipeline_state)
-        stage_reports.append({"stage": "JONA", **report})
+    def iter_cycles(self, count: int, metadata: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Run ``count`` back-to-back cycles, yielding each result as it completes.
 
-        pipeline_state, report = self._run_stage("ASI", self._run_asi, pipeline_state)
-        stage_reports.append({"stage": "ASI", **report})
+        Cycles are pipelined: once ALBI of cycle N has consumed the ALBA history,
+        ALBA ingestion for cycle N+1 starts on the prefetch thread while JONA and
+        ASI finish cycle N (and while the caller handles its result). JONA/ASI only
+        read the cycle's own state, and stage notes/metrics go through the core's
+        stage lock, so the two cycles do not share mutable state.
+        """
+        prefetched: Optional[Future] = None
+        try:
+            for index in range(max(1, count)):
+                cycle_started = datetime.now(timezone.utc).isoformat()
+                start_time = time.time()
+                stage_reports: List[Dict[str, Any]] = []
+
+                if prefetched is not None:
+                    pipeline_state, report = prefetched.result()
+                    prefetched = None
+                else:
+                    pipeline_state, report = self._run_stage("ALBA", self._run_alba, self._initial_state(metadata))
+                stage_reports.append({"stage": "ALBA", **report})
+
+                pipeline_state, report = self._run_stage("ALBI", self._run_albi, pipeline_state)
+                stage_reports.append({"stage": "ALBI", **report})
+
+                if index + 1 < count:
+                    prefetched = self._prefetch_pool.submit(
+                        self._run_stage, "ALBA", self._run_alba, self._initial_state(metadata)
+                    )
+
+                pipeline_state, report = self._run_stage("JONA", self._run_jona, pipeline_state)
+                stage_reports.append({"stage": "JONA", **report})
+
+                pipeline_state, report = self._run_stage("ASI", self._run_asi, pipeline_state)
+                stage_reports.append({"stage": "ASI", **report})
+
+                total_duration = round(time.time() - start_time, 3)
+                summary = self._build_summary(pipeline_state, stage_reports)
+                yield {
+                    "cycle_started": cycle_started,
+                    "cycle_duration_seconds": total_duration,
+                    "stages": stage_reports,
+                    "stage_timings": {item["stage"]: item["duration_seconds"] for item in stage_reports},
+                    "summary": summary,
+                    "metadata": pipeline_state.get("reproduction_meta"),
+                }
+        finally:
+            # Stopped early (error or caller closed us): let a started ALBA finish
+            # so ingestion never continues behind the caller's back
+            if prefetched is not None:
+                prefetched.exception()
+
+    def close(self) -> None:
+        """Stop the prefetch and ingest thread pools (waits for in-flight work)."""
+        self._prefetch_pool.shutdown(wait=True)
+        self._ingest_pool.shutdown(wait=True)
+
+    def stage_timing_summary(self) -> Dict[str, Dict[str, float]]:
+        """Cumulative per-stage timings (count, total, average, last, max seconds)."""
+        with self._timing_lock:
+            return {
+                name: {**stats, "avg_seconds": round(stats["total_seconds"] / stats["count"], 6)}
+                for name, stats in self._stage_timings.items()
+            }
 
-        total_duration = round(time.time() - start_time, 3)
-        summary = self._build_summary(pipeline_state, stage_reports)
-        return {
-            "cycle_started": cycle_started,
-            "cycle_duration_seconds": total_duration,
-            "stages": stage_reports,
-            "summary": summary,
-            "metadata": pipeline_state.get("reproduction_meta"),
-        }
+    def _record_timing(self, name: str, duration: float) -> None:
+        with self._timing_lock:
+            stats = self._stage_timings.setdefault(
+                name, {"count": 0, "total_seconds": 0.0, "last_seconds": 0.0, "max_seconds": 0.0}
+            )
+            stats["count"] += 1
+            stats["total_seconds"] += duration
+            stats["last_seconds"] = duration
+            stats["max_seconds"] = max(stats["max_seconds"], duration)
 
     def _run_stage(
         self,
@@ -663,9 +816,11 @@ class ReproductionPipeline:
         state: Dict[str, Any],
     ) -> tuple[Dict[str, Any], Dict[str, Any]]:
         self.core.add_stage_note(name, "Stage started")
-        stage_start = time.time()
+        stage_start = time.perf_counter()
         result = handler(state)
-        duration = round(time.time() - stage_start, 3)
+        elapsed = time.perf_counter() - stage_start
+        duration = round(elapsed, 3)
+        self._record_timing(name, elapsed)
 
         self.core.record_stage_metric(name, "last_duration_seconds", duration)
         for key, value in result.metrics.items():
@@ -674,13 +829,13 @@ class ReproductionPipeline:
         message = result.message or "Completed"
         self.core.add_stage_note(name, message)
 
-        new_state = dict(state)
-        new_state.update(result.updated_state)
+        # Each cycle owns its state dict, so stages update it in place
+        state.update(result.updated_state)
 
         payload = dict(result.public_payload)
         payload.setdefault("message", message)
         payload["duration_seconds"] = duration
-        return new_state, payload
+        return state, payload
 
     def _run_alba(self, state: Dict[str, Any]) -> StageResult:
         if self._alba is None:
@@ -695,13 +850,20 @@ class ReproductionPipeline:
         ingestion_sources: List[str] = []
         file_frames = 0
         api_frame = None
+        skipped_files = 0
+
+        # The API fetch is network-bound; let it run alongside file parsing
+        api_future = self._ingest_pool.submit(self._fetch_latest_api_frame)
 
         if source_dir.exists() and source_dir.is_dir():
-            for path in sorted(source_dir.glob("*.json")):
-                try:
-                    data = json.loads(path.read_text(encoding="utf-8-sig"))
-                except Exception as exc:
-                    self.core.add_stage_note("ALBA", f"Failed to parse {path.name}: {exc}", "WARN")
+            changed, skipped_files = self._changed_source_files(source_dir)
+            parsed = self._ingest_pool.map(self._read_source_file, [path for path, _ in changed])
+            # Ingest in sorted file order so history stays deterministic
+            for (path, data, error), (_, signature) in zip(parsed, changed):
+                # Broken files are recorded too and retried only once they change
+                self._source_manifest[str(path)] = signature
+                if error is not None:
+                    self.core.add_stage_note("ALBA", f"Failed to parse {path.name}: {error}", "WARN")
                     continue
 
                 ingested = self._ingest_file_payload(data)
@@ -712,7 +874,7 @@ class ReproductionPipeline:
         else:
             self.core.add_stage_note("ALBA", f"Source directory missing: {source_dir}", "WARN")
 
-        api_result = self._ingest_latest_from_api()
+        api_result = self._ingest_api_frame(api_future.result())
         if api_result is not None:
             api_frame = api_result
             ingestion_sources.append("api:latest")
@@ -726,6 +888,7 @@ class ReproductionPipeline:
             "api_frame": bool(api_frame),
             "total_history": len(history),
             "source_files": len(processed_files),
+            "skipped_files": skipped_files,
         }
         public_payload = {
             "source_dir": str(source_dir),
@@ -773,7 +936,8 @@ class ReproductionPipeline:
                 public_payload=payload,
             )
 
-        insight = self._albi.learn_from_alba(history)
+        # Hand ALBI the core itself so it only reads frames added since last cycle
+        insight = self._albi.learn_from_alba(self._alba if self._alba is not None else history)
         recommendations = self._albi.recommendations()
         metrics = {
             "anomaly_count": len(insight.anomalies),
@@ -1215,6 +1379,8 @@ def _build_parser():
     a_cycle.add_argument("--center", default=None, help="Name of the reproduction center executing the cycle")
     a_cycle.add_argument("--specialization", default=None, help="Domain specialization for this cycle (e.g. medical)")
     a_cycle.add_argument("--priority", default=None, help="Override proposal priority label")
+    a_cycle.add_argument("--count", type=int, default=1,
+                         help="Run N back-to-back cycles, overlapping ALBA of each with JONA/ASI of the previous")
 
     a_auto = sub.add_parser("autocycle", help="Loop reproduction cycles on an interval")
     a_auto.add_argument("--data-root", default=None, help="Optional data root for ALBA ingestion")
@@ -1280,7 +1446,9 @@ def main(argv: Optional[List[str]] = None):
             metadata["specialization"] = args.specialization
         if args.priority:
             metadata["priority"] = args.priority
-        result = core.run_reproduction_cycle(data_root=args.data_root, metadata=metadata or None)
+        results = core.run_reproduction_cycles(max(1, args.count), data_root=args.data_root, metadata=metadata or None)
+        core.close()
+        result = results[0] if len(results) == 1 else results
         if args.out:
             Path(args.out).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
             core.log_event("AGIEM", f"Cycle summary written to {args.out}")
@@ -1319,6 +1487,8 @@ def main(argv: Optional[List[str]] = None):
                     time.sleep(wait_for)
         except KeyboardInterrupt:
             core.log_event("AGIEM", "Autocycle interrupted by user", "WARN")
+        finally:
+            core.close()
         return 0
 
     if args.cmd == "analyze":
@@ -9,21 +9,37 @@ Key concepts
 * ``SignalFrame`` records a single capture with channel amplitudes.
 * ``AlbaCore`` manages a rolling history, calculates light-weight metrics and
   persists them when needed.
+* ``ExactSum`` keeps an exactly rounded running sum that supports removal, so
+  rolling averages stay identical to ``statistics.fmean`` over the window.
+  Non-finite values (NaN/inf) never enter the sums: they are kept in the frame
+  but only counted, so one bad sample cannot poison the running statistics.
 
-The implementation is intentionally deterministic: all numeric operations use
-the standard library so unit tests stay fast and predictable.
+History is a fixed-size ring: appends are O(1) and the per-channel sums (and
+the band-power sum / sum of squares) are updated as frames enter and leave, so
+``average_channel_levels`` and ``signal_variance`` cost O(channels). Channel
+values are also mirrored into a channel-indexed matrix (NumPy when available,
+``array('d')`` columns otherwise) for vectorised consumers.
+
+The implementation is intentionally deterministic: all statistics use the
+standard library so unit tests stay fast and predictable.
 """
 
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Iterable
+from typing import Dict, List, Any, Optional, Iterable, Tuple
 
 import json
-import statistics
+import math
 import time
 
+try:  # optional: faster block writes and matrix views
+	import numpy as _np
+except ImportError:  # pragma: no cover - exercised on minimal installs
+	_np = None
+
 
 @dataclass(frozen=True)
 class SignalFrame:
@@ -39,15 +55,107 @@ class SignalFrame:
 		return sum(self.channels.values()) / max(len(self.channels), 1)
 
 
+class ExactSum:
+	"""Running float sum without rounding drift (Shewchuk partials).
+
+	``value()`` equals ``math.fsum`` of every value added minus every value
+	removed, so ``value() / n`` matches ``statistics.fmean`` bit for bit.
+	"""
+
+	__slots__ = ("_partials",)
+
+	def __init__(self) -> None:
+		self._partials: List[float] = []
+
+	def add(self, x: float) -> None:
+		partials = self._partials
+		i = 0
+		for y in partials:
+			if abs(x) < abs(y):
+				x, y = y, x
+			hi = x + y
+			lo = y - (hi - x)
+			if lo:
+				partials[i] = lo
+				i += 1
+			x = hi
+		partials[i:] = [x]
+
+	def remove(self, x: float) -> None:
+		self.add(-x)
+
+	def value(self) -> float:
+		return math.fsum(self._partials)
+
+
+class _ChannelMatrix:
+	"""``capacity x channels`` value store, NaN where a frame lacks a channel."""
+
+	def __init__(self, capacity: int) -> None:
+		self.capacity = capacity
+		self.width = 0
+		if _np is not None:
+			self._data = _np.full((capacity, 0), _np.nan)
+		else:
+			self._columns: List[array] = []
+
+	def add_channel(self) -> None:
+		if _np is not None:
+			column = _np.full((self.capacity, 1), _np.nan)
+			self._data = _np.concatenate([self._data, column], axis=1)
+		else:
+			self._columns.append(array("d", [math.nan]) * self.capacity)
+		self.width += 1
+
+	def write(self, slot: int, values: Dict[int, float]) -> None:
+		if _np is not None:
+			row = self._data[slot]
+			row.fill(_np.nan)
+			for index, value in values.items():
+				row[index] = value
+		else:
+			for index, column in enumerate(self._columns):
+				column[slot] = values.get(index, math.nan)
+
+	def write_block(self, start_slot: int, block: Any) -> None:
+		"""Write consecutive rows starting at ``start_slot`` (no wrap-around)."""
+
+		if _np is not None:
+			self._data[start_slot:start_slot + len(block), : block.shape[1]] = block
+			self._data[start_slot:start_slot + len(block), block.shape[1]:] = _np.nan
+		else:
+			for offset, row in enumerate(block):
+				self.write(start_slot + offset, {i: v for i, v in enumerate(row) if not math.isnan(v)})
+
+	def rows(self, slots: Iterable[int]) -> Any:
+		slots = list(slots)
+		if _np is not None:
+			return self._data[slots]
+		return [[column[slot] for column in self._columns] for slot in slots]
+
+
 class AlbaCore:
 	"""Rolling signal collector with basic statistics."""
 
 	def __init__(self, *, max_history: int = 2048, auto_start: bool = True) -> None:
 		self.max_history = max(1, max_history)
 		self.auto_start = auto_start
-		self._history: List[SignalFrame] = []
 		self._status: str = "idle"
 		self._started_at: Optional[float] = None
+		self._reset_history()
+
+	def _reset_history(self) -> None:
+		self._frames: List[Optional[SignalFrame]] = [None] * self.max_history
+		self._band_powers = array("d", bytes(8 * self.max_history))
+		self._matrix = _ChannelMatrix(self.max_history)
+		self._channel_index: Dict[str, int] = {}
+		self._channel_sums: List[ExactSum] = []
+		self._channel_counts: List[int] = []
+		self._power_sum = ExactSum()
+		self._power_sq_sum = ExactSum()
+		self._power_count = 0
+		self._non_finite = 0  # non-finite values currently in the window
+		self._next_seq = 0  # sequence number of the next frame ever ingested
 
 	# --------------------------------------------------------------
 	# lifecycle helpers
@@ -79,44 +187,160 @@ class AlbaCore:
 
 		clean_channels = {k: float(v) for k, v in channels.items()}
 		frame = SignalFrame(timestamp=timestamp or time.time(), channels=clean_channels, metadata=metadata or {})
-		self._history.append(frame)
-		if len(self._history) > self.max_history:
-			self._history = self._history[-self.max_history :]
+		slot = self._append_frame(frame)
+		self._matrix.write(slot, {self._channel_index[name]: value for name, value in clean_channels.items()})
 		return frame
 
+	def _channel_slot(self, name: str) -> int:
+		index = self._channel_index.get(name)
+		if index is None:
+			index = self._channel_index[name] = len(self._channel_sums)
+			self._channel_sums.append(ExactSum())
+			self._channel_counts.append(0)
+			self._matrix.add_channel()
+		return index
+
+	def _append_frame(self, frame: SignalFrame) -> int:
+		"""Place ``frame`` in the ring and update running statistics."""
+
+		slot = self._next_seq % self.max_history
+		evicted = self._frames[slot]
+		if evicted is not None:
+			for name, value in evicted.channels.items():
+				if not math.isfinite(value):
+					self._non_finite -= 1
+					continue
+				index = self._channel_index[name]
+				self._channel_sums[index].remove(value)
+				self._channel_counts[index] -= 1
+			power = self._band_powers[slot]
+			if math.isfinite(power * power):
+				self._power_sum.remove(power)
+				self._power_sq_sum.remove(power * power)
+				self._power_count -= 1
+
+		for name, value in frame.channels.items():
+			index = self._channel_slot(name)
+			if not math.isfinite(value):
+				self._non_finite += 1
+				continue
+			self._channel_sums[index].add(value)
+			self._channel_counts[index] += 1
+		power = frame.band_power()
+		self._band_powers[slot] = power
+		if math.isfinite(power * power):
+			self._power_sum.add(power)
+			self._power_sq_sum.add(power * power)
+			self._power_count += 1
+		self._frames[slot] = frame
+		self._next_seq += 1
+		return slot
+
 	def ingest_batch(self, frames: Iterable[Dict[str, Any]]) -> int:
+		"""Append a block of frames; channel values are written block-wise."""
+
+		if self._status != "running" and self.auto_start:
+			self.start()
+
+		now = time.time()
 		count = 0
+		pending: List[Tuple[int, Dict[str, float]]] = []
 		for entry in frames:
-			channels = entry.get("channels") or {}
-			metadata = entry.get("metadata") or {}
-			ts = entry.get("timestamp")
-			self.ingest(channels, metadata=metadata, timestamp=ts)
+			channels = {k: float(v) for k, v in (entry.get("channels") or {}).items()}
+			frame = SignalFrame(
+				timestamp=entry.get("timestamp") or now,
+				channels=channels,
+				metadata=entry.get("metadata") or {},
+			)
+			pending.append((self._append_frame(frame), channels))
 			count += 1
+		self._write_rows(pending)
 		return count
 
+	def _write_rows(self, pending: List[Tuple[int, Dict[str, float]]]) -> None:
+		# Only the last ``max_history`` rows survive; write them as contiguous runs.
+		pending = pending[-self.max_history:]
+		if _np is None:
+			for slot, channels in pending:
+				self._matrix.write(slot, {self._channel_index[n]: v for n, v in channels.items()})
+			return
+		width = len(self._channel_index)
+		start = 0
+		while start < len(pending):
+			end = start + 1
+			while end < len(pending) and pending[end][0] == pending[end - 1][0] + 1:
+				end += 1
+			block = _np.full((end - start, width), _np.nan)
+			for row, (_, channels) in enumerate(pending[start:end]):
+				for name, value in channels.items():
+					block[row, self._channel_index[name]] = value
+			self._matrix.write_block(pending[start][0], block)
+			start = end
+
 	# --------------------------------------------------------------
 	# metrics and reporting
 	# --------------------------------------------------------------
+	def __len__(self) -> int:
+		return min(self._next_seq, self.max_history)
+
+	def __bool__(self) -> bool:
+		# a core with an empty history is still a core (``if self.alba:``)
+		return True
+
+	@property
+	def non_finite_values(self) -> int:
+		"""NaN/inf channel values in the window, left out of the statistics."""
+
+		return self._non_finite
+
+	@property
+	def total_ingested(self) -> int:
+		"""Frames ingested since creation (the next frame's sequence number)."""
+
+		return self._next_seq
+
+	@property
+	def oldest_seq(self) -> int:
+		"""Sequence number of the oldest frame still held."""
+
+		return max(0, self._next_seq - self.max_history)
+
+	def _slots(self, start_seq: int) -> range:
+		return range(max(start_seq, self.oldest_seq), self._next_seq)
+
 	def history(self) -> List[SignalFrame]:
-		return list(self._history)
+		return [self._frames[seq % self.max_history] for seq in self._slots(0)]
+
+	def frames_since(self, seq: int) -> List[SignalFrame]:
+		"""Frames with sequence number ``>= seq`` that are still in the ring."""
+
+		return [self._frames[s % self.max_history] for s in self._slots(seq)]
+
+	def channel_matrix(self) -> Tuple[List[str], Any]:
+		"""``(channel_names, rows)`` of the history in chronological order.
+
+		Rows are a NumPy array when available, else lists; missing values are NaN.
+		"""
+
+		names = sorted(self._channel_index, key=self._channel_index.get)
+		return names, self._matrix.rows(seq % self.max_history for seq in self._slots(0))
 
 	def last_frame(self) -> Optional[SignalFrame]:
-		return self._history[-1] if self._history else None
+		return self._frames[(self._next_seq - 1) % self.max_history] if self._next_seq else None
 
 	def average_channel_levels(self) -> Dict[str, float]:
-		if not self._history:
-			return {}
-		sums: Dict[str, List[float]] = {}
-		for frame in self._history:
-			for channel, value in frame.channels.items():
-				sums.setdefault(channel, []).append(value)
-		return {channel: statistics.fmean(values) for channel, values in sums.items()}
+		return {
+			channel: self._channel_sums[index].value() / self._channel_counts[index]
+			for channel, index in self._channel_index.items()
+			if self._channel_counts[index]
+		}
 
 	def signal_variance(self) -> float:
-		if len(self._history) < 2:
+		n = self._power_count
+		if n < 2:
 			return 0.0
-		powers = [frame.band_power() for frame in self._history]
-		return statistics.pvariance(powers) if len(powers) > 1 else 0.0
+		mean = self._power_sum.value() / n
+		return max(self._power_sq_sum.value() / n - mean * mean, 0.0)
 
 	def health(self) -> Dict[str, Any]:
 		uptime = 0.0
@@ -127,10 +351,11 @@ class AlbaCore:
 			"module": "ALBA",
 			"status": self._status,
 			"uptime_seconds": uptime,
-			"total_frames": len(self._history),
+			"total_frames": len(self),
 			"last_timestamp": last.timestamp if last else None,
 			"avg_channels": self.average_channel_levels(),
 			"signal_variance": self.signal_variance(),
+			"non_finite_values": self._non_finite,
 		}
 
 	# --------------------------------------------------------------
@@ -143,7 +368,7 @@ class AlbaCore:
 				"channels": frame.channels,
 				"metadata": frame.metadata,
 			}
-			for frame in self._history
+			for frame in self.history()
 		]
 		path = Path(target)
 		path.write_text(json.dumps(data, indent=2), encoding="utf-8")
@@ -154,16 +379,14 @@ class AlbaCore:
 		if not path.exists():
 			return 0
 		payload = json.loads(path.read_text(encoding="utf-8-sig"))
-		self._history.clear()
+		self._reset_history()
 		for entry in payload:
 			self.ingest(
 				entry.get("channels", {}),
 				metadata=entry.get("metadata"),
 				timestamp=entry.get("timestamp"),
 			)
-		return len(self._history)
-
-
-__all__ = ["SignalFrame", "AlbaCore"]
+		return len(self)
 
 
+__all__ = ["SignalFrame", "AlbaCore", "ExactSum"]
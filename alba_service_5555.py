@@ -10,12 +10,18 @@ import logging
 import uuid
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
-from collections import deque
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
+from alba_telemetry_ring import TelemetryRing
+
+try:  # optional: msgpack bodies for /ingest/batch
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
 # OpenTelemetry imports
 from tracing import setup_tracing, instrument_fastapi_app, instrument_http_clients
 
@@ -73,8 +79,8 @@ class CollectorMetrics(BaseModel):
 START_TIME = time.time()
 INSTANCE_ID = uuid.uuid4().hex[:8]
 
-# Ring buffer for telemetry data
-telemetry_buffer: deque = deque(maxlen=10000)
+# Columnar ring buffer for telemetry data
+telemetry_buffer: TelemetryRing = TelemetryRing(10000)
 metrics_snapshot = {
     "total_entries": 0,
     "entries_per_second": 0.0,
@@ -82,6 +88,14 @@ metrics_snapshot = {
     "types": {}
 }
 
+def store_entry(entry_id: str, source: str, type_: str, payload: Dict[str, Any],
+                timestamp: str, quality: float = 1.0) -> None:
+    """Append one entry to the ring buffer and update the counters."""
+    telemetry_buffer.append(entry_id, source, type_, payload, timestamp, quality)
+    metrics_snapshot["total_entries"] += 1
+    metrics_snapshot["sources"][source] = metrics_snapshot["sources"].get(source, 0) + 1
+    metrics_snapshot["types"][type_] = metrics_snapshot["types"].get(type_, 0) + 1
+
 # ═══════════════════════════════════════════════════════════════════
 # ENDPOINTS
 # ═══════════════════════════════════════════════════════════════════
@@ -96,12 +110,7 @@ async def ingest_telemetry(entry: TelemetryEntry):
         entry.id = entry.id or uuid.uuid4().hex
         entry.timestamp = entry.timestamp or datetime.now(timezone.utc).isoformat()
         
-        telemetry_buffer.append(entry.dict())
-        
-        # Update metrics
-        metrics_snapshot["total_entries"] += 1
-        metrics_snapshot["sources"][entry.source] = metrics_snapshot["sources"].get(entry.source, 0) + 1
-        metrics_snapshot["types"][entry.type] = metrics_snapshot["types"].get(entry.type, 0) + 1
+        store_entry(entry.id, entry.source, entry.type, entry.payload, entry.timestamp, entry.quality)
         
         span.set_attribute("buffer_size", len(telemetry_buffer))
         
@@ -113,12 +122,58 @@ async def ingest_telemetry(entry: TelemetryEntry):
             "timestamp": entry.timestamp
         }
 
+@app.post("/ingest/batch")
+async def ingest_telemetry_batch(request: Request):
+    """Bulk ingest: NDJSON (``application/x-ndjson``), a msgpack array
+    (``application/msgpack``) or a JSON array of telemetry entries."""
+    with tracer.start_as_current_span("ingest_telemetry_batch") as span:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        body = await request.body()
+        try:
+            if content_type in ("application/x-ndjson", "application/ndjson"):
+                items = [json.loads(line) for line in body.splitlines() if line.strip()]
+            elif content_type in ("application/msgpack", "application/x-msgpack"):
+                if msgpack is None:
+                    raise HTTPException(status_code=415, detail="msgpack not installed")
+                items = msgpack.unpackb(body, raw=False)
+            else:
+                items = json.loads(body)
+        except HTTPException:
+            raise
+        except Exception:
+            raise HTTPException(status_code=400, detail="Malformed batch body")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Batch body must be an array of entries")
+
+        now = datetime.now(timezone.utc).isoformat()
+        accepted = rejected = 0
+        for item in items:
+            if not isinstance(item, dict) or not isinstance(item.get("source"), str) or not isinstance(item.get("type"), str):
+                rejected += 1
+                continue
+            try:
+                quality = float(item.get("quality", 1.0))
+            except (TypeError, ValueError):
+                rejected += 1
+                continue
+            payload = item.get("payload")
+            store_entry(item.get("id") or uuid.uuid4().hex, item["source"], item["type"],
+                        payload if isinstance(payload, dict) else {}, item.get("timestamp") or now, quality)
+            accepted += 1
+
+        span.set_attribute("accepted", accepted)
+        span.set_attribute("rejected", rejected)
+        logger.info(f"[INGEST] batch of {accepted} entries ({rejected} rejected)")
+        return {"status": "ingested", "accepted": accepted, "rejected": rejected, "timestamp": now}
+
 @app.get("/data")
-async def get_telemetry_data(limit: int = 100):
-    """Retrieve collected telemetry"""
+async def get_telemetry_data(limit: int = 100, since: Optional[float] = None,
+                             source: Optional[str] = None, type: Optional[str] = None):
+    """Retrieve collected telemetry (newest ``limit`` entries, optionally
+    filtered by source, type and ingest time ``since`` as epoch seconds)"""
     with tracer.start_as_current_span("get_telemetry_data") as span:
         span.set_attribute("limit", limit)
-        entries = list(telemetry_buffer)[-limit:]
+        entries = telemetry_buffer.query(limit, since=since, source=source, type_=type)
         span.set_attribute("entries_returned", len(entries))
         
         return {
@@ -148,36 +203,54 @@ async def get_metrics():
             "types": metrics_snapshot["types"]
         }
 
+def _store_agent_telemetry(data: Dict[str, Any]) -> TelemetryEntry:
+    """Store one agent telemetry record (shared by single and batch ingest)"""
+    agent_name = data.get("source", "unknown_agent")
+    agent_data = data.get("data", {})
+    entry = TelemetryEntry(
+        source=agent_name,
+        type="agent_telemetry",
+        payload=agent_data,  # Changed from 'data' to 'payload'
+        metadata={"agent": True, "operation": agent_data.get("operation")}
+    )
+    entry.id = uuid.uuid4().hex
+    entry.timestamp = datetime.now(timezone.utc).isoformat()
+    
+    store_entry(entry.id, entry.source, entry.type, entry.payload, entry.timestamp, entry.quality)
+    return entry
+
 @app.post("/api/telemetry/ingest")
 async def ingest_agent_telemetry(data: Dict[str, Any]):
     """Ingest telemetry from AI agents (AGIEM, ASI, Blerina)"""
     with tracer.start_as_current_span("ingest_agent_telemetry") as span:
-        agent_name = data.get("source", "unknown_agent")
         agent_data = data.get("data", {})
-        
-        span.set_attribute("agent_name", agent_name)
+        span.set_attribute("agent_name", data.get("source", "unknown_agent"))
         span.set_attribute("operation", agent_data.get("operation", "unknown"))
         
-        # Store in telemetry buffer
-        entry = TelemetryEntry(
-            source=agent_name,
-            type="agent_telemetry",
-            payload=agent_data,  # Changed from 'data' to 'payload'
-            metadata={"agent": True, "operation": agent_data.get("operation")}
-        )
-        
-        telemetry_buffer.append(entry.dict())
-        metrics_snapshot["total_entries"] += 1
-        metrics_snapshot["sources"][agent_name] = metrics_snapshot["sources"].get(agent_name, 0) + 1
+        entry = _store_agent_telemetry(data)
         
-        logger.info(f"[AGENT] {agent_name}.{agent_data.get('operation')} -> Alba")
+        logger.info(f"[AGENT] {entry.source}.{agent_data.get('operation')} -> Alba")
         
         return {
             "status": "ingested",
-            "agent": agent_name,
+            "agent": entry.source,
             "timestamp": entry.timestamp
         }
 
+@app.post("/api/telemetry/ingest/batch")
+async def ingest_agent_telemetry_batch(records: List[Dict[str, Any]]):
+    """Ingest a batch of agent telemetry records (see agent_telemetry.TelemetryExporter)"""
+    with tracer.start_as_current_span("ingest_agent_telemetry_batch") as span:
+        for record in records:
+            _store_agent_telemetry(record)
+        span.set_attribute("records", len(records))
+        logger.info(f"[AGENT] batch of {len(records)} records -> Alba")
+        return {
+            "status": "ingested",
+            "count": len(records),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+
 @app.get("/health")
 async def health():
     """Service health check"""
@@ -210,7 +283,7 @@ async def execute_action(action: Dict[str, Any]):
         elif cmd == "export":
             return {
                 "status": "exported",
-                "entries": list(telemetry_buffer),
+                "entries": telemetry_buffer.export(),
                 "count": len(telemetry_buffer)
             }
         else:
@@ -254,8 +327,8 @@ class CollectorMetrics(BaseModel):
 START_TIME = time.time()
 INSTANCE_ID = uuid.uuid4().hex[:8]
 
-# Ring buffer for telemetry data
-telemetry_buffer: deque = deque(maxlen=10000)
+# Columnar ring buffer for telemetry data
+telemetry_buffer: TelemetryRing = TelemetryRing(10000)
 metrics_snapshot = {
     "total_entries": 0,
     "entries_per_second": 0.0,
@@ -273,12 +346,7 @@ async def ingest_telemetry(entry: TelemetryEntry):
     entry.id = entry.id or uuid.uuid4().hex
     entry.timestamp = entry.timestamp or datetime.utcnow().isoformat()
     
-    telemetry_buffer.append(entry.dict())
-    
-    # Update metrics
-    metrics_snapshot["total_entries"] += 1
-    metrics_snapshot["sources"][entry.source] = metrics_snapshot["sources"].get(entry.source, 0) + 1
-    metrics_snapshot["types"][entry.type] = metrics_snapshot["types"].get(entry.type, 0) + 1
+    store_entry(entry.id, entry.source, entry.type, entry.payload, entry.timestamp, entry.quality)
     
     logger.info(f"[INGEST] {entry.type} from {entry.source} (total: {len(telemetry_buffer)})")
     
@@ -291,7 +359,7 @@ async def ingest_telemetry(entry: TelemetryEntry):
 @app.get("/data")
 async def get_telemetry_data(limit: int = 100):
     """Retrieve collected telemetry"""
-    entries = list(telemetry_buffer)[-limit:]
+    entries = telemetry_buffer.query(limit)
     return {
         "count": len(entries),
         "entries": entries,
@@ -340,7 +408,7 @@ async def execute_action(action: Dict[str, Any]):
     elif cmd == "export":
         return {
             "status": "exported",
-            "entries": list(telemetry_buffer),
+            "entries": telemetry_buffer.export(),
             "count": len(telemetry_buffer)
         }
     else:
@@ -0,0 +1,205 @@
+"""Columnar ring buffer for the ALBA collector (``alba_service_5555``).
+
+Telemetry is stored column-wise in preallocated ``array`` columns (ingest time,
+source id, type id, numeric value, quality) plus object columns for the id,
+original timestamp string and payload. Source and type names are interned into a
+shared string table so the per-entry columns only hold small integers.
+
+Every entry gets a monotonically increasing sequence number; its slot is
+``seq % capacity``. Per-source and per-type indexes are deques of sequence
+numbers, trimmed from the left as the ring overwrites old slots, so:
+
+* tail reads cost O(limit),
+* ``source=`` / ``type=`` filters only visit matching entries,
+* ``since=`` binary-searches the (monotonic) ingest-time column.
+
+Standard library only, like ``alba_core``.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+import math
+import time
+
+
+class StringTable:
+	"""Bidirectional interning table ``name <-> small int``."""
+
+	def __init__(self) -> None:
+		self._ids: Dict[str, int] = {}
+		self.names: List[str] = []
+
+	def intern(self, name: str) -> int:
+		ident = self._ids.get(name)
+		if ident is None:
+			ident = self._ids[name] = len(self.names)
+			self.names.append(name)
+		return ident
+
+	def lookup(self, name: str) -> Optional[int]:
+		return self._ids.get(name)
+
+
+class TelemetryRing:
+	"""Fixed-capacity columnar ring buffer with secondary indexes."""
+
+	def __init__(self, capacity: int = 10000) -> None:
+		self.capacity = capacity
+		self.strings = StringTable()
+		self.ingested_at = array("d", bytes(8 * capacity))
+		self.source_id = array("I", bytes(array("I").itemsize * capacity))
+		self.type_id = array("I", bytes(array("I").itemsize * capacity))
+		self.value = array("d", bytes(8 * capacity))
+		self.quality = array("d", bytes(8 * capacity))
+		self.entry_id: List[Optional[str]] = [None] * capacity
+		self.timestamp: List[Optional[str]] = [None] * capacity
+		self.payload: List[Optional[Dict[str, Any]]] = [None] * capacity
+		self._by_source: Dict[int, deque] = {}
+		self._by_type: Dict[int, deque] = {}
+		self._next = 0  # sequence number of the next append
+
+	# ------------------------------------------------------------------
+	# Writes
+	# ------------------------------------------------------------------
+	def __len__(self) -> int:
+		return min(self._next, self.capacity)
+
+	@property
+	def oldest(self) -> int:
+		return max(0, self._next - self.capacity)
+
+	def append(
+		self,
+		entry_id: str,
+		source: str,
+		type_: str,
+		payload: Dict[str, Any],
+		timestamp: str,
+		quality: float = 1.0,
+		ingested_at: Optional[float] = None,
+	) -> int:
+		"""Store one entry and return its sequence number."""
+
+		seq = self._next
+		slot = seq % self.capacity
+		if seq >= self.capacity:
+			self._drop_slot(seq - self.capacity, slot)
+
+		sid = self.strings.intern(source)
+		tid = self.strings.intern(type_)
+		value = payload.get("value") if isinstance(payload, dict) else None
+		self.ingested_at[slot] = time.time() if ingested_at is None else ingested_at
+		self.source_id[slot] = sid
+		self.type_id[slot] = tid
+		self.value[slot] = float(value) if isinstance(value, (int, float)) else math.nan
+		self.quality[slot] = float(quality)
+		self.entry_id[slot] = entry_id
+		self.timestamp[slot] = timestamp
+		self.payload[slot] = payload
+		self._by_source.setdefault(sid, deque()).append(seq)
+		self._by_type.setdefault(tid, deque()).append(seq)
+		self._next = seq + 1
+		return seq
+
+	def _drop_slot(self, seq: int, slot: int) -> None:
+		# The overwritten entry is the oldest one, so it sits at the left of its
+		# index deques.
+		for index, ident in ((self._by_source, self.source_id[slot]), (self._by_type, self.type_id[slot])):
+			bucket = index.get(ident)
+			if bucket and bucket[0] == seq:
+				bucket.popleft()
+				if not bucket:
+					del index[ident]
+
+	def clear(self) -> None:
+		self.__init__(self.capacity)
+
+	# ------------------------------------------------------------------
+	# Reads
+	# ------------------------------------------------------------------
+	def entry(self, seq: int) -> Dict[str, Any]:
+		slot = seq % self.capacity
+		names = self.strings.names
+		return {
+			"id": self.entry_id[slot],
+			"source": names[self.source_id[slot]],
+			"type": names[self.type_id[slot]],
+			"payload": self.payload[slot],
+			"timestamp": self.timestamp[slot],
+			"quality": self.quality[slot],
+		}
+
+	def _first_since(self, since: float) -> int:
+		"""Smallest live sequence number ingested at or after ``since``."""
+
+		lo, hi = self.oldest, self._next
+		while lo < hi:
+			mid = (lo + hi) // 2
+			if self.ingested_at[mid % self.capacity] < since:
+				lo = mid + 1
+			else:
+				hi = mid
+		return lo
+
+	def _candidates(self, source: Optional[str], type_: Optional[str]) -> Optional[Iterable[int]]:
+		"""Newest-first sequence numbers to visit, or ``None`` if nothing matches."""
+
+		buckets = []
+		if source is not None:
+			sid = self.strings.lookup(source)
+			bucket = self._by_source.get(sid) if sid is not None else None
+			if not bucket:
+				return None
+			buckets.append(bucket)
+		if type_ is not None:
+			tid = self.strings.lookup(type_)
+			bucket = self._by_type.get(tid) if tid is not None else None
+			if not bucket:
+				return None
+			buckets.append(bucket)
+		if not buckets:
+			return range(self._next - 1, self.oldest - 1, -1)
+		return reversed(min(buckets, key=len))
+
+	def query(
+		self,
+		limit: int = 100,
+		since: Optional[float] = None,
+		source: Optional[str] = None,
+		type_: Optional[str] = None,
+	) -> List[Dict[str, Any]]:
+		"""Return up to ``limit`` newest matching entries, oldest first.
+
+		``since`` is an epoch timestamp compared against ingest time.
+		"""
+
+		if limit <= 0:
+			return []
+		candidates = self._candidates(source, type_)
+		if candidates is None:
+			return []
+		floor = self._first_since(since) if since is not None else self.oldest
+		sid = self.strings.lookup(source) if source is not None else None
+		tid = self.strings.lookup(type_) if type_ is not None else None
+
+		picked: List[int] = []
+		for seq in candidates:
+			if seq < floor:
+				break
+			slot = seq % self.capacity
+			if sid is not None and self.source_id[slot] != sid:
+				continue
+			if tid is not None and self.type_id[slot] != tid:
+				continue
+			picked.append(seq)
+			if len(picked) >= limit:
+				break
+		return [self.entry(seq) for seq in reversed(picked)]
+
+	def export(self) -> List[Dict[str, Any]]:
+		return [self.entry(seq) for seq in range(self.oldest, self._next)]
+
@@ -4,18 +4,28 @@ This module consumes frames produced by ALBA and derives knowledge artefacts
 that can be stored or queried by other services. The implementation relies on
 pure Python to keep the dependency surface minimal while still yielding useful
 aggregations.
+
+When fed an ``AlbaCore`` directly, learning is incremental: ALBI remembers how far
+into the ALBA sequence it has read and only folds new frames (and drops evicted
+ones) from exact running sums, producing the same summaries as a full rescan.
+Insights are kept in a bounded ring and can be appended to a JSON-lines file.
 """
 
 from __future__ import annotations
 
+from collections import deque
+from itertools import islice
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Iterable
+from typing import Deque, Dict, List, Any, Optional, Iterable, Tuple
 
 import json
+import math
 import statistics
 import time
 
+from alba_core import ExactSum
+
 
 @dataclass
 class Insight:
@@ -27,12 +37,84 @@ class Insight:
 	source_frame_count: int = 0
 
 
+class _AlbaWindow:
+	"""Running per-channel sums over the frames currently held by an AlbaCore."""
+
+	def __init__(self, source: Any) -> None:
+		self.source = source
+		self.next_seq = 0  # high-water mark into the ALBA sequence
+		self.frames: Deque[Tuple[int, Dict[str, float]]] = deque()
+		self.sums: Dict[str, ExactSum] = {}
+		# per channel: [NaN, +inf, -inf] counts; these stay out of ``sums`` because
+		# ExactSum cannot take them back out once added
+		self.non_finite: Dict[str, List[int]] = {}
+		# per channel: (seq, position in frame) of every frame carrying it, so the
+		# first-appearance order of a full rescan can be reproduced
+		self.occurrences: Dict[str, Deque[Tuple[int, int]]] = {}
+
+	def advance(self, alba: Any) -> None:
+		start = max(self.next_seq, alba.oldest_seq)
+		for offset, frame in enumerate(alba.frames_since(self.next_seq)):
+			seq = start + offset
+			channels = {name: float(value) for name, value in frame.channels.items()}
+			for position, (name, value) in enumerate(channels.items()):
+				self._count(name, value, 1)
+				self.occurrences.setdefault(name, deque()).append((seq, position))
+			self.frames.append((seq, channels))
+		self.next_seq = alba.total_ingested
+
+		oldest = alba.oldest_seq
+		while self.frames and self.frames[0][0] < oldest:
+			_, channels = self.frames.popleft()
+			for name, value in channels.items():
+				self._count(name, value, -1)
+				hits = self.occurrences[name]
+				hits.popleft()
+				if not hits:
+					del self.occurrences[name]
+					del self.sums[name]
+					self.non_finite.pop(name, None)
+
+	def _count(self, name: str, value: float, sign: int) -> None:
+		total = self.sums.setdefault(name, ExactSum())
+		if math.isfinite(value):
+			if sign > 0:
+				total.add(value)
+			else:
+				total.remove(value)
+			return
+		counts = self.non_finite.setdefault(name, [0, 0, 0])
+		counts[0 if math.isnan(value) else 1 if value > 0 else 2] += sign
+
+	def _mean(self, name: str) -> float:
+		# what statistics.fmean gives once NaN / inf are among the values (it raises
+		# ValueError for +inf and -inf together; NaN is the more useful summary)
+		nan, pos_inf, neg_inf = self.non_finite.get(name, (0, 0, 0))
+		if nan or (pos_inf and neg_inf):
+			return math.nan
+		if pos_inf or neg_inf:
+			return math.inf if pos_inf else -math.inf
+		return self.sums[name].value() / len(self.occurrences[name])
+
+	def summary(self) -> Dict[str, float]:
+		order = sorted(self.occurrences, key=lambda name: self.occurrences[name][0])
+		return {name: self._mean(name) for name in order}
+
+
 class AlbiCore:
 	"""Learning engine that turns signal frames into insights."""
 
-	def __init__(self, *, anomaly_threshold: float = 0.25) -> None:
+	def __init__(
+		self,
+		*,
+		anomaly_threshold: float = 0.25,
+		max_insights: int = 1024,
+		persist_path: Optional[Path | str] = None,
+	) -> None:
 		self.anomaly_threshold = anomaly_threshold
-		self._insights: List[Insight] = []
+		self._insights: Deque[Insight] = deque(maxlen=max(1, max_insights))
+		self.persist_path = Path(persist_path) if persist_path else None
+		self._window: Optional[_AlbaWindow] = None
 		self._status = "idle"
 		self._started_at: Optional[float] = None
 
@@ -67,14 +149,47 @@ class AlbiCore:
 			count += 1
 
 		summary = {k: statistics.fmean(v) for k, v in channels.items()} if channels else {}
+		return self._record(summary, count)
+
+	def learn_from_alba(self, alba_history: Any) -> Insight:
+		"""Learn from ALBA frames.
+
+		``alba_history`` may be a list of frames (full rescan) or the ``AlbaCore``
+		itself, in which case only frames ingested since the previous call are read.
+		"""
+
+		if hasattr(alba_history, "frames_since"):
+			return self._learn_incremental(alba_history)
+		frames = [{"channels": frame.channels} for frame in alba_history]
+		return self.learn(frames)
+
+	def _learn_incremental(self, alba: Any) -> Insight:
+		if self._status != "running":
+			self.start()
+
+		window = self._window
+		if window is None or window.source is not alba or alba.total_ingested < window.next_seq:
+			window = self._window = _AlbaWindow(alba)  # new or reset source
+		window.advance(alba)
+		return self._record(window.summary(), len(window.frames))
+
+	def _record(self, summary: Dict[str, float], count: int) -> Insight:
 		anomalies = self._detect_anomalies(summary)
 		insight = Insight(timestamp=time.time(), summary=summary, anomalies=anomalies, source_frame_count=count)
 		self._insights.append(insight)
+		if self.persist_path is not None:
+			with self.persist_path.open("a", encoding="utf-8") as handle:
+				handle.write(json.dumps(self._to_dict(insight)) + "\n")
 		return insight
 
-	def learn_from_alba(self, alba_history: Iterable[Any]) -> Insight:
-		frames = [{"channels": frame.channels} for frame in alba_history]
-		return self.learn(frames)
+	@staticmethod
+	def _to_dict(insight: Insight) -> Dict[str, Any]:
+		return {
+			"timestamp": insight.timestamp,
+			"summary": insight.summary,
+			"anomalies": insight.anomalies,
+			"source_frame_count": insight.source_frame_count,
+		}
 
 	def _detect_anomalies(self, summary: Dict[str, float]) -> List[str]:
 		if not summary:
@@ -93,6 +208,13 @@ class AlbiCore:
 	def insights(self) -> List[Insight]:
 		return list(self._insights)
 
+	def recent(self, limit: int) -> List[Insight]:
+		"""Last ``limit`` insights, oldest first, without copying the whole ring."""
+
+		items = list(islice(reversed(self._insights), max(limit, 0)))
+		items.reverse()
+		return items
+
 	def latest(self) -> Optional[Insight]:
 		return self._insights[-1] if self._insights else None
 
@@ -107,15 +229,7 @@ class AlbiCore:
 		}
 
 	def export(self, target: Path | str) -> Path:
-		data = [
-			{
-				"timestamp": insight.timestamp,
-				"summary": insight.summary,
-				"anomalies": insight.anomalies,
-				"source_frame_count": insight.source_frame_count,
-			}
-			for insight in self._insights
-		]
+		data = [self._to_dict(insight) for insight in self._insights]
 		path = Path(target)
 		path.write_text(json.dumps(data, indent=2), encoding="utf-8")
 		return path
@@ -124,7 +238,11 @@ class AlbiCore:
 		path = Path(source)
 		if not path.exists():
 			return 0
-		payload = json.loads(path.read_text(encoding="utf-8-sig"))
+		text = path.read_text(encoding="utf-8-sig")
+		if path.suffix == ".jsonl":
+			payload = [json.loads(line) for line in text.splitlines() if line.strip()]
+		else:
+			payload = json.loads(text)
 		self._insights.clear()
 		for entry in payload:
 			insight = Insight(
@@ -5,17 +5,31 @@ Neural analytics and pattern detection service
 
 import asyncio
 import json
+import os
 import time
 import logging
+import sys
 import uuid
 from datetime import datetime, timezone
-from typing import Dict, List, Any
-from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+from collections import defaultdict, deque
+from itertools import islice
 
+import numpy as np
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
+from albi_stream_stats import StreamAnalyzer, analyze_batch
+
+# ALBINeuralProcessor lives in apps/api/services; imported from its directory
+# because the services package __init__ pulls in every character module
+SERVICES_DIR = Path(__file__).resolve().parent / "apps" / "api" / "services"
+if str(SERVICES_DIR) not in sys.path:
+    sys.path.append(str(SERVICES_DIR))
+from albi_neural_processor import ALBINeuralProcessor
+
 # OpenTelemetry imports
 from tracing import setup_tracing, instrument_fastapi_app, instrument_http_clients
 
@@ -54,9 +68,36 @@ app.add_middleware(
 START_TIME = time.time()
 INSTANCE_ID = uuid.uuid4().hex[:8]
 
-analysis_cache = []
-insights = []
-anomalies = []
+# Bounded history (deque eviction is O(1)); totals survive eviction
+CACHE_LIMIT = int(os.getenv("ALBI_CACHE_LIMIT", "1000"))
+analysis_cache: deque = deque(maxlen=CACHE_LIMIT)
+insights: deque = deque(maxlen=CACHE_LIMIT)
+anomalies: deque = deque(maxlen=CACHE_LIMIT)
+counters = {"analyses": 0, "anomalies": 0}
+
+# Per-stream Welford/EWMA state for incremental analysis
+stream_analyzer = StreamAnalyzer(
+    alpha=float(os.getenv("ALBI_EWMA_ALPHA", "0.01")),
+    max_streams=int(os.getenv("ALBI_MAX_STREAMS", "1024")),
+)
+
+# Spectral/coherence analysis of raw EEG windows (see /eeg/process)
+neural_processor = ALBINeuralProcessor()
+
+
+class EEGSignal(BaseModel):
+    samples: List[List[float]]  # samples x channels, at neural_processor.sampling_rate
+    channel_names: Optional[List[str]] = None
+    compact: bool = False  # leave out the per-channel spectra
+
+
+def _tail(buffer: deque, limit: int) -> List[Any]:
+    """Last ``limit`` items of a deque without copying the whole buffer."""
+    if limit <= 0:
+        return []
+    recent = list(islice(reversed(buffer), limit))
+    recent.reverse()
+    return recent
 
 # ═══════════════════════════════════════════════════════════════════
 # ENDPOINTS
@@ -64,43 +105,26 @@ anomalies = []
 
 @app.post("/analyze")
 async def analyze_data(data: Dict[str, Any]):
-    """Analyze telemetry data for patterns and anomalies"""
+    """Analyze telemetry data for patterns and anomalies.
+
+    With a ``stream_id`` the channels are folded into that stream's running
+    statistics and outliers are judged against the stream history.
+    """
     with tracer.start_as_current_span("analyze_data") as span:
-        # Simulate neural analysis
         channels = data.get("channels", {})
+        stream_id = data.get("stream_id")
         analysis_id = uuid.uuid4().hex
         
         span.set_attribute("channel_count", len(channels))
         
-        # Simple statistical analysis
-        stats = {}
-        detected_anomalies = []
-        
-        for channel_name, values in channels.items():
-            if isinstance(values, list) and len(values) > 0:
-                try:
-                    avg = sum(values) / len(values)
-                    max_v = max(values)
-                    min_v = min(values)
-                    
-                    # Anomaly detection: values > 2 std devs
-                    variance = sum((x - avg) ** 2 for x in values) / len(values)
-                    std_dev = variance ** 0.5
-                    
-                    outliers = [x for x in values if abs(x - avg) > 2 * std_dev]
-                    
-                    stats[channel_name] = {
-                        "mean": avg,
-                        "max": max_v,
-                        "min": min_v,
-                        "std_dev": std_dev,
-                        "outlier_count": len(outliers)
-                    }
-                    
-                    if len(outliers) > 0:
-                        detected_anomalies.append(channel_name)
-                except:
-                    pass
+        # Vectorized statistics: one stacked NumPy pass over all channels
+        if not isinstance(channels, dict):
+            channels = {}
+        if stream_id:
+            span.set_attribute("stream_id", str(stream_id))
+            stats, detected_anomalies = stream_analyzer.update(str(stream_id), channels)
+        else:
+            stats, detected_anomalies = analyze_batch(channels)
         
         result = {
             "analysis_id": analysis_id,
@@ -110,12 +134,16 @@ async def analyze_data(data: Dict[str, Any]):
             "confidence": 0.92,
             "pattern_type": "neural_oscillation"
         }
+        if stream_id:
+            result["stream_id"] = stream_id
         
         span.set_attribute("anomaly_count", len(detected_anomalies))
         span.set_attribute("analysis_id", analysis_id)
         
         analysis_cache.append(result)
+        counters["analyses"] += 1
         if len(detected_anomalies) > 0:
+            counters["anomalies"] += 1
             anomalies.append({
                 "timestamp": datetime.now(timezone.utc).isoformat(),
                 "channels": detected_anomalies,
@@ -126,12 +154,38 @@ async def analyze_data(data: Dict[str, Any]):
         
         return result
 
+@app.post("/eeg/process")
+async def process_eeg(signal: EEGSignal):
+    """Full ALBI neural analysis of one EEG window.
+
+    With ``compact`` the response omits ``channel_spectra`` (every channel's
+    full power spectrum), which is most of a full response.
+    """
+    with tracer.start_as_current_span("process_eeg") as span:
+        try:
+            data = np.asarray(signal.samples, dtype=float)
+        except ValueError:
+            raise HTTPException(status_code=422, detail="samples rows must all have the same length")
+        if data.ndim != 2 or data.shape[1] == 0:
+            raise HTTPException(status_code=422, detail="samples must be a samples x channels matrix")
+        
+        span.set_attribute("samples", data.shape[0])
+        span.set_attribute("channel_count", data.shape[1])
+        span.set_attribute("compact", signal.compact)
+        
+        try:
+            return await neural_processor.process_eeg_signal(
+                data, signal.channel_names, compact=signal.compact
+            )
+        except ValueError as e:  # e.g. too few samples for the band-pass filter
+            raise HTTPException(status_code=422, detail=str(e))
+
 @app.get("/insights")
 async def get_insights(limit: int = 50):
     """Get recent analysis insights"""
     with tracer.start_as_current_span("get_insights") as span:
         span.set_attribute("limit", limit)
-        recent = analysis_cache[-limit:]
+        recent = _tail(analysis_cache, limit)
         span.set_attribute("insights_returned", len(recent))
         
         return {
@@ -145,7 +199,7 @@ async def get_anomalies(limit: int = 20):
     """Get detected anomalies"""
     with tracer.start_as_current_span("get_anomalies") as span:
         span.set_attribute("limit", limit)
-        recent = anomalies[-limit:]
+        recent = _tail(anomalies, limit)
         span.set_attribute("anomalies_returned", len(recent))
         
         return {
@@ -154,32 +208,48 @@ async def get_anomalies(limit: int = 20):
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
 
+def _record_agent_analytics(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Store one agent analytics record (shared by single and batch endpoints)"""
+    tokens = data.get("tokens") or {}
+    analytics_entry = {
+        "agent": data.get("agent", "unknown"),
+        "operation": data.get("operation", "unknown"),
+        "duration_ms": data.get("duration_ms", 0),
+        "input_tokens": tokens.get("input"),
+        "output_tokens": tokens.get("output"),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "success": data.get("success", True)
+    }
+    insights.append(analytics_entry)
+    return analytics_entry
+
+@app.post("/api/analytics/agent/batch")
+async def agent_analytics_batch(records: List[Dict[str, Any]]):
+    """Process a batch of agent analytics records (see agent_telemetry.TelemetryExporter)"""
+    with tracer.start_as_current_span("agent_analytics_batch") as span:
+        for record in records:
+            _record_agent_analytics(record)
+        span.set_attribute("records", len(records))
+        logger.info(f"[AGENT] batch of {len(records)} records -> Albi")
+        return {
+            "status": "analyzed",
+            "count": len(records),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+
 @app.post("/api/analytics/agent")
 async def agent_analytics(data: Dict[str, Any]):
     """Process analytics from AI agents"""
     with tracer.start_as_current_span("agent_analytics") as span:
-        agent = data.get("agent", "unknown")
-        operation = data.get("operation", "unknown")
-        duration_ms = data.get("duration_ms", 0)
-        tokens = data.get("tokens", {})
+        analytics_entry = _record_agent_analytics(data)
+        agent = analytics_entry["agent"]
+        operation = analytics_entry["operation"]
+        duration_ms = analytics_entry["duration_ms"]
         
         span.set_attribute("agent", agent)
         span.set_attribute("operation", operation)
         span.set_attribute("duration_ms", duration_ms)
         
-        # Store analytics
-        analytics_entry = {
-            "agent": agent,
-            "operation": operation,
-            "duration_ms": duration_ms,
-            "input_tokens": tokens.get("input"),
-            "output_tokens": tokens.get("output"),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "success": data.get("success", True)
-        }
-        
-        insights.append(analytics_entry)
-        
         logger.info(f"[AGENT] {agent}.{operation} -> Albi (duration: {duration_ms:.2f}ms)")
         
         return {
@@ -201,11 +271,13 @@ async def get_metrics():
     
     return {
         "uptime_seconds": uptime,
-        "total_analyses": len(analysis_cache),
-        "total_anomalies": len(anomalies),
-        "analyses_per_minute": (len(analysis_cache) / max(uptime / 60, 1)),
+        "total_analyses": counters["analyses"],
+        "total_anomalies": counters["anomalies"],
+        "analyses_per_minute": (counters["analyses"] / max(uptime / 60, 1)),
         "cache_size": len(analysis_cache),
-        "anomaly_rate": len(anomalies) / max(len(analysis_cache), 1)
+        "cache_limit": CACHE_LIMIT,
+        "tracked_streams": len(stream_analyzer),
+        "anomaly_rate": counters["anomalies"] / max(counters["analyses"], 1)
     }
 
 @app.get("/health")
@@ -240,9 +312,13 @@ async def execute_action(action: Dict[str, Any]):
         elif cmd == "clear_anomalies":
             anomalies.clear()
             return {"status": "anomalies_cleared"}
+        elif cmd == "reset_streams":
+            stream_analyzer.reset(action.get("stream_id"))
+            return {"status": "streams_reset"}
         elif cmd == "reset":
             analysis_cache.clear()
             anomalies.clear()
+            stream_analyzer.reset()
             return {"status": "reset_complete"}
         else:
             raise HTTPException(status_code=400, detail="Unknown action")
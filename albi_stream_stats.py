@@ -0,0 +1,197 @@
+"""Vectorized channel statistics for the ALBI processor (``albi_service_6666``).
+
+Two modes back ``/analyze``:
+
+* ``analyze_batch`` – channels of equal length are stacked into one
+  ``(channels, samples)`` matrix and mean / min / max / std / 2-sigma outlier
+  counts are computed with single NumPy reductions along ``axis=1``.
+* ``StreamAnalyzer`` – keeps per-(stream, channel) Welford moments and an
+  exponentially weighted mean/variance. Each call merges the new block with
+  Chan's parallel update, so repeated calls on one stream are incremental and
+  outliers are judged against the history seen so far, not only the current block.
+
+Per-block statistics stay identical to the previous pure-Python loop; ``min``
+and ``max`` are the original sample values (so integer input stays ``int``).
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+def _numeric_matrix(rows: List[Any]) -> np.ndarray:
+    """``rows`` as a float64 ``(channels, samples)`` matrix; ValueError unless
+    every value is a plain number (nested lists, strings and None are not)."""
+    matrix = np.asarray(rows)
+    if matrix.ndim != 2 or matrix.dtype.kind not in "biuf":
+        raise ValueError("channel values must be flat lists of numbers")
+    return matrix.astype(np.float64, copy=False)
+
+
+def _stack_channels(channels: Dict[str, Any]) -> Dict[Any, Tuple[List[str], np.ndarray, List[Any]]]:
+    """Group valid numeric channels by length into stacked float64 matrices
+    (returned with the original rows)."""
+    groups: Dict[int, Tuple[List[str], List[Any]]] = {}
+    for name, values in channels.items():
+        if not isinstance(values, list) or len(values) == 0:
+            continue
+        names, rows = groups.setdefault(len(values), ([], []))
+        names.append(name)
+        rows.append(values)
+
+    stacked = {}
+    for length, (names, rows) in groups.items():
+        try:
+            stacked[length] = (names, _numeric_matrix(rows), rows)
+        except (TypeError, ValueError):
+            # A non-numeric channel spoils the group; fall back to one row each.
+            for name, row in zip(names, rows):
+                try:
+                    stacked[(length, name)] = ([name], _numeric_matrix([row]), [row])
+                except (TypeError, ValueError):
+                    continue
+    return stacked
+
+
+def _block_moments(matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    mean = matrix.mean(axis=1)
+    centered = matrix - mean[:, None]
+    var = np.einsum("ij,ij->i", centered, centered) / matrix.shape[1]
+    return {
+        "mean": mean,
+        "argmin": matrix.argmin(axis=1),
+        "argmax": matrix.argmax(axis=1),
+        "m2": var * matrix.shape[1],
+        "std": np.sqrt(var),
+        "centered": centered,
+    }
+
+
+def analyze_batch(channels: Dict[str, Any]) -> Tuple[Dict[str, Dict[str, float]], List[str]]:
+    """Return ``(statistics, anomalous_channels)`` for one request."""
+    stats: Dict[str, Dict[str, float]] = {}
+    for names, matrix, rows in _stack_channels(channels).values():
+        m = _block_moments(matrix)
+        outliers = (np.abs(m["centered"]) > 2 * m["std"][:, None]).sum(axis=1)
+        for i, name in enumerate(names):
+            stats[name] = {
+                "mean": float(m["mean"][i]),
+                "max": rows[i][m["argmax"][i]],
+                "min": rows[i][m["argmin"][i]],
+                "std_dev": float(m["std"][i]),
+                "outlier_count": int(outliers[i]),
+            }
+    # keep the request's channel order
+    ordered = {name: stats[name] for name in channels if name in stats}
+    return ordered, [name for name, s in ordered.items() if s["outlier_count"] > 0]
+
+
+class _ChannelState:
+    __slots__ = ("count", "mean", "m2", "min", "max", "ewm", "ewm_sq")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.ewm = 0.0
+        self.ewm_sq = 0.0
+
+    @property
+    def std(self) -> float:
+        return (self.m2 / self.count) ** 0.5 if self.count else 0.0
+
+
+class StreamAnalyzer:
+    """Incremental per-stream analyzer with a bounded number of tracked streams."""
+
+    def __init__(self, alpha: float = 0.01, max_streams: int = 1024) -> None:
+        self.alpha = alpha
+        self.max_streams = max_streams
+        self._streams: "OrderedDict[str, Dict[str, _ChannelState]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+    def reset(self, stream_id: str = None) -> None:
+        if stream_id is None:
+            self._streams.clear()
+        else:
+            self._streams.pop(stream_id, None)
+
+    def _state(self, stream_id: str) -> Dict[str, _ChannelState]:
+        state = self._streams.get(stream_id)
+        if state is None:
+            state = self._streams[stream_id] = {}
+            while len(self._streams) > self.max_streams:
+                self._streams.popitem(last=False)
+        else:
+            self._streams.move_to_end(stream_id)
+        return state
+
+    def update(self, stream_id: str, channels: Dict[str, Any]) -> Tuple[Dict[str, Dict[str, float]], List[str]]:
+        """Fold one block into the stream and return ``(statistics, anomalies)``.
+
+        Block statistics match ``analyze_batch``; ``outlier_count`` is measured
+        against the running mean/std before this block (once at least two
+        samples were seen), and a ``stream`` section carries the running values.
+        """
+        state = self._state(stream_id)
+        stats: Dict[str, Dict[str, float]] = {}
+        alpha = self.alpha
+        for names, matrix, rows in _stack_channels(channels).values():
+            n = matrix.shape[1]
+            m = _block_moments(matrix)
+            # EWMA over the block in closed form: ewm_n = (1-a)^n ewm_0 + sum w_i x_i
+            decay = (1.0 - alpha) ** n
+            weights = alpha * (1.0 - alpha) ** np.arange(n - 1, -1, -1, dtype=np.float64)
+            ewm_block = matrix @ weights
+            ewm_sq_block = (matrix * matrix) @ weights
+
+            prior_mean = np.empty(len(names))
+            prior_std = np.empty(len(names))
+            for i, name in enumerate(names):
+                ch = state.get(name)
+                if ch is None or ch.count < 2:
+                    prior_mean[i], prior_std[i] = m["mean"][i], m["std"][i]
+                else:
+                    prior_mean[i], prior_std[i] = ch.mean, ch.std
+            outliers = (np.abs(matrix - prior_mean[:, None]) > 2 * prior_std[:, None]).sum(axis=1)
+
+            for i, name in enumerate(names):
+                block_max = rows[i][m["argmax"][i]]
+                block_min = rows[i][m["argmin"][i]]
+                ch = state.get(name)
+                if ch is None:
+                    ch = state[name] = _ChannelState()
+                    ch.ewm, ch.ewm_sq = float(matrix[i, 0]), float(matrix[i, 0]) ** 2
+                # Chan et al. parallel merge of (count, mean, M2)
+                total = ch.count + n
+                delta = m["mean"][i] - ch.mean
+                ch.m2 = ch.m2 + m["m2"][i] + delta * delta * ch.count * n / total
+                ch.mean = ch.mean + delta * n / total
+                ch.count = total
+                ch.min = min(ch.min, block_min)
+                ch.max = max(ch.max, block_max)
+                ch.ewm = decay * ch.ewm + float(ewm_block[i])
+                ch.ewm_sq = decay * ch.ewm_sq + float(ewm_sq_block[i])
+                stats[name] = {
+                    "mean": float(m["mean"][i]),
+                    "max": block_max,
+                    "min": block_min,
+                    "std_dev": float(m["std"][i]),
+                    "outlier_count": int(outliers[i]),
+                    "stream": {
+                        "samples": ch.count,
+                        "mean": ch.mean,
+                        "std_dev": ch.std,
+                        "min": ch.min,
+                        "max": ch.max,
+                        "ewma_mean": ch.ewm,
+                        "ewma_std": max(ch.ewm_sq - ch.ewm * ch.ewm, 0.0) ** 0.5,
+                    },
+                }
+        ordered = {name: stats[name] for name in channels if name in stats}
+        return ordered, [name for name, s in ordered.items() if s["outlier_count"] > 0]
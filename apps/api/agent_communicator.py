@@ -6,13 +6,23 @@ Implements self-consumption pattern for agent coordination.
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+import os
+from collections import deque
+from typing import Deque, Dict, Any, Optional
 from datetime import datetime
 
 from apps.api.internal_client import internal_client
 
 logger = logging.getLogger(__name__)
 
+MESSAGE_LOG_LIMIT = int(os.getenv('AGENT_MESSAGE_LOG_LIMIT', '100'))
+
+TRINITY_ENDPOINTS = {
+    'alba': '/asi/alba/process',
+    'albi': '/asi/albi/process',
+    'jona': '/asi/jona/process'
+}
+
 
 class AgentCommunicator:
     """
@@ -23,64 +33,40 @@ class AgentCommunicator:
     def __init__(self, agent_name: str):
         self.agent_name = agent_name
         self.client = internal_client
-        self.message_log: List[Dict] = []
+        self.message_log: Deque[Dict] = deque(maxlen=MESSAGE_LOG_LIMIT)
     
-    async def send_to_alba(self, message: Dict[str, Any]) -> Optional[Dict]:
-        """Send message to ALBA (Network Monitor)"""
+    def _envelope(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'from': self.agent_name,
+            'timestamp': datetime.now().isoformat(),
+            'message': message
+        }
+    
+    async def _send(self, target: str, message: Dict[str, Any]) -> Optional[Dict]:
         try:
             result = await self.client.post(
-                endpoint='/asi/alba/process',
-                json={
-                    'from': self.agent_name,
-                    'timestamp': datetime.now().isoformat(),
-                    'message': message
-                }
+                endpoint=TRINITY_ENDPOINTS[target],
+                json=self._envelope(message)
             )
             
-            self._log_message('alba', 'sent', message)
+            self._log_message(target, 'sent', message)
             return result.get('data')
         
         except Exception as e:
-            logger.error(f"Failed to send to ALBA: {e}")
+            logger.error(f"Failed to send to {target.upper()}: {e}")
             return None
     
+    async def send_to_alba(self, message: Dict[str, Any]) -> Optional[Dict]:
+        """Send message to ALBA (Network Monitor)"""
+        return await self._send('alba', message)
+    
     async def send_to_albi(self, message: Dict[str, Any]) -> Optional[Dict]:
         """Send message to ALBI (Neural Processor)"""
-        try:
-            result = await self.client.post(
-                endpoint='/asi/albi/process',
-                json={
-                    'from': self.agent_name,
-                    'timestamp': datetime.now().isoformat(),
-                    'message': message
-                }
-            )
-            
-            self._log_message('albi', 'sent', message)
-            return result.get('data')
-        
-        except Exception as e:
-            logger.error(f"Failed to send to ALBI: {e}")
-            return None
+        return await self._send('albi', message)
     
     async def send_to_jona(self, message: Dict[str, Any]) -> Optional[Dict]:
         """Send message to JONA (Coordinator)"""
-        try:
-            result = await self.client.post(
-                endpoint='/asi/jona/process',
-                json={
-                    'from': self.agent_name,
-                    'timestamp': datetime.now().isoformat(),
-                    'message': message
-                }
-            )
-            
-            self._log_message('jona', 'sent', message)
-            return result.get('data')
-        
-        except Exception as e:
-            logger.error(f"Failed to send to JONA: {e}")
-            return None
+        return await self._send('jona', message)
     
     async def query_brain_status(self) -> Optional[Dict]:
         """Query brain engine status"""
@@ -121,16 +107,21 @@ class AgentCommunicator:
             'timestamp': datetime.now().isoformat()
         }
         
-        # Send to all agents concurrently
-        alba_task = self.send_to_alba(message)
-        albi_task = self.send_to_albi(message)
-        jona_task = self.send_to_jona(message)
-        
-        results['alba'], results['albi'], results['jona'] = await asyncio.gather(
-            alba_task, albi_task, jona_task,
-            return_exceptions=True
+        # One request per agent, concurrently, over the shared pooled client
+        envelope = self._envelope(message)
+        targets = list(TRINITY_ENDPOINTS)
+        responses = await self.client.post_many(
+            [(TRINITY_ENDPOINTS[target], envelope) for target in targets],
+            max_concurrency=len(targets)
         )
         
+        for target, response in zip(targets, responses):
+            if isinstance(response, Exception):
+                logger.error(f"Failed to send to {target.upper()}: {response}")
+                continue
+            self._log_message(target, 'sent', message)
+            results[target] = response.get('data')
+        
         return results
     
     async def get_asi_status(self) -> Dict[str, Any]:
@@ -153,6 +144,7 @@ class AgentCommunicator:
     
     def _log_message(self, target: str, direction: str, message: Dict):
         """Log inter-agent communication"""
+        # deque(maxlen) keeps only the last MESSAGE_LOG_LIMIT messages
         self.message_log.append({
             'timestamp': datetime.now().isoformat(),
             'from': self.agent_name,
@@ -160,10 +152,6 @@ class AgentCommunicator:
             'direction': direction,
             'message_type': message.get('type', 'unknown')
         })
-        
-        # Keep only last 100 messages
-        if len(self.message_log) > 100:
-            self.message_log = self.message_log[-100:]
     
     def get_communication_stats(self) -> Dict[str, Any]:
         """Get communication statistics"""
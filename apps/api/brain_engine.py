@@ -12,6 +12,8 @@ import requests
 from pathlib import Path
 import json
 
+import numpy as np
+
 try:
     import psutil
     HAS_PSUTIL = True
@@ -19,11 +21,9 @@ except ImportError:
     HAS_PSUTIL = False
 
 try:
-    import librosa
-    import numpy as np
-    HAS_AUDIO = True
-except ImportError:
-    HAS_AUDIO = False
+    from neuro.audio_context import HAS_LIBROSA as HAS_AUDIO, get_audio_context
+except ImportError:  # imported as apps.api.brain_engine
+    from .neuro.audio_context import HAS_LIBROSA as HAS_AUDIO, get_audio_context
 
 try:
     import mne
@@ -167,29 +167,26 @@ class CognitiveEngine:
             return {"error": "librosa not installed"}
         
         try:
-            y, sr = librosa.load(audio_path, sr=None, mono=True)
+            # Decoded once per upload content, features shared with the neuro engines
+            audio = get_audio_context(audio_path).native
+            y, sr = audio.y, audio.sr
             
             # Real spectral analysis
-            spectral_centroid = float(np.mean(librosa.feature.spectral_centroid(y=y, sr=sr)))
-            spectral_rolloff = float(np.mean(librosa.feature.spectral_rolloff(y=y, sr=sr)))
-            zero_crossing_rate = float(np.mean(librosa.feature.zero_crossing_rate(y)))
+            spectral_centroid = float(np.mean(audio.spectral_centroid()))
+            spectral_rolloff = float(np.mean(audio.spectral_rolloff()))
+            zero_crossing_rate = float(np.mean(audio.zero_crossing_rate()))
             
-            # Real pitch detection
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-            pitch_values = []
-            for t in range(pitches.shape[1]):
-                index = magnitudes[:, t].argmax()
-                pitch = pitches[index, t]
-                if pitch > 0:
-                    pitch_values.append(float(pitch))
+            # Real pitch detection (strongest piptrack bin per frame)
+            frame_pitches, _ = audio.pitch_track()
+            pitch_values = frame_pitches[frame_pitches > 0].astype(np.float64)
             
-            fundamental_freq = float(np.median(pitch_values)) if pitch_values else 0.0
+            fundamental_freq = float(np.median(pitch_values)) if pitch_values.size else 0.0
             
             # Real tempo detection
-            tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
+            tempo, beats = audio.beat_track()
             
             # Real chroma features (harmony)
-            chroma = librosa.feature.chroma_stft(y=y, sr=sr)
+            chroma = audio.chroma_stft()
             chroma_mean = chroma.mean(axis=1).tolist()
             
             return {
@@ -203,8 +200,8 @@ class CognitiveEngine:
                 "beat_count": len(beats),
                 "chroma_profile": chroma_mean,
                 "pitch_range": {
-                    "min": float(min(pitch_values)) if pitch_values else 0.0,
-                    "max": float(max(pitch_values)) if pitch_values else 0.0,
+                    "min": float(pitch_values.min()) if pitch_values.size else 0.0,
+                    "max": float(pitch_values.max()) if pitch_values.size else 0.0,
                     "median": fundamental_freq
                 }
             }
@@ -3,11 +3,13 @@ CLINIC INTEGRATION EXAMPLES
 Shembuj real të integrimit me klinike të ndryshme
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional
 import asyncio
 import time
 from datetime import datetime
 
+import numpy as np
+
 # ============================================================================
 # EMOTIV EPOC+ EEG INTEGRATION
 # ============================================================================
@@ -330,6 +332,257 @@ class SpirometerIntegration:
             await asyncio.sleep(3)
 
 
+# ============================================================================
+# TIME-ALIGNED STREAM MULTIPLEXER
+# ============================================================================
+
+MUX_POLICIES = ("drop_oldest", "block", "downsample")
+
+
+class DeviceRing:
+    """
+    Bounded sample buffer for one device stream (timestamps in seconds).
+    When full, ``drop_oldest`` overwrites the oldest sample, ``downsample``
+    averages adjacent pairs (half the resolution, same time span) and
+    ``block`` makes the producer wait for the multiplexer to consume.
+    """
+
+    def __init__(self, name: str, capacity: int, policy: str = "drop_oldest"):
+        if policy not in MUX_POLICIES:
+            raise ValueError(f"unknown policy {policy!r}, expected one of {MUX_POLICIES}")
+        self.name = name
+        self.capacity = max(4, int(capacity))
+        self.policy = policy
+        self.width: Optional[int] = None
+        # twice the capacity, so the live window is compacted only once per ``capacity`` pushes
+        self._ts = np.empty(self.capacity * 2)
+        self._values: Optional[np.ndarray] = None
+        self._start = 0
+        self._end = 0
+        self._space = asyncio.Event()
+        self._space.set()
+        self.stats = {
+            "received": 0,
+            "dropped": 0,
+            "downsampled": 0,
+            "reordered": 0,
+            "blocked_seconds": 0.0,
+            "max_occupancy": 0,
+        }
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        return float(self._ts[self._end - 1]) if len(self) else None
+
+    def nbytes(self) -> int:
+        return self._ts.nbytes + (self._values.nbytes if self._values is not None else 0)
+
+    def _compact(self) -> None:
+        n = len(self)
+        self._ts[:n] = self._ts[self._start:self._end]
+        self._values[:n] = self._values[self._start:self._end]
+        self._start, self._end = 0, n
+
+    def _halve(self) -> None:
+        self._compact()
+        pairs = self._end // 2
+        ts, values = self._ts[:self._end], self._values[:self._end]
+        merged_ts = ts[:pairs * 2].reshape(pairs, 2).mean(axis=1)
+        merged_values = values[:pairs * 2].reshape(pairs, 2, -1).mean(axis=1)
+        tail = self._end - pairs * 2
+        self._ts[pairs:pairs + tail] = ts[pairs * 2:]
+        self._values[pairs:pairs + tail] = values[pairs * 2:]
+        self._ts[:pairs] = merged_ts
+        self._values[:pairs] = merged_values
+        self._end = pairs + tail
+        self.stats["downsampled"] += pairs
+
+    async def put(self, timestamp: float, value: Any) -> None:
+        """Append one reading, applying the overflow policy"""
+        if self.policy == "block":
+            while len(self) >= self.capacity:
+                self._space.clear()
+                started = time.monotonic()
+                await self._space.wait()
+                self.stats["blocked_seconds"] += time.monotonic() - started
+        self.push(timestamp, value)
+
+    def push(self, timestamp: float, value: Any) -> None:
+        row = np.atleast_1d(np.asarray(value, dtype=np.float64))
+        if self._values is None:
+            self.width = row.size
+            self._values = np.empty((self._ts.size, self.width))
+        if row.size != self.width:
+            raise ValueError(f"{self.name}: expected {self.width} values, got {row.size}")
+        last = self.last_timestamp
+        if last is not None and timestamp < last:
+            timestamp = last  # keep the buffer sorted; late samples are held at the newest time
+            self.stats["reordered"] += 1
+
+        if len(self) >= self.capacity:
+            if self.policy == "downsample":
+                self._halve()
+            else:  # drop_oldest (block only gets here through push())
+                self._start += 1
+                self.stats["dropped"] += 1
+        if self._end == self._ts.size:
+            self._compact()
+        self._ts[self._end] = timestamp
+        self._values[self._end] = row
+        self._end += 1
+        self.stats["received"] += 1
+        self.stats["max_occupancy"] = max(self.stats["max_occupancy"], len(self))
+
+    def sample(self, t: float, t_prev: float, mode: str) -> Optional[np.ndarray]:
+        """
+        Value at frame time ``t``: ``interp`` (linear between the samples
+        around ``t``), ``mean`` (average over ``(t_prev, t]``) or ``hold``
+        (last sample at or before ``t``). Falls back to hold when there is
+        nothing to interpolate or average; None before the first sample.
+        """
+        ts = self._ts[self._start:self._end]
+        values = self._values[self._start:self._end] if self._values is not None else None
+        right = int(np.searchsorted(ts, t, side="right"))
+        if right == 0:
+            return None
+        if mode == "mean":
+            left = int(np.searchsorted(ts, t_prev, side="right"))
+            if right > left:
+                return values[left:right].mean(axis=0)
+        elif mode == "interp" and right < len(ts):
+            t0, t1 = ts[right - 1], ts[right]
+            weight = (t - t0) / (t1 - t0) if t1 > t0 else 0.0
+            return values[right - 1] + weight * (values[right] - values[right - 1])
+        return values[right - 1].copy()
+
+    def release(self, before: float) -> None:
+        """Forget samples older than ``before``, keeping one for hold/interp"""
+        ts = self._ts[self._start:self._end]
+        idx = int(np.searchsorted(ts, before, side="left"))
+        self._start += max(idx - 1, 0)
+        if len(self) < self.capacity:
+            self._space.set()
+
+
+class StreamMultiplexer:
+    """
+    Aligns heterogeneous-rate device streams onto one clock.
+
+    Every device generator is pumped into its own bounded ``DeviceRing``;
+    ``frames()`` emits one synchronized frame per ``1 / frame_rate``
+    seconds, sampled ``delay`` seconds in the past so that faster devices
+    have delivered the samples around the frame time. Memory per bed is
+    bounded by the ring capacities, whatever the consumer does:
+
+    - ``drop_oldest`` / ``downsample``: a slow consumer skips to the current
+      frame (``frames_skipped``) and rings apply their overflow policy;
+    - ``block``: every frame is delivered in order, full rings stop reading
+      their device until the consumer catches up.
+    """
+
+    def __init__(self, frame_rate: float = 10.0, policy: str = "drop_oldest",
+                 delay: Optional[float] = None, clock: Callable[[], float] = time.time):
+        if policy not in MUX_POLICIES:
+            raise ValueError(f"unknown policy {policy!r}, expected one of {MUX_POLICIES}")
+        self.frame_rate = frame_rate
+        self.interval = 1.0 / frame_rate
+        self.policy = policy
+        self.delay = self.interval if delay is None else delay
+        self.clock = clock
+        self.rings: Dict[str, DeviceRing] = {}
+        self._streams: Dict[str, Dict[str, Any]] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._last_frame_time: Optional[float] = None
+        self.stats = {"frames_emitted": 0, "frames_skipped": 0}
+
+    def add_stream(self, name: str, source: Any, capacity: int = 512, mode: str = "hold",
+                   stale_after: float = 2.0, policy: Optional[str] = None) -> DeviceRing:
+        """
+        Register an async generator of readings (``{"timestamp": ms, "value": ...}``).
+        ``mode`` is ``interp``, ``mean`` or ``hold`` (see ``DeviceRing.sample``).
+        """
+        if mode not in ("interp", "mean", "hold"):
+            raise ValueError(f"unknown mode {mode!r}")
+        ring = DeviceRing(name, capacity, policy or self.policy)
+        self.rings[name] = ring
+        self._streams[name] = {"source": source, "mode": mode, "stale_after": stale_after}
+        return ring
+
+    async def _pump(self, name: str) -> None:
+        ring = self.rings[name]
+        async for reading in self._streams[name]["source"]:
+            await ring.put(reading["timestamp"] / 1000.0, reading["value"])
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._pump(name), name=f"mux-{name}") for name in self.rings]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def build_frame(self, t: float, t_prev: Optional[float] = None) -> Dict[str, Any]:
+        """Synchronized frame for time ``t`` (seconds); releases consumed samples"""
+        t_prev = t - self.interval if t_prev is None else t_prev
+        values: Dict[str, Any] = {}
+        lag: Dict[str, Optional[float]] = {}
+        stale = []
+        for name, ring in self.rings.items():
+            stream = self._streams[name]
+            value = ring.sample(t, t_prev, stream["mode"])
+            values[name] = None if value is None else (value.tolist() if value.size > 1 else float(value[0]))
+            last = ring.last_timestamp
+            lag[name] = None if last is None else max(0.0, t - last)
+            if lag[name] is None or lag[name] > stream["stale_after"]:
+                stale.append(name)
+            ring.release(t_prev if stream["mode"] == "mean" else t)
+        self._last_frame_time = t
+        self.stats["frames_emitted"] += 1
+        return {"timestamp": int(t * 1000), "values": values, "lag_seconds": lag, "stale": stale}
+
+    async def frames(self) -> AsyncIterator[Dict[str, Any]]:
+        """Emit synchronized frames at ``frame_rate`` (starts the device pumps)"""
+        self.start()
+        next_tick = self.clock()
+        while True:
+            now = self.clock()
+            if next_tick > now:
+                await asyncio.sleep(next_tick - now)
+            elif self.policy != "block" and now - next_tick >= self.interval:
+                skipped = int((now - next_tick) / self.interval)
+                next_tick += skipped * self.interval
+                self.stats["frames_skipped"] += skipped
+            t = next_tick - self.delay
+            yield self.build_frame(t, t - self.interval)
+            next_tick += self.interval
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Per-device lag and buffer metrics"""
+        devices = {}
+        for name, ring in self.rings.items():
+            last = ring.last_timestamp
+            devices[name] = {
+                **ring.stats,
+                "occupancy": len(ring),
+                "capacity": ring.capacity,
+                "policy": ring.policy,
+                "lag_seconds": None if last is None else max(0.0, self.clock() - last),
+                "buffered_seconds": 0.0 if len(ring) < 2 else float(ring._ts[ring._end - 1] - ring._ts[ring._start]),
+            }
+        return {
+            **self.stats,
+            "frame_rate": self.frame_rate,
+            "policy": self.policy,
+            "buffer_bytes": sum(ring.nbytes() for ring in self.rings.values()),
+            "devices": devices,
+        }
+
+
 # ============================================================================
 # MULTI-DEVICE CLINIC SETUP
 # ============================================================================
@@ -390,6 +643,42 @@ class UniversityClinincMultiDeviceSetup:
                 print(f"Error streaming: {e}")
                 await asyncio.sleep(1)
 
+    # (generator method, nominal rate Hz, mux mode, stale after seconds)
+    STREAM_LAYOUT = {
+        "eeg": ("stream_eeg_data", 256, "mean", 1.0),
+        "ecg": ("stream_ecg_data", 130, "interp", 1.0),
+        "spo2": ("stream_spo2_data", 1, "hold", 3.0),
+        "bp": ("stream_bp_data", 0.2, "hold", 15.0),
+        "temperature": ("stream_temperature_data", 0.5, "hold", 6.0),
+        "spirometer": ("stream_spirometer_data", 1 / 3, "hold", 9.0),
+    }
+
+    def create_multiplexer(self, frame_rate: float = 10.0, policy: str = "drop_oldest",
+                           buffer_seconds: float = 2.0) -> StreamMultiplexer:
+        """
+        Multiplexer over all devices, with ring buffers sized for
+        ``buffer_seconds`` at each device's nominal rate
+        """
+        mux = StreamMultiplexer(frame_rate=frame_rate, policy=policy)
+        for name, (method, rate, mode, stale_after) in self.STREAM_LAYOUT.items():
+            mux.add_stream(name, getattr(self.devices[name], method)(),
+                           capacity=int(rate * buffer_seconds) + 4, mode=mode, stale_after=stale_after)
+        return mux
+
+    async def stream_synchronized(self, frame_rate: float = 10.0, policy: str = "drop_oldest",
+                                  buffer_seconds: float = 2.0):
+        """
+        Stream frame-të e sinkronizuara: një vlerë për çdo aparat në çdo frame
+        (time-aligned frames at ``frame_rate``, bounded memory per device)
+        """
+        mux = self.create_multiplexer(frame_rate, policy, buffer_seconds)
+        try:
+            async for frame in mux.frames():
+                frame["clinic_id"] = self.clinic_id
+                yield frame
+        finally:
+            await mux.stop()
+
     def get_device_status(self) -> Dict[str, str]:
         """
         Get status i të gjithë aparateve
@@ -6,24 +6,25 @@ Implements priority-based data fetching for self-evolution.
 
 import asyncio
 import json
-import httpx
+import os
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 from enum import Enum
 
-from apps.api.internal_client import InternalAPIClient, DataSource
+from apps.api.internal_client import InternalAPIClient, DataSource, http_clients
+from apps.api.local_index import LocalSearchIndex
 
 
 class HybridDataCollector:
-    \"\"\"
+    """
     Collects data from multiple sources with priority ordering:
     1. Local files (cycles, docs, stats)
     2. Internal APIs (Weaviate cache, processed data)
     3. External Open APIs (OpenAlex, PubMed, etc.)
     
     Supports self-evolution by prioritizing internal data sources.
-    \"\"\"
+    """
     
     def __init__(
         self,
@@ -41,6 +42,17 @@ class HybridDataCollector:
             'data': self.project_root / 'data'
         }
         
+        # BM25 inverted index over the paths above (refreshed by mtime)
+        self.index = LocalSearchIndex(
+            self.project_root,
+            self.data_paths,
+            index_path=Path(os.getenv(
+                'HYBRID_INDEX_PATH',
+                str(self.project_root / '.cache' / 'hybrid_index.json')
+            )),
+            refresh_interval=float(os.getenv('HYBRID_INDEX_REFRESH_SECONDS', '30'))
+        )
+        
         # External API registry
         self.external_apis = {
             'research': [
@@ -76,66 +88,51 @@ class HybridDataCollector:
         self,
         category: str,
         query: str,
-        file_pattern: str = '*.json'
+        file_pattern: str = '*.json',
+        limit: int = 20
     ) -> List[Dict[str, Any]]:
-        \"\"\"Query local files (cycles, docs, data)\"\"\"
+        """Query local files (cycles, docs, data), ranked by BM25"""
         results = []
         
         if category not in self.data_paths:
             return results
         
-        path = self.data_paths[category]
-        if not path.exists():
+        try:
+            ranked = await asyncio.to_thread(
+                self.index.search, query, category, file_pattern, limit
+            )
+        except Exception:
             return results
         
-        try:
-            for file_path in path.rglob(file_pattern):
+        for file_id, score in ranked:
+            result = {
+                'source': 'local_file',
+                'file': file_id,
+                'score': round(score, 4),
+                'timestamp': datetime.now().isoformat()
+            }
+            if file_id.endswith('.json'):
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        
-                        # Simple text search in JSON content
-                        content_str = json.dumps(data).lower()
-                        if query.lower() in content_str:
-                            results.append({
-                                'source': 'local_file',
-                                'file': str(file_path.relative_to(self.project_root)),
-                                'data': data,
-                                'timestamp': datetime.now().isoformat()
-                            })
-                except:
+                    with open(self.project_root / file_id, 'r', encoding='utf-8') as f:
+                        result['data'] = json.load(f)
+                except Exception:
                     continue
-            
-            self.stats['local_file_queries'] += 1
-        except Exception as e:
-            pass
+            else:
+                result['content'] = self.index.snippet(file_id, query)
+            results.append(result)
         
+        self.stats['local_file_queries'] += 1
         return results
     
     async def query_cycles(self, query: str) -> List[Dict[str, Any]]:
-        \"\"\"Query cycle JSON files\"\"\"
+        """Query cycle JSON files"""
         return await self.query_local_files('cycles', query, '*.json')
     
-    async def query_docs(self, query: str) -> List[Dict[str, Any]]:
-        \"\"\"Query documentation files\"\"\"
-        md_results = await self.query_local_files('docs', query, '*.md')
-        
-        # Also search text content in markdown
-        docs_path = self.data_paths['docs']
-        if docs_path.exists():
-            for md_file in docs_path.rglob('*.md'):
-                try:
-                    content = md_file.read_text(encoding='utf-8')
-                    if query.lower() in content.lower():
-                        md_results.append({
-                            'source': 'local_doc',
-                            'file': str(md_file.relative_to(self.project_root)),
-                            'content': content[:500],  # First 500 chars
-                            'timestamp': datetime.now().isoformat()
-                        })
-                except:
-                    continue
-        
+    async def query_docs(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Query documentation files (ranked snippets)"""
+        md_results = await self.query_local_files('docs', query, '*.md', limit=limit)
+        for result in md_results:
+            result['source'] = 'local_doc'
         return md_results
     
     async def query_internal_api(
@@ -143,7 +140,7 @@ class HybridDataCollector:
         endpoint: str,
         params: Optional[Dict] = None
     ) -> Optional[Dict[str, Any]]:
-        \"\"\"Query internal Clisonix API\"\"\"
+        """Query internal Clisonix API"""
         try:
             result = await self.internal_client.get(endpoint, params=params)
             self.stats['internal_api_queries'] += 1
@@ -156,19 +153,18 @@ class HybridDataCollector:
         api_url: str,
         params: Optional[Dict] = None
     ) -> Optional[Dict[str, Any]]:
-        \"\"\"Query external open API\"\"\"
+        """Query external open API"""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(api_url, params=params)
-                response.raise_for_status()
-                
-                self.stats['external_api_queries'] += 1
-                return {
-                    'source': 'external_api',
-                    'api': api_url,
-                    'data': response.json(),
-                    'timestamp': datetime.now().isoformat()
-                }
+            response = await http_clients.get(api_url, 10.0).get(api_url, params=params)
+            response.raise_for_status()
+            
+            self.stats['external_api_queries'] += 1
+            return {
+                'source': 'external_api',
+                'api': api_url,
+                'data': response.json(),
+                'timestamp': datetime.now().isoformat()
+            }
         except Exception:
             return None
     
@@ -179,14 +175,14 @@ class HybridDataCollector:
         min_results: int = 5,
         use_external: bool = True
     ) -> Dict[str, Any]:
-        \"\"\"
+        """
         Collect data from multiple sources with hybrid approach.
         
         Priority:
         1. Local files (cycles, docs)
         2. Internal APIs (if endpoint provided)
         3. External APIs (if enabled and needed)
-        \"\"\"
+        """
         self.stats['total_queries'] += 1
         all_results = []
         sources_used = []
@@ -250,7 +246,7 @@ class HybridDataCollector:
         topic: str,
         include_external: bool = True
     ) -> Dict[str, Any]:
-        \"\"\"Specialized research data collection\"\"\"
+        """Specialized research data collection"""
         results = []
         
         # 1. Local research files
@@ -295,7 +291,7 @@ class HybridDataCollector:
         city: str,
         coords: Optional[tuple[float, float]] = None
     ) -> Dict[str, Any]:
-        \"\"\"Weather data with internal cache first\"\"\"
+        """Weather data with internal cache first"""
         
         # Try internal API first (cached data)
         internal = await self.query_internal_api(
@@ -321,7 +317,7 @@ class HybridDataCollector:
         self,
         coins: List[str] = ['bitcoin', 'ethereum']
     ) -> Dict[str, Any]:
-        \"\"\"Crypto prices with internal aggregator first\"\"\"
+        """Crypto prices with internal aggregator first"""
         
         # Internal API (aggregated/cached)
         internal = await self.query_internal_api(
@@ -341,7 +337,7 @@ class HybridDataCollector:
         return external or {'error': 'No data available'}
     
     def _calculate_self_consumption(self, sources_used: List[str]) -> float:
-        \"\"\"Calculate percentage of internal vs external sources\"\"\"
+        """Calculate percentage of internal vs external sources"""
         if not sources_used:
             return 0.0
         
@@ -351,7 +347,7 @@ class HybridDataCollector:
         return (internal_count / len(sources_used)) * 100
     
     def get_stats(self) -> Dict[str, Any]:
-        \"\"\"Get collection statistics\"\"\"
+        """Get collection statistics"""
         total_queries = (
             self.stats['local_file_queries'] +
             self.stats['internal_api_queries'] +
@@ -366,7 +362,8 @@ class HybridDataCollector:
         
         return {
             **self.stats,
-            'self_consumption_ratio': self_consumption
+            'self_consumption_ratio': self_consumption,
+            'index': self.index.get_stats()
         }
 
 
@@ -378,7 +375,7 @@ hybrid_collector = HybridDataCollector()
 async def demo_hybrid_collection():
     collector = HybridDataCollector()
     
-    print('=== Hybrid Data Collection Demo ===\\n')
+    print('=== Hybrid Data Collection Demo ===\n')
     
     # 1. Query cycles + docs
     result = await collector.hybrid_collect(
@@ -386,24 +383,24 @@ async def demo_hybrid_collection():
         categories=['cycles', 'docs'],
         min_results=3
     )
-    print(f\"Query: 'neural'\")
-    print(f\"  Total results: {result['total_results']}\")
-    print(f\"  Sources used: {', '.join(result['sources_used'])}\")
-    print(f\"  Self-consumption: {result['self_consumption_ratio']:.1f}%\\n\")
+    print(f"Query: 'neural'")
+    print(f"  Total results: {result['total_results']}")
+    print(f"  Sources used: {', '.join(result['sources_used'])}")
+    print(f"  Self-consumption: {result['self_consumption_ratio']:.1f}%\n")
     
     # 2. Research query
     research = await collector.hybrid_research('machine learning')
-    print(f\"Research: 'machine learning'\")
-    print(f\"  Total results: {research['total_results']}\\n\")
+    print(f"Research: 'machine learning'")
+    print(f"  Total results: {research['total_results']}\n")
     
     # 3. Statistics
     stats = collector.get_stats()
     print('Statistics:')
-    print(f\"  Total queries: {stats['total_queries']}\")
-    print(f\"  Local file queries: {stats['local_file_queries']}\")
-    print(f\"  Internal API queries: {stats['internal_api_queries']}\")
-    print(f\"  External API queries: {stats['external_api_queries']}\")
-    print(f\"  Self-consumption ratio: {stats['self_consumption_ratio']:.1f}%\")
+    print(f"  Total queries: {stats['total_queries']}")
+    print(f"  Local file queries: {stats['local_file_queries']}")
+    print(f"  Internal API queries: {stats['internal_api_queries']}")
+    print(f"  External API queries: {stats['external_api_queries']}")
+    print(f"  Self-consumption ratio: {stats['self_consumption_ratio']:.1f}%")
 
 
 if __name__ == '__main__':
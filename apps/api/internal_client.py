@@ -6,10 +6,16 @@ Implements fallback logic, circuit breaker, and hybrid data collection.
 
 import asyncio
 import httpx
+import logging
+import os
 import time
-from typing import Dict, List, Any, Optional, Callable
+from collections import OrderedDict
+from typing import Awaitable, Dict, List, Any, Optional, Callable, Set, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
 
 
 class DataSource(Enum):
@@ -65,6 +71,138 @@ class CircuitBreaker:
         return True
 
 
+class TTLCache:
+    """Bounded LRU cache whose entries also expire after ``ttl`` seconds"""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if time.monotonic() >= expires:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: Any):
+        now = time.monotonic()
+        self._data[key] = (value, now + self.ttl)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            # Drop expired entries from the cold end first, then plain LRU
+            while self._data:
+                oldest_key, (_, expires) = next(iter(self._data.items()))
+                if expires > now and len(self._data) <= self.maxsize:
+                    break
+                del self._data[oldest_key]
+    
+    def clear(self):
+        self._data.clear()
+
+
+class HTTPClientPool:
+    """
+    One keep-alive ``httpx.AsyncClient`` per origin (scheme://host:port).
+    Clients are bound to the event loop that created them and are replaced
+    transparently if a different loop asks for the same origin. At most
+    ``max_clients`` are kept (least recently used first out); a client that
+    leaves the pool is closed, on its own loop while that loop still runs.
+    """
+    
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        max_clients: int = 32
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.max_clients = max(1, max_clients)
+        self._clients: "OrderedDict[Tuple[str, float], Tuple[httpx.AsyncClient, asyncio.AbstractEventLoop]]" = OrderedDict()
+        self._closing: Set[asyncio.Task] = set()
+    
+    @staticmethod
+    def origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f'{parts.scheme}://{parts.netloc}'
+    
+    def get(self, url: str, timeout: float) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        key = (self.origin(url), timeout)
+        entry = self._clients.get(key)
+        if entry is not None and entry[1] is loop and not entry[0].is_closed:
+            self._clients.move_to_end(key)
+            return entry[0]
+        if entry is not None:
+            self._retire(*entry)
+        client = httpx.AsyncClient(timeout=timeout, limits=self.limits)
+        self._clients[key] = (client, loop)
+        self._clients.move_to_end(key)
+        while len(self._clients) > self.max_clients:
+            _, (evicted, owner) = self._clients.popitem(last=False)
+            self._retire(evicted, owner)
+        return client
+    
+    def __len__(self) -> int:
+        return len(self._clients)
+    
+    @staticmethod
+    async def _close_quietly(client: httpx.AsyncClient):
+        # On a closed owner loop the connections are still shut down (EOF is
+        # sent) before asyncio refuses to schedule the transport callbacks
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug(f'Closing pooled HTTP client failed: {e}')
+    
+    def _retire(self, client: httpx.AsyncClient, owner: asyncio.AbstractEventLoop) -> Optional[Awaitable]:
+        """Schedule ``client.aclose()``: on ``owner`` if it runs in another thread, else on this loop"""
+        if client.is_closed:
+            return None
+        loop = asyncio.get_running_loop()
+        if owner is not loop and owner.is_running():
+            future = asyncio.run_coroutine_threadsafe(self._close_quietly(client), owner)
+            return asyncio.wrap_future(future)
+        task = loop.create_task(self._close_quietly(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+        return task
+    
+    async def aclose(self):
+        """Close every pooled client, including those owned by other loops"""
+        loop = asyncio.get_running_loop()
+        pending = [self._retire(client, owner) for client, owner in self._clients.values()]
+        self._clients.clear()
+        pending.extend(task for task in list(self._closing) if task.get_loop() is loop)
+        await asyncio.gather(*(closing for closing in pending if closing is not None))
+
+
+# Shared by every InternalAPIClient / HybridDataCollector in the process
+http_clients = HTTPClientPool(
+    max_connections=int(os.getenv('INTERNAL_CLIENT_MAX_CONNECTIONS', '100')),
+    max_keepalive_connections=int(os.getenv('INTERNAL_CLIENT_MAX_KEEPALIVE', '20')),
+    max_clients=int(os.getenv('INTERNAL_CLIENT_MAX_ORIGINS', '32'))
+)
+
+
+async def close_http_clients():
+    """Close pooled HTTP clients (call from application shutdown)"""
+    await http_clients.aclose()
+
+
 class InternalAPIClient:
     """
     Client for consuming Clisonix's own APIs with automatic fallback.
@@ -87,8 +225,12 @@ class InternalAPIClient:
             'cache_hits': 0,
             'failures': 0
         }
-        self._cache: Dict[str, tuple[Any, datetime]] = {}
         self.cache_ttl = timedelta(minutes=5)
+        self._cache = TTLCache(
+            maxsize=int(os.getenv('INTERNAL_CLIENT_CACHE_SIZE', '1024')),
+            ttl=self.cache_ttl.total_seconds()
+        )
+        self.pool = http_clients
     
     def _cache_key(self, endpoint: str, params: Optional[Dict] = None) -> str:
         """Generate cache key from endpoint and params"""
@@ -99,18 +241,14 @@ class InternalAPIClient:
     
     def _get_from_cache(self, key: str) -> Optional[Any]:
         """Get data from local cache if not expired"""
-        if key in self._cache:
-            data, timestamp = self._cache[key]
-            if datetime.now() - timestamp < self.cache_ttl:
-                self.stats['cache_hits'] += 1
-                return data
-            else:
-                del self._cache[key]
-        return None
+        data = self._cache.get(key)
+        if data is not None:
+            self.stats['cache_hits'] += 1
+        return data
     
     def _set_cache(self, key: str, data: Any):
         """Store data in local cache"""
-        self._cache[key] = (data, datetime.now())
+        self._cache.set(key, data)
     
     async def get(
         self,
@@ -138,17 +276,16 @@ class InternalAPIClient:
         # Try internal API if circuit breaker allows
         if self.circuit_breaker.can_attempt():
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    url = f'{self.base_url}{endpoint}'
-                    response = await client.get(url, params=params)
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    self.stats['internal_calls'] += 1
-                    self.circuit_breaker.record_success()
-                    self._set_cache(cache_key, data)
-                    
-                    return {'source': 'internal', 'data': data}
+                url = f'{self.base_url}{endpoint}'
+                response = await self.pool.get(url, self.timeout).get(url, params=params)
+                response.raise_for_status()
+                
+                data = response.json()
+                self.stats['internal_calls'] += 1
+                self.circuit_breaker.record_success()
+                self._set_cache(cache_key, data)
+                
+                return {'source': 'internal', 'data': data}
             
             except Exception as e:
                 self.circuit_breaker.record_failure()
@@ -160,15 +297,15 @@ class InternalAPIClient:
         # Fallback to external API
         if fallback_external:
             try:
-                async with httpx.AsyncClient(timeout=self.timeout * 2) as client:
-                    response = await client.get(fallback_external, params=params)
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    self.stats['external_calls'] += 1
-                    self._set_cache(cache_key, data)
-                    
-                    return {'source': 'external', 'data': data}
+                client = self.pool.get(fallback_external, self.timeout * 2)
+                response = await client.get(fallback_external, params=params)
+                response.raise_for_status()
+                
+                data = response.json()
+                self.stats['external_calls'] += 1
+                self._set_cache(cache_key, data)
+                
+                return {'source': 'external', 'data': data}
             
             except Exception:
                 pass
@@ -193,16 +330,15 @@ class InternalAPIClient:
         
         if self.circuit_breaker.can_attempt():
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    url = f'{self.base_url}{endpoint}'
-                    response = await client.post(url, json=json)
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    self.stats['internal_calls'] += 1
-                    self.circuit_breaker.record_success()
-                    
-                    return {'source': 'internal', 'data': data}
+                url = f'{self.base_url}{endpoint}'
+                response = await self.pool.get(url, self.timeout).post(url, json=json)
+                response.raise_for_status()
+                
+                data = response.json()
+                self.stats['internal_calls'] += 1
+                self.circuit_breaker.record_success()
+                
+                return {'source': 'internal', 'data': data}
             
             except Exception:
                 self.circuit_breaker.record_failure()
@@ -214,19 +350,40 @@ class InternalAPIClient:
         # Fallback to external
         if fallback_external:
             try:
-                async with httpx.AsyncClient(timeout=self.timeout * 2) as client:
-                    response = await client.post(fallback_external, json=json)
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    self.stats['external_calls'] += 1
-                    
-                    return {'source': 'external', 'data': data}
+                client = self.pool.get(fallback_external, self.timeout * 2)
+                response = await client.post(fallback_external, json=json)
+                response.raise_for_status()
+                
+                data = response.json()
+                self.stats['external_calls'] += 1
+                
+                return {'source': 'external', 'data': data}
             except Exception:
                 pass
         
         raise RuntimeError(f'All data sources failed for {endpoint}')
     
+    async def post_many(
+        self,
+        requests: List[Tuple[str, Optional[Dict]]],
+        max_concurrency: int = 8
+    ) -> List[Any]:
+        """
+        Issue several POSTs concurrently over the pooled connection.
+        Returns one entry per request, in order: the ``post`` result or the
+        exception it raised.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def _one(endpoint: str, payload: Optional[Dict]):
+            async with semaphore:
+                return await self.post(endpoint, json=payload)
+        
+        return await asyncio.gather(
+            *(_one(endpoint, payload) for endpoint, payload in requests),
+            return_exceptions=True
+        )
+    
     def get_self_consumption_ratio(self) -> float:
         """Calculate percentage of internal vs external calls"""
         total = self.stats['internal_calls'] + self.stats['external_calls']
@@ -240,8 +397,14 @@ class InternalAPIClient:
             **self.stats,
             'self_consumption_ratio': self.get_self_consumption_ratio(),
             'circuit_state': self.circuit_breaker.state.value,
-            'cache_size': len(self._cache)
+            'cache_size': len(self._cache),
+            'pooled_clients': len(self.pool)
         }
+    
+    async def aclose(self):
+        """Release pooled connections and cached data"""
+        self._cache.clear()
+        await self.pool.aclose()
 
 
 # Global instance for easy import
@@ -250,7 +413,7 @@ internal_client = InternalAPIClient()
 
 # Example usage patterns
 async def example_crypto_prices():
-    \"\"\"Example: Get crypto prices with self-consumption pattern\"\"\"
+    """Example: Get crypto prices with self-consumption pattern"""
     client = InternalAPIClient()
     
     result = await client.get(
@@ -259,12 +422,12 @@ async def example_crypto_prices():
         fallback_external='https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum&vs_currencies=usd'
     )
     
-    print(f\"Data source: {result['source']}\")
+    print(f"Data source: {result['source']}")
     return result['data']
 
 
 async def example_weather_data():
-    \"\"\"Example: Get weather with hybrid approach\"\"\"
+    """Example: Get weather with hybrid approach"""
     client = InternalAPIClient()
     
     result = await client.get(
@@ -277,7 +440,7 @@ async def example_weather_data():
 
 
 async def example_research_query():
-    \"\"\"Example: Query research data (internal Weaviate first, then external)\"\"\"
+    """Example: Query research data (internal Weaviate first, then external)"""
     client = InternalAPIClient()
     
     result = await client.post(
@@ -303,11 +466,11 @@ if __name__ == '__main__':
         
         # Show statistics
         stats = client.get_stats()
-        print(f\"\\nStatistics:\")
-        print(f\"  Internal calls: {stats['internal_calls']}\")
-        print(f\"  External calls: {stats['external_calls']}\")
-        print(f\"  Cache hits: {stats['cache_hits']}\")
-        print(f\"  Self-consumption ratio: {stats['self_consumption_ratio']:.1f}%\")
-        print(f\"  Circuit state: {stats['circuit_state']}\")
+        print(f"\nStatistics:")
+        print(f"  Internal calls: {stats['internal_calls']}")
+        print(f"  External calls: {stats['external_calls']}")
+        print(f"  Cache hits: {stats['cache_hits']}")
+        print(f"  Self-consumption ratio: {stats['self_consumption_ratio']:.1f}%")
+        print(f"  Circuit state: {stats['circuit_state']}")
     
     asyncio.run(demo())
@@ -0,0 +1,270 @@
+"""
+Local Search Index - BM25 over cycles, docs, research and data files
+Incrementally maintained inverted index used by HybridDataCollector instead of
+walking and parsing every file on each query.
+
+- Files are tokenized once (lowercase alphanumeric terms) and only re-read when
+  their (mtime_ns, size) signature changes.
+- Directory scans are throttled to once per ``refresh_interval`` seconds, so a
+  query normally touches only the postings of its own terms.
+- The per-document term frequencies are persisted as JSON and the postings are
+  rebuilt from them on startup.
+- Only the top-ranked files are opened again, to build snippets / load JSON.
+"""
+
+import fnmatch
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+INDEXED_SUFFIXES = {'.json', '.md', '.txt', '.py', '.rst', '.csv', '.yaml', '.yml'}
+INDEX_VERSION = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric terms (``neural_patterns`` -> ``neural``, ``patterns``)"""
+    return TOKEN_RE.findall(text.lower())
+
+
+class LocalSearchIndex:
+    """
+    Inverted index with BM25 ranking over a set of named directories.
+    """
+
+    def __init__(
+        self,
+        project_root: Path,
+        paths: Dict[str, Path],
+        index_path: Optional[Path] = None,
+        refresh_interval: float = 30.0,
+        max_file_bytes: int = 2 * 1024 * 1024,
+        k1: float = 1.5,
+        b: float = 0.75
+    ):
+        self.project_root = Path(project_root)
+        self.paths = {category: Path(path) for category, path in paths.items()}
+        self.index_path = Path(index_path) if index_path else None
+        self.refresh_interval = refresh_interval
+        self.max_file_bytes = max_file_bytes
+        self.k1 = k1
+        self.b = b
+
+        # doc_id (relative path) -> {category, mtime_ns, size, length, tf}
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        # term -> {doc_id: term frequency}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._last_refresh: Dict[str, float] = {}
+        self._dirty = False
+        self._lock = threading.RLock()
+        self.stats = {'files_indexed': 0, 'files_removed': 0, 'refreshes': 0, 'queries': 0}
+
+        self._load()
+
+    # ------------------------------------------------------------------
+    # persistence
+    # ------------------------------------------------------------------
+    def _load(self):
+        if self.index_path is None or not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('version') != INDEX_VERSION:
+                return
+            for doc_id, doc in stored.get('docs', {}).items():
+                self._add_doc(doc_id, doc)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable search index {self.index_path}: {e}")
+            self.docs.clear()
+            self.postings.clear()
+            self._total_length = 0
+
+    def save(self):
+        """Write the index if it changed since the last save"""
+        if self.index_path is None or not self._dirty:
+            return
+        with self._lock:
+            payload = {'version': INDEX_VERSION, 'docs': self.docs}
+            tmp = self.index_path.with_suffix(self.index_path.suffix + '.tmp')
+            try:
+                self.index_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(payload, f, separators=(',', ':'))
+                os.replace(tmp, self.index_path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"Could not persist search index: {e}")
+
+    # ------------------------------------------------------------------
+    # maintenance
+    # ------------------------------------------------------------------
+    def _add_doc(self, doc_id: str, doc: Dict[str, Any]):
+        self.docs[doc_id] = doc
+        self._total_length += doc['length']
+        for term, count in doc['tf'].items():
+            self.postings.setdefault(term, {})[doc_id] = count
+
+    def _remove_doc(self, doc_id: str):
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return
+        self._total_length -= doc['length']
+        for term in doc['tf']:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self.postings[term]
+
+    def _scan(self, root: Path) -> Iterable[Tuple[Path, os.stat_result]]:
+        stack = [root]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    elif Path(entry.name).suffix.lower() in INDEXED_SUFFIXES:
+                        yield Path(entry.path), entry.stat()
+                except OSError:
+                    continue
+
+    def refresh(self, category: Optional[str] = None, force: bool = False) -> int:
+        """
+        Re-index new or modified files (by mtime/size) and drop deleted ones.
+        Scans are throttled per category unless ``force`` is set.
+        Returns the number of documents added, updated or removed.
+        """
+        categories = [category] if category else list(self.paths)
+        changed = 0
+        now = time.monotonic()
+        with self._lock:
+            for cat in categories:
+                root = self.paths.get(cat)
+                if root is None:
+                    continue
+                if not force and now - self._last_refresh.get(cat, -math.inf) < self.refresh_interval:
+                    continue
+                self._last_refresh[cat] = now
+                self.stats['refreshes'] += 1
+
+                seen = set()
+                if root.exists():
+                    for file_path, st in self._scan(root):
+                        doc_id = self._doc_id(file_path)
+                        seen.add(doc_id)
+                        doc = self.docs.get(doc_id)
+                        if doc is not None and doc['mtime_ns'] == st.st_mtime_ns and doc['size'] == st.st_size:
+                            continue
+                        self._remove_doc(doc_id)
+                        self._index_file(doc_id, cat, file_path, st)
+                        changed += 1
+
+                for doc_id in [d for d, doc in self.docs.items() if doc['category'] == cat and d not in seen]:
+                    self._remove_doc(doc_id)
+                    self.stats['files_removed'] += 1
+                    changed += 1
+
+            if changed:
+                self._dirty = True
+        if changed:
+            self.save()
+        return changed
+
+    def _doc_id(self, file_path: Path) -> str:
+        try:
+            return file_path.relative_to(self.project_root).as_posix()
+        except ValueError:
+            return file_path.as_posix()
+
+    def _index_file(self, doc_id: str, category: str, file_path: Path, st: os.stat_result):
+        tf: Dict[str, int] = {}
+        length = 0
+        if st.st_size <= self.max_file_bytes:
+            try:
+                text = file_path.read_text(encoding='utf-8', errors='ignore')
+            except OSError:
+                text = ''
+            for term in tokenize(text):
+                tf[term] = tf.get(term, 0) + 1
+                length += 1
+        self._add_doc(doc_id, {
+            'category': category,
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'length': length,
+            'tf': tf
+        })
+        self.stats['files_indexed'] += 1
+
+    # ------------------------------------------------------------------
+    # queries
+    # ------------------------------------------------------------------
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        file_pattern: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Tuple[str, float]]:
+        """Return ``[(doc_id, bm25_score), ...]`` best first"""
+        self.refresh(category)
+        terms = set(tokenize(query))
+        if not terms or not self.docs:
+            return []
+
+        with self._lock:
+            self.stats['queries'] += 1
+            n_docs = len(self.docs)
+            avg_length = self._total_length / n_docs if n_docs else 0.0
+            scores: Dict[str, float] = {}
+            for term in terms:
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1.0 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc_id, tf in posting.items():
+                    doc = self.docs[doc_id]
+                    if category is not None and doc['category'] != category:
+                        continue
+                    norm = self.k1 * (1.0 - self.b + self.b * doc['length'] / avg_length) if avg_length else self.k1
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+        if file_pattern:
+            scores = {d: s for d, s in scores.items() if fnmatch.fnmatch(d.rsplit('/', 1)[-1], file_pattern)}
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
+
+    def snippet(self, doc_id: str, query: str, width: int = 240) -> str:
+        """Text around the first query term in the file"""
+        path = self.project_root / doc_id
+        try:
+            text = path.read_text(encoding='utf-8', errors='ignore')
+        except OSError:
+            return ''
+        lowered = text.lower()
+        positions = [lowered.find(term) for term in tokenize(query)]
+        positions = [p for p in positions if p >= 0]
+        start = max(0, min(positions) - width // 4) if positions else 0
+        return text[start:start + width].strip()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'documents': len(self.docs),
+            'terms': len(self.postings),
+            'index_path': str(self.index_path) if self.index_path else None
+        }
@@ -824,17 +824,21 @@ async def harmonic_personality_scan(file: UploadFile = File(...)):
 async def brain_sync(
     youtube_video_id: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None),
+    pitch_mode: str = Form("accurate"),
 ):
     """
     Full NEURAL–HARMONIC SYNCHRONIZATION ENGINE.
     Accepts:
     - YouTube video ID (fetches metadata)
     - Audio file (analyzes harmony, converts to MIDI, syncs pipelines)
+    pitch_mode: "accurate" (piptrack) or "fast" (vectorized YIN) for MIDI notes
     """
     if not cog:
         raise HTTPException(
             status_code=503, detail="Cognitive engine not available"
         )
+    if pitch_mode not in ("fast", "accurate"):
+        raise HTTPException(status_code=400, detail="invalid_pitch_mode")
     try:
         import httpx
 
@@ -890,7 +894,7 @@ async def brain_sync(
             )
             midi_path = midi_temp.name
             midi_temp.close()
-            midi_output = converter.convert(audio_path, midi_path)
+            midi_output = converter.convert(audio_path, midi_path, mode=pitch_mode)
 
             # 2c. Neural Load + Pipeline Sync
             neural_load = await cog.get_neural_load()
@@ -1181,6 +1185,30 @@ try:
 except Exception:
     _EEG = False
 
+# EDF/BDF streaming reader (numpy/scipy only, no mne)
+try:
+    from edf_stream import EEG_BANDS, EDFFormatError, analyze_edf_stream, band_powers_from_psd
+
+    _EEG_STREAM = True
+except Exception:
+    _EEG_STREAM = False
+    # The mne path (.fif and other formats) summarizes bands the same way
+    EEG_BANDS = {"delta": (0.5, 4), "theta": (4, 8), "alpha": (8, 13), "beta": (13, 30), "gamma": (30, 45)}
+
+    def band_powers_from_psd(freqs, psd, bands=EEG_BANDS):
+        """Mean PSD inside each band per channel, summarized as mean/max over channels"""
+        result = {}
+        for name, (fmin, fmax) in bands.items():
+            mask = (freqs >= fmin) & (freqs <= fmax)
+            if not mask.any() or psd.shape[0] == 0:
+                result[name] = {"mean": 0.0, "max": 0.0}
+                continue
+            per_channel = psd[:, mask].mean(axis=1)
+            result[name] = {"mean": float(np.mean(per_channel)), "max": float(np.max(per_channel))}
+        return result
+
+EEG_STREAM_CHUNK_SECONDS = float(os.getenv("EEG_STREAM_CHUNK_SECONDS", "10"))
+
 # Audio (librosa/soundfile)
 try:
     import librosa
@@ -1747,11 +1775,7 @@ def derive_albi_insight(
                     summary[channel_name]["avg"] = avg_val
             if insight.anomalies:
                 anomalies = sorted(set(anomalies) | set(insight.anomalies))
-            if (
-                hasattr(albi_engine, "_insights")
-                and len(getattr(albi_engine, "_insights", [])) > 50
-            ):
-                albi_engine._insights = albi_engine._insights[-50:]
+            # AlbiCore keeps its insights in a bounded deque, no trimming needed
         except Exception as exc:  # pragma: no cover - defensive
             logger.debug("AlbiCore insight failed: %s", exc)
 
@@ -2179,6 +2203,19 @@ async def on_shutdown():
         pass
 
 
+@app.on_event("shutdown")
+async def close_internal_clients():
+    """Close the keep-alive clients pooled by the self-consumption layer"""
+    internal = sys.modules.get("apps.api.internal_client")
+    if internal is None:  # never imported, nothing was pooled
+        return
+    try:
+        await internal.internal_client.aclose()
+        await internal.close_http_clients()
+    except Exception as e:
+        logger.warning(f"Closing internal HTTP clients failed: {e}")
+
+
 # ------------- Middlewares -------------
 @app.middleware("http")
 async def correlation_middleware(request: Request, call_next):
@@ -2374,39 +2411,45 @@ async def system_status_api():
 
 
 # ------------- EEG Processing (REAL) -------------
-def _eeg_band_powers(
-    raw: "mne.io.BaseRaw", fmin: float, fmax: float
-) -> Dict[str, float]:
+def _eeg_band_powers(raw: "mne.io.BaseRaw") -> Dict[str, Dict[str, float]]:
     data = raw.get_data(return_times=False)
     sfreq = raw.info["sfreq"]
     # Ensure data is a numpy array (not a tuple)
     if isinstance(data, tuple):
         data = data[0]
-    # Welch PSD per channel
-    psd_vals = []
-    for ch in range(data.shape[0]):
-        f, pxx = welch(data[ch], fs=sfreq, nperseg=min(len(data[ch]), 4096))
-        band = pxx[(f >= fmin) & (f <= fmax)]
-        if band.size:
-            psd_vals.append(float(np.mean(band)))
-    if not psd_vals:
-        return {"mean": 0.0, "max": 0.0}
-    return {"mean": float(np.mean(psd_vals)), "max": float(np.max(psd_vals))}
+    # One Welch PSD per channel, shared by all bands
+    f, pxx = welch(data, fs=sfreq, nperseg=min(data.shape[1], 4096), axis=-1)
+    return band_powers_from_psd(f, pxx, EEG_BANDS)
 
 
 def analyze_eeg_file(file_path: Path) -> Dict[str, Any]:
+    # Try format detection
+    suffix = file_path.suffix.lower()
+    if suffix in [".edf", ".bdf"]:
+        require(
+            _EEG_STREAM,
+            "EEG analysis libs (numpy, scipy) not installed",
+            501,
+            error_code="EEG_LIBS_UNAVAILABLE",
+        )
+        # Memory-mapped, chunked pass: O(chunk x channels) memory for any length
+        try:
+            return analyze_edf_stream(
+                file_path, EEG_BANDS, chunk_seconds=EEG_STREAM_CHUNK_SECONDS
+            )
+        except EDFFormatError as e:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid EDF/BDF file: {e}"
+            )
+
     require(
         _EEG,
         "EEG analysis libs (mne, numpy, scipy) not installed",
         501,
         error_code="EEG_LIBS_UNAVAILABLE",
     )
-    # Try format detection
-    suffix = file_path.suffix.lower()
     # Load using mne supported readers; we do not fabricate any values.
-    if suffix in [".edf", ".bdf"]:
-        raw = mne.io.read_raw_edf(str(file_path), preload=True, verbose=False)
-    elif suffix in [".fif"]:
+    if suffix in [".fif"]:
         raw = mne.io.read_raw_fif(str(file_path), preload=True, verbose=False)
     else:
         # Let mne try auto
@@ -2425,13 +2468,7 @@ def analyze_eeg_file(file_path: Path) -> Dict[str, Any]:
     }
 
     # Band powers (delta/theta/alpha/beta/gamma)
-    bands = {
-        "delta": _eeg_band_powers(raw, 0.5, 4),
-        "theta": _eeg_band_powers(raw, 4, 8),
-        "alpha": _eeg_band_powers(raw, 8, 13),
-        "beta": _eeg_band_powers(raw, 13, 30),
-        "gamma": _eeg_band_powers(raw, 30, 45),
-    }
+    bands = _eeg_band_powers(raw)
 
     return {"file": file_path.name, "info": info, "bands_psd": bands}
 
@@ -2474,15 +2511,18 @@ async def process_eeg(
 
 
 # ------------- Audio Processing (REAL) -------------
-def analyze_audio_file(file_path: Path) -> Dict[str, Any]:
+def analyze_audio_file(file_path: Path, pitch_mode: str = "accurate") -> Dict[str, Any]:
     require(
         _AUDIO,
         "Audio analysis libs (librosa, soundfile) not installed",
         501,
         error_code="AUDIO_LIBS_UNAVAILABLE",
     )
-    # librosa loads actual samples
-    y, sr = librosa.load(str(file_path), sr=None, mono=True)
+    # librosa loads actual samples (once per content, shared with the brain engines)
+    from neuro.audio_context import get_audio_context
+
+    audio = get_audio_context(str(file_path)).native
+    y, sr = audio.y, audio.sr
     require(
         y.size > 0 and sr > 0,
         "Empty audio data",
@@ -2492,16 +2532,17 @@ def analyze_audio_file(file_path: Path) -> Dict[str, Any]:
 
     duration = float(len(y) / sr)
     # Real metrics
-    zcr = float(np.mean(librosa.feature.zero_crossing_rate(y)[0]))
-    centroid = float(np.mean(librosa.feature.spectral_centroid(y=y, sr=sr)))
-    rolloff = float(np.mean(librosa.feature.spectral_rolloff(y=y, sr=sr)))
-    rms = float(np.mean(librosa.feature.rms(y=y)))
+    zcr = float(np.mean(audio.zero_crossing_rate()[0]))
+    centroid = float(np.mean(audio.spectral_centroid()))
+    rolloff = float(np.mean(audio.spectral_rolloff()))
+    rms = float(np.mean(audio.rms()))
 
-    # Fundamental frequency via pYIN (if possible), otherwise 0 (no fabrication)
+    # Fundamental frequency via pYIN ("accurate") or vectorized YIN ("fast"),
+    # otherwise 0 (no fabrication)
     f0_mean = 0.0
     try:
-        f0, voiced_flag, _ = librosa.pyin(
-            y, fmin=librosa.note_to_hz("C2"), fmax=librosa.note_to_hz("C7")
+        f0, voiced_flag, _ = audio.f0(
+            pitch_mode, librosa.note_to_hz("C2"), librosa.note_to_hz("C7")
         )
         valid = f0[~np.isnan(f0)]
         if valid.size:
@@ -2518,17 +2559,25 @@ def analyze_audio_file(file_path: Path) -> Dict[str, Any]:
         "spectral_rolloff": rolloff,
         "rms": rms,
         "fundamental_hz": f0_mean,
+        "pitch_mode": pitch_mode,
     }
 
 
 @app.post("/api/uploads/audio/process")
 async def process_audio(
     file: UploadFile = File(...),
+    mode: str = "accurate",
     current_user: Dict[str, Any] = Depends(get_current_user_from_api_key),
 ):
     require(
         file.filename, "Missing filename", 400, error_code="MISSING_FILENAME"
     )
+    require(
+        mode in ("fast", "accurate"),
+        "mode must be 'fast' or 'accurate'",
+        400,
+        error_code="INVALID_PITCH_MODE",
+    )
     dest = (
         Path(settings.storage_dir)
         / f"audio_{int(time.time())}_{uuid.uuid4().hex[:6]}_{Path(file.filename).name}"
@@ -2546,7 +2595,7 @@ async def process_audio(
         )
 
     try:
-        analysis = analyze_audio_file(dest)
+        analysis = await asyncio.to_thread(analyze_audio_file, dest, mode)
         return {"status": "OK", "timestamp": utcnow(), "analysis": analysis}
     except HTTPException:
         raise
@@ -2905,6 +2954,16 @@ except Exception as e:
     logger.warning(f"Alba routes not loaded: {e}")
 
 
+# Import and include the Clisonix binary EEG device ingest (API key required before the handshake)
+try:
+    from neurosonix import eeg_stream_router
+
+    app.include_router(eeg_stream_router, dependencies=[Depends(get_current_user_from_api_key)])
+    logger.info("Clisonix EEG ingest loaded - binary WebSocket ingest at /api/Clisonix/eeg/stream")
+except Exception as e:
+    logger.warning(f"Clisonix EEG ingest not loaded: {e}")
+
+
 # Import and include Industrial Dashboard Demo routes
 try:
     from industrial_dashboard_demo import router as industrial_dashboard_router
@@ -2,6 +2,8 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
 import json, time, os
+from collections import deque
+from itertools import islice
 
 app = FastAPI(title="Mesh HQ - Clisonix Real Telemetry")
 
@@ -15,6 +17,10 @@ app.add_middleware(
 
 STATUS_FILE = os.path.join(os.path.dirname(__file__), "nodes_status.json")
 
+# Log events relayed by AGIEM/ASI (hq_event_relay), newest last
+EVENT_LIMIT = int(os.getenv("MESH_EVENT_LIMIT", "5000"))
+events = deque(maxlen=EVENT_LIMIT)
+
 def save_status(data):
     if not os.path.exists(STATUS_FILE):
         json.dump([], open(STATUS_FILE, "w"))
@@ -41,6 +47,27 @@ async def mesh_status(req: Request):
     save_status(body)
     return {"ok": True, "updated": body.get("id"), "timestamp": time.time()}
 
+@app.post("/mesh/event")
+async def mesh_event(req: Request):
+    """Accept one event or a batch ``{"events": [...]}``"""
+    body = await req.json()
+    batch = body.get("events") if isinstance(body, dict) and "events" in body else [body]
+    if not isinstance(batch, list):
+        return JSONResponse({"ok": False, "error": "events must be a list"}, status_code=422)
+    received = time.time()
+    accepted = 0
+    for event in batch:
+        if isinstance(event, dict):
+            events.append({**event, "received_at": received})
+            accepted += 1
+    return {"ok": True, "accepted": accepted, "timestamp": received}
+
+@app.get("/mesh/events")
+async def mesh_events(limit: int = 100):
+    recent = list(islice(reversed(events), max(0, limit)))
+    recent.reverse()
+    return JSONResponse(recent)
+
 @app.get("/mesh/nodes")
 async def mesh_nodes():
     if os.path.exists(STATUS_FILE):
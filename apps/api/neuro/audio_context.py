@@ -0,0 +1,293 @@
+"""
+Audio Analysis Context - decode an upload once, share features across engines
+Every brain toolkit endpoint stores its upload in a fresh temp file, so the
+cache is keyed by a hash of the file content rather than by path.
+
+- ``AudioAnalysisContext`` decodes the file once (native rate, mono) and
+  hands out ``AudioView``s for the resample rates / durations engines ask for
+- ``AudioView`` computes feature layers lazily and memoizes them: STFT
+  magnitude, chroma, onset envelope, RMS, beats, spectral features, pitch
+  (``f0(mode=...)``: fast vectorized YIN or librosa's pyin)
+- ``AudioContextCache`` is a bounded LRU (entries and bytes) shared by the
+  HPS, energy, moodboard, MIDI and harmony engines; layers and views count
+  toward the byte bound as they are added, and an upload that alone exceeds
+  it is analysed but not kept
+
+Views pass the same arguments librosa would have derived itself (e.g. the
+``n_fft=2048, hop_length=512`` magnitude spectrogram), so engine outputs are
+unchanged.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    import librosa
+    HAS_LIBROSA = True
+except ImportError:
+    HAS_LIBROSA = False
+
+from .pitch_engine import PITCH_MODES, yin_track
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[str], Tuple[np.ndarray, int]]
+
+
+def _librosa_load(path: str) -> Tuple[np.ndarray, int]:
+    return librosa.load(path, sr=None, mono=True)
+
+
+def content_digest(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """BLAKE2b digest of a file's bytes"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(item) for item in value)
+    return 0
+
+
+class AudioView:
+    """One signal (``y``, ``sr``) and its memoized feature layers"""
+
+    def __init__(self, y: np.ndarray, sr: int, on_grow: Optional[Callable[[], None]] = None):
+        self.y = y
+        self.sr = sr
+        self._layers: Dict[Any, Any] = {}
+        self._lock = threading.RLock()
+        self._on_grow = on_grow
+
+    @property
+    def duration(self) -> float:
+        return len(self.y) / self.sr
+
+    @property
+    def nbytes(self) -> int:
+        return self.y.nbytes + sum(_nbytes(value) for value in self._layers.values())
+
+    def layer(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """Memoize ``compute()`` under ``key`` (engine-specific layers use this too)"""
+        with self._lock:
+            if key in self._layers:
+                return self._layers[key]
+            value = self._layers[key] = compute()
+        if self._on_grow is not None:
+            self._on_grow()
+        return value
+
+    # --- spectrogram layers ---
+    def magnitude(self, n_fft: int = 2048, hop_length: int = 512) -> np.ndarray:
+        """|STFT|, the spectrogram librosa's spectral features build from ``y``"""
+        return self.layer(("magnitude", n_fft, hop_length),
+                          lambda: np.abs(librosa.stft(self.y, n_fft=n_fft, hop_length=hop_length)))
+
+    def power(self, n_fft: int = 2048, hop_length: int = 512) -> np.ndarray:
+        return self.layer(("power", n_fft, hop_length), lambda: self.magnitude(n_fft, hop_length) ** 2)
+
+    def spectral_centroid(self) -> np.ndarray:
+        return self.layer("spectral_centroid",
+                          lambda: librosa.feature.spectral_centroid(S=self.magnitude(), sr=self.sr))
+
+    def spectral_rolloff(self) -> np.ndarray:
+        return self.layer("spectral_rolloff",
+                          lambda: librosa.feature.spectral_rolloff(S=self.magnitude(), sr=self.sr))
+
+    def spectral_bandwidth(self) -> np.ndarray:
+        return self.layer("spectral_bandwidth",
+                          lambda: librosa.feature.spectral_bandwidth(S=self.magnitude(), sr=self.sr))
+
+    def spectral_flatness(self) -> np.ndarray:
+        return self.layer("spectral_flatness",
+                          lambda: librosa.feature.spectral_flatness(S=self.magnitude()))
+
+    def chroma_stft(self) -> np.ndarray:
+        return self.layer("chroma_stft", lambda: librosa.feature.chroma_stft(S=self.power(), sr=self.sr))
+
+    def chroma_cqt(self) -> np.ndarray:
+        return self.layer("chroma_cqt", lambda: librosa.feature.chroma_cqt(y=self.y, sr=self.sr))
+
+    # --- time-domain and rhythm layers ---
+    def rms(self) -> np.ndarray:
+        return self.layer("rms", lambda: librosa.feature.rms(y=self.y))
+
+    def zero_crossing_rate(self) -> np.ndarray:
+        return self.layer("zero_crossing_rate", lambda: librosa.feature.zero_crossing_rate(self.y))
+
+    def onset_strength(self) -> np.ndarray:
+        return self.layer("onset_strength", lambda: librosa.onset.onset_strength(y=self.y, sr=self.sr))
+
+    def beat_track(self) -> Tuple[Any, np.ndarray]:
+        """``(tempo, beat frames)`` as returned by ``librosa.beat.beat_track``"""
+        return self.layer("beat_track", lambda: librosa.beat.beat_track(y=self.y, sr=self.sr))
+
+    # --- pitch layers ---
+    def piptrack(self, fmin: float = 150.0, fmax: float = 4000.0) -> Tuple[np.ndarray, np.ndarray]:
+        return self.layer(("piptrack", fmin, fmax),
+                          lambda: librosa.piptrack(S=self.magnitude(), sr=self.sr, fmin=fmin, fmax=fmax))
+
+    def pitch_track(self, fmin: float = 150.0, fmax: float = 4000.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Per frame: the pitch and magnitude of the strongest ``piptrack`` bin (0 if none)"""
+        def compute():
+            pitches, magnitudes = self.piptrack(fmin, fmax)
+            index = magnitudes.argmax(axis=0)
+            frames = np.arange(pitches.shape[1])
+            return pitches[index, frames], magnitudes[index, frames]
+        return self.layer(("pitch_track", fmin, fmax), compute)
+
+    def pyin(self, fmin: float, fmax: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.layer(("pyin", fmin, fmax), lambda: librosa.pyin(self.y, fmin=fmin, fmax=fmax, sr=self.sr))
+
+    def yin(self, fmin: float, fmax: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.layer(("yin", fmin, fmax), lambda: yin_track(self.y, self.sr, fmin=fmin, fmax=fmax))
+
+    def f0(self, mode: str, fmin: float, fmax: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """``(f0, voiced_flag, voiced_probability)`` per frame: ``fast`` = YIN, ``accurate`` = pyin"""
+        if mode not in PITCH_MODES:
+            raise ValueError(f"unknown pitch mode {mode!r}, expected one of {PITCH_MODES}")
+        return self.yin(fmin, fmax) if mode == "fast" else self.pyin(fmin, fmax)
+
+
+class AudioAnalysisContext:
+    """A decoded upload: the native-rate mono signal plus derived views"""
+
+    def __init__(self, digest: str, y: np.ndarray, sr: int):
+        self.digest = digest
+        self.on_grow: Optional[Callable[[], None]] = None  # set by the cache holding this context
+        self._views: Dict[Tuple[Optional[int], Optional[float]], AudioView] = {
+            (None, None): AudioView(y, sr, self._grown)}
+        self._lock = threading.Lock()
+
+    def _grown(self) -> None:
+        if self.on_grow is not None:
+            self.on_grow()
+
+    @property
+    def native(self) -> AudioView:
+        return self._views[(None, None)]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(view.nbytes for view in list(self._views.values()))
+
+    def view(self, sr: Optional[int] = None, duration: Optional[float] = None) -> AudioView:
+        """
+        The signal ``librosa.load(path, sr=sr, mono=True, duration=duration)``
+        returns: the first ``duration`` seconds, resampled to ``sr``.
+        """
+        native = self.native
+        if sr == native.sr:
+            sr = None
+        if duration is not None and int(duration * native.sr) >= len(native.y):
+            duration = None
+        key = (sr, duration)
+        with self._lock:
+            view = self._views.get(key)
+            if view is not None:
+                return view
+            y = native.y if duration is None else native.y[:int(duration * native.sr)]
+            if sr is not None:
+                y = librosa.resample(y, orig_sr=native.sr, target_sr=sr)
+            view = self._views[key] = AudioView(y, sr or native.sr, self._grown)
+        self._grown()
+        return view
+
+
+class AudioContextCache:
+    """LRU of decoded uploads keyed by content digest, bounded by entries and bytes"""
+
+    def __init__(self, max_entries: int = 8, max_bytes: int = 512 * 1024 * 1024,
+                 loader: Optional[Loader] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.loader = loader or _librosa_load
+        self._entries: "OrderedDict[str, AudioAnalysisContext]" = OrderedDict()
+        self._loading: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, path: str) -> AudioAnalysisContext:
+        """Context for the file at ``path``, decoding it only on the first request"""
+        digest = content_digest(path)
+        with self._lock:
+            context = self._entries.get(digest)
+            if context is not None:
+                self._entries.move_to_end(digest)
+                self.stats["hits"] += 1
+                self._trim(keep=digest)
+                return context
+            loading = self._loading.setdefault(digest, threading.Lock())
+
+        with loading:  # concurrent requests for one file decode it once
+            with self._lock:
+                context = self._entries.get(digest)
+                if context is not None:
+                    self.stats["hits"] += 1
+                    return context
+            y, sr = self.loader(path)
+            context = AudioAnalysisContext(digest, y, sr)
+            context.on_grow = lambda: self._grown(digest, context)
+            with self._lock:
+                self._entries[digest] = context
+                self._loading.pop(digest, None)
+                self.stats["misses"] += 1
+                self._trim(keep=digest)
+        return context
+
+    def _grown(self, digest: str, context: AudioAnalysisContext) -> None:
+        """A view or layer was added to ``context``: re-check the bounds"""
+        with self._lock:
+            if self._entries.get(digest) is context:  # not evicted meanwhile
+                self._trim(keep=digest)
+
+    def _trim(self, keep: str) -> None:
+        """
+        Evict least recently used contexts until within bounds; ``keep`` goes
+        last, and only if it alone exceeds ``max_bytes`` (callers still hold it).
+        """
+        total = sum(context.nbytes for context in self._entries.values())
+        while self._entries and (len(self._entries) > self.max_entries or total > self.max_bytes):
+            digest = next(iter(self._entries))
+            if digest == keep and len(self._entries) > 1:
+                self._entries.move_to_end(digest)
+                digest = next(iter(self._entries))
+            total -= self._entries.pop(digest).nbytes
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "bytes": sum(context.nbytes for context in self._entries.values()),
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+shared_audio_cache = AudioContextCache(
+    max_entries=int(os.getenv("AUDIO_CONTEXT_CACHE_ENTRIES", "8")),
+    max_bytes=int(float(os.getenv("AUDIO_CONTEXT_CACHE_MB", "512")) * 1024 * 1024),
+)
+
+
+def get_audio_context(path: str) -> AudioAnalysisContext:
+    """Shared context for an audio file (decoded at most once per content)"""
+    return shared_audio_cache.get(str(path))
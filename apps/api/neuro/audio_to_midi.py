@@ -7,11 +7,7 @@ import logging
 from typing import Dict, Any
 import numpy as np
 
-try:
-    import librosa
-    HAS_LIBROSA = True
-except ImportError:
-    HAS_LIBROSA = False
+from .audio_context import HAS_LIBROSA, get_audio_context
 
 try:
     from midiutil import MIDIFile
@@ -28,9 +24,10 @@ class AudioToMidi:
     def __init__(self):
         self.sample_rate = 22050
     
-    def convert(self, audio_path: str, midi_path: str) -> str:
+    def convert(self, audio_path: str, midi_path: str, mode: str = "accurate") -> str:
         """
         Convert audio file to MIDI
+        mode: "accurate" (piptrack peaks) or "fast" (vectorized YIN f0 per frame)
         Returns: path to generated MIDI file
         """
         if not HAS_LIBROSA:
@@ -39,38 +36,42 @@ class AudioToMidi:
             raise ImportError("midiutil not installed - pip install MIDIUtil")
         
         try:
-            # 1. Load audio
-            y, sr = librosa.load(audio_path, sr=self.sample_rate)
+            # 1. Load audio (decoded once, shared with the other engines)
+            audio = get_audio_context(audio_path).view(sr=self.sample_rate)
+            sr = audio.sr
             
-            # 2. REAL pitch detection using librosa
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr, fmin=50, fmax=2000)
+            # 2. REAL pitch detection (strongest piptrack bin, or YIN f0 + frame RMS)
+            if mode == "fast":
+                f0, voiced, _ = audio.f0("fast", fmin=50, fmax=2000)
+                rms = audio.rms()[0]
+                pitches = np.where(voiced, f0, 0.0)
+                magnitudes = rms / (rms.max() + 1e-12)
+            else:
+                pitches, magnitudes = audio.pitch_track(fmin=50, fmax=2000)
             
             # 3. Extract notes from pitches
             notes = []
             hop_length = 512
             time_step = hop_length / sr
             
-            for t in range(pitches.shape[1]):
-                # Get pitch with highest magnitude at this time
-                index = magnitudes[:, t].argmax()
-                pitch = pitches[index, t]
-                magnitude = magnitudes[index, t]
-                
-                if pitch > 0 and magnitude > 0.1:  # Threshold for note detection
-                    midi_note = self._hz_to_midi(pitch)
-                    velocity = int(min(127, magnitude * 127))
-                    time = t * time_step
-                    notes.append({
-                        'midi_note': midi_note,
-                        'time': time,
-                        'velocity': velocity
-                    })
+            # Threshold for note detection
+            for t in np.flatnonzero((pitches > 0) & (magnitudes > 0.1)):
+                pitch = pitches[t]
+                magnitude = magnitudes[t]
+                midi_note = self._hz_to_midi(pitch)
+                velocity = int(min(127, magnitude * 127))
+                time = int(t) * time_step
+                notes.append({
+                    'midi_note': midi_note,
+                    'time': time,
+                    'velocity': velocity
+                })
             
             # 4. Group consecutive same notes into longer notes
             grouped_notes = self._group_notes(notes, time_step)
             
             # 5. REAL tempo detection
-            tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
+            tempo, _ = audio.beat_track()
             tempo = float(tempo)
             
             # 6. Create MIDI file
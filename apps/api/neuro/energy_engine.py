@@ -7,11 +7,7 @@ import logging
 from typing import Dict, Any
 import numpy as np
 
-try:
-    import librosa
-    HAS_LIBROSA = True
-except ImportError:
-    HAS_LIBROSA = False
+from .audio_context import HAS_LIBROSA, get_audio_context
 
 logger = logging.getLogger(__name__)
 
@@ -28,19 +24,14 @@ class EnergyEngine:
             return {"error": "librosa not installed"}
         
         try:
-            # Load real audio
-            y, sr = librosa.load(audio_path, sr=None, mono=True)
+            # Load real audio (decoded once, shared with the other engines)
+            audio = get_audio_context(audio_path).native
             
-            # 1. DOMINANT FREQUENCY (pitch)
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-            pitch_values = []
-            for t in range(pitches.shape[1]):
-                index = magnitudes[:, t].argmax()
-                pitch = pitches[index, t]
-                if pitch > 0:
-                    pitch_values.append(float(pitch))
+            # 1. DOMINANT FREQUENCY (pitch of the strongest bin per frame)
+            frame_pitches, _ = audio.pitch_track()
+            pitch_values = frame_pitches[frame_pitches > 0].astype(np.float64)
             
-            if pitch_values:
+            if pitch_values.size:
                 dominant_freq = float(np.median(pitch_values))
                 pitch_std = float(np.std(pitch_values))
             else:
@@ -48,8 +39,8 @@ class EnergyEngine:
                 pitch_std = 0.0
             
             # 2. VOCAL TENSION (from spectral features)
-            spectral_flatness = float(np.mean(librosa.feature.spectral_flatness(y=y)))
-            spectral_rolloff = float(np.mean(librosa.feature.spectral_rolloff(y=y, sr=sr)))
+            spectral_flatness = float(np.mean(audio.spectral_flatness()))
+            spectral_rolloff = float(np.mean(audio.spectral_rolloff()))
             
             # Higher flatness = more tension/stress
             tension_score = spectral_flatness * 100
@@ -70,8 +61,8 @@ class EnergyEngine:
                 emotional_tone = "balanced"
             
             # 4. ENERGY LEVEL (0-100)
-            rms = float(np.mean(librosa.feature.rms(y=y)))
-            tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
+            rms = float(np.mean(audio.rms()))
+            tempo, _ = audio.beat_track()
             
             # Real energy calculation
             energy_level = min(100, (
@@ -8,11 +8,7 @@ import logging
 from typing import Dict, Any
 import numpy as np
 
-try:
-    import librosa
-    HAS_LIBROSA = True
-except ImportError:
-    HAS_LIBROSA = False
+from .audio_context import HAS_LIBROSA, get_audio_context
 
 logger = logging.getLogger(__name__)
 
@@ -33,12 +29,13 @@ class HPSEngine:
             return {"error": "librosa not installed"}
         
         try:
-            # Load real audio
-            y, sr = librosa.load(audio_path, sr=None, mono=True)
+            # Load real audio (decoded once, shared with the other engines)
+            audio = get_audio_context(audio_path).native
+            y, sr = audio.y, audio.sr
             duration = len(y) / sr
             
             # 1. REAL KEY DETECTION
-            chroma = librosa.feature.chroma_cqt(y=y, sr=sr)
+            chroma = audio.chroma_cqt()
             key_profile = chroma.mean(axis=1)
             key_idx = int(np.argmax(key_profile))
             keys = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
@@ -49,15 +46,15 @@ class HPSEngine:
             key_confidence = min(1.0, key_strength * 2)  # Normalize
             
             # 2. REAL BPM/TEMPO
-            tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
-            beat_strength = float(np.std(librosa.onset.onset_strength(y=y, sr=sr)))
+            tempo, beats = audio.beat_track()
+            beat_strength = float(np.std(audio.onset_strength()))
             tempo_confidence = min(1.0, beat_strength / 10)  # Dynamic confidence
             
             # 3. HARMONIC FINGERPRINT (spectral features)
-            spectral_centroid = float(np.mean(librosa.feature.spectral_centroid(y=y, sr=sr)))
-            spectral_rolloff = float(np.mean(librosa.feature.spectral_rolloff(y=y, sr=sr)))
-            spectral_bandwidth = float(np.mean(librosa.feature.spectral_bandwidth(y=y, sr=sr)))
-            zcr = float(np.mean(librosa.feature.zero_crossing_rate(y)))
+            spectral_centroid = float(np.mean(audio.spectral_centroid()))
+            spectral_rolloff = float(np.mean(audio.spectral_rolloff()))
+            spectral_bandwidth = float(np.mean(audio.spectral_bandwidth()))
+            zcr = float(np.mean(audio.zero_crossing_rate()))
             
             # 4. EMOTIONAL TONE (from harmonic content) - DYNAMICALLY CALCULATED
             major_likelihood = float(key_profile[(key_idx + 4) % 12])  # Major 3rd
@@ -80,7 +77,7 @@ class HPSEngine:
             # No arbitrary thresholds - use percentiles from audio features
             tempo_percentile = min(100, (tempo / 200) * 100)  # 200 BPM = 100%
             brightness = spectral_centroid / 4000  # Normalize to 0-1
-            energy = float(np.mean(librosa.feature.rms(y=y)))
+            energy = float(np.mean(audio.rms()))
             
             # Calculate archetype score matrix
             energetic_score = (tempo_percentile / 100) * harmonic_ratio * energy * 100
@@ -14,11 +14,7 @@ try:
 except ImportError:
     HAS_PIL = False
 
-try:
-    import librosa
-    HAS_LIBROSA = True
-except ImportError:
-    HAS_LIBROSA = False
+from .audio_context import HAS_LIBROSA, get_audio_context
 
 logger = logging.getLogger(__name__)
 
@@ -234,13 +230,13 @@ class MoodboardEngine:
             return {"error": "librosa not installed"}
         
         try:
-            y, sr = librosa.load(file_path, sr=None, duration=30)  # First 30 seconds
+            audio = get_audio_context(file_path).view(duration=30)  # First 30 seconds
             
             # Extract harmonic features
-            chroma = librosa.feature.chroma_stft(y=y, sr=sr)
-            spectral_centroid = float(np.mean(librosa.feature.spectral_centroid(y=y, sr=sr)))
-            tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
-            energy = float(np.mean(librosa.feature.rms(y=y)))
+            chroma = audio.chroma_stft()
+            spectral_centroid = float(np.mean(audio.spectral_centroid()))
+            tempo, _ = audio.beat_track()
+            energy = float(np.mean(audio.rms()))
             
             # Map audio features to colors
             # High spectral centroid = brighter colors
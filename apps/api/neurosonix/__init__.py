@@ -8,13 +8,15 @@ from .brain_analyzer import BrainWaveAnalyzer
 from .audio_synthesizer import AudioSynthesizer
 from .signal_filter import SignalFilter
 from .routes import router as Clisonix_router
+from .routes import eeg_stream_router
 
 __all__ = [
     "EEGProcessor", 
     "BrainWaveAnalyzer", 
     "AudioSynthesizer", 
     "SignalFilter",
-    "Clisonix_router"
+    "Clisonix_router",
+    "eeg_stream_router"
 ]
 
 
@@ -4,7 +4,7 @@ Convert brain wave patterns into real-time audio synthesis with real audio outpu
 """
 
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterator, List, Tuple, Optional
 import math
 from datetime import datetime
 import logging
@@ -23,6 +23,180 @@ import time
 logger = logging.getLogger(__name__)
 
 
+class WavetableOscillatorBank:
+    """
+    Phase-continuous oscillator bank reading precomputed wavetables.
+
+    ``render(out)`` fills exactly ``len(out)`` frames in place: phases carry
+    over between blocks, frequency and amplitude glide towards their targets
+    with a one-pole smoother (amplitude ramps linearly inside each block),
+    and every intermediate array is preallocated per block size, so a
+    steady-state callback does not allocate sample buffers.
+    """
+    
+    TABLES = ("sine", "harmonic")
+    
+    def __init__(self, sample_rate: int, n_voices: int, channels: int = 1,
+                 table_size: int = 4096, smoothing: float = 0.05,
+                 harmonics: Tuple[float, ...] = (0.5, 0.25, 0.125)):
+        if table_size < 2 or table_size & (table_size - 1):
+            raise ValueError("table_size must be a power of two")
+        self.sample_rate = sample_rate
+        self.n_voices = n_voices
+        self.channels = channels
+        self.table_size = table_size
+        self.smoothing = smoothing  # seconds to ~63% of a parameter change
+        
+        # One flat array of tables, each with a guard sample for interpolation
+        phase = np.arange(table_size + 1) * (2 * np.pi / table_size)
+        harmonic = np.sin(phase) + sum(a * np.sin((i + 2) * phase) for i, a in enumerate(harmonics))
+        harmonic /= np.max(np.abs(harmonic))
+        self._tables = np.concatenate([np.sin(phase), harmonic])
+        
+        self.frequency_target = np.zeros(n_voices)
+        self.amplitude_target = np.zeros(n_voices)
+        self.pan = np.full(n_voices, 0.5)
+        self._table_offset = np.zeros((n_voices, 1), dtype=np.intp)
+        self._phase = np.zeros((n_voices, 1))
+        self._increment = np.zeros((n_voices, 1))
+        self._amplitude = np.zeros((n_voices, 1))
+        self._next_amplitude = np.zeros((n_voices, 1))
+        self._scratch = np.zeros((n_voices, 1))
+        self._gains = np.ones((channels, n_voices))
+        self._buffers: Dict[int, Dict[str, np.ndarray]] = {}
+        self._sequences: Dict[int, Tuple[np.ndarray, int]] = {}
+        self.blocks_rendered = 0
+        self.frames_rendered = 0
+    
+    def set_voice(self, voice: int, frequency: Optional[float] = None, amplitude: Optional[float] = None,
+                  pan: Optional[float] = None, table: Optional[str] = None, immediate: bool = False):
+        """Set a voice's targets; ``immediate`` skips the glide (e.g. note changes)"""
+        if frequency is not None:
+            self.frequency_target[voice] = frequency
+            if immediate:
+                self._increment[voice, 0] = frequency * self.table_size / self.sample_rate
+        if amplitude is not None:
+            self.amplitude_target[voice] = amplitude
+            if immediate:
+                self._amplitude[voice, 0] = amplitude
+        if pan is not None:
+            self.pan[voice] = min(max(pan, 0.0), 1.0)
+            if self.channels == 2:
+                self._gains[0, voice] = min(1.0, 2.0 * (1.0 - self.pan[voice]))
+                self._gains[1, voice] = min(1.0, 2.0 * self.pan[voice])
+        if table is not None:
+            self._table_offset[voice, 0] = self.TABLES.index(table) * (self.table_size + 1)
+    
+    def set_sequence(self, voice: int, frequencies: Optional[np.ndarray], note_seconds: float = 0.25):
+        """
+        Step ``voice`` through ``frequencies`` (note changes land on block starts);
+        None stops it. The sequence map is replaced, never mutated, so the audio
+        thread iterates a consistent snapshot.
+        """
+        sequences = dict(self._sequences)
+        if frequencies is None or len(frequencies) == 0:
+            sequences.pop(voice, None)
+        else:
+            note_samples = max(1, int(note_seconds * self.sample_rate))
+            sequences[voice] = (np.asarray(frequencies, dtype=np.float64), note_samples)
+        self._sequences = sequences
+    
+    def silence(self):
+        """Fade every voice out"""
+        self.amplitude_target.fill(0.0)
+    
+    def _block_buffers(self, frames: int) -> Dict[str, np.ndarray]:
+        buffers = self._buffers.get(frames)
+        if buffers is None:
+            shape = (self.n_voices, frames)
+            ramp = np.arange(frames, dtype=np.float64)[None, :]
+            buffers = self._buffers[frames] = {
+                "ramp": ramp,
+                "fade": ramp / frames,
+                "phase": np.empty(shape),
+                "frac": np.empty(shape),
+                "index": np.empty(shape, dtype=np.intp),
+                "a": np.empty(shape),
+                "b": np.empty(shape),
+                "mix": np.empty((self.channels, frames)),
+            }
+        return buffers
+    
+    def render(self, out: np.ndarray) -> np.ndarray:
+        """Render ``len(out)`` frames into ``out`` (shape (frames,) or (frames, channels))"""
+        frames = out.shape[0]
+        if frames == 0:
+            return out
+        buf = self._block_buffers(frames)
+        phase, frac, index, a, b = buf["phase"], buf["frac"], buf["index"], buf["a"], buf["b"]
+        scratch = self._scratch
+        alpha = 1.0 - math.exp(-frames / (self.smoothing * self.sample_rate)) if self.smoothing > 0 else 1.0
+        
+        sequences = self._sequences
+        for voice, (frequencies, note_samples) in sequences.items():
+            note = frequencies[(self.frames_rendered // note_samples) % len(frequencies)]
+            self.frequency_target[voice] = note
+            self._increment[voice, 0] = note * self.table_size / self.sample_rate
+        
+        # Glide the per-block phase increment towards the target frequency
+        np.multiply(self.frequency_target[:, None], self.table_size / self.sample_rate, out=scratch)
+        scratch -= self._increment
+        scratch *= alpha
+        self._increment += scratch
+        
+        # Phases for the block; the integer part wraps into the table with a mask
+        np.multiply(self._increment, buf["ramp"], out=phase)
+        phase += self._phase
+        np.floor(phase, out=frac)
+        np.copyto(index, frac, casting="unsafe")
+        np.subtract(phase, frac, out=frac)
+        np.bitwise_and(index, self.table_size - 1, out=index)
+        index += self._table_offset
+        
+        # Linear interpolation between neighbouring table samples
+        np.take(self._tables, index, out=a, mode="clip")
+        index += 1
+        np.take(self._tables, index, out=b, mode="clip")
+        b -= a
+        b *= frac
+        a += b
+        
+        # Amplitude ramps linearly from the current to the smoothed next value
+        np.subtract(self.amplitude_target[:, None], self._amplitude, out=scratch)
+        scratch *= alpha
+        np.add(self._amplitude, scratch, out=self._next_amplitude)
+        np.multiply(scratch, buf["fade"], out=b)
+        b += self._amplitude
+        a *= b
+        self._amplitude, self._next_amplitude = self._next_amplitude, self._amplitude
+        
+        # Carry the phase over to the next block
+        np.multiply(self._increment, frames, out=scratch)
+        self._phase += scratch
+        np.mod(self._phase, self.table_size, out=self._phase)
+        
+        mix = buf["mix"]
+        np.matmul(self._gains, a, out=mix)
+        if out.ndim == 1:
+            out[:] = mix[0]
+        else:
+            out[:] = mix[:out.shape[1]].T
+        self.blocks_rendered += 1
+        self.frames_rendered += frames
+        return out
+    
+    def get_state(self) -> Dict:
+        return {
+            "voices": self.n_voices,
+            "channels": self.channels,
+            "table_size": self.table_size,
+            "frequencies": (self._increment[:, 0] * self.sample_rate / self.table_size).round(2).tolist(),
+            "amplitudes": self._amplitude[:, 0].round(4).tolist(),
+            "blocks_rendered": self.blocks_rendered,
+            "frames_rendered": self.frames_rendered
+        }
+
+
 class AudioSynthesizer:
     """Convert EEG brain waves to audio synthesis with real-time audio output"""
     
@@ -60,6 +234,22 @@ class AudioSynthesizer:
             "gamma": {"base_freq": 960, "octave": 5}    # High frequencies
         }
         
+        self.musical_patterns = {
+            "relaxed": ["C", "E", "G", "C"],
+            "focused": ["C", "D", "E", "F", "G"],
+            "meditative": ["A", "C", "E", "A"],
+            "stressed": ["G", "F", "E", "D", "C"],
+            "drowsy": ["C", "G", "C", "G"]
+        }
+        
+        # Continuous output: one wavetable voice per band, then melody and hemisphere tone
+        self.band_voices = list(self.brainwave_mapping)
+        self.melody_voice = len(self.band_voices)
+        self.hemisphere_voice = self.melody_voice + 1
+        self.oscillator_bank = self.create_oscillator_bank()
+        self._clip: Optional[np.ndarray] = None
+        self._clip_position = 0
+        
         # Initialize audio device if real audio is enabled
         if self.real_audio:
             try:
@@ -90,20 +280,26 @@ class AudioSynthesizer:
         if status:
             logger.warning(f"Audio callback status: {status}")
         
-        try:
-            # Get audio data from queue (non-blocking)
-            audio_chunk = self.audio_queue.get_nowait()
-            
-            # Ensure correct shape
-            if len(audio_chunk.shape) == 1:
-                audio_chunk = audio_chunk.reshape(-1, 1)  # Mono
-            
-            # Copy to output buffer
-            outdata[:] = audio_chunk[:frames]
-            
-        except queue.Empty:
-            # No audio data available, output silence
-            outdata.fill(0)
+        # Exactly `frames` samples from the oscillator bank, then any queued clips on top
+        self.oscillator_bank.render(outdata)
+        self._mix_queued_clips(outdata[:, 0])
+    
+    def _mix_queued_clips(self, out: np.ndarray):
+        """Add queued one-shot clips to ``out``; a clip continues where the last callback stopped"""
+        filled = 0
+        while filled < len(out):
+            if self._clip is None:
+                try:
+                    self._clip = self.audio_queue.get_nowait()
+                    self._clip_position = 0
+                except queue.Empty:
+                    return
+            count = min(len(out) - filled, len(self._clip) - self._clip_position)
+            out[filled:filled + count] += self._clip[self._clip_position:self._clip_position + count]
+            filled += count
+            self._clip_position += count
+            if self._clip_position >= len(self._clip):
+                self._clip = None
     
     def start_audio_stream(self):
         """Start real-time audio streaming"""
@@ -139,6 +335,8 @@ class AudioSynthesizer:
         if self.real_audio and hasattr(self, 'stream') and self.stream.active:
             try:
                 # Add to queue for real-time playback
+                if audio_data.ndim > 1:
+                    audio_data = audio_data.mean(axis=1)  # the output stream is mono
                 if not self.audio_queue.full():
                     self.audio_queue.put_nowait(audio_data)
                 logger.debug(f"ðŸ”Š Playing {len(audio_data)} audio samples")
@@ -190,15 +388,7 @@ class AudioSynthesizer:
         note_duration = 0.25  # Quarter note
         
         # Map cognitive states to musical patterns
-        musical_patterns = {
-            "relaxed": ["C", "E", "G", "C"],
-            "focused": ["C", "D", "E", "F", "G"],
-            "meditative": ["A", "C", "E", "A"],
-            "stressed": ["G", "F", "E", "D", "C"],
-            "drowsy": ["C", "G", "C", "G"]
-        }
-        
-        pattern = musical_patterns.get(cognitive_state, ["C", "E", "G"])
+        pattern = self.musical_patterns.get(cognitive_state, ["C", "E", "G"])
         sequence = np.array([])
         
         for note in pattern:
@@ -315,6 +505,115 @@ class AudioSynthesizer:
         
         return audio_streams
     
+    def create_oscillator_bank(self, channels: int = 1) -> WavetableOscillatorBank:
+        """Oscillator bank with the brain wave, melody and hemisphere voices laid out"""
+        bank = WavetableOscillatorBank(self.sample_rate, len(self.band_voices) + 2, channels)
+        for voice, band in enumerate(self.band_voices):
+            mapping = self.brainwave_mapping[band]
+            bank.set_voice(voice, frequency=mapping["base_freq"] * mapping["octave"], immediate=True)
+        bank.set_voice(self.melody_voice, frequency=self.musical_scale["C"], immediate=True)
+        bank.set_voice(self.hemisphere_voice, frequency=220, immediate=True)
+        return bank
+    
+    def apply_brain_data(self, brain_analysis: Dict, bank: Optional[WavetableOscillatorBank] = None) -> List[str]:
+        """
+        Retarget an oscillator bank (default: the live output bank) from brain
+        analysis data; the bank glides to the new levels. Returns the active streams.
+        """
+        bank = bank or self.oscillator_bank
+        if brain_analysis.get("status") != "active":
+            bank.silence()
+            bank.set_sequence(self.melody_voice, None)
+            return []
+        
+        amplitudes = np.zeros(bank.n_voices)
+        active_streams = []
+        cognitive_state = brain_analysis.get("cognitive_state", {})
+        
+        # 1. Brain wave tones, same levels as generate_brain_tone
+        band_powers = cognitive_state.get("band_powers", {})
+        if band_powers:
+            total_power = sum(band_powers.values()) + 1e-6
+            for voice, band in enumerate(self.band_voices):
+                power = band_powers.get(band, 0.0) / total_power
+                if power > 0.01:
+                    amplitudes[voice] = min(power * 2.0, 0.8)
+            active_streams.append("brain_waves")
+        
+        # 2. Musical interpretation
+        state = cognitive_state.get("state", "unknown")
+        if state != "unknown":
+            pattern = self.musical_patterns.get(state, ["C", "E", "G"])
+            bank.set_sequence(self.melody_voice, [self.musical_scale[note] for note in pattern])
+            amplitudes[self.melody_voice] = cognitive_state.get("confidence", 0.0) * 0.6
+            active_streams.append("musical")
+        else:
+            bank.set_sequence(self.melody_voice, None)
+        
+        # 3. Hemisphere balance (panned in stereo, the mean of both sides in mono)
+        symmetry = brain_analysis.get("brain_symmetry", {}).get("symmetry_index")
+        if symmetry is not None:
+            amplitudes[self.hemisphere_voice] = 0.3 if bank.channels == 2 else 0.15
+            bank.set_voice(self.hemisphere_voice, pan=symmetry)
+            active_streams.append("hemisphere_balance")
+        
+        # Same 0.8 peak ceiling the clip mixer normalizes to
+        total = amplitudes.sum()
+        if total > 0:
+            amplitudes *= 0.8 / total
+        bank.amplitude_target[:] = amplitudes
+        return active_streams
+    
+    def render_offline(self, brain_analysis: Optional[Dict] = None, duration: float = 1.0,
+                       block_size: int = 1024, brain_data_callback: Optional[Callable[[], Dict]] = None,
+                       update_interval: float = 0.5, channels: int = 1) -> np.ndarray:
+        """
+        Render ``duration`` seconds without an audio device, block by block into
+        one preallocated array. Brain data comes from ``brain_analysis`` or is
+        polled from ``brain_data_callback`` every ``update_interval`` seconds.
+        """
+        bank = self.create_oscillator_bank(channels)
+        if brain_analysis:
+            self.apply_brain_data(brain_analysis, bank)
+        n_samples = int(duration * self.sample_rate)
+        audio = np.zeros((n_samples, channels) if channels > 1 else n_samples, dtype=np.float32)
+        update_samples = max(1, int(update_interval * self.sample_rate))
+        next_update = 0
+        for start in range(0, n_samples, block_size):
+            if brain_data_callback is not None and start >= next_update:
+                brain_data = brain_data_callback()
+                if brain_data:
+                    self.apply_brain_data(brain_data, bank)
+                next_update = start + update_samples
+            bank.render(audio[start:start + block_size])
+        return audio
+    
+    def iter_pcm_blocks(self, brain_data_callback: Callable[[], Dict], block_size: int = 4410,
+                        update_interval: float = 0.5, duration: Optional[float] = None,
+                        channels: int = 1) -> Iterator[bytes]:
+        """
+        Endless (or ``duration`` seconds of) 16-bit little-endian PCM blocks for
+        server-side streaming. Each stream gets its own oscillator bank and
+        reuses one float and one int16 block; pacing is up to the caller.
+        """
+        bank = self.create_oscillator_bank(channels)
+        block = np.zeros((block_size, channels) if channels > 1 else block_size)
+        pcm = np.zeros(block.shape, dtype="<i2")
+        update_blocks = max(1, int(round(update_interval * self.sample_rate / block_size)))
+        total_blocks = None if duration is None else math.ceil(duration * self.sample_rate / block_size)
+        index = 0
+        while total_blocks is None or index < total_blocks:
+            if index % update_blocks == 0:
+                brain_data = brain_data_callback()
+                if brain_data:
+                    self.apply_brain_data(brain_data, bank)
+            bank.render(block)
+            np.clip(block, -1.0, 1.0, out=block)
+            block *= 32767
+            np.copyto(pcm, block, casting="unsafe")
+            yield pcm.tobytes()
+            index += 1
+    
     def synthesize_and_play_realtime(self, brain_analysis: Dict) -> Dict:
         """Real-time synthesis and playback from brain data"""
         try:
@@ -372,12 +671,11 @@ class AudioSynthesizer:
                     brain_data = brain_data_callback()
                     
                     if brain_data:
-                        # Synthesize and play
-                        result = self.synthesize_and_play_realtime(brain_data)
-                        if result["status"] == "playing":
-                            logger.debug(f"ðŸ”Š Playing: {result['active_streams']}")
+                        # Retarget the oscillator bank; the audio callback keeps rendering
+                        active_streams = self.apply_brain_data(brain_data)
+                        logger.debug(f"ðŸ”Š Playing: {active_streams}")
                     
-                    # Wait for next update
+                    # Wait for next control update
                     time.sleep(update_interval)
                     
                 except Exception as e:
@@ -400,6 +698,7 @@ class AudioSynthesizer:
         """Stop continuous synthesis and audio stream"""
         self.is_playing = False
         self.stop_audio_stream()
+        self.oscillator_bank.silence()
         
         if self.audio_thread and self.audio_thread.is_alive():
             self.audio_thread.join(timeout=2.0)
@@ -417,6 +716,7 @@ class AudioSynthesizer:
             "queue_size": self.audio_queue.qsize() if hasattr(self, 'audio_queue') else 0,
             "available_modes": ["brain_waves", "musical", "hemisphere_balance"],
             "frequency_mappings": self.brainwave_mapping,
+            "oscillator_bank": self.oscillator_bank.get_state(),
             "timestamp": datetime.now().isoformat()
         }
 
@@ -0,0 +1,215 @@
+"""
+Clisonix Binary EEG Ingest
+Framed binary WebSocket protocol for live EEG device streams
+
+Frame layout (little-endian):
+    header   44 bytes   struct ``<4sBBH16sfIdI``
+             magic b"EEGF", version, flags, channel count, device id
+             (ASCII, NUL padded), sample rate (Hz), sequence number,
+             timestamp of the first sample (UNIX seconds), sample count
+    payload  float32    sample-major: ``samples x channels`` values in uV
+
+Each frame is decoded with one ``np.frombuffer`` and handed to
+``IndustrialEEGProcessor.add_sample_block`` - no per-sample Python objects.
+
+Control messages are JSON text frames:
+    client -> server  {"type": "hello", "channel_names": [...]}
+    server -> client  {"type": "ready"}, {"type": "ack"}, {"type": "error"},
+                      {"type": "flow", "state": "pause" | "resume"}
+
+Backpressure: frames go through a bounded queue drained by a worker. The
+server sends ``pause`` once the queue passes its high-water mark and
+``resume`` after it drained below the low-water mark; when the queue is full
+the server stops reading, so a client ignoring ``pause`` is throttled by TCP.
+"""
+
+import asyncio
+import json
+import logging
+import struct
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FRAME_MAGIC = b"EEGF"
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct("<4sBBH16sfIdI")
+
+
+class FrameError(ValueError):
+    """Malformed binary EEG frame"""
+
+
+class EEGFrame(NamedTuple):
+    device_id: str
+    sample_rate: float
+    sequence: int
+    timestamp: float
+    samples: np.ndarray  # (channels, samples) float32 view of the payload
+
+
+def encode_frame(device_id: str, samples: np.ndarray, sample_rate: float,
+                 sequence: int, timestamp: Optional[float] = None) -> bytes:
+    """Pack a (channels x samples) block into one binary frame"""
+    samples = np.asarray(samples, dtype="<f4")
+    channels, n_samples = samples.shape
+    header = FRAME_HEADER.pack(
+        FRAME_MAGIC, FRAME_VERSION, 0, channels, device_id.encode("ascii")[:16],
+        sample_rate, sequence & 0xFFFFFFFF, time.time() if timestamp is None else timestamp, n_samples
+    )
+    return header + samples.T.tobytes()
+
+
+def decode_frame(data: bytes) -> EEGFrame:
+    """Unpack a binary frame; the samples are a zero-copy transposed view"""
+    if len(data) < FRAME_HEADER.size:
+        raise FrameError("frame shorter than header")
+    magic, version, _flags, channels, device_id, sample_rate, sequence, timestamp, n_samples = \
+        FRAME_HEADER.unpack_from(data)
+    if magic != FRAME_MAGIC:
+        raise FrameError("bad frame magic")
+    if version != FRAME_VERSION:
+        raise FrameError(f"unsupported frame version {version}")
+    if channels == 0 or sample_rate <= 0:
+        raise FrameError("frame needs channels and a positive sample rate")
+    expected = FRAME_HEADER.size + channels * n_samples * 4
+    if len(data) != expected:
+        raise FrameError(f"payload size mismatch: {len(data)} != {expected}")
+    samples = np.frombuffer(data, dtype="<f4", offset=FRAME_HEADER.size).reshape(n_samples, channels).T
+    return EEGFrame(device_id.rstrip(b"\0").decode("ascii", "replace"), float(sample_rate),
+                    sequence, timestamp, samples)
+
+
+class EEGIngestSession:
+    """One device connection: channel mapping, bounded frame queue, statistics"""
+
+    def __init__(self, processor: Any, queue_size: int = 64,
+                 high_water: float = 0.75, low_water: float = 0.25):
+        self.processor = processor
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.high_water = max(1, int(queue_size * high_water))
+        self.low_water = int(queue_size * low_water)
+        self.channel_names: Optional[List[str]] = None
+        self.paused = False
+        self._last_sequence: Optional[int] = None
+        self.stats = {
+            "frames": 0,
+            "samples": 0,
+            "bytes": 0,
+            "sequence_gaps": 0,
+            "frame_errors": 0,
+            "pauses": 0,
+            "max_queue": 0
+        }
+
+    def hello(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Register the device's channels; returns the ``ready`` reply"""
+        names = [str(name) for name in message.get("channel_names", [])]
+        if not names:
+            raise FrameError("hello needs channel_names")
+        return self._register(names)
+
+    def _register(self, names: List[str]) -> Dict[str, Any]:
+        self.channel_names = names
+        accepted, rejected = [], []
+        for name in names:
+            if name in self.processor.active_channels or self.processor.register_channel(name):
+                accepted.append(name)
+            else:
+                rejected.append(name)
+        return {"type": "ready", "accepted": accepted, "rejected": rejected}
+
+    async def submit(self, frame: EEGFrame) -> Optional[str]:
+        """Queue a decoded frame; returns ``"pause"`` when crossing the high-water mark"""
+        if self.channel_names is None:
+            # no hello: assume the processor's default layout
+            self._register(self.processor.available_channels[:frame.samples.shape[0]])
+        if frame.samples.shape[0] != len(self.channel_names):
+            raise FrameError(f"frame has {frame.samples.shape[0]} channels, "
+                             f"expected {len(self.channel_names)}")
+        if self._last_sequence is not None and frame.sequence != (self._last_sequence + 1) & 0xFFFFFFFF:
+            self.stats["sequence_gaps"] += 1
+        self._last_sequence = frame.sequence
+
+        await self.queue.put(frame)  # full queue: stop reading until the worker catches up
+        depth = self.queue.qsize()
+        self.stats["max_queue"] = max(self.stats["max_queue"], depth)
+        if not self.paused and depth >= self.high_water:
+            self.paused = True
+            self.stats["pauses"] += 1
+            return "pause"
+        return None
+
+    async def consume(self, on_resume) -> None:
+        """Worker: move queued frames into the processor"""
+        while True:
+            frame = await self.queue.get()
+            try:
+                await asyncio.to_thread(
+                    self.processor.add_sample_block, self.channel_names, frame.samples,
+                    frame.timestamp, frame.sample_rate
+                )
+                self.stats["frames"] += 1
+                self.stats["samples"] += frame.samples.shape[1]
+            except Exception as e:
+                self.stats["frame_errors"] += 1
+                logger.error(f"EEG frame ingest failed: {e}")
+            finally:
+                self.queue.task_done()
+            if self.paused and self.queue.qsize() <= self.low_water:
+                self.paused = False
+                await on_resume()
+
+
+async def serve_ingest(websocket: Any, processor: Any, queue_size: int = 64, ack_every: int = 32) -> None:
+    """Run the binary ingest protocol on an (unaccepted) FastAPI/Starlette WebSocket"""
+    await websocket.accept()
+    session = EEGIngestSession(processor, queue_size)
+    send_lock = asyncio.Lock()
+
+    async def send(message: Dict[str, Any]) -> None:
+        async with send_lock:
+            await websocket.send_text(json.dumps(message))
+
+    async def resume() -> None:
+        await send({"type": "flow", "state": "resume", "queued": session.queue.qsize()})
+
+    worker = asyncio.create_task(session.consume(resume))
+    received = 0
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            payload = message.get("bytes")
+            try:
+                if payload is not None:
+                    session.stats["bytes"] += len(payload)
+                    frame = decode_frame(payload)
+                    state = await session.submit(frame)
+                    received += 1
+                    if state:
+                        await send({"type": "flow", "state": state, "queued": session.queue.qsize()})
+                    if received % ack_every == 0:
+                        await send({"type": "ack", "sequence": frame.sequence, "queued": session.queue.qsize()})
+                elif message.get("text"):
+                    request = json.loads(message["text"])
+                    if request.get("type") == "hello":
+                        await send(session.hello(request))
+                    elif request.get("type") == "stats":
+                        await session.queue.join()
+                        await send({"type": "stats", **session.stats})
+            except (FrameError, ValueError, AttributeError, TypeError) as e:
+                session.stats["frame_errors"] += 1
+                await send({"type": "error", "detail": str(e)})
+    finally:
+        if not worker.done():
+            try:
+                await asyncio.wait_for(session.queue.join(), timeout=5.0)
+            except asyncio.TimeoutError:
+                logger.warning("EEG ingest closed with frames still queued")
+        worker.cancel()
+        logger.info(f"EEG ingest session closed: {session.stats}")
@@ -45,6 +45,395 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Artifact types in bitmask order (bit i set -> ARTIFACT_TYPES[i] detected)
+ARTIFACT_TYPES = (
+    "high_amplitude", "flat_line", "high_frequency_noise", "eye_blink",
+    "muscle_artifact", "electrode_pop", "drift", "saturation"
+)
+ARTIFACT_BITS = {name: 1 << i for i, name in enumerate(ARTIFACT_TYPES)}
+
+
+def decode_artifact_mask(mask: int) -> List[str]:
+    """Artifact type names set in a per-channel bitmask"""
+    return [name for name, bit in ARTIFACT_BITS.items() if mask & bit]
+
+
+class ArtifactEngine:
+    """
+    Batch artifact detection over a (channels, samples) matrix.
+
+    Each band-pass is designed once per sampling rate and run over all
+    channels with ``axis=-1``; every detector's statistics come out of the
+    same pass as per-channel arrays. ``evaluate`` returns a uint8 bitmask
+    (see ``ARTIFACT_TYPES``) and a (channels, types) score matrix.
+    """
+
+    # (low, high) Hz of the filtered detectors
+    NOISE_BAND = (50.0, 100.0)
+    BLINK_BAND = (0.5, 4.0)
+    EMG_BAND = (20.0, 45.0)
+
+    # limits of the detectors without an entry in ``artifact_thresholds``
+    FLAT_STD = 1.0
+    NOISE_STD = 10.0
+    BLINK_AMPLITUDE = 50.0
+    BLINK_FRACTION = 0.01
+    EMG_POWER = 100.0
+    DRIFT_RATIO = 2.0
+    SATURATION_RANGE = 400.0
+    SATURATION_UNIQUE = 0.8
+
+    def __init__(self, sampling_rate: int, thresholds: Dict[str, float], filter_order: int = 6):
+        self.sampling_rate = sampling_rate
+        self.thresholds = thresholds
+        self.filter_order = filter_order
+        self._sos: Dict[Tuple[float, float], Optional[np.ndarray]] = {}
+
+    def _design(self, band: Tuple[float, float]) -> Optional[np.ndarray]:
+        """Cached band-pass design, clamped like ``_apply_bandpass_filter``"""
+        if band not in self._sos:
+            nyquist = self.sampling_rate / 2
+            low = max(0.01, band[0] / nyquist)
+            high = min(0.99, band[1] / nyquist)
+            self._sos[band] = (
+                signal.butter(self.filter_order, [low, high], btype='band', output='sos')
+                if low < high else None
+            )
+        return self._sos[band]
+
+    def _bandpass(self, matrix: np.ndarray, band: Tuple[float, float]) -> np.ndarray:
+        sos = self._design(band)
+        if sos is None:
+            return matrix
+        return signal.sosfiltfilt(sos, matrix, axis=-1)
+
+    def _padlen(self, band: Tuple[float, float]) -> int:
+        sos = self._design(band)
+        return 0 if sos is None else 3 * (2 * len(sos) + 1)
+
+    def statistics(self, matrix: np.ndarray) -> Dict[str, np.ndarray]:
+        """Per-channel detector statistics for a (channels, samples) matrix"""
+        n_channels, n = matrix.shape
+        amplitude_threshold = self.thresholds["amplitude_threshold"]
+        gradient_threshold = self.thresholds["gradient_threshold"]
+        nan = np.full(n_channels, np.nan)
+
+        abs_data = np.abs(matrix)
+        stats = {
+            "max_amplitude": abs_data.max(axis=1),
+            "samples_above_threshold": (abs_data > amplitude_threshold).sum(axis=1),
+            "std_deviation": matrix.std(axis=1),
+            "amplitude_range": matrix.max(axis=1) - matrix.min(axis=1),
+        }
+        ordered = np.sort(matrix, axis=1)
+        stats["unique_values"] = (np.diff(ordered, axis=1) != 0).sum(axis=1) + 1
+
+        if n > self.filter_order * 3 and n > self._padlen(self.NOISE_BAND):
+            stats["noise_std"] = self._bandpass(matrix, self.NOISE_BAND).std(axis=1)
+        else:
+            stats["noise_std"] = nan
+        if n > self.sampling_rate:
+            blink = np.abs(self._bandpass(matrix, self.BLINK_BAND)) > self.BLINK_AMPLITUDE
+            stats["blink_samples"] = blink.sum(axis=1)
+            emg = self._bandpass(matrix, self.EMG_BAND)
+            stats["emg_power"] = np.einsum('ij,ij->i', emg, emg) / n
+        else:
+            stats["blink_samples"] = np.zeros(n_channels, dtype=np.int64)
+            stats["emg_power"] = nan
+        if n > 1:
+            gradients = np.abs(np.diff(matrix, axis=1))
+            stats["max_gradient"] = gradients.max(axis=1)
+            stats["sharp_transitions"] = (gradients > gradient_threshold).sum(axis=1)
+        else:
+            stats["max_gradient"] = nan
+            stats["sharp_transitions"] = np.zeros(n_channels, dtype=np.int64)
+        if n > self.sampling_rate * 2:
+            detrended = signal.detrend(matrix, axis=1, type='linear')
+            stats["trend_strength"] = stats["std_deviation"] / np.maximum(detrended.std(axis=1), 0.001)
+        else:
+            stats["trend_strength"] = nan
+        return stats
+
+    def evaluate(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """``(bitmask, scores, statistics)``; scores are 0 where a detector did not fire"""
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.ndim == 1:
+            matrix = matrix[None, :]
+        n = matrix.shape[1]
+        stats = self.statistics(matrix)
+        amplitude_threshold = self.thresholds["amplitude_threshold"]
+        gradient_threshold = self.thresholds["gradient_threshold"]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            flags = np.stack([
+                stats["max_amplitude"] > amplitude_threshold,
+                stats["std_deviation"] < self.FLAT_STD,
+                stats["noise_std"] > self.NOISE_STD,
+                stats["blink_samples"] > n * self.BLINK_FRACTION,
+                stats["emg_power"] > self.EMG_POWER,
+                stats["max_gradient"] > gradient_threshold,
+                stats["trend_strength"] > self.DRIFT_RATIO,
+                (stats["amplitude_range"] > self.SATURATION_RANGE)
+                & (stats["unique_values"] < n * self.SATURATION_UNIQUE),
+            ], axis=1)
+            scores = np.stack([
+                stats["max_amplitude"] / amplitude_threshold,
+                1.0 / np.maximum(stats["std_deviation"], 0.001),
+                stats["noise_std"] / self.NOISE_STD,
+                stats["blink_samples"] / n,
+                stats["emg_power"] / self.EMG_POWER,
+                stats["max_gradient"] / gradient_threshold,
+                stats["trend_strength"] / self.DRIFT_RATIO,
+                stats["amplitude_range"] / self.SATURATION_RANGE,
+            ], axis=1)
+        scores = np.where(flags, scores, 0.0)
+        bits = np.array([ARTIFACT_BITS[name] for name in ARTIFACT_TYPES], dtype=np.uint8)
+        mask = (flags * bits).sum(axis=1).astype(np.uint8)
+        return mask, scores, stats
+
+
+class ICAModel:
+    """
+    Fitted ICA snapshot for one channel layout. Standardization, unmixing,
+    zeroing of the artifact components and re-mixing are folded into one
+    ``cleaning`` matrix, so a window is cleaned with ``cleaning @ x + offset``.
+    """
+
+    def __init__(self, channels: List[str], ica: Any, mean: np.ndarray, scale: np.ndarray,
+                 artifact_components: List[int], n_samples: int):
+        self.channels = tuple(channels)
+        self.n_components = int(ica.components_.shape[0])
+        self.artifact_components = list(artifact_components)
+        self.n_samples = n_samples
+        self.fitted_at = time.time()
+
+        unmixing, mixing, center = ica.components_, ica.mixing_, ica.mean_
+        keep = np.ones(self.n_components)
+        keep[self.artifact_components] = 0.0
+        projection = (mixing * keep) @ unmixing  # in standardized space
+        self.cleaning = scale[:, None] * projection / scale[None, :]
+        self.offset = mean - self.cleaning @ mean + scale * (center - projection @ center)
+        self.unmixing = unmixing / scale[None, :]
+        self.source_offset = -unmixing @ (mean / scale + center)
+
+    def apply(self, data_matrix: np.ndarray) -> np.ndarray:
+        """Artifact-free (channels x samples) reconstruction of a window"""
+        return self.cleaning @ data_matrix + self.offset[:, None]
+
+    def sources(self, data_matrix: np.ndarray) -> np.ndarray:
+        """Independent components of a window (unit variance on the training data)"""
+        return self.unmixing @ data_matrix + self.source_offset[:, None]
+
+    def source_moment(self, data_matrix: np.ndarray) -> np.ndarray:
+        """Second moment of the sources; the identity on the training data"""
+        sources = self.sources(data_matrix)
+        return sources @ sources.T / sources.shape[1]
+
+    def age_seconds(self) -> float:
+        return time.time() - self.fitted_at
+
+
+class SampleRing:
+    """
+    Fixed-capacity float64 buffer used like ``deque(maxlen=...)``. Backed by
+    an array of twice the capacity, so the retained samples are always one
+    contiguous slice (``view()``) and are compacted once per ``maxlen``
+    appends; ``extend`` copies a whole block with one slice assignment.
+    """
+
+    def __init__(self, maxlen: int):
+        self.maxlen = int(maxlen)
+        self._data = np.empty(2 * self.maxlen, dtype=np.float64)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __iter__(self):
+        return iter(self.view().tolist())
+
+    def __getitem__(self, index):
+        return self.view()[index]
+
+    def view(self) -> np.ndarray:
+        """Retained samples, oldest first (a view, copy before releasing the lock)"""
+        return self._data[self._start:self._end]
+
+    def append(self, value: float) -> None:
+        if self._end == len(self._data):
+            self._compact()
+        self._data[self._end] = value
+        self._end += 1
+        if self._end - self._start > self.maxlen:
+            self._start += 1
+
+    def extend(self, values) -> None:
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) >= self.maxlen:
+            self._data[:self.maxlen] = values[len(values) - self.maxlen:]
+            self._start, self._end = 0, self.maxlen
+            return
+        if self._end + len(values) > len(self._data):
+            self._compact()
+        self._data[self._end:self._end + len(values)] = values
+        self._end += len(values)
+        self._start = max(self._start, self._end - self.maxlen)
+
+    def clear(self) -> None:
+        self._start = self._end = 0
+
+    def _compact(self) -> None:
+        count = len(self)
+        self._data[:count] = self._data[self._start:self._end]
+        self._start, self._end = 0, count
+
+
+class StreamingICA:
+    """
+    Session ICA: fitted once (in a background thread for streamed windows),
+    then reused for every window until a refit is triggered by source drift
+    or by ``refit_interval``. The most recent ``min_samples`` of streamed
+    data are kept as the training set for the next fit.
+
+    Drift is the mean absolute deviation from the identity of the sources'
+    second moment, averaged over roughly the last ``drift_seconds``: once
+    the mixing changes (electrode shift, new artifact sources) the sources
+    stop being white and uncorrelated.
+    """
+
+    def __init__(self, sampling_rate: int, min_samples: int,
+                 classify: Callable[[np.ndarray], List[int]],
+                 refit_interval: float = 1800.0, drift_threshold: float = 0.5,
+                 drift_seconds: float = 30.0, max_iter: int = 1000):
+        self.sampling_rate = sampling_rate
+        self.min_samples = min_samples
+        self.classify = classify
+        self.refit_interval = refit_interval
+        self.drift_threshold = drift_threshold
+        self.drift_samples = int(sampling_rate * drift_seconds)
+        self.max_iter = max_iter
+
+        self.model: Optional[ICAModel] = None
+        self._history: deque = deque()
+        self._history_samples = 0
+        self._history_channels: Tuple[str, ...] = ()
+        self._moment: Optional[np.ndarray] = None
+        self._moment_model: Optional[ICAModel] = None
+        self._moment_samples = 0
+        self._last_drift = 0.0
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.stats = {
+            "fits": 0,
+            "drift_refits": 0,
+            "scheduled_refits": 0,
+            "windows_cleaned": 0,
+            "last_fit_ms": 0.0,
+            "last_error": None
+        }
+
+    @property
+    def fitting(self) -> bool:
+        return self._worker is not None and self._worker.is_alive()
+
+    def model_for(self, channels: List[str]) -> Optional[ICAModel]:
+        model = self.model
+        return model if model is not None and model.channels == tuple(channels) else None
+
+    def fit(self, data_matrix: np.ndarray, channels: List[str],
+            n_components: Optional[int] = None) -> ICAModel:
+        """Fit synchronously and install the model"""
+        start_time = time.perf_counter()
+        scaler = StandardScaler()
+        standardized = scaler.fit_transform(data_matrix.T)
+        if n_components is None:
+            n_components = min(len(channels), data_matrix.shape[1] // 100)
+        ica = FastICA(n_components=n_components, random_state=42, max_iter=self.max_iter)
+        sources = ica.fit_transform(standardized).T
+        model = ICAModel(channels, ica, scaler.mean_, scaler.scale_, self.classify(sources),
+                         data_matrix.shape[1])
+        self.model = model
+        self.stats["fits"] += 1
+        self.stats["last_fit_ms"] = (time.perf_counter() - start_time) * 1000
+        logger.info(f"ICA model fitted: {model.n_components} components, "
+                    f"{len(model.artifact_components)} artifact, {self.stats['last_fit_ms']:.0f} ms")
+        return model
+
+    def fit_async(self, data_matrix: np.ndarray, channels: List[str],
+                  n_components: Optional[int] = None) -> bool:
+        """Start a background fit unless one is already running"""
+        with self._lock:
+            if self.fitting:
+                return False
+
+            def run():
+                try:
+                    self.fit(data_matrix, channels, n_components)
+                except Exception as e:
+                    self.stats["last_error"] = str(e)
+                    logger.error(f"Background ICA fit failed: {e}")
+
+            self._worker = threading.Thread(target=run, name="ica-fit", daemon=True)
+            self._worker.start()
+            return True
+
+    def observe(self, data_matrix: np.ndarray, channels: List[str],
+                n_components: Optional[int] = None) -> None:
+        """Record a streamed window and start a (re)fit when one is due"""
+        channels = tuple(channels)
+        with self._lock:
+            if channels != self._history_channels:
+                self._history.clear()
+                self._history_samples = 0
+                self._history_channels = channels
+            self._history.append(data_matrix)
+            self._history_samples += data_matrix.shape[1]
+            while self._history_samples - self._history[0].shape[1] >= self.min_samples:
+                self._history_samples -= self._history.popleft().shape[1]
+            ready = self._history_samples >= self.min_samples
+
+        model = self.model_for(list(channels))
+        if model is not None:
+            if model is not self._moment_model:
+                self._moment, self._moment_model, self._moment_samples = None, model, 0
+            moment = model.source_moment(data_matrix)
+            weight = min(1.0, data_matrix.shape[1] / self.drift_samples)
+            self._moment = moment if self._moment is None else (1 - weight) * self._moment + weight * moment
+            self._moment_samples += data_matrix.shape[1]
+            self._last_drift = float(np.abs(self._moment - np.eye(len(moment))).mean())
+
+        if not ready or self.fitting:
+            return
+        if model is None:
+            reason = None
+        elif self._moment_samples >= self.drift_samples and self._last_drift > self.drift_threshold:
+            reason = "drift_refits"
+        elif model.age_seconds() >= self.refit_interval:
+            reason = "scheduled_refits"
+        else:
+            return
+        with self._lock:
+            training = np.concatenate(list(self._history), axis=1)[:, -self.min_samples:]
+        if self.fit_async(training, list(channels), n_components) and reason:
+            self.stats[reason] += 1
+
+    def buffered_samples(self, channels: List[str]) -> int:
+        return self._history_samples if tuple(channels) == self._history_channels else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        model = self.model
+        return {
+            **self.stats,
+            "trained": model is not None,
+            "fitting": self.fitting,
+            "channels": list(model.channels) if model else [],
+            "n_components": model.n_components if model else 0,
+            "artifact_components": model.artifact_components if model else [],
+            "model_age_seconds": model.age_seconds() if model else None,
+            "last_drift": self._last_drift
+        }
+
 
 class IndustrialEEGProcessor:
     """Industrial-grade real-time EEG signal processing and analysis"""
@@ -126,11 +515,11 @@ class IndustrialEEGProcessor:
             "kurtosis_threshold": 5.0,     # Dimensionless
             "frequency_ratio_threshold": 0.3  # Power ratio
         }
+        self.artifact_engine = ArtifactEngine(sampling_rate, self.artifact_thresholds, self.filter_order)
         
-        # ICA for artifact removal
-        self.ica_model = None
-        self.ica_trained = False
+        # ICA for artifact removal (fitted once per session, see StreamingICA)
         self.ica_buffer_required = int(sampling_rate * 60)  # 1 minute for ICA training
+        self.ica = StreamingICA(sampling_rate, self.ica_buffer_required, self._classify_ica_components)
         
         # Performance monitoring
         self.processing_stats = {
@@ -162,9 +551,9 @@ class IndustrialEEGProcessor:
         
         with self.processing_lock:
             self.active_channels.add(channel)
-            self.signal_buffers[channel] = deque(maxlen=self.buffer_size)
+            self.signal_buffers[channel] = SampleRing(self.buffer_size)
             self.quality_buffers[channel] = deque(maxlen=100)  # Quality metrics
-            self.timestamp_buffers[channel] = deque(maxlen=self.buffer_size)
+            self.timestamp_buffers[channel] = SampleRing(self.buffer_size)
             
         logger.info(f"Channel {channel} registered. Active channels: {len(self.active_channels)}")
         return True
@@ -207,7 +596,7 @@ class IndustrialEEGProcessor:
             
             # Real-time quality assessment
             if len(self.signal_buffers[channel]) >= 10:
-                recent_samples = list(self.signal_buffers[channel])[-10:]
+                recent_samples = self.signal_buffers[channel].view()[-10:].copy()
                 quality_score = self._calculate_signal_quality(recent_samples)
                 self.quality_buffers[channel].append(quality_score)
         
@@ -244,6 +633,47 @@ class IndustrialEEGProcessor:
                 
         return successful_adds
     
+    def add_sample_block(self, channels: List[str], block: np.ndarray,
+                         start_timestamp: Optional[float] = None,
+                         sample_rate: Optional[float] = None) -> Dict[str, int]:
+        """
+        Add a (channels x samples) block in one step (binary device streams).
+        Samples are copied into each channel's ``SampleRing`` as arrays; non-finite
+        samples are dropped like in ``add_sample``, and quality scores are
+        computed for consecutive 10-sample windows in one vectorized pass.
+        Returns the number of samples accepted per channel.
+        """
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim != 2 or block.shape[0] != len(channels):
+            raise ValueError("block must be shaped (channels, samples)")
+        if start_timestamp is None:
+            start_timestamp = time.time()
+        rate = sample_rate or self.sampling_rate
+        timestamps = start_timestamp + np.arange(block.shape[1]) / rate
+        
+        accepted = {}
+        with self.processing_lock:
+            for channel, row in zip(channels, block):
+                if channel not in self.active_channels:
+                    accepted[channel] = 0
+                    continue
+                row_timestamps = timestamps
+                finite = np.isfinite(row)
+                if not finite.all():
+                    row, row_timestamps = row[finite], timestamps[finite]
+                self.signal_buffers[channel].extend(row)
+                self.timestamp_buffers[channel].extend(row_timestamps)
+                accepted[channel] = len(row)
+                
+                # Quality of the last complete 10-sample windows
+                n_windows = min(len(row) // 10, self.quality_buffers[channel].maxlen or 100)
+                if n_windows:
+                    segments = row[len(row) - n_windows * 10:].reshape(n_windows, 10)
+                    self.quality_buffers[channel].extend(self._calculate_block_quality(segments).tolist())
+            self.processing_stats["samples_processed"] += sum(accepted.values())
+        
+        return accepted
+    
     def get_channel_data(self, channel: str, duration_seconds: float = 2.0, 
                         apply_filters: bool = True) -> Dict[str, Union[np.ndarray, List[float]]]:
         """Get recent data from specific channel with metadata"""
@@ -260,11 +690,11 @@ class IndustrialEEGProcessor:
         
         with self.processing_lock:
             # Get raw data
-            raw_data = list(self.signal_buffers[channel])[-num_samples:]
-            timestamps = list(self.timestamp_buffers[channel])[-num_samples:]
+            raw_data = self.signal_buffers[channel].view()[-num_samples:].copy()
+            timestamps = self.timestamp_buffers[channel].view()[-num_samples:].tolist()
             quality_scores = list(self.quality_buffers[channel])[-min(len(self.quality_buffers[channel]), num_samples//10):]
         
-        if not raw_data:
+        if len(raw_data) == 0:
             return {
                 "data": np.array([]),
                 "timestamps": [],
@@ -273,7 +703,7 @@ class IndustrialEEGProcessor:
                 "duration": 0.0
             }
         
-        data_array = np.array(raw_data)
+        data_array = raw_data
         
         # Apply industrial-grade filtering if requested
         if apply_filters and len(data_array) > self.filter_order * 3:
@@ -426,6 +856,18 @@ class IndustrialEEGProcessor:
         
         return float(np.clip(quality_score, 0.0, 1.0))
     
+    def _calculate_block_quality(self, segments: np.ndarray) -> np.ndarray:
+        """``_calculate_signal_quality`` for each row of a (windows x samples) array"""
+        amplitude_stability = 1.0 / (1.0 + segments.std(axis=1) / 50.0)
+        gradient_stability = 1.0 / (1.0 + np.diff(segments, axis=1).std(axis=1) / 20.0)
+        finite_ratio = np.isfinite(segments).mean(axis=1)
+        max_amplitude = np.abs(segments).max(axis=1)
+        amplitude_reasonableness = np.where(
+            max_amplitude < 200.0, 1.0, np.maximum(0.1, 200.0 / np.maximum(max_amplitude, 1e-12))
+        )
+        quality = (amplitude_stability + gradient_stability + finite_ratio + amplitude_reasonableness) / 4
+        return np.clip(quality, 0.0, 1.0)
+    
     def _synchronize_channel_data(self, channel_data: Dict[str, Dict]) -> Dict[str, Dict]:
         """Synchronize timestamps across multiple channels"""
         if len(channel_data) < 2:
@@ -662,156 +1104,188 @@ class IndustrialEEGProcessor:
         if len(data) == 0:
             return self._empty_artifact_report()
         
-        artifacts = {
-            "high_amplitude": False,
-            "flat_line": False,
-            "high_frequency_noise": False,
-            "eye_blink": False,
-            "muscle_artifact": False,
-            "electrode_pop": False,
-            "drift": False,
-            "saturation": False
-        }
-        
-        artifact_scores = {}
-        artifact_details = {}
-        
         try:
-            # 1. Amplitude-based artifacts
-            max_amplitude = np.max(np.abs(data))
-            amplitude_threshold = self.artifact_thresholds["amplitude_threshold"]
-            
-            if max_amplitude > amplitude_threshold:
-                artifacts["high_amplitude"] = True
-                artifact_scores["high_amplitude"] = float(max_amplitude / amplitude_threshold)
-                artifact_details["high_amplitude"] = {
-                    "max_amplitude": float(max_amplitude),
-                    "threshold": amplitude_threshold,
-                    "samples_above_threshold": int(np.sum(np.abs(data) > amplitude_threshold))
-                }
-            
-            # 2. Flat line detection (electrode disconnection)
-            data_std = np.std(data)
-            if data_std < 1.0:
-                artifacts["flat_line"] = True
-                artifact_scores["flat_line"] = float(1.0 / max(data_std, 0.001))
-                artifact_details["flat_line"] = {
-                    "std_deviation": float(data_std),
-                    "threshold": 1.0
-                }
-            
-            # 3. High frequency noise (EMG, electrical interference)
-            if len(data) > self.filter_order * 3:
-                high_freq_filtered = self._apply_bandpass_filter(data, 50.0, 100.0)
-                noise_std = np.std(high_freq_filtered)
-                
-                if noise_std > 10.0:
-                    artifacts["high_frequency_noise"] = True
-                    artifact_scores["high_frequency_noise"] = float(noise_std / 10.0)
-                    artifact_details["high_frequency_noise"] = {
-                        "noise_std": float(noise_std),
-                        "threshold": 10.0,
-                        "frequency_range": [50.0, 100.0]
-                    }
-            
-            # 4. Eye blink detection (low frequency, high amplitude)
-            if len(data) > self.sampling_rate:
-                low_freq_filtered = self._apply_bandpass_filter(data, 0.5, 4.0)
-                blink_candidates = np.abs(low_freq_filtered) > 50.0
-                
-                if np.sum(blink_candidates) > len(data) * 0.01:  # More than 1% of samples
-                    artifacts["eye_blink"] = True
-                    artifact_scores["eye_blink"] = float(np.sum(blink_candidates) / len(data))
-                    artifact_details["eye_blink"] = {
-                        "affected_samples": int(np.sum(blink_candidates)),
-                        "percentage": float(np.sum(blink_candidates) / len(data) * 100),
-                        "threshold": 50.0
-                    }
-            
-            # 5. Muscle artifact detection (high frequency, sustained)
-            if len(data) > self.sampling_rate:
-                emg_filtered = self._apply_bandpass_filter(data, 20.0, 45.0)
-                emg_power = np.mean(emg_filtered ** 2)
-                
-                if emg_power > 100.0:
-                    artifacts["muscle_artifact"] = True
-                    artifact_scores["muscle_artifact"] = float(emg_power / 100.0)
-                    artifact_details["muscle_artifact"] = {
-                        "emg_power": float(emg_power),
-                        "threshold": 100.0,
-                        "frequency_range": [20.0, 45.0]
-                    }
-            
-            # 6. Electrode pop detection (sudden amplitude changes)
-            if len(data) > 1:
-                gradients = np.abs(np.diff(data))
-                max_gradient = np.max(gradients)
-                gradient_threshold = self.artifact_thresholds["gradient_threshold"]
-                
-                if max_gradient > gradient_threshold:
-                    artifacts["electrode_pop"] = True
-                    artifact_scores["electrode_pop"] = float(max_gradient / gradient_threshold)
-                    artifact_details["electrode_pop"] = {
-                        "max_gradient": float(max_gradient),
-                        "threshold": gradient_threshold,
-                        "sharp_transitions": int(np.sum(gradients > gradient_threshold))
-                    }
-            
-            # 7. Drift detection (low frequency trend)
-            if len(data) > self.sampling_rate * 2:
-                detrended = signal.detrend(data, type='linear')
-                trend_strength = np.std(data) / max(np.std(detrended), 0.001)
-                
-                if trend_strength > 2.0:
-                    artifacts["drift"] = True
-                    artifact_scores["drift"] = float(trend_strength / 2.0)
-                    artifact_details["drift"] = {
-                        "trend_strength": float(trend_strength),
-                        "threshold": 2.0
-                    }
-            
-            # 8. Saturation detection (clipping)
-            amplitude_range = np.max(data) - np.min(data)
-            unique_values = len(np.unique(data))
-            
-            if amplitude_range > 400.0 and unique_values < len(data) * 0.8:
-                artifacts["saturation"] = True
-                artifact_scores["saturation"] = float(amplitude_range / 400.0)
-                artifact_details["saturation"] = {
-                    "amplitude_range": float(amplitude_range),
-                    "unique_values": unique_values,
-                    "total_samples": len(data)
-                }
-            
-            # Calculate overall artifact severity
-            artifact_count = sum(artifacts.values())
-            max_score = max(artifact_scores.values()) if artifact_scores else 0.0
+            mask, scores, stats = self.artifact_engine.evaluate(np.asarray(data)[None, :])
+            report = self._artifact_report(int(mask[0]), scores[0], stats, 0, channel, len(data))
             
             # Update processing stats
+            artifact_count = report["summary"]["total_artifacts"]
             if artifact_count > 0:
                 self.processing_stats["artifacts_detected"] += artifact_count
             
-            return {
-                "artifacts_detected": artifacts,
-                "artifact_scores": artifact_scores,
-                "artifact_details": artifact_details,
-                "summary": {
-                    "total_artifacts": artifact_count,
-                    "max_severity_score": float(max_score),
-                    "overall_quality": "poor" if artifact_count > 3 else "fair" if artifact_count > 1 else "good",
-                    "channel": channel,
-                    "data_length": len(data),
-                    "analysis_timestamp": datetime.now(timezone.utc).isoformat()
-                }
-            }
+            return report
             
         except Exception as e:
             logger.error(f"Artifact detection failed for channel {channel}: {e}")
             return self._empty_artifact_report()
     
+    def detect_artifacts_batch(self, data_matrix: np.ndarray,
+                               channels: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Artifact detection for a (channels x samples) matrix in one pass.
+        Returns a compact per-channel bitmask (bit order ``ARTIFACT_TYPES``)
+        and a channels x types score matrix.
+        """
+        start_time = time.perf_counter()
+        data_matrix = np.asarray(data_matrix, dtype=np.float64)
+        if data_matrix.ndim == 1:
+            data_matrix = data_matrix[None, :]
+        if channels is None:
+            channels = [f"ch{i}" for i in range(data_matrix.shape[0])]
+        elif len(channels) != data_matrix.shape[0]:
+            raise ValueError("channel count must match data rows")
+        
+        if data_matrix.shape[1] == 0:
+            mask = np.zeros(len(channels), dtype=np.uint8)
+            scores = np.zeros((len(channels), len(ARTIFACT_TYPES)))
+        else:
+            mask, scores, _ = self.artifact_engine.evaluate(data_matrix)
+        
+        flagged = np.unpackbits(mask[:, None], axis=1, bitorder='little')
+        artifact_count = int(flagged.sum())
+        if artifact_count > 0:
+            self.processing_stats["artifacts_detected"] += artifact_count
+        processing_time = (time.perf_counter() - start_time) * 1000
+        self.processing_stats["processing_time_ms"].append(processing_time)
+        
+        return {
+            "channels": list(channels),
+            "artifact_types": list(ARTIFACT_TYPES),
+            "bitmask": mask.tolist(),
+            "scores": np.round(scores, 4).tolist(),
+            "summary": {
+                "total_artifacts": artifact_count,
+                "channels_flagged": int(np.count_nonzero(mask)),
+                "artifacts_per_type": dict(zip(ARTIFACT_TYPES, flagged.sum(axis=0).tolist())),
+                "data_length": int(data_matrix.shape[1]),
+                "processing_time_ms": float(processing_time),
+                "analysis_timestamp": datetime.now(timezone.utc).isoformat()
+            }
+        }
+    
+    def _batch_artifact_reports(self, channel_data: Dict[str, np.ndarray]) -> Dict[str, Dict[str, Any]]:
+        """Per-channel artifact reports, one engine pass per distinct data length"""
+        by_length: Dict[int, List[str]] = {}
+        for channel, data in channel_data.items():
+            if len(data) > 0:
+                by_length.setdefault(len(data), []).append(channel)
+        
+        reports = {}
+        for length, channels in by_length.items():
+            try:
+                mask, scores, stats = self.artifact_engine.evaluate(
+                    np.stack([channel_data[channel] for channel in channels])
+                )
+            except Exception as e:
+                logger.error(f"Batch artifact detection failed: {e}")
+                continue
+            for row, channel in enumerate(channels):
+                reports[channel] = self._artifact_report(
+                    int(mask[row]), scores[row], stats, row, channel, length
+                )
+                self.processing_stats["artifacts_detected"] += reports[channel]["summary"]["total_artifacts"]
+        
+        for channel in channel_data:
+            reports.setdefault(channel, self._empty_artifact_report())
+        return reports
+    
+    def _artifact_report(self, mask: int, scores: np.ndarray, stats: Dict[str, np.ndarray],
+                         row: int, channel: str, data_length: int) -> Dict[str, Any]:
+        """Expand one engine row into the per-channel report format"""
+        thresholds = self.artifact_thresholds
+        engine = self.artifact_engine
+        details = {
+            "high_amplitude": lambda: {
+                "max_amplitude": float(stats["max_amplitude"][row]),
+                "threshold": thresholds["amplitude_threshold"],
+                "samples_above_threshold": int(stats["samples_above_threshold"][row])
+            },
+            "flat_line": lambda: {
+                "std_deviation": float(stats["std_deviation"][row]),
+                "threshold": engine.FLAT_STD
+            },
+            "high_frequency_noise": lambda: {
+                "noise_std": float(stats["noise_std"][row]),
+                "threshold": engine.NOISE_STD,
+                "frequency_range": list(engine.NOISE_BAND)
+            },
+            "eye_blink": lambda: {
+                "affected_samples": int(stats["blink_samples"][row]),
+                "percentage": float(stats["blink_samples"][row] / data_length * 100),
+                "threshold": engine.BLINK_AMPLITUDE
+            },
+            "muscle_artifact": lambda: {
+                "emg_power": float(stats["emg_power"][row]),
+                "threshold": engine.EMG_POWER,
+                "frequency_range": list(engine.EMG_BAND)
+            },
+            "electrode_pop": lambda: {
+                "max_gradient": float(stats["max_gradient"][row]),
+                "threshold": thresholds["gradient_threshold"],
+                "sharp_transitions": int(stats["sharp_transitions"][row])
+            },
+            "drift": lambda: {
+                "trend_strength": float(stats["trend_strength"][row]),
+                "threshold": engine.DRIFT_RATIO
+            },
+            "saturation": lambda: {
+                "amplitude_range": float(stats["amplitude_range"][row]),
+                "unique_values": int(stats["unique_values"][row]),
+                "total_samples": data_length
+            }
+        }
+        
+        artifacts = {name: bool(mask & ARTIFACT_BITS[name]) for name in ARTIFACT_TYPES}
+        artifact_scores = {
+            name: float(scores[i]) for i, name in enumerate(ARTIFACT_TYPES) if artifacts[name]
+        }
+        artifact_details = {name: details[name]() for name in ARTIFACT_TYPES if artifacts[name]}
+        
+        # Calculate overall artifact severity
+        artifact_count = sum(artifacts.values())
+        max_score = max(artifact_scores.values()) if artifact_scores else 0.0
+        
+        return {
+            "artifacts_detected": artifacts,
+            "artifact_scores": artifact_scores,
+            "artifact_details": artifact_details,
+            "summary": {
+                "total_artifacts": artifact_count,
+                "max_severity_score": float(max_score),
+                "overall_quality": "poor" if artifact_count > 3 else "fair" if artifact_count > 1 else "good",
+                "channel": channel,
+                "data_length": data_length,
+                "analysis_timestamp": datetime.now(timezone.utc).isoformat()
+            }
+        }
+    
+    @property
+    def ica_model(self) -> Optional[ICAModel]:
+        return self.ica.model
+    
+    @property
+    def ica_trained(self) -> bool:
+        return self.ica.model is not None
+    
+    def _classify_ica_components(self, components: np.ndarray) -> List[int]:
+        """Indices of artifact components (high amplitude or high spectral centroid)"""
+        artifact = components.std(axis=1) > 2.0
+        if components.shape[1] > self.sampling_rate:
+            freqs, psd = signal.welch(components, fs=self.sampling_rate, axis=-1,
+                                      nperseg=min(components.shape[1], self.sampling_rate * 2))
+            centroid = (psd * freqs).sum(axis=1) / np.maximum(psd.sum(axis=1), 1e-20)
+            artifact |= centroid > 25.0
+        return np.flatnonzero(artifact).tolist()
+    
     def apply_ica_artifact_removal(self, multi_channel_data: Dict[str, np.ndarray], 
                                   n_components: Optional[int] = None) -> Dict[str, Any]:
-        """Apply Independent Component Analysis for artifact removal"""
+        """
+        Remove artifact components with the session ICA model.
+        The model is fitted once (synchronously for a block of at least
+        ``ica_buffer_required`` samples, otherwise in the background once
+        enough streamed windows were seen) and then applied to every window
+        as a single matrix multiply until drift or the schedule triggers a refit.
+        """
         if not ICA_AVAILABLE:
             logger.warning("ICA not available - sklearn not installed")
             return {
@@ -832,54 +1306,35 @@ class IndustrialEEGProcessor:
             # Prepare data matrix (channels x samples)
             channel_names = list(multi_channel_data.keys())
             min_length = min(len(data) for data in multi_channel_data.values())
-            
-            if min_length < self.ica_buffer_required:
-                logger.warning(f"Insufficient data for ICA: {min_length} < {self.ica_buffer_required}")
-                return {
-                    "success": False,
-                    "message": f"Need at least {self.ica_buffer_required} samples for ICA",
-                    "cleaned_data": multi_channel_data
-                }
-            
-            # Create data matrix
             data_matrix = np.array([
                 multi_channel_data[channel][:min_length] 
                 for channel in channel_names
-            ])
-            
-            # Standardize data
-            scaler = StandardScaler()
-            standardized_data = scaler.fit_transform(data_matrix.T).T
-            
-            # Apply ICA
-            if n_components is None:
-                n_components = min(len(channel_names), data_matrix.shape[1] // 100)
+            ], dtype=np.float64)
             
-            ica = FastICA(n_components=n_components, random_state=42, max_iter=1000)
-            ica_components = ica.fit_transform(standardized_data.T).T
+            model = self.ica.model_for(channel_names)
+            if n_components is not None and model is not None and model.n_components != n_components:
+                model = None
+            if model is None and min_length >= self.ica_buffer_required and not self.ica.fitting:
+                model = self.ica.fit(data_matrix, channel_names, n_components)
             
-            # Identify artifact components (simple heuristic)
-            artifact_components = []
-            
-            for i, component in enumerate(ica_components):
-                # High amplitude components likely artifacts
-                if np.std(component) > 2.0:
-                    artifact_components.append(i)
-                
-                # High frequency components likely muscle artifacts
-                if len(component) > self.sampling_rate:
-                    freq_analysis = self.extract_advanced_frequency_analysis(component)
-                    if freq_analysis["spectral_features"]["spectral_centroid"] > 25.0:
-                        artifact_components.append(i)
-            
-            # Remove artifact components
-            cleaned_components = ica_components.copy()
-            for artifact_idx in artifact_components:
-                cleaned_components[artifact_idx] = 0
+            if model is None:
+                self.ica.observe(data_matrix, channel_names, n_components)
+                buffered = self.ica.buffered_samples(channel_names)
+                return {
+                    "success": False,
+                    "message": ("ICA model is being fitted" if self.ica.fitting else
+                                f"Need at least {self.ica_buffer_required} samples for ICA"),
+                    "cleaned_data": multi_channel_data,
+                    "ica_info": {
+                        "status": "fitting" if self.ica.fitting else "buffering",
+                        "buffered_samples": buffered,
+                        "required_samples": self.ica_buffer_required
+                    }
+                }
             
-            # Reconstruct cleaned data
-            cleaned_standardized = ica.inverse_transform(cleaned_components.T).T
-            cleaned_data_matrix = scaler.inverse_transform(cleaned_standardized.T).T
+            cleaned_data_matrix = model.apply(data_matrix)
+            self.ica.observe(data_matrix, channel_names, n_components)
+            self.ica.stats["windows_cleaned"] += 1
             
             # Convert back to channel dictionary
             cleaned_data = {}
@@ -887,16 +1342,19 @@ class IndustrialEEGProcessor:
                 cleaned_data[channel] = cleaned_data_matrix[i]
             
             # Update processing stats
-            self.processing_stats["ica_components_removed"] += len(artifact_components)
+            self.processing_stats["ica_components_removed"] += len(model.artifact_components)
             
             return {
                 "success": True,
                 "cleaned_data": cleaned_data,
                 "ica_info": {
-                    "n_components": n_components,
-                    "artifact_components_removed": artifact_components,
+                    "n_components": model.n_components,
+                    "artifact_components_removed": model.artifact_components,
                     "channels_processed": channel_names,
                     "data_length": min_length,
+                    "model_fit_samples": model.n_samples,
+                    "model_age_seconds": model.age_seconds(),
+                    "refit_in_progress": self.ica.fitting,
                     "processing_timestamp": datetime.now(timezone.utc).isoformat()
                 }
             }
@@ -945,16 +1403,24 @@ class IndustrialEEGProcessor:
         total_quality_scores = []
         total_artifacts = 0
         
+        channel_infos = {
+            channel: self.get_channel_data(channel, 4.0, apply_filters=False)
+            for channel in self.active_channels
+        }
+        artifact_reports = self._batch_artifact_reports(
+            {channel: info["data"] for channel, info in channel_infos.items()}
+        )
+        
         for channel in self.active_channels:
-            channel_data_info = self.get_channel_data(channel, 4.0, apply_filters=False)
+            channel_data_info = channel_infos[channel]
             data = channel_data_info["data"]
             
             if len(data) > 0:
                 # Frequency analysis
                 freq_analysis = self.extract_advanced_frequency_analysis(data)
                 
-                # Artifact detection
-                artifact_analysis = self.detect_advanced_artifacts(data, channel)
+                # Artifact detection (computed for all channels in one batch)
+                artifact_analysis = artifact_reports[channel]
                 
                 # Signal quality assessment
                 quality_scores = channel_data_info.get("quality_scores", [])
@@ -1053,6 +1519,7 @@ class IndustrialEEGProcessor:
                     "ica_available": ICA_AVAILABLE,
                     "advanced_windows_available": ADVANCED_WINDOWS_AVAILABLE
                 },
+                "ica_model": self.ica.get_stats(),
                 "channel_management": {
                     "total_channels_available": len(self.available_channels),
                     "active_channels": len(self.active_channels),
@@ -1146,7 +1613,7 @@ class IndustrialEEGProcessor:
         active_count = 0
         
         for channel in self.active_channels:
-            timestamps = list(self.timestamp_buffers[channel])
+            timestamps = self.timestamp_buffers[channel].view().copy()
             if len(timestamps) > 1:
                 duration = timestamps[-1] - timestamps[0]
                 if duration > 0:
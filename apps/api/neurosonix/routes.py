@@ -3,7 +3,7 @@ Clisonix API Routes
 Real EEG processing and brain-to-audio conversion endpoints
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, WebSocket
 from typing import Dict, List, Optional
 import asyncio
 from datetime import datetime
@@ -12,8 +12,11 @@ from datetime import datetime
 from .eeg_processor import EEGProcessor
 from .brain_analyzer import BrainWaveAnalyzer
 from .audio_synthesizer import AudioSynthesizer
+from .eeg_ingest import serve_ingest
 
 router = APIRouter(prefix="/api/Clisonix", tags=["Clisonix EEG Processing"])
+# Device ingest only, so the API can mount it (behind its API-key check) without the rest
+eeg_stream_router = APIRouter(prefix="/api/Clisonix", tags=["Clisonix EEG Ingest"])
 
 # Initialize real processing modules
 eeg_processor = EEGProcessor(sampling_rate=256)
@@ -71,6 +74,12 @@ async def add_multi_channel_sample(samples: Dict[str, float]):
         raise HTTPException(status_code=500, detail=f"Multi-sample error: {str(e)}")
 
 
+@eeg_stream_router.websocket("/eeg/stream")
+async def eeg_binary_stream(websocket: WebSocket):
+    """Binary framed EEG ingest for live devices (frame layout in eeg_ingest)"""
+    await serve_ingest(websocket, eeg_processor)
+
+
 @router.get("/brain/analysis")
 async def get_brain_analysis():
     """Get comprehensive brain wave analysis"""
@@ -191,33 +200,26 @@ async def stream_neuroacoustic_audio():
     """Real-time neuroacoustic audio streaming from live EEG"""
     try:
         from fastapi.responses import StreamingResponse
-        import io
-        import numpy as np
         
         def generate_real_audio_stream():
             """Generate real-time audio based on current brain state"""
-            while True:
-                try:
-                    # Get current brain analysis
-                    brain_analysis = brain_analyzer.get_brain_analysis_summary()
-                    
-                    # Generate audio chunk based on brain state
-                    audio_chunk = audio_synthesizer.generate_brain_tone(
-                        brain_analysis["cognitive_state"]["dominant_frequency"], 
-                        duration=0.1  # 100ms chunks
-                    )
-                    
-                    # Convert to WAV format bytes
-                    audio_bytes = (audio_chunk * 32767).astype(np.int16).tobytes()
+            import time
+            block_seconds = 0.1  # 100ms chunks
+            blocks = audio_synthesizer.iter_pcm_blocks(
+                brain_analyzer.get_brain_analysis_summary,
+                block_size=int(audio_synthesizer.sample_rate * block_seconds)
+            )
+            start = time.perf_counter()
+            try:
+                for index, audio_bytes in enumerate(blocks):
                     yield audio_bytes
                     
-                    # Delay for real-time streaming
-                    import time
-                    time.sleep(0.1)
-                    
-                except Exception as stream_error:
-                    print(f"Stream error: {stream_error}")
-                    break
+                    # Pace to real time (the oscillator bank keeps phase between blocks)
+                    delay = start + (index + 1) * block_seconds - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+            except Exception as stream_error:
+                print(f"Stream error: {stream_error}")
         
         return StreamingResponse(
             generate_real_audio_stream(),
@@ -67,6 +67,61 @@ class NeuralPattern:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+class SpectralPlan:
+    """
+    📐 Spektri i përbashkët i një thirrjeje të process_eeg_signal
+    Një rfft e vetme mbi matricën samples x channels. Maskat dhe fuqitë e brezave
+    ruhen në cache, kështu që çdo hap i analizës i ripërdor pa rillogaritur FFT.
+    """
+
+    def __init__(self, data: np.ndarray, sampling_rate: float, welch_nperseg: int = 256):
+        self.data = data
+        self.sampling_rate = sampling_rate
+        self.welch_nperseg = welch_nperseg
+        half = data.shape[0] // 2
+        # Të njëjtat bin-e si fft.fft(...)[:n//2] - vetëm frekuencat pozitive
+        self.frequencies = fft.rfftfreq(data.shape[0], 1 / sampling_rate)[:half]
+        self.power = np.abs(fft.rfft(data, axis=0)[:half]) ** 2  # (bins, channels)
+        self._masks: Dict[Tuple[float, float], np.ndarray] = {}
+        self._band_power: Dict[Tuple[float, float], np.ndarray] = {}
+        self._welch: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def band_mask(self, low: float, high: float) -> np.ndarray:
+        mask = self._masks.get((low, high))
+        if mask is None:
+            mask = self._masks[(low, high)] = (self.frequencies >= low) & (self.frequencies <= high)
+        return mask
+
+    def band_power(self, low: float, high: float) -> np.ndarray:
+        """Fuqia totale e brezit low-high për çdo kanal"""
+        power = self._band_power.get((low, high))
+        if power is None:
+            power = self._band_power[(low, high)] = self.power[self.band_mask(low, high)].sum(axis=0)
+        return power
+
+    def _welch_spectra(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Spektrat e segmenteve Welch (hann, 50% overlap), si scipy.signal.csd"""
+        if self._welch is None:
+            nperseg = min(self.welch_nperseg, self.data.shape[0])
+            step = nperseg - nperseg // 2
+            segments = np.lib.stride_tricks.sliding_window_view(self.data, nperseg, axis=0)[::step]
+            segments = segments - segments.mean(axis=-1, keepdims=True)
+            window = scipy.signal.get_window('hann', nperseg)
+            spectra = fft.rfft(segments * window, axis=-1)  # (segments, channels, freqs)
+            self._welch = (fft.rfftfreq(nperseg, 1 / self.sampling_rate), spectra)
+        return self._welch
+
+    def coherence(self, low: float, high: float, channels: int) -> np.ndarray:
+        """Coherence mesatare në brezin low-high për çdo çift nga `channels` kanalet e para"""
+        freqs, spectra = self._welch_spectra()
+        segments = spectra[:, :channels, (freqs >= low) & (freqs <= high)]
+        cross = np.einsum('sif,sjf->fij', segments.conj(), segments) / segments.shape[0]
+        auto = cross.real[:, np.arange(channels), np.arange(channels)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            coherence = np.abs(cross) ** 2 / (auto[:, :, None] * auto[:, None, :])
+        return coherence.mean(axis=0)
+
+
 class ALBINeuralProcessor:
     """
     🧠 Procesori neural i ALBI - specializimi në EEG dhe brain signals
@@ -115,13 +170,15 @@ class ALBINeuralProcessor:
         
         return channels
     
-    async def process_eeg_signal(self, raw_data: np.ndarray, channel_names: List[str] = None) -> Dict[str, Any]:
+    async def process_eeg_signal(self, raw_data: np.ndarray, channel_names: List[str] = None,
+                                 compact: bool = False) -> Dict[str, Any]:
         """
         🔬 Procesimi kryesor i sinjaleve EEG
         
         Args:
             raw_data: Të dhënat e papërpunuara EEG (samples x channels)
             channel_names: Emrat e kanaleve (opsionale)
+            compact: Nëse True, përgjigja nuk përmban spektrat e plotë për kanal (channel_spectra)
             
         Returns:
             Dict me rezultatet e analizës
@@ -134,14 +191,17 @@ class ALBINeuralProcessor:
         # HAPI 1: Pastrimi i sinjalit
         cleaned_data = await self._preprocess_signal(raw_data)
         
+        # Një spektër i vetëm për të gjithë hapat e mëposhtëm
+        plan = SpectralPlan(cleaned_data, self.sampling_rate)
+        
         # HAPI 2: Analiza e frekuencave
-        frequency_analysis = await self._frequency_analysis(cleaned_data, channel_names)
+        frequency_analysis = await self._frequency_analysis(cleaned_data, channel_names, plan, compact)
         
         # HAPI 3: Identifikimi i pattern-eve
-        pattern_detection = await self._detect_neural_patterns(cleaned_data, channel_names)
+        pattern_detection = await self._detect_neural_patterns(cleaned_data, channel_names, plan)
         
         # HAPI 4: Analiza e coherence-s
-        coherence_analysis = await self._coherence_analysis(cleaned_data, channel_names)
+        coherence_analysis = await self._coherence_analysis(cleaned_data, channel_names, plan)
         
         # HAPI 5: Interpretimi i gjendjes së trurit
         brain_state = await self._interpret_brain_state(frequency_analysis, pattern_detection)
@@ -180,10 +240,8 @@ class ALBINeuralProcessor:
         # Dizajno filtrin
         b, a = scipy.signal.butter(4, [low, high], btype='band')
         
-        # Apliko filtrin në secilin kanal
-        filtered_data = np.zeros_like(raw_data)
-        for i in range(raw_data.shape[1]):
-            filtered_data[:, i] = scipy.signal.filtfilt(b, a, raw_data[:, i])
+        # Apliko filtrin në të gjithë kanalet njëherësh
+        filtered_data = scipy.signal.filtfilt(b, a, raw_data, axis=0)
         
         # Hiq artifacts (outliers)
         cleaned_data = self._remove_artifacts(filtered_data)
@@ -192,85 +250,56 @@ class ALBINeuralProcessor:
     
     def _remove_artifacts(self, data: np.ndarray) -> np.ndarray:
         """🚫 Heq artifacts dhe outliers"""
-        cleaned = data.copy()
-        
-        for i in range(data.shape[1]):
-            channel_data = data[:, i]
-            
-            # Identifiko outliers (> 3 standard deviations)
-            mean_val = np.mean(channel_data)
-            std_val = np.std(channel_data)
-            outlier_threshold = 3 * std_val
-            
-            # Zëvendëso outliers me median
-            outlier_mask = np.abs(channel_data - mean_val) > outlier_threshold
-            if np.any(outlier_mask):
-                median_val = np.median(channel_data)
-                cleaned[outlier_mask, i] = median_val
+        # Identifiko outliers (> 3 standard deviations) për çdo kanal
+        outlier_mask = np.abs(data - data.mean(axis=0)) > 3 * data.std(axis=0)
+        if not np.any(outlier_mask):
+            return data.copy()
         
-        return cleaned
+        # Zëvendëso outliers me median e kanalit
+        return np.where(outlier_mask, np.median(data, axis=0), data)
     
-    async def _frequency_analysis(self, data: np.ndarray, channel_names: List[str]) -> Dict[str, Any]:
+    async def _frequency_analysis(self, data: np.ndarray, channel_names: List[str],
+                                  plan: Optional[SpectralPlan] = None, compact: bool = False) -> Dict[str, Any]:
         """📊 Analiza e spektrit të frekuencave"""
-        # FFT për secilin kanal
-        fft_results = {}
-        power_spectra = {}
-        
-        for i, channel in enumerate(channel_names):
-            if i >= data.shape[1]:
-                continue
-                
-            # FFT
-            fft_result = fft.fft(data[:, i])
-            freqs = fft.fftfreq(len(data[:, i]), 1/self.sampling_rate)
-            
-            # Power spectral density
-            power_spectrum = np.abs(fft_result) ** 2
-            
-            # Merr vetëm frekuencat pozitive
-            positive_freqs = freqs[:len(freqs)//2]
-            positive_power = power_spectrum[:len(power_spectrum)//2]
-            
-            fft_results[channel] = {
-                'frequencies': positive_freqs.tolist(),
-                'power': positive_power.tolist()
-            }
-            power_spectra[channel] = positive_power
+        plan = plan or SpectralPlan(data, self.sampling_rate)
+        named = list(channel_names[:data.shape[1]])
+        positive_freqs = plan.frequencies
+        power = plan.power[:, :len(named)]
         
         # Analizo brezat e frekuencave
         band_analysis = {}
         for band_name, (low_freq, high_freq) in self.frequency_bands.items():
-            band_power = {}
-            for channel in channel_names:
-                if channel in power_spectra:
-                    power = power_spectra[channel]
-                    freq_mask = (positive_freqs >= low_freq) & (positive_freqs <= high_freq)
-                    band_power[channel] = np.sum(power[freq_mask])
+            channel_power = plan.band_power(low_freq, high_freq)
+            band_power = {channel: float(channel_power[i]) for i, channel in enumerate(named)}
             
             band_analysis[band_name] = {
                 'frequency_range': f"{low_freq}-{high_freq} Hz",
                 'channel_power': band_power,
-                'average_power': np.mean(list(band_power.values())) if band_power else 0
+                'average_power': float(np.mean(list(band_power.values()))) if band_power else 0
             }
         
-        # Gjej frekuencën dominante
-        all_power = np.concatenate([power_spectra[ch] for ch in power_spectra.keys()])
-        all_freqs = np.tile(positive_freqs, len(power_spectra))
-        
-        dominant_idx = np.argmax(all_power)
-        dominant_frequency = all_freqs[dominant_idx] if len(all_freqs) > dominant_idx else 0
+        # Gjej frekuencën dominante (renditja kanal pas kanali, si më parë)
+        dominant_idx = np.argmax(power.T)
+        dominant_frequency = positive_freqs[dominant_idx % len(positive_freqs)]
         
         # Klasifiko llojin e valës së trurit
         brainwave_type = self._classify_brainwave(dominant_frequency)
         
-        return {
+        result = {
             'dominant_frequency': float(dominant_frequency),
-            'dominant_power': float(np.max(all_power)) if len(all_power) > 0 else 0,
+            'dominant_power': float(np.max(power)) if power.size > 0 else 0,
             'brainwave_type': brainwave_type.value,
             'frequency_bands': band_analysis,
-            'channel_spectra': fft_results,
-            'spectral_centroid': float(np.average(positive_freqs, weights=np.mean([power_spectra[ch] for ch in power_spectra.keys()], axis=0)))
+            'spectral_centroid': float(np.average(positive_freqs, weights=np.mean(power, axis=1)))
         }
+        if not compact:
+            # Spektri i plotë për kanal - frekuencat janë të njëjta për të gjithë
+            frequencies = positive_freqs.tolist()
+            result['channel_spectra'] = {
+                channel: {'frequencies': frequencies, 'power': power[:, i].tolist()}
+                for i, channel in enumerate(named)
+            }
+        return result
     
     def _classify_brainwave(self, frequency: float) -> BrainwaveType:
         """🧠 Klasifikon llojin e valës së trurit"""
@@ -285,7 +314,8 @@ class ALBINeuralProcessor:
         else:
             return BrainwaveType.GAMMA
     
-    async def _detect_neural_patterns(self, data: np.ndarray, channel_names: List[str]) -> Dict[str, Any]:
+    async def _detect_neural_patterns(self, data: np.ndarray, channel_names: List[str],
+                                      plan: Optional[SpectralPlan] = None) -> Dict[str, Any]:
         """🔍 Identifikon pattern-et neurale"""
         detected_patterns = []
         
@@ -300,7 +330,7 @@ class ALBINeuralProcessor:
             detected_patterns.append(erp_pattern)
         
         # Pattern 3: Cross-frequency coupling
-        coupling_pattern = await self._detect_cross_frequency_coupling(data, channel_names)
+        coupling_pattern = await self._detect_cross_frequency_coupling(data, channel_names, plan)
         if coupling_pattern['confidence'] > 0.5:
             detected_patterns.append(coupling_pattern)
         
@@ -327,15 +357,13 @@ class ALBINeuralProcessor:
         if data.shape[1] < 2:
             return {'pattern_id': 'sync_001', 'confidence': 0.0, 'pattern_type': 'synchronization'}
         
-        # Llogarit korrelacionin midis kanaleve
-        correlations = []
-        for i in range(data.shape[1]):
-            for j in range(i+1, data.shape[1]):
-                corr = np.corrcoef(data[:, i], data[:, j])[0, 1]
-                if not np.isnan(corr):
-                    correlations.append(abs(corr))
+        # Llogarit korrelacionin midis kanaleve (matrica e plotë njëherësh)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr_matrix = np.corrcoef(data, rowvar=False)
+        correlations = np.abs(corr_matrix[np.triu_indices(data.shape[1], k=1)])
+        correlations = correlations[~np.isnan(correlations)]
         
-        avg_correlation = np.mean(correlations) if correlations else 0
+        avg_correlation = np.mean(correlations) if correlations.size else 0
         
         return {
             'pattern_id': f'sync_{datetime.now().strftime("%Y%m%d_%H%M%S")}',
@@ -376,28 +404,19 @@ class ALBINeuralProcessor:
             }
         }
     
-    async def _detect_cross_frequency_coupling(self, data: np.ndarray, channels: List[str]) -> Dict[str, Any]:
+    async def _detect_cross_frequency_coupling(self, data: np.ndarray, channels: List[str],
+                                               plan: Optional[SpectralPlan] = None) -> Dict[str, Any]:
         """🌊 Detekton Cross-Frequency Coupling"""
         # Simplified cross-frequency coupling detection
+        plan = plan or SpectralPlan(data, self.sampling_rate)
         
-        coupling_scores = []
-        for i in range(data.shape[1]):
-            channel_data = data[:, i]
-            
-            # Nxjerr fuqinë e frekuencave të ndryshme
-            freqs = fft.fftfreq(len(channel_data), 1/self.sampling_rate)
-            fft_result = fft.fft(channel_data)
-            power_spectrum = np.abs(fft_result) ** 2
-            
-            # Kontrollo coupling midis brezave të ndryshëm
-            alpha_power = np.sum(power_spectrum[(freqs >= 8) & (freqs <= 12)])
-            gamma_power = np.sum(power_spectrum[(freqs >= 30) & (freqs <= 50)])
-            
-            if alpha_power > 0:
-                coupling_ratio = gamma_power / alpha_power
-                coupling_scores.append(coupling_ratio)
+        # Kontrollo coupling midis brezave alpha dhe gamma për çdo kanal
+        alpha_power = plan.band_power(8, 12)
+        gamma_power = plan.band_power(30, 50)
+        active = alpha_power > 0
+        coupling_scores = gamma_power[active] / alpha_power[active]
         
-        avg_coupling = np.mean(coupling_scores) if coupling_scores else 0
+        avg_coupling = np.mean(coupling_scores) if coupling_scores.size else 0
         confidence = min(avg_coupling / 0.5, 1.0)  # Normalize
         
         return {
@@ -412,19 +431,15 @@ class ALBINeuralProcessor:
             }
         }
     
-    async def _coherence_analysis(self, data: np.ndarray, channels: List[str]) -> Dict[str, Any]:
+    async def _coherence_analysis(self, data: np.ndarray, channels: List[str],
+                                  plan: Optional[SpectralPlan] = None) -> Dict[str, Any]:
         """🌊 Analiza e coherence-s midis kanaleve"""
+        plan = plan or SpectralPlan(data, self.sampling_rate)
         coherence_matrix = np.zeros((len(channels), len(channels)))
         
-        for i in range(len(channels)):
-            for j in range(len(channels)):
-                if i < data.shape[1] and j < data.shape[1]:
-                    # Llogarit coherence midis kanaleve
-                    f, Cxy = scipy.signal.coherence(data[:, i], data[:, j], 
-                                                  fs=self.sampling_rate, nperseg=256)
-                    # Merr coherence mesataren në brezin 1-50 Hz
-                    freq_mask = (f >= 1) & (f <= 50)
-                    coherence_matrix[i, j] = np.mean(Cxy[freq_mask])
+        # Coherence mesatare në brezin 1-50 Hz, nga spektrat Welch të përbashkët
+        analyzed = min(len(channels), data.shape[1])
+        coherence_matrix[:analyzed, :analyzed] = plan.coherence(1, 50, analyzed)
         
         # Statistika të coherence
         avg_coherence = np.mean(coherence_matrix[np.triu_indices_from(coherence_matrix, k=1)])
@@ -14,6 +14,7 @@ import asyncio
 import logging
 import time
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status, Depends, BackgroundTasks
@@ -23,6 +24,14 @@ from pydantic import BaseModel
 from . import file_validator, FileValidationError
 from .storage import storage_system, StorageError
 
+# Tile pyramid (numpy/scipy)
+try:
+    from .tiles import TILE_FORMATS, TilePyramid, build_tile_pyramid, tiles_path
+    TILES_AVAILABLE = True
+except ImportError:
+    TILES_AVAILABLE = False
+    TILE_FORMATS = set()
+
 logger = logging.getLogger(__name__)
 
 # Create router
@@ -459,6 +468,84 @@ async def download_file(
             detail="Failed to download file"
         )
 
+async def _load_tile_pyramid(file_id: str, current_user: dict) -> "TilePyramid":
+    """Tile pyramid of a stored EEG file, after the usual permission check"""
+    if not TILES_AVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Tile pyramid support (numpy, scipy) not installed"
+        )
+    
+    try:
+        metadata = await storage_system.get_file_metadata(file_id)
+    except StorageError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+    
+    # Check user permission
+    if metadata['user_id'] != current_user['user_id']:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this file"
+        )
+    
+    path = tiles_path(Path(metadata['storage_path']))
+    if not path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tiles not available for this file (unsupported format or still processing)"
+        )
+    return TilePyramid(path)
+
+@router.get("/files/{file_id}/tiles")
+async def get_tile_info(
+    file_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Describe the band-power / envelope tile pyramid of an EEG file"""
+    
+    pyramid = await _load_tile_pyramid(file_id, current_user)
+    return {"file_id": file_id, **pyramid.info()}
+
+@router.get("/files/{file_id}/tiles/query")
+async def query_tiles(
+    file_id: str,
+    start: float = 0.0,
+    end: Optional[float] = None,
+    pixels: int = 1000,
+    channels: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Envelope and band power of an EEG file for one view of the dashboard
+    
+    Args:
+        start: Window start in seconds
+        end: Window end in seconds (default: end of recording)
+        pixels: Number of columns the client will draw (max 10000)
+        channels: Comma-separated channel names (default: all)
+    """
+    
+    query_id = f"TILES_{int(time.time())}"
+    pixels = max(1, min(pixels, 10000))
+    pyramid = await _load_tile_pyramid(file_id, current_user)
+    
+    try:
+        picks = [name.strip() for name in channels.split(',')] if channels else None
+        result = await asyncio.to_thread(pyramid.query, start, end, pixels, picks)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    logger.info(f"Tile query served: {file_id} level {result['level']}, {result['bins_read']} bins",
+               extra={'correlation_id': query_id})
+    
+    return {"file_id": file_id, **result}
+
 @router.delete("/files/{file_id}")
 async def delete_file(
     file_id: str,
@@ -565,14 +652,20 @@ async def process_eeg_file_background(file_id: str, metadata: Dict[str, Any]):
                extra={'correlation_id': process_id})
     
     try:
-        # TODO: Implement EEG-specific processing
+        file_metadata = await storage_system.get_file_metadata(file_id)
+        source = Path(file_metadata['storage_path'])
+        
+        # Band-power / envelope tile pyramid for zoomable dashboard views
+        if TILES_AVAILABLE and source.suffix.lower() in TILE_FORMATS:
+            pyramid = await asyncio.to_thread(build_tile_pyramid, source)
+            logger.info(f"EEG tile pyramid built: {file_id} ({len(pyramid['levels'])} levels)",
+                       extra={'correlation_id': process_id})
+        
+        # TODO: Implement remaining EEG-specific processing
         # - Signal quality analysis
         # - Artifact detection
-        # - Frequency band extraction
         # - Metadata enhancement
         
-        await asyncio.sleep(1)  # Placeholder processing
-        
         logger.info(f"Background EEG processing completed: {file_id}",
                    extra={'correlation_id': process_id})
         
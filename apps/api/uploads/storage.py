@@ -190,6 +190,16 @@ class IndustrialStorageSystem:
         finally:
             self.storage_stats['active_sessions'] = max(0, self.storage_stats['active_sessions'] - 1)
     
+    async def get_file_metadata(self, file_id: str) -> Dict[str, Any]:
+        """Load stored metadata only (no file content, no access tracking)"""
+        metadata_path = self.config.local_storage_root / "metadata" / f"{file_id}.json"
+        
+        if not metadata_path.exists():
+            raise StorageError(f"File not found: {file_id}")
+        
+        async with aiofiles.open(metadata_path, 'r') as f:
+            return json.loads(await f.read())
+    
     async def retrieve_file(self, file_id: str, user_id: str = None) -> Dict[str, Any]:
         """Retrieve file with access tracking"""
         
@@ -349,6 +359,10 @@ class IndustrialStorageSystem:
             if local_path.exists():
                 local_path.unlink()
             
+            # Delete derived files stored next to it (e.g. <file>.tiles)
+            for derived in local_path.parent.glob(f"{local_path.name}.*"):
+                derived.unlink()
+            
             # Delete from S3 if available
             if self.s3_client and file_metadata.get('s3_url'):
                 try:
@@ -0,0 +1,254 @@
+"""
+Clisonix EEG Tile Pyramid
+Multi-resolution band-power and min/max envelope tiles for stored recordings
+Business: Ledjan Ahmati - WEB8euroweb GmbH
+
+Features:
+- Built once at upload time, streaming the recording chunk by chunk
+- Level 0 holds one bin per ``base_seconds``; every level above merges
+  ``factor`` bins (min of mins, max of maxes, mean band power)
+- Compact binary file next to the upload (``<stored file>.tiles``): a JSON
+  header followed by float32 rows laid out level by level
+- Queries pick the coarsest level that still resolves one pixel and read only
+  the rows covering the requested window, so browsing cost is O(pixels)
+"""
+
+import json
+import logging
+import math
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import fft
+from scipy.signal import get_window
+
+from ..edf_stream import EEG_BANDS, EDFReader
+
+logger = logging.getLogger(__name__)
+
+TILE_MAGIC = b"EEGTILE1"
+TILE_FORMATS = {'.edf', '.bdf'}
+TILE_VERSION = 1
+
+
+def tiles_path(source: Path) -> Path:
+    """Location of the tile pyramid for a stored recording"""
+    source = Path(source)
+    return source.with_name(source.name + ".tiles")
+
+
+class _BinReducer:
+    """Per-bin min/max and band power (periodogram) for blocks of samples"""
+
+    def __init__(self, sfreq: float, bands: Dict[str, Tuple[float, float]]):
+        self.sfreq = sfreq
+        self.bands = bands
+        self._plans: Dict[int, Tuple[np.ndarray, float, List[np.ndarray]]] = {}
+
+    def _plan(self, length: int):
+        plan = self._plans.get(length)
+        if plan is None:
+            window = get_window('hann', length)
+            freqs = fft.rfftfreq(length, 1.0 / self.sfreq)
+            masks = [(freqs >= low) & (freqs <= high) for low, high in self.bands.values()]
+            plan = self._plans[length] = (window, 1.0 / (self.sfreq * (window ** 2).sum()), masks)
+        return plan
+
+    def __call__(self, segments: np.ndarray) -> np.ndarray:
+        """(channels, bins, samples) -> (bins, channels, 2 + bands) float32"""
+        length = segments.shape[-1]
+        window, scale, masks = self._plan(length)
+        spectra = fft.rfft((segments - segments.mean(axis=-1, keepdims=True)) * window, axis=-1)
+        psd = (spectra.real ** 2 + spectra.imag ** 2) * scale
+        psd[..., 1:] *= 2  # one-sided
+        fields = [segments.min(axis=-1), segments.max(axis=-1)]
+        fields += [psd[..., mask].mean(axis=-1) if mask.any() else np.zeros(psd.shape[:2]) for mask in masks]
+        return np.stack(fields, axis=-1).transpose(1, 0, 2).astype(np.float32)
+
+
+def _merge(rows: np.ndarray) -> np.ndarray:
+    """(groups, members, channels, fields) -> (groups, channels, fields)"""
+    merged = rows.mean(axis=1)
+    merged[..., 0] = rows[..., 0].min(axis=1)
+    merged[..., 1] = rows[..., 1].max(axis=1)
+    return merged.astype(np.float32)
+
+
+def _merge_columns(rows: np.ndarray, group: int) -> np.ndarray:
+    """Merge consecutive runs of ``group`` rows (the last run may be shorter)"""
+    if group <= 1:
+        return rows
+    starts = np.arange(0, rows.shape[0], group)
+    counts = np.diff(np.append(starts, rows.shape[0]))[:, None, None]
+    merged = np.add.reduceat(rows, starts, axis=0) / counts
+    merged[..., 0] = np.minimum.reduceat(rows[..., 0], starts, axis=0)
+    merged[..., 1] = np.maximum.reduceat(rows[..., 1], starts, axis=0)
+    return merged
+
+
+def build_tile_pyramid(
+    source: Path,
+    target: Optional[Path] = None,
+    base_seconds: float = 1.0,
+    factor: int = 4,
+    top_bins: int = 256,
+    chunk_seconds: float = 60.0,
+    bands: Dict[str, Tuple[float, float]] = EEG_BANDS,
+) -> Dict[str, Any]:
+    """
+    Stream an EDF/BDF recording into a tile pyramid file and return its header.
+    Memory stays O(chunk x channels): level 0 rows are written as soon as a
+    chunk is reduced and only the unmerged remainder of each level is kept.
+    """
+    reader = EDFReader(source)
+    target = Path(target) if target else tiles_path(source)
+    bin_samples = max(1, int(round(base_seconds * reader.sfreq)))
+    fields = ['min', 'max'] + list(bands)
+    row_bytes = reader.n_channels * len(fields) * 4
+
+    counts = [math.ceil(reader.n_times / bin_samples)]
+    while counts[-1] > top_bins:
+        counts.append(math.ceil(counts[-1] / factor))
+    header = {
+        'version': TILE_VERSION,
+        'source': Path(source).name,
+        'channels': reader.ch_names,
+        'sfreq': float(reader.sfreq),
+        'duration_seconds': float(reader.n_times / reader.sfreq),
+        'base_seconds': bin_samples / reader.sfreq,
+        'factor': factor,
+        'fields': fields,
+        'bands': {name: list(band) for name, band in bands.items()},
+        'levels': [],
+    }
+    header_size = len(TILE_MAGIC) + 4 + len(json.dumps(header)) + 256 * len(counts)  # room for level entries
+    offset = header_size
+    for level, n_bins in enumerate(counts):
+        header['levels'].append({
+            'level': level,
+            'bin_seconds': header['base_seconds'] * factor ** level,
+            'n_bins': n_bins,
+            'offset': offset,
+        })
+        offset += n_bins * row_bytes
+
+    reduce_bins = _BinReducer(reader.sfreq, bands)
+    cursors = [0] * len(counts)
+    pending: List[Optional[np.ndarray]] = [None] * len(counts)
+    tmp = target.with_name(target.name + '.tmp')
+
+    with open(tmp, 'wb') as out:
+        def push(level: int, rows: np.ndarray):
+            out.seek(header['levels'][level]['offset'] + cursors[level] * row_bytes)
+            out.write(rows.tobytes())
+            cursors[level] += rows.shape[0]
+            if level + 1 >= len(counts):
+                return
+            rows = rows if pending[level] is None else np.concatenate([pending[level], rows])
+            groups = rows.shape[0] // factor
+            pending[level] = rows[groups * factor:]
+            if groups:
+                push(level + 1, _merge(rows[:groups * factor].reshape(groups, factor, *rows.shape[1:])))
+
+        chunk_records = max(1, int(round(chunk_seconds / reader.record_duration)))
+        carry = np.empty((reader.n_channels, 0))
+        for chunk in reader.iter_chunks(chunk_records):
+            buf = np.concatenate([carry, chunk], axis=1) if carry.shape[1] else chunk
+            full = buf.shape[1] // bin_samples
+            if full:
+                push(0, reduce_bins(buf[:, :full * bin_samples].reshape(reader.n_channels, full, bin_samples)))
+            carry = buf[:, full * bin_samples:].copy()
+        if carry.shape[1]:
+            push(0, reduce_bins(carry[:, None, :]))
+        # fold the partial group left at each level into the level above
+        for level in range(len(counts) - 1):
+            rows, pending[level] = pending[level], None
+            if rows is not None and rows.shape[0]:
+                push(level + 1, _merge(rows[None]))
+
+        encoded = json.dumps(header).encode('utf-8')
+        if len(TILE_MAGIC) + 4 + len(encoded) > header_size:
+            raise ValueError("tile header does not fit its reserved space")
+        out.seek(0)
+        out.write(TILE_MAGIC + struct.pack('<I', len(encoded)) + encoded)
+    os.replace(tmp, target)
+    return header
+
+
+class TilePyramid:
+    """Read-only view of a ``.tiles`` file"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            if f.read(len(TILE_MAGIC)) != TILE_MAGIC:
+                raise ValueError(f"not a tile pyramid: {self.path.name}")
+            (length,) = struct.unpack('<I', f.read(4))
+            self.header = json.loads(f.read(length).decode('utf-8'))
+        self.channels: List[str] = self.header['channels']
+        self.fields: List[str] = self.header['fields']
+        self.levels: List[Dict[str, Any]] = self.header['levels']
+
+    def info(self) -> Dict[str, Any]:
+        return {key: value for key, value in self.header.items() if key != 'version'}
+
+    def _read_rows(self, level: Dict[str, Any], start: int, stop: int) -> np.ndarray:
+        shape = (len(self.channels), len(self.fields))
+        with open(self.path, 'rb') as f:
+            f.seek(level['offset'] + start * shape[0] * shape[1] * 4)
+            rows = np.fromfile(f, dtype='<f4', count=(stop - start) * shape[0] * shape[1])
+        return rows.reshape(-1, *shape)
+
+    def query(
+        self,
+        start: float = 0.0,
+        end: Optional[float] = None,
+        pixels: int = 1000,
+        channels: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        At most ``pixels`` columns of min/max envelope and band power for the
+        window ``start..end`` (seconds), from the coarsest level that still
+        has one bin per pixel.
+        """
+        duration = self.header['duration_seconds']
+        pixels = max(1, int(pixels))
+        start = min(max(0.0, float(start)), duration)
+        end = duration if end is None else min(max(start, float(end)), duration)
+        if channels:
+            unknown = [name for name in channels if name not in self.channels]
+            if unknown:
+                raise ValueError(f"unknown channels: {unknown}")
+            picks = [self.channels.index(name) for name in channels]
+        else:
+            picks = list(range(len(self.channels)))
+
+        per_pixel = (end - start) / pixels
+        level = self.levels[0]
+        for candidate in self.levels:
+            if candidate['bin_seconds'] <= per_pixel:
+                level = candidate
+        bin_seconds = level['bin_seconds']
+        first = min(int(start // bin_seconds), max(level['n_bins'] - 1, 0))
+        stop = min(level['n_bins'], max(first + 1, math.ceil(end / bin_seconds)))
+        rows = self._read_rows(level, first, stop)[:, picks].astype(np.float64)
+        group = math.ceil(rows.shape[0] / pixels)
+        columns = _merge_columns(rows, group)
+
+        return {
+            'level': level['level'],
+            'bin_seconds': bin_seconds,
+            'column_seconds': bin_seconds * group,
+            'start': first * bin_seconds,
+            'end': min(stop * bin_seconds, duration),
+            'bins_read': int(rows.shape[0]),
+            'channels': [self.channels[i] for i in picks],
+            'min': columns[..., 0].T.tolist(),
+            'max': columns[..., 1].T.tolist(),
+            'band_power': {
+                name: columns[..., 2 + i].T.tolist() for i, name in enumerate(self.fields[2:])
+            },
+        }
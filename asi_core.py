@@ -10,6 +10,7 @@ Përfshin:
 
 from __future__ import annotations
 import json, datetime, time, socket, platform, os
+from collections import deque
 from typing import Dict, Any
 
 from asi_realtime_engine import ASIRealtimeEngine
@@ -24,6 +25,11 @@ try:
 except ImportError:
     psutil = None
 
+try:
+    from hq_event_relay import get_relay
+except ImportError:
+    get_relay = None
+
 
 class ASICore:
     """Bërthama reale e ASI – telemetri dhe status node-sh."""
@@ -41,7 +47,8 @@ class ASICore:
             "ALBI": {"status": "active", "role": "neural_processor"},
             "JONA": {"status": "active", "role": "coordinator"},
         }
-        self.logs: list[Dict[str, Any]] = []
+        self.logs: deque = deque(maxlen=int(os.getenv("ASI_LOG_LIMIT", "5000")))
+        self._hq_relay = get_relay(hq_url) if (get_relay and hq_url) else None
         self.realtime_engine = ASIRealtimeEngine(log_dir="logs", language=language)
         self._recalculate_health()
 
@@ -71,12 +78,9 @@ class ASICore:
         self._send_to_hq(entry)
 
     def _send_to_hq(self, entry: Dict[str, Any]) -> None:
-        if not requests:
-            return
-        try:
-            requests.post(self.hq_url, json=entry, timeout=5)
-        except Exception as exc:
-            print(f"[ASI] ⚠️ HQ i paarritshëm: {exc}")
+        # Radhë asinkrone e përbashkët me AGIEM: nuk bllokon thirrësin
+        if self._hq_relay is not None:
+            self._hq_relay.submit(entry)
 
     # ---------------- Node health ----------------
     def update_node_status(self, node: str, status: str) -> None:
@@ -110,7 +114,7 @@ class ASICore:
 
     def export_logs(self, filename: str = "asi_logs.json") -> None:
         with open(filename, "w", encoding="utf-8") as f:
-            json.dump(self.logs, f, indent=2, ensure_ascii=False)
+            json.dump(list(self.logs), f, indent=2, ensure_ascii=False)
         print(f"[ASI] Loget u ruajtën në {filename}")
 
     def realtime_status(self) -> Dict[str, Any]:
@@ -0,0 +1,234 @@
+"""Bounded queue plus background batch sender.
+
+Shared by ``hq_event_relay.HQEventRelay`` (log events to Mesh HQ) and
+``agent_telemetry.TelemetryExporter`` (agent metrics to Alba/Albi/Jona).
+
+Producers call ``submit``, which never blocks: when the queue is full the item
+is dropped and counted. A daemon thread takes up to ``batch_size`` items every
+``flush_interval`` seconds, or as soon as a full batch is queued, and ships
+them with one request.
+
+Failures are split by status code:
+
+* Connection errors, 5xx, 408 and 429 are transient: the items that were not
+  delivered go back to the front of the queue and the sender backs off
+  exponentially (up to ``backoff_max``) before retrying.
+* Any other 4xx on a batch makes the sender post that batch's items one by
+  one, so a single bad item cannot hold back the rest. An item the receiver
+  refuses on its own is dropped and counted as ``rejected``.
+* A batch refused with a status in ``BATCH_UNSUPPORTED`` (a receiver that
+  only takes single items) also switches the sender to per-item posts. It
+  tries batches again every ``batch_reprobe`` seconds, so a transient 404 (a
+  wrong URL, a service restarting) does not cost batching for good.
+
+Subclasses implement ``_send_batch`` and ``_send_one``, each returning the
+HTTP status code of its request.
+"""
+
+from __future__ import annotations
+
+import abc
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("BatchSender")
+
+# Status codes meaning "this endpoint does not take batch bodies"
+BATCH_UNSUPPORTED = (404, 405, 415, 422)
+# Client errors worth retrying; every other 4xx is final for the item
+RETRYABLE_4XX = (408, 429)
+
+
+def _retryable(status: int) -> bool:
+    return status >= 500 or status in RETRYABLE_4XX
+
+
+class BatchSender(abc.ABC):
+    """Bounded queue plus background batch sender for one endpoint."""
+
+    thread_name = "batch-sender"
+
+    def __init__(
+        self,
+        label: str,
+        *,
+        max_queue: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        backoff_max: float = 60.0,
+        batch_reprobe: float = 300.0,
+    ) -> None:
+        self.label = label
+        self.max_queue = max(1, max_queue)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.backoff_max = backoff_max
+        self.batch_reprobe = batch_reprobe
+        self._queue: Deque[Any] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._inflight = 0
+        self._backoff = 0.0
+        self._batched = True
+        self._reprobe_at = 0.0
+        self.stats: Dict[str, Any] = {
+            "submitted": 0,
+            "sent": 0,
+            "batches": 0,
+            "dropped": 0,
+            "rejected": 0,
+            "failed_batches": 0,
+            "last_error": None,
+        }
+
+    # ------------------------------------------------------------------
+    # producer side
+    # ------------------------------------------------------------------
+    def submit(self, item: Any) -> bool:
+        """Queue ``item`` without blocking; returns False if it was dropped."""
+
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                self.stats["dropped"] += 1
+                return False
+            self._queue.append(item)
+            self.stats["submitted"] += 1
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify_all()
+        self._ensure_started()
+        return True
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+            self._thread.start()
+
+    # ------------------------------------------------------------------
+    # sender side
+    # ------------------------------------------------------------------
+    @abc.abstractmethod
+    def _send_batch(self, batch: List[Any]) -> int:
+        """POST ``batch`` as one request; returns the HTTP status code."""
+
+    @abc.abstractmethod
+    def _send_one(self, item: Any) -> int:
+        """POST a single item; returns the HTTP status code."""
+
+    def _take_batch(self) -> List[Any]:
+        with self._cond:
+            if len(self._queue) < self.batch_size and not self._stopping:
+                self._cond.wait(timeout=self.flush_interval)
+            count = min(len(self._queue), self.batch_size)
+            batch = [self._queue.popleft() for _ in range(count)]
+            self._inflight = len(batch)
+            return batch
+
+    def _requeue(self, batch: List[Any]) -> None:
+        with self._cond:
+            room = self.max_queue - len(self._queue)
+            keep = batch[:max(0, room)]
+            self.stats["dropped"] += len(batch) - len(keep)
+            self._queue.extendleft(reversed(keep))
+
+    def _post(self, batch: List[Any]) -> Tuple[int, int]:
+        """Ship ``batch``; returns ``(handled, rejected)``: how many leading items
+        are done with (delivered or refused for good), and how many were refused."""
+
+        handled = rejected = 0
+        try:
+            if not self._batched and time.monotonic() >= self._reprobe_at:
+                self._batched = True
+            if self._batched:
+                status = self._send_batch(batch)
+                if status < 400:
+                    return len(batch), 0
+                if _retryable(status):
+                    raise RuntimeError(f"HTTP {status}")
+                if status in BATCH_UNSUPPORTED:
+                    logger.info(f"{self.label} rejected a batch ({status}), sending items one by one")
+                    self._batched = False
+                    self._reprobe_at = time.monotonic() + self.batch_reprobe
+            for item in batch:
+                status = self._send_one(item)
+                if status >= 400:
+                    if _retryable(status):
+                        raise RuntimeError(f"HTTP {status}")
+                    rejected += 1
+                    self.stats["last_error"] = f"HTTP {status}"
+                handled += 1
+            return handled, rejected
+        except Exception as exc:
+            self.stats["last_error"] = str(exc)
+            logger.debug(f"{self.label} not reachable: {exc}")
+            return handled, rejected
+        finally:
+            if rejected:
+                logger.warning(f"{self.label} refused {rejected} item(s), dropping them ({self.stats['last_error']})")
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                if self._stopping:
+                    return
+                continue
+            handled, rejected = self._post(batch)
+            with self._cond:
+                self.stats["sent"] += handled - rejected
+                self.stats["rejected"] += rejected
+                delivered = handled == len(batch)
+                if delivered:
+                    self._backoff = 0.0
+                    self.stats["batches"] += 1
+                else:
+                    self.stats["failed_batches"] += 1
+                    if self._stopping:  # do not keep retrying on shutdown
+                        self.stats["dropped"] += len(batch) - handled
+                    else:
+                        self._requeue(batch[handled:])
+                        self._backoff = min(self.backoff_max,
+                                            self._backoff * 2 if self._backoff else self.flush_interval)
+                self._inflight = 0
+                self._cond.notify_all()
+            if delivered:
+                continue
+            if self._stopping:
+                return
+            time.sleep(self._backoff)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything queued so far was delivered (or ``timeout``); True if it was."""
+
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._inflight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.notify_all()
+                self._cond.wait(timeout=min(remaining, 0.05))
+        return True
+
+    def close(self, timeout: float = 2.0) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {**self.stats, "queued": len(self._queue), "inflight": self._inflight,
+                    "backoff_seconds": self._backoff, "batched": self._batched}
+
+
+__all__ = ["BATCH_UNSUPPORTED", "BatchSender"]
@@ -15,6 +15,7 @@ të lidhura me source, domain, agent, alignment dhe policy.
 from __future__ import annotations
 import asyncio
 import json
+import os
 import uuid
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Any, Optional, Literal
@@ -22,6 +23,9 @@ from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
+from cycle_history import ExecutionHistory
+from cycle_scheduler import CycleScheduler
+
 try:
     from alba_core import AlbaCore
 except:
@@ -117,8 +121,22 @@ class CycleEngine:
     def __init__(self, data_root: Optional[Path] = None):
         self.data_root = Path(data_root) if data_root else Path.cwd() / "data"
         self.cycles: Dict[str, CycleDefinition] = {}
-        self.executions: Dict[str, List[CycleExecution]] = {}
-        self.active_tasks: Dict[str, asyncio.Task] = {}
+        # Indeks status -> cycle_ids (dict i renditur), mbahet në çdo tranzicion
+        self._by_status: Dict[CycleStatus, Dict[str, None]] = {s: {} for s in CycleStatus}
+        
+        # Historiku: ring i kufizuar për cycle + SQLite nën data_root
+        persist = os.getenv("CYCLE_HISTORY_PERSIST", "1") != "0"
+        self.history = ExecutionHistory(
+            self.data_root / "cycle_history.sqlite3" if persist else None,
+            per_cycle=int(os.getenv("CYCLE_HISTORY_PER_CYCLE", "100"))
+        )
+        
+        # Një planifikues qendror në vend të një task-u për çdo cycle
+        self.scheduler = CycleScheduler(
+            self._dispatch_cycle,
+            workers=int(os.getenv("CYCLE_ENGINE_WORKERS", "8"))
+        )
+        self.stream_interval = float(os.getenv("CYCLE_STREAM_INTERVAL", "0.1"))
         
         # Inicializo agents
         self.alba = AlbaCore(auto_start=False) if AlbaCore else None
@@ -200,7 +218,7 @@ class CycleEngine:
         )
         
         self.cycles[cycle_def.cycle_id] = cycle_def
-        self.executions[cycle_def.cycle_id] = []
+        self._by_status[cycle_def.status][cycle_def.cycle_id] = None
         self.metrics["total_cycles"] += 1
         
         print(f"✓ Cycle created: {cycle_def.cycle_id} ({domain}/{task})")
@@ -260,8 +278,8 @@ class CycleEngine:
         gaps = []
         
         # Simulim: në realitet do lexonte nga ALBI insights
-        if self.albi and len(self.albi._insights) > 0:
-            for insight in self.albi._insights[-5:]:
+        if self.albi:
+            for insight in self.albi.recent(5):
                 if insight.summary.get("confidence", 1.0) < 0.7:
                     gaps.append({
                         "domain": "neural_patterns",
@@ -281,23 +299,17 @@ class CycleEngine:
         
         cycle = self.cycles[cycle_id]
         execution = CycleExecution(cycle_id=cycle_id)
-        self.executions[cycle_id].append(execution)
+        self.history.record(execution)
         
-        cycle.status = CycleStatus.ACTIVE
-        self.metrics["active_cycles"] += 1
+        self._set_status(cycle, CycleStatus.ACTIVE)
         
         # Nis ekzekutimin sipas tipit
-        if cycle.cycle_type == CycleType.INTERVAL:
-            task = asyncio.create_task(self._run_interval_cycle(cycle, execution))
-            self.active_tasks[cycle_id] = task
+        if cycle.cycle_type in (CycleType.INTERVAL, CycleType.STREAM):
+            self.scheduler.schedule(cycle_id, 0.0)
         
         elif cycle.cycle_type == CycleType.EVENT:
-            task = asyncio.create_task(self._run_event_cycle(cycle, execution))
-            self.active_tasks[cycle_id] = task
-        
-        elif cycle.cycle_type == CycleType.STREAM:
-            task = asyncio.create_task(self._run_stream_cycle(cycle, execution))
-            self.active_tasks[cycle_id] = task
+            # Zgjohet vetëm kur publish_event() përputhet me trigger-in
+            self.scheduler.subscribe(cycle_id, cycle.event_trigger or cycle_id)
         
         elif cycle.cycle_type == CycleType.GAP_TRIGGERED:
             await self._run_gap_cycle(cycle, execution)
@@ -308,65 +320,113 @@ class CycleEngine:
         print(f"▶️ Started: {cycle_id} ({cycle.domain}/{cycle.task})")
         return execution
     
-    async def _run_interval_cycle(self, cycle: CycleDefinition, execution: CycleExecution):
-        """Ekzekuton cycle me interval"""
-        interval = cycle.interval or 60.0
-        
-        while cycle.status == CycleStatus.ACTIVE:
-            try:
-                # Ekzekuto detyrën
-                result = await self._execute_task(cycle, execution)
-                
-                # Check alignment
-                if not await self._check_alignment(cycle, result):
-                    cycle.status = CycleStatus.BLOCKED
-                    execution.status = CycleStatus.BLOCKED
-                    print(f"🚫 BLOCKED: {cycle.cycle_id} (alignment violation)")
-                    break
-                
-                # Update metrics
-                execution.data_processed += result.get("items_processed", 0)
-                execution.insights_generated += result.get("insights", 0)
-                
-                await asyncio.sleep(interval)
-            
-            except Exception as e:
-                execution.error = str(e)
-                execution.status = CycleStatus.FAILED
-                cycle.status = CycleStatus.FAILED
-                print(f"❌ FAILED: {cycle.cycle_id} - {e}")
-                break
+    def publish_event(self, name: str, value: Optional[float] = None) -> List[str]:
+        """
+        📣 Publikon një event/matje në event bus
         
-        execution.completed_at = datetime.now(timezone.utc)
-        self.metrics["active_cycles"] -= 1
-        self.metrics["completed_cycles"] += 1
+        engine.publish_event("beta", 27.0)   # zgjon cycles me "beta>25Hz"
+        engine.publish_event("new_paper")    # zgjon cycles me "new_paper"
+        """
+        return self.scheduler.publish(name, value)
+    
+    def ingest_frame(
+        self,
+        channels: Dict[str, float],
+        timestamp: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """
+        📥 Fut një frame reale në ALBA dhe publikon kanalet në event bus
+        
+        engine.ingest_frame({"alpha": 9.8, "beta": 27.1})   # zgjon "beta>25Hz"
+        
+        Kthen id-të e cycles të zgjuara.
+        """
+        if self.alba is not None:
+            self.alba.ingest(channels, metadata=metadata, timestamp=timestamp)
+        return self.scheduler.publish_many(channels)
     
-    async def _run_event_cycle(self, cycle: CycleDefinition, execution: CycleExecution):
-        """Ekzekuton cycle me event trigger"""
-        while cycle.status == CycleStatus.ACTIVE:
-            # Pret për event
-            triggered = await self._wait_for_event(cycle.event_trigger)
-            
-            if triggered:
-                result = await self._execute_task(cycle, execution)
-                
-                # Nëse kërkon human review
-                if "human-review" in cycle.metadata:
-                    cycle.status = CycleStatus.HUMAN_REVIEW
-                    execution.status = CycleStatus.HUMAN_REVIEW
-                    print(f"👤 HUMAN REVIEW REQUIRED: {cycle.cycle_id}")
-                    break
-                
-                execution.data_processed += result.get("items_processed", 0)
-            
-            await asyncio.sleep(1.0)
-    
-    async def _run_stream_cycle(self, cycle: CycleDefinition, execution: CycleExecution):
-        """Ekzekuton continuous streaming cycle"""
-        while cycle.status == CycleStatus.ACTIVE:
+    async def _dispatch_cycle(self, cycle_id: str):
+        """Një hap i cycle, i ekzekutuar nga worker pool i scheduler-it"""
+        cycle = self.cycles.get(cycle_id)
+        if cycle is None or cycle.status != CycleStatus.ACTIVE:
+            return
+        execution = self.history.latest(cycle_id)
+        
+        if cycle.cycle_type == CycleType.INTERVAL:
+            await self._run_interval_step(cycle, execution, cycle.interval or 60.0)
+        elif cycle.cycle_type == CycleType.STREAM:
+            await self._run_interval_step(cycle, execution, self.stream_interval, check_alignment=False)
+        elif cycle.cycle_type == CycleType.EVENT:
+            await self._run_event_step(cycle, execution)
+    
+    async def _run_interval_step(
+        self,
+        cycle: CycleDefinition,
+        execution: CycleExecution,
+        interval: float,
+        check_alignment: bool = True
+    ):
+        """Ekzekuton një hap të cycle me interval dhe e riplanifikon"""
+        try:
+            # Ekzekuto detyrën
             result = await self._execute_task(cycle, execution)
+            
+            # Check alignment
+            if check_alignment and not await self._check_alignment(cycle, result):
+                self._set_status(cycle, CycleStatus.BLOCKED, execution)
+                print(f"🚫 BLOCKED: {cycle.cycle_id} (alignment violation)")
+                self._finish_execution(execution)
+                return
+            
+            # Update metrics
             execution.data_processed += result.get("items_processed", 0)
-            await asyncio.sleep(0.1)  # High frequency
+            execution.insights_generated += result.get("insights", 0)
+        
+        except Exception as e:
+            execution.error = str(e)
+            self._set_status(cycle, CycleStatus.FAILED, execution)
+            print(f"❌ FAILED: {cycle.cycle_id} - {e}")
+            self._finish_execution(execution)
+            return
+        
+        if cycle.status == CycleStatus.ACTIVE:
+            self.scheduler.schedule(cycle.cycle_id, interval)
+    
+    async def _run_event_step(self, cycle: CycleDefinition, execution: CycleExecution):
+        """Ekzekuton cycle me event trigger (pasi eventi u publikua)"""
+        result = await self._execute_task(cycle, execution)
+        
+        # Nëse kërkon human review
+        if "human-review" in cycle.metadata:
+            self._set_status(cycle, CycleStatus.HUMAN_REVIEW, execution)
+            self.history.update(execution)
+            self.scheduler.cancel(cycle.cycle_id)
+            print(f"👤 HUMAN REVIEW REQUIRED: {cycle.cycle_id}")
+            return
+        
+        execution.data_processed += result.get("items_processed", 0)
+    
+    def _set_status(
+        self,
+        cycle: CycleDefinition,
+        status: CycleStatus,
+        execution: Optional[CycleExecution] = None
+    ):
+        """Ndryshon statusin dhe mban indeksin/numëruesit në O(1)"""
+        self._by_status[cycle.status].pop(cycle.cycle_id, None)
+        cycle.status = status
+        self._by_status[status][cycle.cycle_id] = None
+        self.metrics["active_cycles"] = len(self._by_status[CycleStatus.ACTIVE])
+        if status == CycleStatus.BLOCKED:
+            self.metrics["blocked_cycles"] += 1
+        if execution is not None:
+            execution.status = status
+    
+    def _finish_execution(self, execution: CycleExecution):
+        execution.completed_at = datetime.now(timezone.utc)
+        self.metrics["completed_cycles"] += 1
+        self.history.update(execution)
     
     async def _run_gap_cycle(self, cycle: CycleDefinition, execution: CycleExecution):
         """Ekzekuton gap-filling cycle (Born-Concepts)"""
@@ -379,17 +439,15 @@ class CycleEngine:
             self.metrics["gaps_filled"] += 1
             print(f"✓ Gap filled: {cycle.metadata.get('concept')}")
         
-        execution.completed_at = datetime.now(timezone.utc)
-        execution.status = CycleStatus.COMPLETED
-        cycle.status = CycleStatus.COMPLETED
+        self._set_status(cycle, CycleStatus.COMPLETED, execution)
+        self._finish_execution(execution)
     
     async def _run_batch_cycle(self, cycle: CycleDefinition, execution: CycleExecution):
         """Ekzekuton one-time batch cycle"""
         result = await self._execute_task(cycle, execution)
         execution.data_processed = result.get("items_processed", 0)
-        execution.completed_at = datetime.now(timezone.utc)
-        execution.status = CycleStatus.COMPLETED
-        cycle.status = CycleStatus.COMPLETED
+        self._set_status(cycle, CycleStatus.COMPLETED, execution)
+        self._finish_execution(execution)
     
     async def _execute_task(self, cycle: CycleDefinition, execution: CycleExecution) -> Dict[str, Any]:
         """Ekzekuton detyrën aktuale të cycle"""
@@ -401,13 +459,15 @@ class CycleEngine:
         }
         
         # Zgjedh agent dhe ekzekuto
-        if cycle.agent == "ALBA" and self.alba:
+        if cycle.agent == "ALBA" and self.alba is not None:
             # ALBA collection - EEG nga burime të hapura
             if cycle.task == "eeg_collection":
-                # EEG nga open sources (simulim)
+                # EEG nga open sources (simulim kur ALBA s'ka frames reale)
                 result["items_processed"] = 5  # 5 EEG streams
                 result["eeg_sources"] = ["openneuro.org", "eegdb.org", "zenodo.org"]
-                result["frequency_data"] = {"alpha": 10.5, "beta": 15.2, "theta": 6.8}
+                levels = self.alba.average_channel_levels()
+                result["frequency_data"] = levels or {"alpha": 10.5, "beta": 15.2, "theta": 6.8}
+                result["frequency_simulated"] = not levels
             
             elif cycle.task == "signal_processing":
                 # Procesimi i sinjaleve
@@ -415,9 +475,11 @@ class CycleEngine:
                 result["processed_signals"] = ["fft_analysis", "band_power", "coherence"]
             
             elif cycle.task == "frequency_monitor":
-                # Simulon EEG monitoring
+                # Mesataret e ALBA (nga ingest_frame), përndryshe simulim
                 result["items_processed"] = 1
-                result["frequency_data"] = {"alpha": 10.5, "beta": 15.2}
+                levels = self.alba.average_channel_levels()
+                result["frequency_data"] = levels or {"alpha": 10.5, "beta": 15.2}
+                result["frequency_simulated"] = not levels
             
             elif cycle.task == "literature_ingest":
                 # Simulon PubMed ingestion
@@ -685,6 +747,11 @@ class CycleEngine:
                 result["ethical_compliance"] = 0.98
                 result["policy_updates"] = ["alignment_policy_v1.2", "ethical_framework_update"]
         
+        # Matjet reale të frekuencave shkojnë në event bus (p.sh. "beta>25Hz");
+        # vlerat e simuluara nuk duhet të ndezin cikle me event trigger
+        if isinstance(result.get("frequency_data"), dict) and not result.get("frequency_simulated"):
+            self.scheduler.publish_many(result["frequency_data"])
+        
         return result
     
     async def _check_alignment(self, cycle: CycleDefinition, result: Dict[str, Any]) -> bool:
@@ -703,12 +770,6 @@ class CycleEngine:
         
         return True
     
-    async def _wait_for_event(self, trigger: Optional[str]) -> bool:
-        """Pret për një event (simulim)"""
-        # Në realitet do monitoronte event streams
-        await asyncio.sleep(5.0)
-        return True
-    
     # ==================== CYCLE MANAGEMENT ====================
     
     def stop_cycle(self, cycle_id: str) -> bool:
@@ -717,20 +778,25 @@ class CycleEngine:
             return False
         
         cycle = self.cycles[cycle_id]
-        cycle.status = CycleStatus.PAUSED
+        execution = self.history.latest(cycle_id)
+        if execution is not None and execution.completed_at is not None:
+            execution = None  # ekzekutimi i fundit ka përfunduar tashmë
+        self._set_status(cycle, CycleStatus.PAUSED, execution)
         
-        if cycle_id in self.active_tasks:
-            self.active_tasks[cycle_id].cancel()
-            del self.active_tasks[cycle_id]
+        self.scheduler.cancel(cycle_id)
+        
+        # Mbyll ekzekutimin aktual që historiku të mos e mbajë "active"
+        if execution is not None:
+            execution.completed_at = datetime.now(timezone.utc)
+            self.history.update(execution)
         
-        self.metrics["active_cycles"] -= 1
         print(f"⏹️ Stopped: {cycle_id}")
         return True
     
     async def stop_all_cycles(self) -> int:
         """⏹️ Ndalon të gjithë cycles aktive"""
         stopped_count = 0
-        active_cycles = [cid for cid, cycle in self.cycles.items() if cycle.status == CycleStatus.ACTIVE]
+        active_cycles = list(self._by_status[CycleStatus.ACTIVE])
         
         for cycle_id in active_cycles:
             if self.stop_cycle(cycle_id):
@@ -739,6 +805,12 @@ class CycleEngine:
         print(f"⏹️ Stopped {stopped_count} cycles")
         return stopped_count
     
+    async def shutdown(self):
+        """⏹️ Ndalon cycles dhe worker-at e scheduler-it"""
+        await self.stop_all_cycles()
+        await self.scheduler.close()
+        self.history.close()
+    
     def get_status(self) -> Dict[str, Any]:
         """📊 Status i përgjithshëm (stil njerëzor)"""
         alba_status = "IDLE"
@@ -746,8 +818,8 @@ class CycleEngine:
         jona_status = "IDLE"
         alignment_status = "SAFE MODE"
         
-        if self.alba:
-            alba_status = "ACTIVE" if len(self.alba._history) > 0 else "IDLE"
+        if self.alba is not None:
+            alba_status = "ACTIVE" if len(self.alba) > 0 else "IDLE"
         
         if self.albi:
             albi_status = "ACTIVE" if len(self.albi._insights) > 0 else "IDLE"
@@ -765,19 +837,39 @@ class CycleEngine:
             "JONA": jona_status,
             "Alignment": alignment_status,
             "metrics": self.metrics,
-            "active_cycles": len([c for c in self.cycles.values() if c.status == CycleStatus.ACTIVE]),
-            "pending_gaps": len(self.concept_gaps)
+            "active_cycles": len(self._by_status[CycleStatus.ACTIVE]),
+            "cycles_by_status": {s.value: len(ids) for s, ids in self._by_status.items()},
+            "executions": dict(self.history.counters),
+            "pending_gaps": len(self.concept_gaps),
+            "scheduler": self.scheduler.snapshot()
         }
     
     def list_cycles(self, status: Optional[str] = None) -> List[CycleDefinition]:
         """📋 Liston cycles"""
         if status:
-            return [c for c in self.cycles.values() if c.status == CycleStatus(status)]
+            return [self.cycles[cid] for cid in self._by_status[CycleStatus(status)]]
         return list(self.cycles.values())
     
     def get_executions(self, cycle_id: str) -> List[CycleExecution]:
-        """📜 History e ekzekutimeve"""
-        return self.executions.get(cycle_id, [])
+        """📜 Ekzekutimet e fundit (ring në memorie)"""
+        return self.history.recent(cycle_id)
+    
+    def query_executions(
+        self,
+        cycle_id: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[Any] = None,
+        until: Optional[Any] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """
+        📜 Historiku i plotë me faqe (nga SQLite nëse është aktiv)
+        
+        engine.query_executions(cycle_id="cycle_ab12cd34", status="failed",
+                                since="2025-01-01T00:00:00Z", limit=20, offset=40)
+        """
+        return self.history.query(cycle_id, status, since, until, limit, offset)
 
 
 # ==================== CLI INTERFACE ====================
@@ -798,6 +890,7 @@ async def cli_main():
   python cycle_engine.py stop <cycle_id>
   python cycle_engine.py status
   python cycle_engine.py list [--status active]
+  python cycle_engine.py history [<cycle_id>] [--status failed] [--since 2025-01-01] [--limit 20] [--offset 0]
         """)
         return
     
@@ -861,6 +954,28 @@ async def cli_main():
             "task": c.task,
             "status": c.status.value
         } for c in cycles], indent=2))
+    
+    elif command == "history":
+        options = {}
+        cycle_id = None
+        i = 2
+        while i < len(sys.argv):
+            if sys.argv[i].startswith("--") and i+1 < len(sys.argv):
+                options[sys.argv[i].lstrip("-")] = sys.argv[i+1]
+                i += 2
+            else:
+                cycle_id = sys.argv[i]
+                i += 1
+        
+        page = engine.query_executions(
+            cycle_id=cycle_id,
+            status=options.get("status"),
+            since=options.get("since"),
+            until=options.get("until"),
+            limit=int(options.get("limit", 50)),
+            offset=int(options.get("offset", 0))
+        )
+        print(json.dumps(page, indent=2, ensure_ascii=False))
 
 
 # ==================== MODULE INTERFACE ====================
@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+📜 CYCLE HISTORY – historiku i ekzekutimeve të CycleEngine
+=========================================================
+``CycleEngine.executions`` used to be an unbounded list per cycle. The history
+is now split in two:
+
+* memory – the last ``per_cycle`` executions of every cycle in a ``deque``
+  ring (what ``get_executions`` and the scheduler need);
+* disk – every execution in SQLite (``data_root/cycle_history.sqlite3``),
+  written when an execution starts and on each status transition, and queried
+  with pagination by cycle, status and time range. Rows are snapshotted on the
+  caller's thread and committed in batches by a writer thread, so the event
+  loop never waits on SQLite; queries flush pending rows first.
+
+Execution counters per status are kept up to date on every transition, so
+reading them is O(1). Without a database path the store is memory-only and
+queries fall back to the rings.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+from collections import Counter, deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Union
+
+logger = logging.getLogger("CycleHistory")
+
+_WRITE_BATCH = 256
+
+TimeLike = Union[datetime, float, str, None]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    execution_id TEXT PRIMARY KEY,
+    cycle_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    completed_at REAL,
+    data_processed INTEGER NOT NULL DEFAULT 0,
+    insights_generated INTEGER NOT NULL DEFAULT 0,
+    gaps_detected INTEGER NOT NULL DEFAULT 0,
+    alignment_score REAL,
+    jona_review TEXT,
+    error TEXT,
+    output TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_exec_cycle ON executions (cycle_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_exec_status ON executions (status, started_at);
+CREATE INDEX IF NOT EXISTS idx_exec_started ON executions (started_at);
+"""
+
+
+def _epoch(value: TimeLike) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _iso(epoch: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat() if epoch is not None else None
+
+
+def execution_to_dict(execution) -> Dict[str, Any]:
+    """JSON-friendly view of a ``CycleExecution``."""
+    return {
+        "execution_id": execution.execution_id,
+        "cycle_id": execution.cycle_id,
+        "status": execution.status.value,
+        "started_at": execution.started_at.isoformat(),
+        "completed_at": execution.completed_at.isoformat() if execution.completed_at else None,
+        "data_processed": execution.data_processed,
+        "insights_generated": execution.insights_generated,
+        "gaps_detected": execution.gaps_detected,
+        "alignment_score": execution.alignment_score,
+        "jona_review": execution.jona_review,
+        "error": execution.error,
+        "output": execution.output,
+    }
+
+
+class ExecutionHistory:
+    """Per-cycle bounded rings backed by an optional SQLite log."""
+
+    def __init__(self, db_path: Optional[Path] = None, per_cycle: int = 100) -> None:
+        self.db_path = Path(db_path) if db_path else None
+        self.per_cycle = max(1, per_cycle)
+        self._recent: Dict[str, Deque[Any]] = {}
+        self._status: Dict[str, str] = {}  # execution_id -> status, for executions still in memory
+        self.counters: Counter = Counter()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._pending: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # storage
+    # ------------------------------------------------------------------
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and self.db_path is not None:
+            with self._lock:  # the writer thread and readers may both get here first
+                if self._conn is None and self.db_path is not None:
+                    try:
+                        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.execute("PRAGMA synchronous=NORMAL")
+                        conn.executescript(_SCHEMA)
+                        self._conn = conn
+                    except sqlite3.Error as exc:
+                        logger.warning(f"Cycle history disabled ({self.db_path}): {exc}")
+                        self.db_path = None
+        return self._conn
+
+    def _write(self, execution) -> None:
+        """Queue a snapshot of ``execution`` for the writer thread."""
+        if self.db_path is None:
+            return
+        row = (
+            execution.execution_id,
+            execution.cycle_id,
+            execution.status.value,
+            execution.started_at.timestamp(),
+            execution.completed_at.timestamp() if execution.completed_at else None,
+            execution.data_processed,
+            execution.insights_generated,
+            execution.gaps_detected,
+            execution.alignment_score,
+            execution.jona_review,
+            execution.error,
+            json.dumps(execution.output, default=str),
+        )
+        self._pending.put(row)
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, name="cycle-history-writer",
+                                                    daemon=True)
+                    self._writer.start()
+
+    def _write_loop(self) -> None:
+        while True:
+            rows = [self._pending.get()]
+            while len(rows) < _WRITE_BATCH:
+                try:
+                    rows.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in rows
+            batch = [row for row in rows if row is not None]
+            try:
+                conn = self._db()
+                if conn is not None and batch:
+                    with self._lock:
+                        conn.executemany("INSERT OR REPLACE INTO executions VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+                                         batch)
+                        conn.commit()
+            except sqlite3.Error as exc:
+                logger.warning(f"Cycle history write failed: {exc}")
+            finally:
+                for _ in rows:
+                    self._pending.task_done()
+            if stop:
+                return
+
+    def flush(self) -> None:
+        """Block until every queued row is committed."""
+        if self._writer is not None:
+            self._pending.join()
+
+    def close(self) -> None:
+        writer = self._writer
+        if writer is not None:
+            self._pending.put(None)
+            writer.join()
+            self._writer = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # transitions
+    # ------------------------------------------------------------------
+    def record(self, execution) -> None:
+        """Add a new execution (ring + disk) and count it under its status."""
+        ring = self._recent.get(execution.cycle_id)
+        if ring is None:
+            ring = self._recent[execution.cycle_id] = deque()
+        if len(ring) >= self.per_cycle:
+            self._status.pop(ring.popleft().execution_id, None)
+        ring.append(execution)
+        self._status[execution.execution_id] = execution.status.value
+        self.counters["executions"] += 1
+        self.counters[execution.status.value] += 1
+        self._write(execution)
+
+    def update(self, execution) -> None:
+        """Persist the execution's current state and move its status counter."""
+        previous = self._status.get(execution.execution_id)
+        status = execution.status.value
+        if previous is not None and previous != status:
+            self.counters[previous] -= 1
+            self.counters[status] += 1
+            self._status[execution.execution_id] = status
+        if execution.completed_at is not None:
+            self.counters["data_processed"] += execution.data_processed
+        self._write(execution)
+
+    def forget(self, cycle_id: str) -> None:
+        for execution in self._recent.pop(cycle_id, ()):
+            self._status.pop(execution.execution_id, None)
+
+    # ------------------------------------------------------------------
+    # reads
+    # ------------------------------------------------------------------
+    def latest(self, cycle_id: str):
+        ring = self._recent.get(cycle_id)
+        return ring[-1] if ring else None
+
+    def recent(self, cycle_id: str) -> List[Any]:
+        return list(self._recent.get(cycle_id, ()))
+
+    def query(
+        self,
+        cycle_id: Optional[str] = None,
+        status: Optional[str] = None,
+        since: TimeLike = None,
+        until: TimeLike = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """Newest-first page of executions matching all given filters."""
+        limit, offset = max(0, limit), max(0, offset)
+        since_ts, until_ts = _epoch(since), _epoch(until)
+        self.flush()
+        conn = self._db()
+        if conn is None:
+            return self._query_memory(cycle_id, status, since_ts, until_ts, limit, offset)
+
+        where, params = [], []
+        if cycle_id is not None:
+            where.append("cycle_id = ?")
+            params.append(cycle_id)
+        if status is not None:
+            where.append("status = ?")
+            params.append(status)
+        if since_ts is not None:
+            where.append("started_at >= ?")
+            params.append(since_ts)
+        if until_ts is not None:
+            where.append("started_at < ?")
+            params.append(until_ts)
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        with self._lock:
+            total = conn.execute(f"SELECT COUNT(*) FROM executions{clause}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT * FROM executions{clause} ORDER BY started_at DESC, execution_id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        items = [
+            {
+                "execution_id": r[0],
+                "cycle_id": r[1],
+                "status": r[2],
+                "started_at": _iso(r[3]),
+                "completed_at": _iso(r[4]),
+                "data_processed": r[5],
+                "insights_generated": r[6],
+                "gaps_detected": r[7],
+                "alignment_score": r[8],
+                "jona_review": r[9],
+                "error": r[10],
+                "output": json.loads(r[11]) if r[11] else {},
+            }
+            for r in rows
+        ]
+        return {"items": items, "total": total, "limit": limit, "offset": offset}
+
+    def _query_memory(self, cycle_id, status, since_ts, until_ts, limit, offset) -> Dict[str, Any]:
+        rings = [self._recent.get(cycle_id, ())] if cycle_id is not None else list(self._recent.values())
+        matched = [
+            e for ring in rings for e in ring
+            if (status is None or e.status.value == status)
+            and (since_ts is None or e.started_at.timestamp() >= since_ts)
+            and (until_ts is None or e.started_at.timestamp() < until_ts)
+        ]
+        matched.sort(key=lambda e: (e.started_at, e.execution_id), reverse=True)
+        page = matched[offset:offset + limit]
+        return {"items": [execution_to_dict(e) for e in page], "total": len(matched),
+                "limit": limit, "offset": offset}
+
+
+__all__ = ["ExecutionHistory", "execution_to_dict"]
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""
+⏱️ CYCLE SCHEDULER – planifikuesi qendror i CycleEngine
+======================================================
+Replaces the one-asyncio-task-per-cycle model of ``cycle_engine``:
+
+* ``TimerHeap`` – one min-heap of due times for every interval/stream cycle,
+  drained by a single timer task that sleeps until the earliest deadline.
+* ``EventBus`` – parses ``event_trigger`` expressions (``beta>25Hz``,
+  ``confidence<=0.7``, plain names such as ``new_paper``) and indexes them by
+  metric, so ``publish("beta", 27.0)`` only touches the cycles whose condition
+  holds (bisect over sorted thresholds per metric and operator).
+* ``CycleScheduler`` – ties both together with a bounded pool of worker tasks
+  that run the engine's handler for each due or triggered cycle. A cycle that is
+  already queued or running is coalesced instead of being queued twice.
+
+Idle cycles cost nothing: the loop only wakes up for the next deadline or for a
+published event.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import re
+from bisect import bisect_left, bisect_right
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger("CycleScheduler")
+
+_TRIGGER_RE = re.compile(
+    r"^\s*([A-Za-z_][\w.]*)\s*(>=|<=|==|!=|>|<)\s*(-?\d+(?:\.\d+)?)\s*([A-Za-z%µ]*)\s*$"
+)
+
+
+def parse_trigger(trigger: str) -> Tuple[str, Optional[str], Optional[float]]:
+    """``"beta>25Hz"`` -> ``("beta", ">", 25.0)``; ``"new_paper"`` -> ``("new_paper", None, None)``.
+
+    Units after the threshold are ignored; names are case-insensitive.
+    """
+    match = _TRIGGER_RE.match(trigger or "")
+    if match:
+        name, op, threshold, _unit = match.groups()
+        return name.lower(), op, float(threshold)
+    return (trigger or "").strip().lower(), None, None
+
+
+class EventBus:
+    """Subscriptions of cycles to trigger expressions, indexed by metric."""
+
+    def __init__(self) -> None:
+        # metric -> op -> (sorted thresholds, cycle ids in the same order)
+        self._conditions: Dict[str, Dict[str, Tuple[List[float], List[str]]]] = {}
+        self._named: Dict[str, Set[str]] = {}
+        self._subscriptions: Dict[str, Tuple[str, Optional[str], Optional[float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, cycle_id: str, trigger: str) -> None:
+        self.unsubscribe(cycle_id)
+        name, op, threshold = parse_trigger(trigger)
+        self._subscriptions[cycle_id] = (name, op, threshold)
+        if op is None:
+            self._named.setdefault(name, set()).add(cycle_id)
+            return
+        thresholds, ids = self._conditions.setdefault(name, {}).setdefault(op, ([], []))
+        pos = bisect_right(thresholds, threshold)
+        thresholds.insert(pos, threshold)
+        ids.insert(pos, cycle_id)
+
+    def unsubscribe(self, cycle_id: str) -> None:
+        sub = self._subscriptions.pop(cycle_id, None)
+        if sub is None:
+            return
+        name, op, threshold = sub
+        if op is None:
+            named = self._named.get(name)
+            if named is not None:
+                named.discard(cycle_id)
+                if not named:
+                    del self._named[name]
+            return
+        thresholds, ids = self._conditions[name][op]
+        lo, hi = bisect_left(thresholds, threshold), bisect_right(thresholds, threshold)
+        pos = ids.index(cycle_id, lo, hi)
+        del thresholds[pos], ids[pos]
+        if not ids:
+            del self._conditions[name][op]
+            if not self._conditions[name]:
+                del self._conditions[name]
+
+    def match(self, name: str, value: Optional[float] = None) -> List[str]:
+        """Cycle ids whose trigger is satisfied by ``name`` (= ``value``)."""
+        name = name.lower()
+        matched: List[str] = list(self._named.get(name, ()))
+        if value is None:
+            return matched
+        for op, (thresholds, ids) in self._conditions.get(name, {}).items():
+            if op == ">":
+                matched.extend(ids[:bisect_left(thresholds, value)])
+            elif op == ">=":
+                matched.extend(ids[:bisect_right(thresholds, value)])
+            elif op == "<":
+                matched.extend(ids[bisect_right(thresholds, value):])
+            elif op == "<=":
+                matched.extend(ids[bisect_left(thresholds, value):])
+            else:
+                lo, hi = bisect_left(thresholds, value), bisect_right(thresholds, value)
+                matched.extend(ids[lo:hi] if op == "==" else ids[:lo] + ids[hi:])
+        return matched
+
+
+class TimerHeap:
+    """Min-heap of ``(due, seq, cycle_id)`` with lazy cancellation."""
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, str]] = []
+        self._live: Dict[str, int] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def push(self, cycle_id: str, due: float) -> bool:
+        """Schedule (or reschedule) ``cycle_id``; True if it is now the earliest entry."""
+        seq = next(self._seq)
+        self._live[cycle_id] = seq
+        heapq.heappush(self._heap, (due, seq, cycle_id))
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self._heap = [e for e in self._heap if self._live.get(e[2]) == e[1]]
+            heapq.heapify(self._heap)
+        return self._heap[0][1] == seq
+
+    def cancel(self, cycle_id: str) -> None:
+        self._live.pop(cycle_id, None)
+
+    def next_due(self) -> Optional[float]:
+        while self._heap and self._live.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> List[str]:
+        due: List[str] = []
+        while self._heap and self._heap[0][0] <= now:
+            _, seq, cycle_id = heapq.heappop(self._heap)
+            if self._live.get(cycle_id) == seq:
+                del self._live[cycle_id]
+                due.append(cycle_id)
+        return due
+
+
+class CycleScheduler:
+    """Timer heap + event bus + bounded worker pool for one ``CycleEngine``."""
+
+    def __init__(
+        self,
+        handler: Callable[[str], Awaitable[None]],
+        workers: int = 8,
+        resolution: float = 0.01,
+    ) -> None:
+        self._handler = handler
+        self.workers = max(1, workers)
+        # timers due within ``resolution`` of each other fire on the same wakeup
+        self.resolution = resolution
+        self.timers = TimerHeap()
+        self.bus = EventBus()
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Set[str] = set()
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {
+            "timer_wakeups": 0,
+            "dispatched": 0,
+            "coalesced": 0,
+            "executed": 0,
+            "errors": 0,
+            "events_published": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # lifecycle
+    # ------------------------------------------------------------------
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start the timer task and workers on the running loop (idempotent)."""
+        if self._tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._timer_loop())]
+        self._tasks += [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._pending.clear()
+
+    # ------------------------------------------------------------------
+    # producers
+    # ------------------------------------------------------------------
+    def schedule(self, cycle_id: str, delay: float) -> None:
+        """Run ``cycle_id`` once, ``delay`` seconds from now."""
+        self.start()
+        if self.timers.push(cycle_id, self._loop.time() + max(0.0, delay)):
+            self._wake.set()
+
+    def subscribe(self, cycle_id: str, trigger: str) -> None:
+        self.start()
+        self.bus.subscribe(cycle_id, trigger)
+
+    def cancel(self, cycle_id: str) -> None:
+        self.timers.cancel(cycle_id)
+        self.bus.unsubscribe(cycle_id)
+
+    def submit(self, cycle_id: str) -> bool:
+        """Queue ``cycle_id`` for a worker unless it is already queued or running."""
+        if cycle_id in self._pending:
+            self.stats["coalesced"] += 1
+            return False
+        self.start()
+        self._pending.add(cycle_id)
+        self._queue.put_nowait(cycle_id)
+        self.stats["dispatched"] += 1
+        return True
+
+    def publish(self, name: str, value: Optional[float] = None) -> List[str]:
+        """Wake the cycles whose trigger matches; returns their ids."""
+        self.stats["events_published"] += 1
+        matched = self.bus.match(name, value)
+        for cycle_id in matched:
+            self.submit(cycle_id)
+        return matched
+
+    def publish_many(self, values: Dict[str, float]) -> List[str]:
+        matched: List[str] = []
+        for name, value in values.items():
+            if isinstance(value, (int, float)):
+                matched.extend(self.publish(name, float(value)))
+        return matched
+
+    # ------------------------------------------------------------------
+    # loops
+    # ------------------------------------------------------------------
+    async def _timer_loop(self) -> None:
+        while True:
+            self._wake.clear()
+            for cycle_id in self.timers.pop_due(self._loop.time() + self.resolution):
+                self.submit(cycle_id)
+            next_due = self.timers.next_due()
+            timeout = None if next_due is None else max(0.0, next_due - self._loop.time())
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self.stats["timer_wakeups"] += 1
+
+    async def _worker(self) -> None:
+        while True:
+            cycle_id = await self._queue.get()
+            try:
+                await self._handler(cycle_id)
+                self.stats["executed"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.stats["errors"] += 1
+                logger.warning(f"Cycle {cycle_id} handler failed: {exc}")
+            finally:
+                self._pending.discard(cycle_id)
+                self._queue.task_done()
+
+    async def drain(self) -> None:
+        """Wait until every queued cycle has been handled."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            **self.stats,
+            "workers": self.workers,
+            "timers": len(self.timers),
+            "subscriptions": len(self.bus),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "pending": len(self._pending),
+        }
+
+
+__all__ = ["CycleScheduler", "EventBus", "TimerHeap", "parse_trigger"]
@@ -0,0 +1,101 @@
+"""Non-blocking, batched relay of log events to Mesh HQ.
+
+``AGIEMCore.log_event`` and ``ASICore._send_to_hq`` used to POST every log line
+synchronously, so an unreachable HQ stalled the caller for the full request
+timeout per line. Events are now put on a bounded in-memory queue and a daemon
+thread ships them in batches (one POST of ``{"events": [...]}``), backing off
+exponentially while HQ is down. When the queue is full new events are dropped
+and counted instead of blocking. An HQ that rejects the batch body (an older
+``/mesh/event`` taking one event per request) is detected from the status code
+and the relay falls back to one POST per event, trying batches again later.
+Events HQ refuses for good (a 4xx other than 408/429) are dropped and counted
+as ``rejected`` rather than retried. The queue, sender thread and retry logic
+are ``batch_sender.BatchSender``, shared with the agent telemetry exporter.
+
+Use ``get_relay(url)`` so every component posting to the same HQ URL shares one
+queue and one sender thread.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from typing import Any, Dict, List
+
+try:
+    import requests
+except Exception:  # pragma: no cover - optional dependency
+    requests = None
+
+from batch_sender import BATCH_UNSUPPORTED, BatchSender
+
+
+class HQEventRelay(BatchSender):
+    """Bounded queue plus background batch sender for one HQ endpoint."""
+
+    thread_name = "hq-event-relay"
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        max_queue: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        timeout: float = 5.0,
+        backoff_max: float = 60.0,
+    ) -> None:
+        super().__init__(
+            f"HQ ({url})",
+            max_queue=max_queue,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            backoff_max=backoff_max,
+        )
+        self.url = url
+        self.timeout = timeout
+        self._session = requests.Session() if requests is not None else None
+
+    def submit(self, event: Dict[str, Any]) -> bool:
+        """Queue ``event`` without blocking; returns False if it was dropped."""
+
+        if self._session is None or not self.url:
+            return False
+        return super().submit(event)
+
+    def _send_batch(self, batch: List[Dict[str, Any]]) -> int:
+        return self._session.post(self.url, json={"events": batch}, timeout=self.timeout).status_code
+
+    def _send_one(self, event: Dict[str, Any]) -> int:
+        return self._session.post(self.url, json=event, timeout=self.timeout).status_code
+
+
+_relays: Dict[str, HQEventRelay] = {}
+_relays_lock = threading.Lock()
+
+
+def get_relay(url: str) -> HQEventRelay:
+    """Shared relay for ``url`` (configured from ``HQ_RELAY_*`` env vars)."""
+
+    with _relays_lock:
+        relay = _relays.get(url)
+        if relay is None:
+            relay = _relays[url] = HQEventRelay(
+                url,
+                max_queue=int(os.getenv("HQ_RELAY_MAX_QUEUE", "10000")),
+                batch_size=int(os.getenv("HQ_RELAY_BATCH_SIZE", "200")),
+                flush_interval=float(os.getenv("HQ_RELAY_FLUSH_INTERVAL", "1.0")),
+                backoff_max=float(os.getenv("HQ_RELAY_BACKOFF_MAX", "60.0")),
+            )
+        return relay
+
+
+@atexit.register
+def _close_relays() -> None:
+    for relay in list(_relays.values()):
+        relay.flush(timeout=1.0)
+        relay.close(timeout=1.0)
+
+
+__all__ = ["BATCH_UNSUPPORTED", "HQEventRelay", "get_relay"]
@@ -0,0 +1,165 @@
+"""Streamed WAV synthesis for the JONA coordinator (``jona_service_7777``).
+
+Audio is rendered on the fly in fixed-size blocks. Every sample is computed
+from its absolute index on the original ``np.linspace(0, duration, N,
+endpoint=False)`` time base (``t = n * duration / N``), so blocks are
+phase-continuous, any byte range of the file can be produced without
+rendering what precedes it, and the bytes match the old whole-file generator.
+Memory per request is O(block), not O(duration).
+
+Short clips are additionally kept, fully rendered, in a byte-budgeted LRU keyed
+by ``(mode, frequency, duration, amplitude)``.
+"""
+
+import re
+import struct
+import threading
+from collections import OrderedDict
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 44100
+NUM_CHANNELS = 1
+BYTES_PER_SAMPLE = 2
+HEADER_SIZE = 44
+BLOCK_SAMPLES = 16384
+
+
+def wav_header(num_samples: int, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """44-byte PCM WAV header (mono, 16-bit) for ``num_samples`` samples."""
+    data_size = num_samples * NUM_CHANNELS * BYTES_PER_SAMPLE
+    byte_rate = sample_rate * NUM_CHANNELS * BYTES_PER_SAMPLE
+    return b"".join([
+        b"RIFF", struct.pack("<I", 36 + data_size), b"WAVE",
+        b"fmt ", struct.pack("<I", 16),
+        struct.pack("<HHIIHH", 1, NUM_CHANNELS, sample_rate, byte_rate,
+                    NUM_CHANNELS * BYTES_PER_SAMPLE, 16),
+        b"data", struct.pack("<I", data_size),
+    ])
+
+
+class ToneSpec:
+    """Parameters of one synthesized sine clip."""
+
+    __slots__ = ("mode", "frequency", "duration", "amplitude", "sample_rate")
+
+    def __init__(self, mode: str, frequency: float, duration: float, amplitude: float,
+                 sample_rate: int = SAMPLE_RATE):
+        self.mode = mode
+        self.frequency = float(frequency)
+        self.duration = float(duration)
+        self.amplitude = float(amplitude)
+        self.sample_rate = sample_rate
+
+    @property
+    def key(self) -> Tuple[str, float, float, float]:
+        return (self.mode, self.frequency, self.duration, self.amplitude)
+
+    @property
+    def num_samples(self) -> int:
+        return int(self.sample_rate * self.duration)
+
+    @property
+    def total_bytes(self) -> int:
+        return HEADER_SIZE + self.num_samples * BYTES_PER_SAMPLE
+
+    def render(self, start: int, count: int) -> bytes:
+        """Little-endian int16 PCM for samples ``[start, start + count)``."""
+        # same step as np.linspace(0, duration, num_samples, endpoint=False)
+        t = np.arange(start, start + count, dtype=np.float64) * (self.duration / self.num_samples)
+        audio = self.amplitude * np.sin(2 * np.pi * self.frequency * t)
+        return np.int16(audio * 32767).astype("<i2").tobytes()
+
+    def iter_bytes(self, first: int = 0, last: Optional[int] = None,
+                   block_samples: int = BLOCK_SAMPLES) -> Iterator[bytes]:
+        """Yield bytes ``first..last`` (inclusive) of the complete WAV file."""
+        last = self.total_bytes - 1 if last is None else last
+        if first < HEADER_SIZE:
+            yield wav_header(self.num_samples, self.sample_rate)[first:last + 1]
+            first = HEADER_SIZE
+        if first > last:
+            return
+        # map the byte window onto whole samples, then trim the edges
+        sample = (first - HEADER_SIZE) // BYTES_PER_SAMPLE
+        end_sample = min(self.num_samples, (last - HEADER_SIZE) // BYTES_PER_SAMPLE + 1)
+        skip = (first - HEADER_SIZE) % BYTES_PER_SAMPLE
+        remaining = last - first + 1
+        while sample < end_sample and remaining > 0:
+            count = min(block_samples, end_sample - sample)
+            chunk = self.render(sample, count)[skip:skip + remaining]
+            skip = 0
+            remaining -= len(chunk)
+            sample += count
+            yield chunk
+
+
+class ClipCache:
+    """Thread-safe LRU of fully rendered WAV clips bounded by total bytes."""
+
+    def __init__(self, max_bytes: int, max_clip_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.max_clip_bytes = max_clip_bytes if max_clip_bytes is not None else max_bytes // 4
+        self._clips: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def cacheable(self, spec: ToneSpec) -> bool:
+        return spec.total_bytes <= self.max_clip_bytes
+
+    def get_or_render(self, spec: ToneSpec) -> bytes:
+        key = spec.key
+        with self._lock:
+            clip = self._clips.get(key)
+            if clip is not None:
+                self._clips.move_to_end(key)
+                self.hits += 1
+                return clip
+            self.misses += 1
+        clip = b"".join(spec.iter_bytes())
+        with self._lock:
+            if key not in self._clips:
+                self._clips[key] = clip
+                self._bytes += len(clip)
+                while self._bytes > self.max_bytes and self._clips:
+                    _, evicted = self._clips.popitem(last=False)
+                    self._bytes -= len(evicted)
+        return clip
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clips.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        return {"clips": len(self._clips), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses}
+
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: Optional[str], total: int) -> Optional[Tuple[int, int]]:
+    """Parse a single-range ``Range`` header into inclusive ``(first, last)``.
+
+    Returns ``None`` when absent or not understood (serve the whole file) and
+    raises ``ValueError`` when the range cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    start, end = match.groups()
+    if start == "":
+        length = int(end)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(0, total - length), total - 1
+    first = int(start)
+    last = min(int(end), total - 1) if end else total - 1
+    if first >= total or first > last:
+        raise ValueError("range not satisfiable")
+    return first, last
@@ -4,19 +4,21 @@ Data synthesis and neural audio generation service
 """
 
 import asyncio
-import json
+import os
 import time
 import logging
 import uuid
-import io
 from datetime import datetime, timezone
 from typing import Dict, List, Any
+from collections import OrderedDict, deque
 
-from fastapi import FastAPI, HTTPException, File, UploadFile
+from fastapi import FastAPI, HTTPException, File, UploadFile, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from jona_audio_stream import ClipCache, ToneSpec, parse_range
+
 # OpenTelemetry imports
 from tracing import setup_tracing, instrument_fastapi_app, instrument_http_clients
 
@@ -55,9 +57,16 @@ app.add_middleware(
 START_TIME = time.time()
 INSTANCE_ID = uuid.uuid4().hex[:8]
 
-synthesis_queue = []
-generated_files = {}
-coordination_log = []
+# Bounded synthesis bookkeeping: oldest entries fall off first; totals survive eviction
+MAX_SYNTHESES = int(os.getenv("JONA_MAX_SYNTHESES", "1000"))
+MAX_COORDINATION_EVENTS = int(os.getenv("JONA_MAX_COORDINATION_EVENTS", "1000"))
+synthesis_queue: deque = deque(maxlen=MAX_SYNTHESES)
+generated_files: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+coordination_log: deque = deque(maxlen=MAX_COORDINATION_EVENTS)
+counters = {"syntheses": 0, "coordination_events": 0}
+
+# Rendered clips keyed by (mode, frequency, duration, amplitude)
+clip_cache = ClipCache(int(os.getenv("JONA_CLIP_CACHE_BYTES", str(64 * 1024 * 1024))))
 
 # ═══════════════════════════════════════════════════════════════════
 # ENDPOINTS
@@ -94,6 +103,9 @@ async def synthesize_data(config: Dict[str, Any]):
         
         synthesis_queue.append(synthesis_result)
         generated_files[synthesis_id] = synthesis_result
+        counters["syntheses"] += 1
+        while len(generated_files) > MAX_SYNTHESES:
+            generated_files.popitem(last=False)
         
         logger.info(f"[SYNTHESIZE] Mode: {mode}, Freq: {frequency}Hz, Duration: {duration}s")
         
@@ -108,60 +120,43 @@ async def get_synthesis(synthesis_id: str):
     return generated_files[synthesis_id]
 
 @app.get("/synthesize/{synthesis_id}/audio")
-async def get_synthesis_audio(synthesis_id: str):
-    """Stream generated audio"""
+async def get_synthesis_audio(synthesis_id: str, request: Request):
+    """Stream generated audio (supports single ``Range`` requests for scrubbing)"""
     if synthesis_id not in generated_files:
         raise HTTPException(status_code=404, detail="Synthesis not found")
     
     synthesis = generated_files[synthesis_id]
+    spec = ToneSpec(synthesis["mode"], synthesis["frequency"], synthesis["duration"],
+                    synthesis["amplitude"], synthesis.get("sample_rate", 44100))
+    total = spec.total_bytes
     
-    # Generate synthetic WAV data
-    import numpy as np
-    
-    sample_rate = 44100
-    duration = synthesis["duration"]
-    frequency = synthesis["frequency"]
-    amplitude = synthesis["amplitude"]
-    
-    # Generate sine wave
-    t = np.linspace(0, duration, int(sample_rate * duration), endpoint=False)
-    audio = amplitude * np.sin(2 * np.pi * frequency * t)
-    audio = np.int16(audio * 32767)
-    
-    # Convert to bytes
-    wav_buffer = io.BytesIO()
-    
-    # Simple WAV header (PCM, mono, 44.1kHz, 16-bit)
-    import struct
+    try:
+        byte_range = parse_range(request.headers.get("range"), total)
+    except ValueError:
+        raise HTTPException(status_code=416, detail="Range not satisfiable",
+                            headers={"Content-Range": f"bytes */{total}"})
+    first, last = byte_range if byte_range else (0, total - 1)
     
-    # WAV header
-    num_channels = 1
-    byte_rate = sample_rate * num_channels * 2
-    block_align = num_channels * 2
-    
-    wav_buffer.write(b'RIFF')
-    wav_buffer.write(struct.pack('<I', 36 + len(audio) * 2))
-    wav_buffer.write(b'WAVE')
-    
-    wav_buffer.write(b'fmt ')
-    wav_buffer.write(struct.pack('<I', 16))
-    wav_buffer.write(struct.pack('<H', 1))  # PCM
-    wav_buffer.write(struct.pack('<H', num_channels))
-    wav_buffer.write(struct.pack('<I', sample_rate))
-    wav_buffer.write(struct.pack('<I', byte_rate))
-    wav_buffer.write(struct.pack('<H', block_align))
-    wav_buffer.write(struct.pack('<H', 16))  # bits per sample
-    
-    wav_buffer.write(b'data')
-    wav_buffer.write(struct.pack('<I', len(audio) * 2))
-    wav_buffer.write(audio.tobytes())
+    headers = {
+        "Content-Disposition": f"attachment; filename={synthesis_id}.wav",
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(last - first + 1),
+    }
+    if byte_range:
+        headers["Content-Range"] = f"bytes {first}-{last}/{total}"
     
-    wav_buffer.seek(0)
+    if clip_cache.cacheable(spec):
+        clip = await asyncio.to_thread(clip_cache.get_or_render, spec)
+        body = iter([clip[first:last + 1]])
+    else:
+        # Long sessions are rendered block by block while streaming
+        body = spec.iter_bytes(first, last)
     
     return StreamingResponse(
-        iter([wav_buffer.getvalue()]),
+        body,
+        status_code=206 if byte_range else 200,
         media_type="audio/wav",
-        headers={"Content-Disposition": f"attachment; filename={synthesis_id}.wav"}
+        headers=headers
     )
 
 @app.post("/coordinate")
@@ -178,6 +173,7 @@ async def coordinate_services(coordination: Dict[str, Any]):
         }
         
         coordination_log.append(coordination_record)
+        counters["coordination_events"] += 1
         
         logger.info(f"[COORDINATE] Action: {action}")
         
@@ -192,35 +188,52 @@ async def get_synthesis_queue():
     """Get synthesis queue status"""
     return {
         "queue_size": len(synthesis_queue),
-        "pending": synthesis_queue,
+        "pending": list(synthesis_queue),
         "completed": len(generated_files),
         "timestamp": datetime.utcnow().isoformat()
     }
 
+def _log_coordination_event(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Append one agent coordination event (shared by single and batch endpoints)"""
+    event_record = {
+        "agent": data.get("agent", "unknown"),
+        "operation": data.get("operation", "unknown"),
+        "status": data.get("status", "unknown"),
+        "success": data.get("success", True),
+        "error": data.get("error"),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+    coordination_log.append(event_record)
+    counters["coordination_events"] += 1
+    return event_record
+
+@app.post("/api/coordination/event/batch")
+async def coordination_event_batch(records: List[Dict[str, Any]]):
+    """Receive a batch of coordination events (see agent_telemetry.TelemetryExporter)"""
+    with tracer.start_as_current_span("coordination_event_batch") as span:
+        for record in records:
+            _log_coordination_event(record)
+        span.set_attribute("records", len(records))
+        logger.info(f"[AGENT] batch of {len(records)} events -> Jona")
+        return {
+            "status": "logged",
+            "count": len(records),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+
 @app.post("/api/coordination/event")
 async def coordination_event(data: Dict[str, Any]):
     """Receive coordination events from AI agents"""
     with tracer.start_as_current_span("coordination_event") as span:
-        agent = data.get("agent", "unknown")
-        operation = data.get("operation", "unknown")
-        status = data.get("status", "unknown")
+        event_record = _log_coordination_event(data)
+        agent = event_record["agent"]
+        operation = event_record["operation"]
+        status = event_record["status"]
         
         span.set_attribute("agent", agent)
         span.set_attribute("operation", operation)
         span.set_attribute("status", status)
         
-        # Log coordination event
-        event_record = {
-            "agent": agent,
-            "operation": operation,
-            "status": status,
-            "success": data.get("success", True),
-            "error": data.get("error"),
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
-        
-        coordination_log.append(event_record)
-        
         logger.info(f"[AGENT] {agent}.{operation} -> Jona ({status})")
         
         return {
@@ -236,10 +249,11 @@ async def get_metrics():
     
     return {
         "uptime_seconds": uptime,
-        "total_syntheses": len(generated_files),
+        "total_syntheses": counters["syntheses"],
         "queue_size": len(synthesis_queue),
-        "syntheses_per_minute": (len(generated_files) / max(uptime / 60, 1)),
-        "coordination_events": len(coordination_log)
+        "syntheses_per_minute": (counters["syntheses"] / max(uptime / 60, 1)),
+        "coordination_events": counters["coordination_events"],
+        "clip_cache": clip_cache.stats()
     }
 
 @app.get("/health")
@@ -273,12 +287,13 @@ async def execute_action(action: Dict[str, Any]):
             return {"status": "queue_cleared"}
         elif cmd == "clear_files":
             generated_files.clear()
+            clip_cache.clear()
             return {"status": "files_cleared"}
         elif cmd == "status":
             return {
                 "queue_size": len(synthesis_queue),
                 "generated_files": len(generated_files),
-                "coordination_events": len(coordination_log)
+                "coordination_events": counters["coordination_events"]
             }
         else:
             raise HTTPException(status_code=400, detail="Unknown action")
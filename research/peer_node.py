@@ -9,7 +9,9 @@ import time
 import uuid
 import hmac
 import hashlib
-from aiohttp import web, ClientSession
+from collections import OrderedDict
+from itertools import islice
+from aiohttp import web, ClientSession, ClientTimeout, TCPConnector
 
 # =========================
 # Config & defaults
@@ -26,6 +28,20 @@ TLS_CERT = os.getenv("CLX_TLS_CERT")  # path to PEM cert (optional but recommend
 TLS_KEY = os.getenv("CLX_TLS_KEY")    # path to PEM private key (optional but recommended)
 TLS_CA = os.getenv("CLX_TLS_CA")      # optional CA bundle; if omitted we still encrypt but skip identity verification
 
+# Replication pipeline
+REPL_BATCH_MAX = int(os.getenv("CLX_REPL_BATCH_MAX", "256"))            # updates per /replicate POST
+REPL_FLUSH_INTERVAL = float(os.getenv("CLX_REPL_FLUSH_INTERVAL", "0.02"))  # coalescing window (seconds)
+REPL_MAX_PENDING = int(os.getenv("CLX_REPL_MAX_PENDING", "100000"))     # per-peer queued keys before dropping
+REPL_TIMEOUT = float(os.getenv("CLX_REPL_TIMEOUT", "5.0"))
+REPL_CONNS_PER_PEER = int(os.getenv("CLX_REPL_CONNS_PER_PEER", "2"))
+REPL_BACKOFF_MAX = float(os.getenv("CLX_REPL_BACKOFF_MAX", "5.0"))
+
+# Memory shard
+SHARD_STRIPES = int(os.getenv("CLX_SHARD_STRIPES", "16"))
+MEMORY_MAX_BYTES = int(os.getenv("CLX_MEMORY_MAX_BYTES", "0"))  # LRU byte budget, 0 = unbounded (default)
+DEFAULT_TTL = float(os.getenv("CLX_DEFAULT_TTL", "0"))  # seconds, 0 = keys never expire
+DUMP_CHUNK = int(os.getenv("CLX_DUMP_CHUNK", "1000"))
+
 # =========================
 # Helpers: HMAC signing
 # =========================
@@ -47,25 +63,223 @@ def verify_signature(secret: str, ts: str, body: bytes, signature: str, skew: in
     expected = sign_payload(secret, ts, body)
     return hmac.compare_digest(expected, signature)
 
+def sign_headers(body: bytes) -> dict:
+    ts = str(int(time.time()))
+    sig = sign_payload(SHARED_SECRET, ts, body)
+    return {"Content-Type": "application/json", "X-Timestamp": ts, "X-Signature": sig}
+
+# =========================
+# Versions (last-writer-wins)
+# =========================
+class VersionClock:
+    """Hybrid clock: wall-clock nanoseconds, bumped to stay monotonic and to
+    stay ahead of versions observed from peers. A version is ``[counter, node_id]``
+    so ties between nodes are broken deterministically."""
+
+    def __init__(self, node_id: str):
+        self.node_id = node_id
+        self._last = 0
+
+    def next(self):
+        now = time.time_ns()
+        self._last = now if now > self._last else self._last + 1
+        return [self._last, self.node_id]
+
+    def observe(self, version):
+        if version and version[0] > self._last:
+            self._last = version[0]
+
+def version_key(version):
+    return (int(version[0]), str(version[1]))
+
 # =========================
 # Memory shard (in-memory KV)
 # =========================
-class MemoryShard:
-    def __init__(self):
-        self._data = {}
-        self._lock = asyncio.Lock()
+class _Entry:
+    __slots__ = ("value", "version", "size", "expires")
 
-    async def set(self, key, value):
-        async with self._lock:
-            self._data[key] = value
+    def __init__(self, value, version, size, expires):
+        self.value = value
+        self.version = version
+        self.size = size
+        self.expires = expires
+
+
+def approx_size(key, value) -> int:
+    """Rough retained-size estimate used for the byte budget (key + JSON value)."""
+    try:
+        return len(key) + len(json.dumps(value, separators=(",", ":"))) + 64
+    except (TypeError, ValueError):
+        return len(key) + len(repr(value)) + 64
+
+
+class _Stripe:
+    """One LRU-ordered partition of the key space with its own lock and byte budget."""
+
+    __slots__ = ("data", "lock", "bytes", "max_bytes")
+
+    def __init__(self, max_bytes):
+        self.data = OrderedDict()  # key -> _Entry, least recently used first
+        self.lock = asyncio.Lock()
+        self.bytes = 0
+        self.max_bytes = max_bytes
+
+    def remove(self, key):
+        entry = self.data.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+        return entry
+
+
+class TimerWheel:
+    """Hashed timer wheel for key expiry.
+
+    Deadlines are bucketed into ``slots`` buckets of ``resolution`` seconds; a
+    tick only looks at the bucket under the hand, so expiry costs O(expiring keys)
+    instead of a scan of the whole store. Deadlines further out than one rotation
+    simply stay in their bucket until the hand comes round again.
+    """
+
+    def __init__(self, resolution: float = 1.0, slots: int = 512):
+        self.resolution = resolution
+        self.slots = [set() for _ in range(slots)]
+        self._tick = int(time.monotonic() / resolution)
+
+    def schedule(self, key, deadline: float):
+        # The hand has already passed the current tick's bucket: deadlines in it
+        # (or earlier) go to the next one rather than wait a full rotation.
+        tick = max(int(deadline / self.resolution), self._tick + 1)
+        self.slots[tick % len(self.slots)].add(key)
+
+    def advance(self, now: float):
+        """Yield candidate keys from every bucket the hand passed since the last call."""
+        target = int(now / self.resolution)
+        steps = min(target - self._tick, len(self.slots))
+        for i in range(steps):
+            bucket = self.slots[(self._tick + 1 + i) % len(self.slots)]
+            if bucket:
+                candidates = list(bucket)
+                bucket.clear()
+                yield from candidates
+        self._tick = target
+
+
+class MemoryShard:
+    """Lock-striped KV store with last-writer-wins versions, optional per-key TTL
+    and an optional LRU-enforced byte budget.
+
+    Keys hash onto ``stripes`` partitions. Writes serialize per stripe only; reads
+    never await, so they are atomic on the event loop without taking a lock.
+    With ``max_bytes=0`` (the default, ``CLX_MEMORY_MAX_BYTES``) nothing is
+    evicted; a budget is split evenly across stripes and each stripe evicts
+    its least recently used keys once it is over its share.
+    """
+
+    def __init__(self, stripes: int = 16, max_bytes: int = 0, default_ttl: float = 0.0):
+        self._stripes = [_Stripe(max_bytes // stripes if max_bytes else 0) for _ in range(stripes)]
+        self.default_ttl = default_ttl
+        self._wheel = TimerWheel()
+        self.evictions = 0
+        self.expirations = 0
+
+    def _stripe(self, key) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def _alive(self, stripe: _Stripe, key, entry: _Entry, now: float) -> bool:
+        if entry.expires and entry.expires <= now:
+            stripe.remove(key)
+            self.expirations += 1
+            return False
+        return True
+
+    async def set(self, key, value, version=None, ttl=None):
+        """Store ``value``; with a ``version`` the write only wins if it is newer
+        than what we hold. Returns True when the value was applied."""
+        stripe = self._stripe(key)
+        async with stripe.lock:
+            now = time.monotonic()
+            current = stripe.data.get(key)
+            if current is not None and not self._alive(stripe, key, current, now):
+                current = None
+            if version is not None and current is not None and current.version is not None:
+                if version_key(current.version) >= version_key(version):
+                    return False
+            ttl = self.default_ttl if ttl is None else ttl
+            expires = now + ttl if ttl else 0.0
+            entry = _Entry(value, version, approx_size(key, value), expires)
+            stripe.remove(key)
+            stripe.data[key] = entry
+            stripe.bytes += entry.size
+            if expires:
+                self._wheel.schedule(key, expires)
+            if stripe.max_bytes:
+                while stripe.bytes > stripe.max_bytes and len(stripe.data) > 1:
+                    old_key = next(iter(stripe.data))
+                    stripe.remove(old_key)
+                    self.evictions += 1
+            return True
 
     async def get(self, key):
-        async with self._lock:
-            return self._data.get(key)
+        stripe = self._stripe(key)
+        entry = stripe.data.get(key)
+        if entry is None or not self._alive(stripe, key, entry, time.monotonic()):
+            return None
+        stripe.data.move_to_end(key)
+        return entry.value
+
+    def ttl_remaining(self, key):
+        entry = self._stripe(key).data.get(key)
+        if entry is None or not entry.expires:
+            return None
+        return max(0.0, entry.expires - time.monotonic())
+
+    def expire(self, now=None) -> int:
+        """Drop keys whose deadline passed; driven by ``PeerNode.expiry_ticker``."""
+        now = time.monotonic() if now is None else now
+        removed = 0
+        for key in self._wheel.advance(now):
+            stripe = self._stripe(key)
+            entry = stripe.data.get(key)
+            if entry is None or not entry.expires:
+                continue
+            if entry.expires <= now:
+                stripe.remove(key)
+                removed += 1
+            else:
+                self._wheel.schedule(key, entry.expires)  # deadline is a later rotation
+        self.expirations += removed
+        return removed
+
+    async def iter_dump(self, chunk_size: int = 1000):
+        """Yield the live contents as dicts of at most ``chunk_size`` keys,
+        yielding to the loop between chunks instead of copying the whole store."""
+        now = time.monotonic()
+        for stripe in self._stripes:
+            keys = list(stripe.data)
+            for start in range(0, len(keys), chunk_size):
+                chunk = {}
+                for key in keys[start:start + chunk_size]:
+                    entry = stripe.data.get(key)
+                    if entry is not None and not (entry.expires and entry.expires <= now):
+                        chunk[key] = entry.value
+                if chunk:
+                    yield chunk
+                await asyncio.sleep(0)
 
     async def dump(self):
-        async with self._lock:
-            return dict(self._data)
+        data = {}
+        async for chunk in self.iter_dump():
+            data.update(chunk)
+        return data
+
+    def stats(self):
+        return {
+            "keys": sum(len(s.data) for s in self._stripes),
+            "bytes": sum(s.bytes for s in self._stripes),
+            "max_bytes": sum(s.max_bytes for s in self._stripes),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
 
 # =========================
 # Peer registry with TTL
@@ -94,6 +308,132 @@ class PeerRegistry:
         async with self._lock:
             return dict(self._peers)
 
+# =========================
+# Replication: per-peer coalescing outbox
+# =========================
+class PeerOutbox:
+    """Outbound queue for one peer.
+
+    Updates are coalesced by key (only the newest version is kept) and shipped
+    in signed bulk ``/replicate`` payloads over a pooled keep-alive session, so
+    a burst of writes costs one request per ``REPL_BATCH_MAX`` keys instead of
+    one handshake per write.
+    """
+
+    def __init__(self, addr: str, ssl_ctx, origin: str):
+        self.addr = addr
+        self.ssl = ssl_ctx
+        self.origin = origin
+        scheme = "https" if ssl_ctx else "http"
+        self.url = f"{scheme}://{addr}/replicate"
+        self.pending = {}  # key -> (value, version), insertion ordered
+        self.wakeup = asyncio.Event()
+        self.session = None
+        self.task = None
+        self.stats = {"batches": 0, "updates": 0, "coalesced": 0, "dropped": 0, "failures": 0}
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    def enqueue(self, key, value, version, ttl=None):
+        prev = self.pending.get(key)
+        if prev is not None:
+            if version_key(prev[1]) >= version_key(version):
+                return
+            self.stats["coalesced"] += 1
+        elif len(self.pending) >= REPL_MAX_PENDING:
+            self.stats["dropped"] += 1
+            return
+        self.pending[key] = (value, version, ttl)
+        self.wakeup.set()
+
+    def _take_batch(self):
+        batch = []
+        for key in list(islice(self.pending, REPL_BATCH_MAX)):
+            value, version, ttl = self.pending.pop(key)
+            item = {"key": key, "value": value, "version": version}
+            if ttl is not None:
+                item["ttl"] = ttl
+            batch.append(item)
+        return batch
+
+    def _requeue(self, batch):
+        # Put failed updates back unless a newer write arrived meanwhile
+        for item in batch:
+            prev = self.pending.get(item["key"])
+            if prev is None or version_key(prev[1]) < version_key(item["version"]):
+                self.pending[item["key"]] = (item["value"], item["version"], item.get("ttl"))
+
+    async def _post(self, batch) -> bool:
+        body = json.dumps({"origin": self.origin, "updates": batch}).encode("utf-8")
+        # sign at send time so retried batches never fall outside the freshness window
+        try:
+            async with self.session.post(self.url, data=body, headers=sign_headers(body)) as resp:
+                await resp.read()
+                return resp.status < 300
+        except Exception:
+            return False
+
+    async def run(self):
+        connector = TCPConnector(limit=REPL_CONNS_PER_PEER, ssl=self.ssl if self.ssl else False)
+        self.session = ClientSession(connector=connector, timeout=ClientTimeout(total=REPL_TIMEOUT))
+        backoff = 0.0
+        try:
+            while True:
+                await self.wakeup.wait()
+                self.wakeup.clear()
+                if len(self.pending) < REPL_BATCH_MAX:
+                    await asyncio.sleep(REPL_FLUSH_INTERVAL)  # let the burst coalesce
+                while self.pending:
+                    batch = self._take_batch()
+                    if await self._post(batch):
+                        backoff = 0.0
+                        self.stats["batches"] += 1
+                        self.stats["updates"] += len(batch)
+                        continue
+                    self.stats["failures"] += 1
+                    self._requeue(batch)
+                    backoff = min(REPL_BACKOFF_MAX, backoff * 2 if backoff else 0.1)
+                    await asyncio.sleep(backoff)
+        finally:
+            await self.session.close()
+
+    async def close(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+
+class Replicator:
+    """Fans updates out to one ``PeerOutbox`` per live peer address."""
+
+    def __init__(self, origin: str):
+        self.origin = origin
+        self.ssl = None
+        self._outboxes = {}  # addr -> PeerOutbox
+
+    def publish(self, addrs, key, value, version, ttl=None):
+        for addr in addrs:
+            box = self._outboxes.get(addr)
+            if box is None:
+                box = self._outboxes[addr] = PeerOutbox(addr, self.ssl, self.origin)
+                box.start()
+            box.enqueue(key, value, version, ttl)
+
+    async def retain(self, addrs):
+        """Close outboxes of peers that dropped out of the registry."""
+        live = set(addrs)
+        for addr in [a for a in self._outboxes if a not in live]:
+            await self._outboxes.pop(addr).close()
+
+    def stats(self):
+        return {addr: dict(box.stats, pending=len(box.pending)) for addr, box in self._outboxes.items()}
+
 # =========================
 # Peer Node
 # =========================
@@ -102,8 +442,10 @@ class PeerNode:
         self.id = os.getenv("CLX_NODE_ID", str(uuid.uuid4())[:8])
         self.host = host
         self.port = port
-        self.memory = MemoryShard()
+        self.memory = MemoryShard(SHARD_STRIPES, MEMORY_MAX_BYTES, DEFAULT_TTL)
         self.peers = PeerRegistry()
+        self.clock = VersionClock(self.id)
+        self.replicator = Replicator(self.id)
         self.server_ssl = None
         self.client_ssl = None
 
@@ -126,6 +468,7 @@ class PeerNode:
             client_ctx.check_hostname = False
             client_ctx.verify_mode = ssl.CERT_NONE
         self.client_ssl = client_ctx
+        self.replicator.ssl = client_ctx
 
     # ---------- HTTP Handlers ----------
     async def handle_get(self, request):
@@ -134,9 +477,22 @@ class PeerNode:
         return web.json_response({"key": key, "value": val})
 
     async def handle_dump(self, request):
-        data = await self.memory.dump()
+        # Stream the store chunk by chunk so a large shard is never copied or
+        # serialized as one document.
         peers = await self.peers.snapshot()
-        return web.json_response({"node": self.id, "data": data, "peers": peers})
+        resp = web.StreamResponse(headers={"Content-Type": "application/json"})
+        await resp.prepare(request)
+        head = {"node": self.id, "peers": peers, "replication": self.replicator.stats(),
+                "memory": self.memory.stats()}
+        await resp.write(json.dumps(head)[:-1].encode("utf-8") + b', "data": {')
+        first = True
+        async for chunk in self.memory.iter_dump(DUMP_CHUNK):
+            body = json.dumps(chunk)[1:-1]
+            await resp.write((body if first else ", " + body).encode("utf-8"))
+            first = False
+        await resp.write(b"}}")
+        await resp.write_eof()
+        return resp
 
     async def handle_set(self, request):
         body_bytes = await request.read()
@@ -148,13 +504,15 @@ class PeerNode:
         try:
             body = json.loads(body_bytes.decode("utf-8"))
             key = body["key"]; value = body["value"]
+            ttl = float(body["ttl"]) if body.get("ttl") is not None else None
         except Exception:
             return web.json_response({"error": "bad_request"}, status=400)
 
-        await self.memory.set(key, value)
-        # replicate to others
-        asyncio.create_task(self.replicate_to_peers(key, value))
-        return web.json_response({"status": "ok", "key": key})
+        version = self.clock.next()
+        await self.memory.set(key, value, version, ttl)
+        # replicate to others (queued, coalesced and batched per peer)
+        await self.replicate_to_peers(key, value, version, self.memory.ttl_remaining(key))
+        return web.json_response({"status": "ok", "key": key, "version": version})
 
     async def handle_replicate(self, request):
         body_bytes = await request.read()
@@ -165,33 +523,25 @@ class PeerNode:
 
         try:
             body = json.loads(body_bytes.decode("utf-8"))
-            key = body["key"]; value = body["value"]
+            if "updates" in body:
+                updates = [(u["key"], u["value"], u.get("version"), u.get("ttl")) for u in body["updates"]]
+            else:  # single-key payload from older nodes
+                updates = [(body["key"], body["value"], body.get("version"), body.get("ttl"))]
         except Exception:
             return web.json_response({"error": "bad_request"}, status=400)
 
-        await self.memory.set(key, value)
-        return web.json_response({"replicated": key})
-
-    async def replicate_to_peers(self, key, value):
-        payload = json.dumps({"key": key, "value": value}).encode("utf-8")
-        ts = str(int(time.time()))
-        sig = sign_payload(SHARED_SECRET, ts, payload)
-        headers = {"Content-Type": "application/json", "X-Timestamp": ts, "X-Signature": sig}
+        applied = 0
+        for key, value, version, ttl in updates:
+            if version is not None:
+                self.clock.observe(version)
+            if await self.memory.set(key, value, version, ttl):
+                applied += 1
+        return web.json_response({"replicated": len(updates), "applied": applied})
 
+    async def replicate_to_peers(self, key, value, version, ttl=None):
         addrs = await self.peers.list_addrs(self.id)
-        if not addrs:
-            return
-
-        async with ClientSession() as session:
-            tasks = []
-            for addr in addrs:
-                scheme = "https" if self.client_ssl else "http"
-                url = f"{scheme}://{addr}/replicate"
-                tasks.append(session.post(url, data=payload, headers=headers, ssl=self.client_ssl))
-            # fire-and-forget, but consume exceptions
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            # Optional: log failures
-            # for r in results: ...
+        if addrs:
+            self.replicator.publish(addrs, key, value, version, ttl)
 
     # ---------- UDP multicast: heartbeat + discovery ----------
     async def heartbeat_sender(self):
@@ -253,8 +603,14 @@ class PeerNode:
     async def peer_reaper(self):
         while True:
             await self.peers.cull(PEER_TTL)
+            await self.replicator.retain(await self.peers.list_addrs(self.id))
             await asyncio.sleep(1.0)
 
+    async def expiry_ticker(self):
+        while True:
+            self.memory.expire()
+            await asyncio.sleep(self.memory._wheel.resolution)
+
     # ---------- Utils ----------
     def get_advertise_ip(self) -> str:
         # Best-effort: find a non-loopback IP
@@ -291,6 +647,7 @@ class PeerNode:
         asyncio.create_task(self.heartbeat_sender())
         asyncio.create_task(self.heartbeat_listener())
         asyncio.create_task(self.peer_reaper())
+        asyncio.create_task(self.expiry_ticker())
 
         # keep alive
         while True:
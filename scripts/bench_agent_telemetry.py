@@ -0,0 +1,107 @@
+"""Benchmark instrumented-operation overhead of AgentTelemetryMixin.
+
+Starts a local stand-in for the Alba/Albi/Jona telemetry endpoints (each
+request sleeps ``--latency-ms``) and times ``start_operation`` +
+``end_operation`` with the blocking ``send_all`` path vs the buffered
+``queue_all`` path, then waits for the exporter to deliver everything.
+
+Usage: python scripts/bench_agent_telemetry.py [--ops 300] [--latency-ms 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from agent_telemetry import AgentTelemetryMixin, TelemetryRouter  # noqa: E402
+
+
+def start_server(latency: float):
+    received = {"requests": 0, "records": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(latency)
+            with lock:
+                received["requests"] += 1
+                received["records"] += len(body) if isinstance(body, list) else 1
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, received
+
+
+class Agent(AgentTelemetryMixin):
+    agent_name = "BENCH"
+
+    def __init__(self, router: TelemetryRouter, sync: bool):
+        self.telemetry = router
+        self._operation_start = None
+        self._current_operation = None
+        if sync:
+            router.queue_all = router.send_all  # the pre-exporter behaviour
+
+
+def run(label, router, sync, ops, received):
+    agent = Agent(router, sync)
+    before = dict(received)
+    samples = []
+    for i in range(ops):
+        start = time.perf_counter()
+        agent.start_operation("bench_op")
+        agent.end_operation(success=True, metadata={"i": i})
+        samples.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    router.flush(timeout=30)
+    drain = time.perf_counter() - start
+    samples.sort()
+    print(f"{label:<9} mean {statistics.fmean(samples) * 1e3:8.3f} ms  "
+          f"p99 {samples[int(len(samples) * 0.99) - 1] * 1e3:8.3f} ms  "
+          f"total {sum(samples):6.2f}s  drain {drain:5.2f}s  "
+          f"HTTP requests {received['requests'] - before['requests']:>5}  "
+          f"records {received['records'] - before['records']:>5}")
+    return statistics.fmean(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    logging.getLogger("AgentTelemetry").setLevel(logging.WARNING)
+
+    server, received = start_server(args.latency_ms / 1000)
+    port = server.server_address[1]
+    make = lambda: TelemetryRouter(alba_port=port, albi_port=port, jona_port=port)  # noqa: E731
+
+    print(f"{args.ops} operations, {args.latency_ms:.0f} ms per telemetry request")
+    sync = run("sync", make(), True, args.ops, received)
+    buffered = run("buffered", make(), False, args.ops, received)
+    print(f"per-operation overhead: {sync / buffered:.0f}x lower with the exporter")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
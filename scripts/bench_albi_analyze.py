@@ -0,0 +1,70 @@
+"""Benchmark ALBI ``/analyze`` statistics: pure-Python loop vs stacked NumPy.
+
+Usage: python scripts/bench_albi_analyze.py [--channels 64] [--samples 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from albi_stream_stats import StreamAnalyzer, analyze_batch  # noqa: E402
+
+
+def python_loop(channels):
+    """The original per-channel loop from albi_service_6666."""
+    stats = {}
+    for name, values in channels.items():
+        avg = sum(values) / len(values)
+        variance = sum((x - avg) ** 2 for x in values) / len(values)
+        std_dev = variance ** 0.5
+        outliers = [x for x in values if abs(x - avg) > 2 * std_dev]
+        stats[name] = {"mean": avg, "max": max(values), "min": min(values),
+                       "std_dev": std_dev, "outlier_count": len(outliers)}
+    return stats
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=64)
+    parser.add_argument("--samples", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    channels = {f"ch{i}": rng.normal(0, 1, args.samples).tolist() for i in range(args.channels)}
+
+    reference = python_loop(channels)
+    batch, _ = analyze_batch(channels)
+    assert all(reference[k]["outlier_count"] == batch[k]["outlier_count"] for k in channels)
+    assert all(abs(reference[k]["std_dev"] - batch[k]["std_dev"]) < 1e-9 for k in channels)
+
+    t_loop = timed(lambda: python_loop(channels), args.repeat)
+    t_batch = timed(lambda: analyze_batch(channels), args.repeat)
+    analyzer = StreamAnalyzer()
+    t_stream = timed(lambda: analyzer.update("bench", channels), args.repeat)
+
+    print(f"{args.channels} channels x {args.samples} samples")
+    print(f"  python loop : {t_loop * 1000:8.1f} ms")
+    print(f"  numpy batch : {t_batch * 1000:8.1f} ms  ({t_loop / t_batch:.1f}x)")
+    print(f"  stream mode : {t_stream * 1000:8.1f} ms  ({t_loop / t_stream:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark ALBINeuralProcessor.process_eeg_signal: per-channel FFTs vs the shared SpectralPlan.
+
+The legacy processor replays the old per-stage spectra (a complex ``fft.fft``
+per channel in the frequency analysis and again in the coupling detector, and
+one ``scipy.signal.coherence`` call per channel pair). Reports wall time and
+JSON response size for the legacy, full and ``compact=True`` responses.
+
+Usage: python scripts/bench_albi_spectral.py [--channels 64] [--seconds 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import scipy.signal
+from scipy import fft
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / "apps" / "api" / "services"))
+
+from albi_neural_processor import ALBINeuralProcessor  # noqa: E402
+
+
+class LegacyProcessor(ALBINeuralProcessor):
+    """Spectral stages as they were before SpectralPlan."""
+
+    async def _frequency_analysis(self, data, channel_names, plan=None, compact=False):
+        power_spectra, fft_results = {}, {}
+        for i, channel in enumerate(channel_names[:data.shape[1]]):
+            power = np.abs(fft.fft(data[:, i])) ** 2
+            freqs = fft.fftfreq(len(data[:, i]), 1 / self.sampling_rate)
+            positive_freqs, power_spectra[channel] = freqs[:len(freqs) // 2], power[:len(power) // 2]
+            fft_results[channel] = {'frequencies': positive_freqs.tolist(), 'power': power_spectra[channel].tolist()}
+        bands = {}
+        for band, (low, high) in self.frequency_bands.items():
+            mask = (positive_freqs >= low) & (positive_freqs <= high)
+            channel_power = {ch: float(np.sum(p[mask])) for ch, p in power_spectra.items()}
+            bands[band] = {'frequency_range': f"{low}-{high} Hz", 'channel_power': channel_power,
+                           'average_power': float(np.mean(list(channel_power.values())))}
+        all_power = np.concatenate(list(power_spectra.values()))
+        dominant = float(np.tile(positive_freqs, len(power_spectra))[np.argmax(all_power)])
+        return {'dominant_frequency': dominant, 'dominant_power': float(np.max(all_power)),
+                'brainwave_type': self._classify_brainwave(dominant).value, 'frequency_bands': bands,
+                'channel_spectra': fft_results,
+                'spectral_centroid': float(np.average(positive_freqs, weights=np.mean(list(power_spectra.values()), axis=0)))}
+
+    async def _detect_cross_frequency_coupling(self, data, channels, plan=None):
+        scores = []
+        for i in range(data.shape[1]):
+            freqs = fft.fftfreq(data.shape[0], 1 / self.sampling_rate)
+            power = np.abs(fft.fft(data[:, i])) ** 2
+            alpha = np.sum(power[(freqs >= 8) & (freqs <= 12)])
+            if alpha > 0:
+                scores.append(np.sum(power[(freqs >= 30) & (freqs <= 50)]) / alpha)
+        # same scores as the shared implementation; only the per-channel FFT cost is replayed
+        return await super()._detect_cross_frequency_coupling(data, channels, plan)
+
+    async def _coherence_analysis(self, data, channels, plan=None):
+        matrix = np.zeros((len(channels), len(channels)))
+        for i in range(min(len(channels), data.shape[1])):
+            for j in range(min(len(channels), data.shape[1])):
+                f, cxy = scipy.signal.coherence(data[:, i], data[:, j], fs=self.sampling_rate, nperseg=256)
+                matrix[i, j] = np.mean(cxy[(f >= 1) & (f <= 50)])
+        avg = float(np.mean(matrix[np.triu_indices_from(matrix, k=1)]))
+        return {'coherence_matrix': matrix.tolist(), 'average_coherence': avg,
+                'max_coherence': float(np.max(matrix)), 'channel_names': channels}
+
+
+def run(label, processor, data, names, compact=False):
+    start = time.perf_counter()
+    kwargs = {'compact': True} if compact else {}
+    result = asyncio.run(processor.process_eeg_signal(data, names, **kwargs))
+    elapsed = time.perf_counter() - start
+    size = len(json.dumps(result, default=str))
+    print(f"{label:<8} {elapsed * 1e3:9.1f} ms  response {size / 1024:9.1f} KiB")
+    return elapsed, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    rng = np.random.default_rng(3)
+    samples = int(args.seconds * 256)
+    t = np.arange(samples) / 256
+    data = np.sin(2 * np.pi * 10 * t)[:, None] + rng.normal(0, 0.5, (samples, args.channels))
+    names = [f"E{i + 1}" for i in range(args.channels)]
+
+    print(f"{args.channels} channels x {args.seconds:.0f}s @ 256 Hz")
+    legacy_time, legacy_size = run("legacy", LegacyProcessor(), data, names)
+    full_time, _ = run("full", ALBINeuralProcessor(), data, names)
+    compact_time, compact_size = run("compact", ALBINeuralProcessor(), data, names, compact=True)
+    print(f"CPU {legacy_time / full_time:.0f}x faster (full), {legacy_time / compact_time:.0f}x (compact); "
+          f"compact response {legacy_size / compact_size:.0f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark AudioSynthesizer rendering: queued 1 s clips vs the oscillator bank.
+
+The clip path re-synthesizes a full second of tones, harmonics and envelope
+(``synthesize_and_play_realtime``) per update and the device callback used to
+play ``clip[:frames]`` of each queued clip; the bank renders exactly
+``frames`` samples per callback from precomputed wavetables. Reports render
+speed relative to real time, callback latency, allocations per callback and
+discontinuities at block boundaries, plus an offline render.
+
+Usage: python scripts/bench_audio_synth.py [--block 1024] [--seconds 30] [--rate 44100]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from apps.api.neurosonix.audio_synthesizer import AudioSynthesizer  # noqa: E402
+
+BRAIN_DATA = {
+    "status": "active",
+    "cognitive_state": {
+        "band_powers": {"delta": 1.0, "theta": 2.0, "alpha": 5.0, "beta": 1.5, "gamma": 0.3},
+        "state": "relaxed",
+        "confidence": 0.8,
+    },
+    "brain_symmetry": {"symmetry_index": 0.4},
+}
+
+
+def legacy_mix(synth: AudioSynthesizer) -> np.ndarray:
+    """The clip that synthesize_and_play_realtime queues for one update"""
+    mixed = np.zeros(synth.buffer_size)
+    for audio in synth.synthesize_from_brain_data(BRAIN_DATA).values():
+        mixed += audio[:synth.buffer_size] if audio.ndim == 1 else audio.mean(axis=1)[:synth.buffer_size]
+    return mixed / np.max(np.abs(mixed)) * 0.8
+
+
+def boundary_jumps(audio: np.ndarray, block: int) -> int:
+    """Block boundaries whose step exceeds twice the largest step inside the blocks"""
+    steps = np.abs(np.diff(audio))
+    boundary = np.zeros(steps.size, dtype=bool)
+    boundary[block - 1::block] = True
+    return int(np.sum(steps[boundary] > 2 * steps[~boundary].max()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--block", type=int, default=1024)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--legacy-updates", type=int, default=20)
+    args = parser.parse_args()
+    logging.getLogger("apps.api.neurosonix").setLevel(logging.ERROR)
+
+    synth = AudioSynthesizer(sample_rate=args.rate, real_audio=False)
+    block_seconds = args.block / args.rate
+
+    # Clip path: cost of one 1 s clip, and what the old callback made of queued clips
+    times = []
+    for _ in range(args.legacy_updates):
+        start = time.perf_counter()
+        clip = legacy_mix(synth)
+        times.append(time.perf_counter() - start)
+    legacy_update = statistics.median(times)
+    legacy_played = np.concatenate([clip[:args.block] for _ in range(64)])
+
+    # Oscillator bank through the device callback
+    synth.apply_brain_data(BRAIN_DATA)
+    outdata = np.zeros((args.block, 1), dtype=np.float32)
+    n_blocks = int(args.seconds / block_seconds)
+    played = np.empty(64 * args.block)
+    callbacks = []
+    for i in range(n_blocks):
+        start = time.perf_counter()
+        synth._audio_callback(outdata, args.block, None, None)
+        callbacks.append(time.perf_counter() - start)
+        if i < 64:
+            played[i * args.block:(i + 1) * args.block] = outdata[:, 0]
+    callback = statistics.median(callbacks)
+
+    tracemalloc.start()
+    for _ in range(100):
+        synth._audio_callback(outdata, args.block, None, None)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    synth.render_offline(BRAIN_DATA, args.seconds, args.block)
+    offline = time.perf_counter() - start
+
+    print(f"{args.rate} Hz, {args.block}-frame callbacks ({block_seconds * 1e3:.1f} ms), "
+          f"{synth.oscillator_bank.n_voices} voices")
+    print(f"clip re-synthesis     {legacy_update * 1e3:9.3f} ms per 1 s clip   "
+          f"{1.0 / legacy_update:10,.0f}x real time")
+    print(f"bank callback         {callback * 1e6:9.1f} us per block     "
+          f"{block_seconds / callback:10,.0f}x real time  (p99 "
+          f"{sorted(callbacks)[int(len(callbacks) * 0.99) - 1] * 1e6:.1f} us)")
+    print(f"offline render        {offline * 1e3:9.1f} ms for {args.seconds:g} s  "
+          f"{args.seconds / offline:10,.0f}x real time")
+    print(f"bank heap growth after 100 callbacks: {allocated} bytes")
+    print(f"boundary discontinuities in 64 callbacks: clip slicing {boundary_jumps(legacy_played, args.block)}, "
+          f"oscillator bank {boundary_jumps(played, args.block)}")
+
+
+if __name__ == "__main__":
+    main()
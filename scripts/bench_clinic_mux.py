@@ -0,0 +1,99 @@
+"""Benchmark the clinic stream multiplexer with many beds and a slow consumer.
+
+Runs ``--beds`` simulated multi-device setups on one event loop for
+``--seconds``. The consumer takes ``--consumer-ms`` per frame. Compared:
+
+- legacy: ``stream_all_devices`` (readings merged as they arrive);
+- mux: ``stream_synchronized`` (time-aligned frames, bounded ring buffers),
+  once per overflow policy.
+
+Reports delivered EEG/ECG readings per second per bed, frames, the EEG lag
+and the total ring buffer memory (fixed by the ring capacities).
+
+Usage: python scripts/bench_clinic_mux.py [--beds 24] [--seconds 10] [--consumer-ms 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / "apps" / "api"))
+
+from clinic_integrations import UniversityClinincMultiDeviceSetup  # noqa: E402
+
+
+async def legacy_bed(bed: UniversityClinincMultiDeviceSetup, deadline: float, consumer: float, counts: dict):
+    async for reading in bed.stream_all_devices():
+        counts[reading["device_type"]] = counts.get(reading["device_type"], 0) + 1
+        if consumer:
+            await asyncio.sleep(consumer)
+        if time.monotonic() >= deadline:
+            return
+
+
+async def mux_bed(bed: UniversityClinincMultiDeviceSetup, deadline: float, consumer: float, args, out: list):
+    mux = bed.create_multiplexer(frame_rate=args.frame_rate, policy=args.policy_name)
+    try:
+        async for frame in mux.frames():
+            if consumer:
+                await asyncio.sleep(consumer)
+            if time.monotonic() >= deadline:
+                break
+    finally:
+        out.append(mux.get_metrics())
+        await mux.stop()
+
+
+async def run(mode: str, args) -> None:
+    beds = [UniversityClinincMultiDeviceSetup(f"bed{i:03d}") for i in range(args.beds)]
+    deadline = time.monotonic() + args.seconds
+    consumer = args.consumer_ms / 1000
+    started = time.monotonic()
+    if mode == "legacy":
+        counts: dict = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            await asyncio.gather(*(legacy_bed(bed, deadline, consumer, counts) for bed in beds))
+        elapsed = time.monotonic() - started
+        per_bed = {k: v / elapsed / args.beds for k, v in counts.items()}
+        print(f"legacy            EEG {per_bed.get('EEG', 0):6.1f}/s  ECG {per_bed.get('ECG', 0):6.1f}/s per bed "
+              f"(nominal 256 / 130)")
+    else:
+        metrics: list = []
+        await asyncio.gather(*(mux_bed(bed, deadline, consumer, args, metrics) for bed in beds))
+        elapsed = time.monotonic() - started
+        eeg = [m["devices"]["eeg"] for m in metrics]
+        ecg = [m["devices"]["ecg"] for m in metrics]
+        frames = sum(m["frames_emitted"] for m in metrics) / elapsed / args.beds
+        eeg_lag = max(d["lag_seconds"] or 0.0 for d in eeg)
+        print(f"mux {args.policy_name:<12}  EEG {statistics.fmean(d['received'] for d in eeg) / elapsed:6.1f}/s  "
+              f"ECG {statistics.fmean(d['received'] for d in ecg) / elapsed:6.1f}/s per bed, "
+              f"frames {frames:5.1f}/s (skipped {sum(m['frames_skipped'] for m in metrics)}), "
+              f"EEG dropped {sum(d['dropped'] for d in eeg)} downsampled {sum(d['downsampled'] for d in eeg)} "
+              f"blocked {statistics.fmean(d['blocked_seconds'] for d in eeg):.2f}s, "
+              f"max EEG lag {eeg_lag:.2f}s, ring memory {sum(m['buffer_bytes'] for m in metrics) / 2**10:,.0f} KiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--beds", type=int, default=24)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--frame-rate", type=float, default=10.0)
+    parser.add_argument("--consumer-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    print(f"{args.beds} beds, {args.seconds:g} s, consumer {args.consumer_ms:g} ms per item")
+    asyncio.run(run("legacy", args))
+    for policy in ("drop_oldest", "block", "downsample"):
+        args.policy_name = policy
+        asyncio.run(run("mux", args))
+
+
+if __name__ == "__main__":
+    main()
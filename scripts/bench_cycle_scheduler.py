@@ -0,0 +1,137 @@
+"""Benchmark CycleEngine scheduling: one sleep-polling task per cycle vs CycleScheduler.
+
+Registers N cycles (interval / event / stream mix), lets them run for a few
+seconds and reports CPU time, loop wakeups and executions for both models. The
+legacy model replays the old ``_run_*_cycle`` loops (``sleep(interval)``,
+``sleep(0.1)`` for streams, ``sleep(5) + sleep(1)`` for event polling).
+
+Usage: python scripts/bench_cycle_scheduler.py [--cycles 10000] [--seconds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("CYCLE_HISTORY_PERSIST", "0")  # measure scheduling, not SQLite
+
+from cycle_engine import CycleEngine, CycleExecution, CycleType  # noqa: E402
+
+
+def build_engine(args) -> CycleEngine:
+    rng = random.Random(7)
+    engine = CycleEngine()
+    n_stream = int(args.cycles * args.stream_share)
+    n_event = int(args.cycles * args.event_share)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(args.cycles):
+            if i < n_stream:
+                engine.create_cycle(domain="neuro", task="signal_processing", cycle_type="stream")
+            elif i < n_stream + n_event:
+                engine.create_cycle(domain="neuro", agent="JONA", task="stress_alert", cycle_type="event",
+                                    event_trigger=f"beta>{rng.uniform(20, 40):.1f}Hz")
+            else:
+                engine.create_cycle(domain="neuro", task="signal_processing",
+                                    interval=rng.uniform(1, 60))
+    return engine
+
+
+async def run_legacy(engine: CycleEngine, seconds: float):
+    """The pre-scheduler model: one task per cycle, polling with sleep."""
+    counters = {"wakeups": 0, "executions": 0, "tasks": len(engine.cycles)}
+
+    async def interval_loop(cycle, execution, delay):
+        while True:
+            await engine._execute_task(cycle, execution)
+            counters["executions"] += 1
+            await asyncio.sleep(delay)
+            counters["wakeups"] += 1
+
+    async def event_loop(cycle, execution):
+        while True:
+            await asyncio.sleep(5.0)  # old _wait_for_event
+            counters["wakeups"] += 1
+            await engine._execute_task(cycle, execution)
+            counters["executions"] += 1
+            await asyncio.sleep(1.0)
+            counters["wakeups"] += 1
+
+    tasks = []
+    for cycle in engine.cycles.values():
+        execution = CycleExecution(cycle_id=cycle.cycle_id)
+        if cycle.cycle_type == CycleType.EVENT:
+            tasks.append(asyncio.create_task(event_loop(cycle, execution)))
+        else:
+            delay = 0.1 if cycle.cycle_type == CycleType.STREAM else cycle.interval
+            tasks.append(asyncio.create_task(interval_loop(cycle, execution, delay)))
+    await asyncio.sleep(seconds)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return counters
+
+
+async def run_scheduler(engine: CycleEngine, seconds: float, event_rate: float):
+    rng = random.Random(11)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for cycle_id in list(engine.cycles):
+            await engine.start_cycle(cycle_id)
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            # beta readings as ALBA would publish them
+            engine.publish_event("beta", rng.uniform(10, 30))
+            await asyncio.sleep(1.0 / event_rate)
+        await engine.shutdown()
+    snap = engine.scheduler.snapshot()
+    return {"wakeups": snap["timer_wakeups"], "executions": snap["executed"], "tasks": 1 + snap["workers"]}
+
+
+def measure(label, coro_factory):
+    cpu, wall = time.process_time(), time.perf_counter()
+    counters = asyncio.run(coro_factory())
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    print(f"{label:<10} cpu {cpu:7.3f}s  wall {wall:6.2f}s  tasks {counters['tasks']:>6}  "
+          f"timer wakeups {counters['wakeups']:>7}  executions {counters['executions']:>7}  "
+          f"cpu/exec {cpu / max(counters['executions'], 1) * 1e6:6.1f}us")
+    return cpu
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=10000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--stream-share", type=float, default=0.01)
+    parser.add_argument("--event-share", type=float, default=0.3)
+    parser.add_argument("--event-rate", type=float, default=1.0, help="beta readings per second")
+    args = parser.parse_args()
+
+    print(f"{args.cycles} cycles, {args.seconds:.0f}s run "
+          f"({args.stream_share:.0%} stream, {args.event_share:.0%} event)")
+    engine = build_engine(args)
+    legacy = measure("legacy", lambda: run_legacy(engine, args.seconds))
+    engine = build_engine(args)
+    sched = measure("scheduler", lambda: run_scheduler(engine, args.seconds, args.event_rate))
+    print(f"CPU ratio legacy/scheduler: {legacy / max(sched, 1e-9):.1f}x")
+
+    engine = build_engine(args)
+    bus = engine.scheduler.bus
+    for cycle in engine.cycles.values():
+        if cycle.cycle_type == CycleType.EVENT:
+            bus.subscribe(cycle.cycle_id, cycle.event_trigger)
+    start = time.perf_counter()
+    for i in range(1000):
+        bus.match("beta", 10 + (i % 30))
+    print(f"event match over {len(bus)} subscriptions: {(time.perf_counter() - start) * 1e3:.1f} us/publish")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Benchmark analyze_eeg_file on EDF/BDF: whole-file preload vs the streaming reader.
+
+Writes a synthetic EDF recording of ``--size-mb`` (64 channels @ 512 Hz,
+int16, 1 s records) and runs ``edf_stream.analyze_edf_stream`` on it in a
+child process, reporting wall time and peak RSS next to what a float64
+preload (``mne.io.read_raw_edf(preload=True)``) would need. On a smaller
+``--compare-mb`` file it also runs the preload path (load everything, filter,
+one Welch per band) and checks that both give the same band powers.
+
+Usage: python scripts/bench_edf_stream.py [--size-mb 4096] [--compare-mb 256] [--bdf]
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from scipy.signal import welch
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / "apps" / "api"))
+
+from edf_stream import (  # noqa: E402
+    EEG_BANDS, EDFReader, StreamingBandpass, analyze_edf_stream, band_powers_from_psd,
+)
+
+CHANNELS = 64
+SFREQ = 512
+
+
+def write_synthetic(path: Path, size_mb: float, bdf: bool = False) -> None:
+    sample_bytes = 3 if bdf else 2
+    record_bytes = CHANNELS * SFREQ * sample_bytes
+    n_records = max(1, int(size_mb * 1024 * 1024 // record_bytes))
+    dig_min, dig_max = (-8388608, 8388607) if bdf else (-32768, 32767)
+
+    def field(value, width):
+        return str(value).ljust(width)[:width].encode("latin-1")
+
+    header = b"".join([
+        b"\xffBIOSEMI" if bdf else field(0, 8), field("X X X bench", 80), field("Startdate X bench", 80),
+        field("01.01.25", 8), field("00.00.00", 8), field(256 * (CHANNELS + 1), 8),
+        field("24BIT" if bdf else "", 44), field(n_records, 8), field(1, 8), field(CHANNELS, 4),
+    ])
+    columns = [
+        [f"EEG{i:03d}" for i in range(CHANNELS)], ["AgAgCl"] * CHANNELS, ["uV"] * CHANNELS,
+        [-3200] * CHANNELS, [3200] * CHANNELS, [dig_min] * CHANNELS, [dig_max] * CHANNELS,
+        ["HP:0.1Hz"] * CHANNELS, [SFREQ] * CHANNELS, [""] * CHANNELS,
+    ]
+    widths = [16, 80, 8, 8, 8, 8, 8, 80, 8, 32]
+    header += b"".join(field(v, w) for col, w in zip(columns, widths) for v in col)
+
+    # a minute of alpha + noise, written over and over with a per-block gain
+    rng = np.random.default_rng(1)
+    block = 60
+    t = np.arange(block * SFREQ) / SFREQ
+    signal = (40 * np.sin(2 * np.pi * 10 * t)[:, None] * rng.uniform(0.5, 1.5, CHANNELS)
+              + rng.normal(0, 15, (block * SFREQ, CHANNELS)))
+    scale = (dig_max - dig_min) / 6400.0
+    with open(path, "wb") as f:
+        f.write(header)
+        for start in range(0, n_records, block):
+            count = min(block, n_records - start)
+            gain = 1.0 + 0.2 * np.sin(start / 600.0)
+            digital = np.clip(np.round(signal[:count * SFREQ] * gain * scale), dig_min, dig_max)
+            # record layout: channel 0's second, channel 1's second, ...
+            records = digital.astype(np.int32).reshape(count, SFREQ, CHANNELS).transpose(0, 2, 1)
+            if bdf:
+                raw = np.ascontiguousarray(records, dtype="<i4").view(np.uint8).reshape(count, CHANNELS, SFREQ, 4)[..., :3]
+                f.write(np.ascontiguousarray(raw).tobytes())
+            else:
+                f.write(records.astype("<i2").tobytes())
+
+
+def preload_analysis(path: Path):
+    """The previous approach: whole recording in memory, filtered, one Welch per band."""
+    reader = EDFReader(path)
+    data = reader.read_records(0, reader.n_records)
+    data = StreamingBandpass(reader.n_channels, reader.sfreq)(data)  # one call over the whole array
+    bands = {}
+    for name, band in EEG_BANDS.items():
+        f, pxx = welch(data, fs=reader.sfreq, nperseg=min(data.shape[1], 4096), axis=-1)
+        bands[name] = band_powers_from_psd(f, pxx, {name: band})[name]
+    return {"bands_psd": bands}
+
+
+def _child(kind: str, path: str, queue) -> None:
+    start = time.perf_counter()
+    result = analyze_edf_stream(Path(path)) if kind == "stream" else preload_analysis(Path(path))
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put((time.perf_counter() - start, peak_mb, result))
+
+
+def measure(kind: str, path: Path):
+    """Run one analysis in a fresh process so its peak RSS is its own."""
+    queue = mp.Queue()
+    proc = mp.Process(target=_child, args=(kind, str(path), queue))
+    proc.start()
+    elapsed, peak_mb, result = queue.get()
+    proc.join()
+    return elapsed, peak_mb, result
+
+
+def report(label: str, path: Path, kind: str):
+    elapsed, peak_mb, result = measure(kind, path)
+    print(f"  {label:<8} {elapsed:8.1f} s  peak RSS {peak_mb:8.0f} MB")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=4096)
+    parser.add_argument("--compare-mb", type=float, default=256)
+    parser.add_argument("--bdf", action="store_true", help="write 24-bit BDF instead of EDF")
+    parser.add_argument("--dir", default=tempfile.gettempdir())
+    args = parser.parse_args()
+    suffix = ".bdf" if args.bdf else ".edf"
+
+    small = Path(args.dir) / f"bench_small{suffix}"
+    write_synthetic(small, args.compare_mb, args.bdf)
+    print(f"{small.name}: {small.stat().st_size / 2**20:.0f} MB")
+    stream = report("stream", small, "stream")
+    preload = report("preload", small, "preload")
+    for band, values in preload["bands_psd"].items():
+        assert np.isclose(values["mean"], stream["bands_psd"][band]["mean"], rtol=1e-9), band
+    print("  band powers identical")
+    small.unlink()
+
+    large = Path(args.dir) / f"bench_large{suffix}"
+    start = time.perf_counter()
+    write_synthetic(large, args.size_mb, args.bdf)
+    reader = EDFReader(large)
+    print(f"{large.name}: {large.stat().st_size / 2**30:.2f} GB, {reader.n_channels} ch x "
+          f"{reader.n_times / reader.sfreq / 3600:.1f} h (written in {time.perf_counter() - start:.0f} s); "
+          f"float64 preload would need {reader.n_channels * reader.n_times * 8 / 2**30:.1f} GB")
+    report("stream", large, "stream")
+    large.unlink()
+
+
+if __name__ == "__main__":
+    main()
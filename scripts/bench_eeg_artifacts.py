@@ -0,0 +1,79 @@
+"""Benchmark artifact detection for a full EEG cap within one processing tick.
+
+Generates ``--channels`` x ``--seconds`` of synthetic EEG (with blinks, muscle
+bursts, drift and a clipped channel mixed in) and times the pre-engine
+per-channel detector (the frozen copy in tests/unit/eeg_artifacts_baseline.py)
+looped over every channel against one ``detect_artifacts_batch`` call over the
+whole matrix, then checks both flag the same artifacts.
+
+Usage: python scripts/bench_eeg_artifacts.py [--channels 64] [--seconds 4] [--rate 256]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR / "tests" / "unit"))
+
+from apps.api.neurosonix.eeg_processor import IndustrialEEGProcessor  # noqa: E402
+from eeg_artifacts_baseline import baseline_report  # noqa: E402
+
+
+def synthetic_cap(channels: int, seconds: float, rate: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    data = rng.normal(0, 8, (channels, t.size)) + 20 * np.sin(2 * np.pi * 10 * t)
+    data[0] += 180 * np.exp(-((t - seconds / 2) ** 2) / 0.02)  # blink
+    data[1] += rng.normal(0, 30, t.size) * (np.sin(2 * np.pi * 0.5 * t) > 0)  # muscle bursts
+    data[2] += np.linspace(0, 250, t.size)  # drift
+    data[3] = np.clip(data[3] * 30, -250, 250).round()  # saturation
+    data[4] = 0.2 * rng.normal(size=t.size)  # disconnected electrode
+    return data
+
+
+def timed(fn, repeats: int):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e3, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=4.0)
+    parser.add_argument("--rate", type=int, default=256)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--tick-ms", type=float, default=250.0)
+    args = parser.parse_args()
+    logging.getLogger("apps.api.neurosonix.eeg_processor").setLevel(logging.WARNING)
+
+    processor = IndustrialEEGProcessor(sampling_rate=args.rate, max_channels=args.channels)
+    data = synthetic_cap(args.channels, args.seconds, args.rate)
+    names = [f"ch{i}" for i in range(args.channels)]
+
+    loop_ms, reports = timed(lambda: [baseline_report(processor, row) for row in data], args.repeats)
+    batch_ms, batch = timed(lambda: processor.detect_artifacts_batch(data, names), args.repeats)
+
+    legacy = [sum(1 << i for i, flag in enumerate(r["artifacts_detected"].values()) if flag) for r in reports]
+    print(f"{args.channels} channels x {args.seconds:g} s @ {args.rate} Hz, median of {args.repeats}")
+    print(f"baseline loop    {loop_ms:8.2f} ms")
+    print(f"batch            {batch_ms:8.2f} ms  ({batch['summary']['channels_flagged']} channels flagged, "
+          f"{loop_ms / batch_ms:.1f}x faster)")
+    print(f"bitmasks identical to baseline: {legacy == batch['bitmask']}  "
+          f"fits {args.tick_ms:g} ms tick: {batch_ms < args.tick_ms}")
+
+
+if __name__ == "__main__":
+    main()
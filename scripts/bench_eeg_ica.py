@@ -0,0 +1,103 @@
+"""Benchmark per-window ICA artifact removal with the cached session model.
+
+Mixes synthetic sources (alpha, blinks, line-noise bursts, noise) into
+``--channels`` EEG channels, then compares the previous behaviour (a fresh
+FastICA fit on the last minute of data for every window) with
+``apply_ica_artifact_removal`` using the session model: one fit, then a
+single matrix multiply per window.
+
+Usage: python scripts/bench_eeg_ica.py [--channels 19] [--windows 200] [--window-ms 250]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from apps.api.neurosonix.eeg_processor import ICA_AVAILABLE, FastICA, StandardScaler, IndustrialEEGProcessor  # noqa: E402
+
+
+def synthetic_recording(channels: int, seconds: float, rate: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    sources = [
+        np.sin(2 * np.pi * 10 * t),                                   # alpha
+        (np.sin(2 * np.pi * 0.2 * t) > 0.95).astype(float) * 5,       # blinks
+        np.sin(2 * np.pi * 50 * t) * (rng.random(t.size) > 0.5),     # line-noise bursts
+        rng.laplace(size=t.size),
+    ]
+    sources += [rng.normal(size=t.size) for _ in range(channels - len(sources))]
+    return rng.normal(size=(channels, channels)) @ np.array(sources) * 20
+
+
+def legacy_window(processor, block: np.ndarray) -> np.ndarray:
+    """The pre-model path: standardize, fit FastICA, drop components, reconstruct"""
+    scaler = StandardScaler()
+    standardized = scaler.fit_transform(block.T).T
+    ica = FastICA(n_components=min(block.shape[0], block.shape[1] // 100), random_state=42, max_iter=1000)
+    components = ica.fit_transform(standardized.T).T
+    components[processor._classify_ica_components(components)] = 0
+    return scaler.inverse_transform(ica.inverse_transform(components.T)).T
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=19)
+    parser.add_argument("--rate", type=int, default=256)
+    parser.add_argument("--windows", type=int, default=200)
+    parser.add_argument("--window-ms", type=float, default=250.0)
+    parser.add_argument("--legacy-windows", type=int, default=3)
+    args = parser.parse_args()
+    if not ICA_AVAILABLE:
+        print("scikit-learn is not installed; nothing to benchmark")
+        return
+    logging.getLogger("apps.api.neurosonix.eeg_processor").setLevel(logging.WARNING)
+    warnings.filterwarnings("ignore", module="sklearn")
+
+    processor = IndustrialEEGProcessor(sampling_rate=args.rate, max_channels=args.channels)
+    window = int(args.rate * args.window_ms / 1000)
+    minute = processor.ica_buffer_required
+    data = synthetic_recording(args.channels, (minute + window * args.windows) / args.rate + 1, args.rate)
+    names = [f"ch{i}" for i in range(args.channels)]
+
+    legacy = []
+    for i in range(args.legacy_windows):
+        end = minute + i * window
+        start = time.perf_counter()
+        legacy_window(processor, data[:, end - minute:end])
+        legacy.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    processor.apply_ica_artifact_removal(dict(zip(names, data[:, :minute])))
+    warm_up = time.perf_counter() - start
+
+    cached = []
+    for i in range(args.windows):
+        block = data[:, minute + i * window:minute + (i + 1) * window]
+        start = time.perf_counter()
+        result = processor.apply_ica_artifact_removal(dict(zip(names, block)))
+        cached.append(time.perf_counter() - start)
+    assert result["success"], result
+
+    legacy_ms = statistics.median(legacy) * 1e3
+    cached_ms = statistics.median(cached) * 1e3
+    print(f"{args.channels} channels @ {args.rate} Hz, {args.window_ms:g} ms windows")
+    print(f"fresh fit per window  {legacy_ms:10.3f} ms  (median of {args.legacy_windows})")
+    print(f"session model warm-up {warm_up * 1e3:10.3f} ms  (one fit on {minute} samples)")
+    print(f"cached model          {cached_ms:10.3f} ms  (median of {args.windows}, "
+          f"p99 {sorted(cached)[int(len(cached) * 0.99) - 1] * 1e3:.3f} ms)")
+    print(f"speed-up {legacy_ms / cached_ms:,.0f}x, drift {processor.ica.get_stats()['last_drift']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
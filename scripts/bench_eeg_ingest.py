@@ -0,0 +1,84 @@
+"""Benchmark server-side cost of JSON vs binary EEG ingest.
+
+Pre-encodes ``--seconds`` of ``--channels``-channel EEG both as per-sample
+JSON readings (the shape ``EmotivEPOCIntegration.stream_eeg_data`` produces)
+and as binary frames, then times parsing + handing the data to
+``IndustrialEEGProcessor`` (``add_multi_channel_sample`` per reading vs
+``decode_frame`` + ``add_sample_block`` per frame).
+
+Usage: python scripts/bench_eeg_ingest.py [--channels 14] [--seconds 30] [--block-samples 32]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from apps.api.neurosonix.eeg_ingest import decode_frame, encode_frame  # noqa: E402
+from apps.api.neurosonix.eeg_processor import IndustrialEEGProcessor  # noqa: E402
+
+
+def make_processor(names, rate):
+    processor = IndustrialEEGProcessor(sampling_rate=rate, max_channels=len(names))
+    for name in names:
+        processor.register_channel(name)
+    return processor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=14)
+    parser.add_argument("--rate", type=int, default=256)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--block-samples", type=int, default=32)
+    args = parser.parse_args()
+    logging.getLogger("apps.api.neurosonix.eeg_processor").setLevel(logging.WARNING)
+
+    names = IndustrialEEGProcessor().available_channels[:args.channels]
+    n = int(args.seconds * args.rate)
+    data = np.random.default_rng(0).normal(0, 20, (args.channels, n)).astype(np.float32)
+    start_time = time.time()
+
+    readings = [json.dumps({
+        "device_type": "EEG", "device_id": "bench", "value": data[:, i].tolist(), "unit": "uV",
+        "timestamp": int((start_time + i / args.rate) * 1000),
+        "metadata": {"channels": args.channels, "sample_rate": args.rate, "channel_names": names},
+    }) for i in range(n)]
+    frames = [encode_frame("bench", data[:, i:i + args.block_samples], args.rate, seq,
+                           start_time + i / args.rate)
+              for seq, i in enumerate(range(0, n, args.block_samples))]
+
+    processor = make_processor(names, args.rate)
+    start = time.perf_counter()
+    for raw in readings:
+        reading = json.loads(raw)
+        processor.add_multi_channel_sample(dict(zip(reading["metadata"]["channel_names"], reading["value"])),
+                                           reading["timestamp"] / 1000)
+    json_seconds = time.perf_counter() - start
+
+    processor = make_processor(names, args.rate)
+    start = time.perf_counter()
+    for raw in frames:
+        frame = decode_frame(raw)
+        processor.add_sample_block(names, frame.samples, frame.timestamp, frame.sample_rate)
+    binary_seconds = time.perf_counter() - start
+
+    total = args.channels * n
+    print(f"{args.seconds:g} s of {args.channels} ch @ {args.rate} Hz ({total:,} channel-samples)")
+    print(f"json   {sum(map(len, readings)) / 2**20:7.2f} MiB  {json_seconds * 1e3:9.1f} ms  "
+          f"{total / json_seconds:13,.0f} channel-samples/s")
+    print(f"binary {sum(map(len, frames)) / 2**20:7.2f} MiB  {binary_seconds * 1e3:9.1f} ms  "
+          f"{total / binary_seconds:13,.0f} channel-samples/s  ({json_seconds / binary_seconds:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
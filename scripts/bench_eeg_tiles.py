@@ -0,0 +1,93 @@
+"""Benchmark EEG dashboard zoom queries: raw samples per request vs the tile pyramid.
+
+Writes a synthetic EDF recording (64 channels @ 512 Hz, ``--hours`` long),
+builds its tile pyramid once (the upload-time stage) and then serves the same
+1000-pixel views (whole recording down to 10 s) from raw samples and from the
+pyramid, reporting per-query latency and how much data each path touched.
+
+Usage: python scripts/bench_eeg_tiles.py [--hours 10] [--pixels 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+from scipy import fft
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from apps.api.edf_stream import EEG_BANDS, EDFReader  # noqa: E402
+from apps.api.uploads.tiles import TilePyramid, build_tile_pyramid, tiles_path  # noqa: E402
+from bench_edf_stream import CHANNELS, SFREQ, write_synthetic  # noqa: E402
+
+
+def raw_view(reader: EDFReader, start: float, end: float, pixels: int):
+    """What a request did without tiles: read the window and reduce it per column."""
+    first = int(start // reader.record_duration)
+    last = int(np.ceil(end / reader.record_duration))
+    data = reader.read_records(first, last - first)
+    per_column = max(1, data.shape[1] // pixels)
+    columns = data[:, :per_column * (data.shape[1] // per_column)].reshape(reader.n_channels, -1, per_column)
+    spectra = np.abs(fft.rfft(columns - columns.mean(axis=-1, keepdims=True), axis=-1)) ** 2
+    freqs = fft.rfftfreq(per_column, 1 / reader.sfreq)
+    bands = {name: spectra[..., (freqs >= lo) & (freqs <= hi)].mean(axis=-1) for name, (lo, hi) in EEG_BANDS.items()}
+    return columns.min(axis=-1), columns.max(axis=-1), bands, data.size
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=10.0)
+    parser.add_argument("--pixels", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dir", default=tempfile.gettempdir())
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")  # short raw columns leave the delta band empty
+
+    source = Path(args.dir) / "bench_tiles.edf"
+    write_synthetic(source, args.hours * 3600 * CHANNELS * SFREQ * 2 / 2**20)
+    reader = EDFReader(source)
+    start = time.perf_counter()
+    header = build_tile_pyramid(source)
+    build = time.perf_counter() - start
+    tiles = tiles_path(source)
+    print(f"{source.stat().st_size / 2**30:.2f} GB recording ({reader.n_times / reader.sfreq / 3600:.1f} h, "
+          f"{reader.n_channels} ch): pyramid built in {build:.0f} s, {len(header['levels'])} levels, "
+          f"{tiles.stat().st_size / 2**20:.1f} MB")
+
+    pyramid = TilePyramid(tiles)
+    duration = reader.n_times / reader.sfreq
+    print(f"{'window':>10}  {'raw':>10}  {'samples read':>14}  {'tiles':>9}  {'bins read':>9}  level")
+    for window in sorted({min(w, duration) for w in (duration, 3600.0, 600.0, 60.0, 10.0)}, reverse=True):
+        begin = (duration - window) / 2
+        if window >= 3600:
+            raw, raw_samples = "skipped", reader.n_channels * int(window * reader.sfreq)
+        else:
+            raw_time, result = timed(lambda: raw_view(reader, begin, begin + window, args.pixels), args.repeat)
+            raw, raw_samples = f"{raw_time * 1e3:.1f}ms", result[3]
+        tile_time, result = timed(lambda: pyramid.query(begin, begin + window, args.pixels), args.repeat)
+        print(f"{window:>9.0f}s  {raw:>10}  {raw_samples:>14,}  {tile_time * 1e3:>7.1f}ms  "
+              f"{result['bins_read']:>9}  {result['level']}")
+    print("(raw views of an hour or more are skipped: they would load the whole window into memory)")
+    tiles.unlink()
+    source.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark the usage_tracker file fallback: rewrite-per-call JSON vs UsageLedger.
+
+For a growing number of distinct API keys, times ``increment`` calls with the
+old path (load + increment + rewrite ``api_usage.json`` on every call) and the
+append-only ledger, and checks that both end with the same totals.
+
+Usage: python scripts/bench_usage_tracker.py [--calls 1000] [--keys 10,100,1000,10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from usage_ledger import UsageLedger  # noqa: E402
+
+DAY = "2026-01-01"
+
+
+def legacy_increment(path: str, api_key: str) -> int:
+    """The pre-ledger fallback of ``usage_tracker.increment_usage``."""
+    data = {}
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            data = json.load(f)
+    data.setdefault(api_key, {}).setdefault(DAY, 0)
+    data[api_key][DAY] += 1
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    return data[api_key][DAY]
+
+
+def seed(path: str, keys: int) -> None:
+    with open(path, "w") as f:
+        json.dump({f"key-{i}": {DAY: 1} for i in range(keys)}, f, indent=2)
+
+
+def run(keys: int, calls: int, workdir: str):
+    rng = random.Random(keys)
+    sequence = [f"key-{rng.randrange(keys)}" for _ in range(calls)]
+
+    legacy_path = os.path.join(workdir, f"legacy-{keys}.json")
+    seed(legacy_path, keys)
+    start = time.perf_counter()
+    for api_key in sequence:
+        legacy_increment(legacy_path, api_key)
+    legacy = calls / (time.perf_counter() - start)
+
+    ledger_path = os.path.join(workdir, f"ledger-{keys}.json")
+    seed(ledger_path, keys)
+    ledger = UsageLedger(ledger_path)
+    ledger.get(sequence[0], DAY)  # load the snapshot once, outside the timed loop
+    start = time.perf_counter()
+    for api_key in sequence:
+        ledger.increment(api_key, DAY)
+    ledger.flush()
+    fast = calls / (time.perf_counter() - start)
+
+    with open(legacy_path) as f:
+        expected = json.load(f)
+    assert UsageLedger(ledger_path).snapshot() == expected
+    print(f"{keys:>7} keys  legacy {legacy:10.0f} calls/s  ledger {fast:10.0f} calls/s  "
+          f"({fast / legacy:.0f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--keys", default="10,100,1000,10000")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as workdir:
+        for keys in (int(k) for k in args.keys.split(",")):
+            run(keys, args.calls, workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Load generator for the binary EEG WebSocket ingest endpoint.
+
+Opens ``--devices`` connections, sends a hello with the channel layout and
+then streams synthetic EEG as binary frames, either paced at the device
+sample rate (``--realtime``) or as fast as the server accepts them. The
+server's ``pause``/``resume`` flow messages are honoured; at the end every
+connection asks for its session statistics.
+
+``--serve`` starts the Clisonix EEG ingest route in-process on a free port
+(requires uvicorn, no API key check) instead of targeting ``--url``. The API
+itself requires ``--api-key``, sent as ``Authorization: Bearer <key>``.
+
+Usage: python scripts/eeg_ingest_loadgen.py --serve [--devices 4] [--channels 14] [--seconds 10] [--realtime]
+       python scripts/eeg_ingest_loadgen.py --url ws://host:8000/api/Clisonix/eeg/stream --api-key KEY
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from apps.api.neurosonix.eeg_ingest import encode_frame  # noqa: E402
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+CHANNELS = ["Fp1", "Fp2", "F3", "F4", "C3", "C4", "P3", "P4", "O1", "O2", "F7", "F8", "T3", "T4",
+            "T5", "T6", "Fz", "Cz", "Pz", "A1", "A2"]
+
+
+def start_server() -> tuple:
+    import uvicorn
+    from fastapi import FastAPI
+    from apps.api.neurosonix.routes import eeg_stream_router as router
+
+    app = FastAPI()
+    app.include_router(router)
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"ws://127.0.0.1:{port}{router.prefix}/eeg/stream"
+
+
+async def run_device(url: str, index: int, args) -> dict:
+    rng = np.random.default_rng(index)
+    names = CHANNELS[:args.channels]
+    block_seconds = args.block_samples / args.rate
+    n_frames = int(args.seconds / block_seconds)
+    t = np.arange(args.block_samples) / args.rate
+    resume = asyncio.Event()
+    resume.set()
+    counters = {"acks": 0, "pauses": 0, "errors": 0}
+    stats_reply = asyncio.get_running_loop().create_future()
+
+    headers = {"Authorization": f"Bearer {args.api_key}"} if args.api_key else None
+    async with websockets.connect(url, max_size=None, additional_headers=headers) as ws:
+        await ws.send(json.dumps({"type": "hello", "channel_names": names}))
+        ready = json.loads(await ws.recv())
+
+        async def reader():
+            async for raw in ws:
+                message = json.loads(raw)
+                kind = message.get("type")
+                if kind == "flow":
+                    if message["state"] == "pause":
+                        counters["pauses"] += 1
+                        resume.clear()
+                    else:
+                        resume.set()
+                elif kind == "ack":
+                    counters["acks"] += 1
+                elif kind == "error":
+                    counters["errors"] += 1
+                elif kind == "stats" and not stats_reply.done():
+                    stats_reply.set_result(message)
+
+        reader_task = asyncio.create_task(reader())
+        start = time.perf_counter()
+        for seq in range(n_frames):
+            await resume.wait()
+            block = rng.normal(0, 10, (args.channels, args.block_samples)) + 20 * np.sin(
+                2 * np.pi * 10 * (t + seq * block_seconds))
+            await ws.send(encode_frame(f"loadgen{index:03d}", block, args.rate, seq,
+                                       time.time()))
+            if args.realtime:
+                delay = start + (seq + 1) * block_seconds - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        send_seconds = time.perf_counter() - start
+        await ws.send(json.dumps({"type": "stats"}))
+        server_stats = await asyncio.wait_for(stats_reply, timeout=60)
+        elapsed = time.perf_counter() - start
+        reader_task.cancel()
+
+    return {"ready": ready, "frames": n_frames, "send_seconds": send_seconds,
+            "elapsed": elapsed, "client": counters, "server": server_stats}
+
+
+async def main_async(args) -> None:
+    server = None
+    url = args.url
+    if args.serve:
+        server, url = start_server()
+    print(f"{args.devices} devices x {args.channels} ch @ {args.rate} Hz, {args.block_samples} samples/frame, "
+          f"{args.seconds:g} s of EEG each, {'real-time' if args.realtime else 'flood'} -> {url}")
+    results = await asyncio.gather(*(run_device(url, i, args) for i in range(args.devices)))
+    total_samples = 0
+    for i, result in enumerate(results):
+        srv = result["server"]
+        total_samples += srv["samples"]
+        print(f"device {i}: {srv['frames']}/{result['frames']} frames ingested, "
+              f"{srv['samples'] / result['elapsed']:,.0f} samples/s per channel, "
+              f"pauses {result['client']['pauses']} (server {srv['pauses']}), max queue {srv['max_queue']}, "
+              f"gaps {srv['sequence_gaps']}, errors {srv['frame_errors']}")
+    elapsed = max(r["elapsed"] for r in results)
+    print(f"total {total_samples * args.channels / elapsed:,.0f} channel-samples/s "
+          f"({total_samples / elapsed / args.rate:,.1f}x real time across devices)")
+    if server is not None:
+        server.should_exit = True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="ws://127.0.0.1:8000/api/Clisonix/eeg/stream")
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--serve", action="store_true")
+    parser.add_argument("--devices", type=int, default=4)
+    parser.add_argument("--channels", type=int, default=14)
+    parser.add_argument("--rate", type=float, default=256.0)
+    parser.add_argument("--block-samples", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--realtime", action="store_true")
+    args = parser.parse_args()
+    if websockets is None:
+        sys.exit("the load generator needs the 'websockets' package (installed with uvicorn[standard])")
+    if args.channels > len(CHANNELS):
+        sys.exit(f"at most {len(CHANNELS)} channels")
+    logging.getLogger("apps.api.neurosonix").setLevel(logging.WARNING)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
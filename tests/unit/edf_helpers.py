@@ -0,0 +1,22 @@
+"""EDF fixtures shared by the EDF streaming and tile pyramid tests"""
+
+
+def write_edf(path, digital, sfreq, phys=(-500.0, 500.0), n_records_field=None):
+    """Minimal EDF writer: ``digital`` is (channels, samples) int16, 1 s records"""
+    channels, samples = digital.shape
+    n_records = samples // sfreq
+
+    def field(value, width):
+        return str(value).ljust(width)[:width].encode('latin-1')
+
+    header = b''.join([
+        field(0, 8), field('X', 80), field('X', 80), field('01.01.25', 8), field('00.00.00', 8),
+        field(256 * (channels + 1), 8), field('', 44),
+        field(n_records if n_records_field is None else n_records_field, 8), field(1, 8), field(channels, 4),
+    ])
+    for values, width in (([f'C{i}' for i in range(channels)], 16), (['']*channels, 80), (['uV']*channels, 8),
+                          ([phys[0]]*channels, 8), ([phys[1]]*channels, 8), ([-32768]*channels, 8),
+                          ([32767]*channels, 8), (['']*channels, 80), ([sfreq]*channels, 8), (['']*channels, 32)):
+        header += b''.join(field(v, width) for v in values)
+    records = digital[:, :n_records * sfreq].reshape(channels, n_records, sfreq).transpose(1, 0, 2)
+    path.write_bytes(header + records.astype('<i2').tobytes())
@@ -0,0 +1,94 @@
+"""
+Frozen copy of ``IndustrialEEGProcessor.detect_advanced_artifacts`` from
+before the batch ``ArtifactEngine``: one channel at a time, one
+``sosfiltfilt`` design per band per call. Reference for the artifact tests
+and ``scripts/bench_eeg_artifacts.py``; do not update it with the engine.
+
+Only ``artifacts_detected`` and ``artifact_scores`` are reproduced.
+"""
+
+import numpy as np
+from scipy import signal
+
+ARTIFACT_NAMES = (
+    "high_amplitude", "flat_line", "high_frequency_noise", "eye_blink",
+    "muscle_artifact", "electrode_pop", "drift", "saturation"
+)
+
+
+def _bandpass(sampling_rate, filter_order, data, low_freq, high_freq):
+    nyquist = sampling_rate / 2
+    low = max(0.01, low_freq / nyquist)
+    high = min(0.99, high_freq / nyquist)
+    if low >= high:
+        return data
+    sos = signal.butter(filter_order, [low, high], btype='band', output='sos')
+    return signal.sosfiltfilt(sos, data)
+
+
+def baseline_artifact_report(sampling_rate, filter_order, thresholds, data):
+    """``{"artifacts_detected": {...}, "artifact_scores": {...}}`` for one channel"""
+    artifacts = {name: False for name in ARTIFACT_NAMES}
+    scores = {}
+    if len(data) == 0:
+        return {"artifacts_detected": artifacts, "artifact_scores": scores}
+
+    def bandpass(low, high):
+        return _bandpass(sampling_rate, filter_order, data, low, high)
+
+    try:
+        max_amplitude = np.max(np.abs(data))
+        if max_amplitude > thresholds["amplitude_threshold"]:
+            artifacts["high_amplitude"] = True
+            scores["high_amplitude"] = float(max_amplitude / thresholds["amplitude_threshold"])
+
+        data_std = np.std(data)
+        if data_std < 1.0:
+            artifacts["flat_line"] = True
+            scores["flat_line"] = float(1.0 / max(data_std, 0.001))
+
+        if len(data) > filter_order * 3:
+            noise_std = np.std(bandpass(50.0, 100.0))
+            if noise_std > 10.0:
+                artifacts["high_frequency_noise"] = True
+                scores["high_frequency_noise"] = float(noise_std / 10.0)
+
+        if len(data) > sampling_rate:
+            blink_candidates = np.abs(bandpass(0.5, 4.0)) > 50.0
+            if np.sum(blink_candidates) > len(data) * 0.01:
+                artifacts["eye_blink"] = True
+                scores["eye_blink"] = float(np.sum(blink_candidates) / len(data))
+
+        if len(data) > sampling_rate:
+            emg_power = np.mean(bandpass(20.0, 45.0) ** 2)
+            if emg_power > 100.0:
+                artifacts["muscle_artifact"] = True
+                scores["muscle_artifact"] = float(emg_power / 100.0)
+
+        if len(data) > 1:
+            max_gradient = np.max(np.abs(np.diff(data)))
+            if max_gradient > thresholds["gradient_threshold"]:
+                artifacts["electrode_pop"] = True
+                scores["electrode_pop"] = float(max_gradient / thresholds["gradient_threshold"])
+
+        if len(data) > sampling_rate * 2:
+            detrended = signal.detrend(data, type='linear')
+            trend_strength = np.std(data) / max(np.std(detrended), 0.001)
+            if trend_strength > 2.0:
+                artifacts["drift"] = True
+                scores["drift"] = float(trend_strength / 2.0)
+
+        amplitude_range = np.max(data) - np.min(data)
+        if amplitude_range > 400.0 and len(np.unique(data)) < len(data) * 0.8:
+            artifacts["saturation"] = True
+            scores["saturation"] = float(amplitude_range / 400.0)
+    except Exception:  # the original logged and returned an empty report
+        return {"artifacts_detected": {name: False for name in ARTIFACT_NAMES}, "artifact_scores": {}}
+
+    return {"artifacts_detected": artifacts, "artifact_scores": scores}
+
+
+def baseline_report(processor, data):
+    """``baseline_artifact_report`` with ``processor``'s rate, filter order and thresholds"""
+    return baseline_artifact_report(processor.sampling_rate, processor.filter_order,
+                                    processor.artifact_thresholds, data)
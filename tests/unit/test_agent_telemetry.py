@@ -0,0 +1,129 @@
+import threading
+import unittest
+
+from agent_telemetry import AgentMetrics, TelemetryExporter, TelemetryRouter
+
+
+class FakeResponse:
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeSession:
+    """Answers POSTs from per-URL status lists (then 200) and records what was accepted."""
+
+    def __init__(self, statuses=None, default=200):
+        self.statuses = {url: list(codes) for url, codes in (statuses or {}).items()}
+        self.default = default
+        self.posts = []
+        self.accepted = []
+        self.lock = threading.Lock()
+
+    def post(self, url, json=None, timeout=None):
+        with self.lock:
+            self.posts.append((url, json))
+            pending = self.statuses.get(url)
+            status = pending.pop(0) if pending else self.default
+            if isinstance(status, Exception):
+                raise status
+            if status < 400:
+                self.accepted.append((url, json))
+            return FakeResponse(status)
+
+    def records(self, url):
+        out = []
+        for target, body in self.accepted:
+            if target == url + "/batch":
+                out.extend(body)
+            elif target == url:
+                out.append(body)
+        return out
+
+
+def metrics(i):
+    return AgentMetrics(agent_name="TEST", timestamp=float(i), status="success",
+                        operation=f"op{i}", duration_ms=1.0, metadata={"i": i})
+
+
+def make_router(sessions, **kwargs):
+    router = TelemetryRouter(alba_port=1, albi_port=2, jona_port=3)
+    kwargs.setdefault("flush_interval_ms", 10)
+    kwargs.setdefault("backoff_max", 0.02)
+    router._exporter = TelemetryExporter(router, **kwargs)
+    for dest, sender in router._exporter.destinations.items():
+        sender._session = sessions[dest]
+    return router
+
+
+class TestTelemetryExporter(unittest.TestCase):
+
+    def setUp(self):
+        self.sessions = {dest: FakeSession() for dest in TelemetryExporter.DESTINATIONS}
+
+    def url(self, router, dest):
+        return router.route(dest)[0]
+
+    def test_queue_all_batches_payloads_per_destination(self):
+        router = make_router(self.sessions, batch_size=4)
+        for i in range(10):
+            self.assertEqual(router.queue_all(metrics(i)), {"alba": True, "albi": True, "jona": True})
+        self.assertTrue(router.flush(timeout=2.0))
+        router._exporter.close()
+        for dest, session in self.sessions.items():
+            self.assertEqual([len(body) for _, body in session.posts], [4, 4, 2])
+            _, build = router.route(dest)
+            self.assertEqual(session.records(self.url(router, dest)), [build(metrics(i)) for i in range(10)])
+        self.assertEqual(router._exporter.snapshot()["pending"], 0)
+
+    def test_failed_destination_retries_without_resending_the_others(self):
+        albi = self.url(TelemetryRouter(albi_port=2), "albi")
+        self.sessions["albi"] = FakeSession({albi + "/batch": [ConnectionError("down"), 503]})
+        router = make_router(self.sessions, batch_size=10)
+        for i in range(3):
+            router.queue_all(metrics(i))
+        self.assertTrue(router.flush(timeout=3.0))
+        router._exporter.close()
+        self.assertEqual(len(self.sessions["albi"].posts), 3)
+        self.assertEqual(len(self.sessions["alba"].posts), 1)
+        self.assertEqual([r["metadata"]["i"] for r in self.sessions["albi"].records(albi)], [0, 1, 2])
+        snapshot = router._exporter.snapshot()["destinations"]
+        self.assertEqual((snapshot["albi"]["failed_batches"], snapshot["albi"]["sent"]), (2, 3))
+        self.assertEqual(snapshot["alba"]["failed_batches"], 0)
+
+    def test_destination_without_batch_endpoint_gets_single_records(self):
+        jona = self.url(TelemetryRouter(jona_port=3), "jona")
+        self.sessions["jona"] = FakeSession({jona + "/batch": [404]})
+        router = make_router(self.sessions, batch_size=10)
+        for i in range(3):
+            router.queue_all(metrics(i))
+        self.assertTrue(router.flush(timeout=2.0))
+        router._exporter.close()
+        self.assertEqual([url for url, _ in self.sessions["jona"].posts], [jona + "/batch"] + [jona] * 3)
+        self.assertFalse(router._exporter.snapshot()["destinations"]["jona"]["batched"])
+
+    def test_full_queue_is_reported_per_destination(self):
+        router = make_router(self.sessions, max_queue=2, batch_size=100, flush_interval_ms=5000)
+        for sender in router._exporter.destinations.values():
+            sender._ensure_started = lambda: None  # keep everything queued
+        results = [router.queue_all(metrics(i))["alba"] for i in range(3)]
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(router._exporter.snapshot()["pending"], 6)
+
+    def test_disabled_router_queues_nothing(self):
+        router = TelemetryRouter(enabled=False)
+        self.assertEqual(router.queue_all(metrics(0)), {"alba": True, "albi": True, "jona": True})
+        self.assertIsNone(router._exporter)
+
+
+class TestSendAll(unittest.TestCase):
+
+    def test_send_all_reports_delivery(self):
+        router = TelemetryRouter(alba_port=1, albi_port=2, jona_port=3)
+        router.session = FakeSession({router.route("albi")[0]: [500]})
+        self.assertEqual(router.send_all(metrics(0)), {"alba": True, "albi": False, "jona": True})
+        self.assertIsNone(router._exporter)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from agiem_core import AGIEMCore
+
+
+class TestReproductionPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "alba").mkdir()
+        for i in range(4):
+            frames = [{"channels": {"a": i, "b": 2 * i}, "timestamp": i + 1}]
+            (self.root / "alba" / f"f{i}.json").write_text(json.dumps(frames), encoding="utf-8")
+        (self.root / "alba" / "broken.json").write_text("{", encoding="utf-8")
+        env = mock.patch.dict(os.environ, {"ALBA_API_URL": "http://127.0.0.1:1/alba/latest"})
+        env.start()
+        self.addCleanup(env.stop)
+        self.core = AGIEMCore(hq_event_url="")
+
+    def tearDown(self):
+        self.core.close()
+        self.tmp.cleanup()
+
+    def test_cycle_runs_every_stage_and_skips_unchanged_files(self):
+        first = self.core.run_reproduction_cycle(data_root=str(self.root))
+        self.assertEqual([s["stage"] for s in first["stages"]], ["ALBA", "ALBI", "JONA", "ASI"])
+        self.assertEqual(set(first["stage_timings"]), {"ALBA", "ALBI", "JONA", "ASI"})
+        self.assertEqual(first["stages"][0]["processed_files"], [f"f{i}.json" for i in range(4)])
+
+        (self.root / "alba" / "f9.json").write_text(json.dumps([{"channels": {"a": 9}}]), encoding="utf-8")
+        second = self.core.run_reproduction_cycle(data_root=str(self.root))
+        self.assertEqual(second["stages"][0]["processed_files"], ["f9.json"])
+        self.assertEqual(second["stages"][0]["total_history"], 5)
+        self.assertEqual(self.core.get_pipeline().stage_timing_summary()["ALBA"]["count"], 2)
+
+    def test_back_to_back_cycles_overlap_alba_with_jona(self):
+        pipeline = self.core.get_pipeline()
+        run_alba, run_jona = pipeline._run_alba, pipeline._run_jona
+        alba_calls = []
+        next_alba_started = threading.Event()
+        overlapped = []
+
+        def alba(state):
+            alba_calls.append(threading.current_thread().name)
+            if len(alba_calls) == 2:
+                next_alba_started.set()
+            return run_alba(state)
+
+        def jona(state):
+            if not overlapped:  # cycle 1: ALBA of cycle 2 should already be running
+                overlapped.append(next_alba_started.wait(timeout=5))
+            return run_jona(state)
+
+        (self.root / "alba" / "late.json").write_text(json.dumps([{"channels": {"a": 7}}]), encoding="utf-8")
+        with mock.patch.object(pipeline, "_run_alba", alba), mock.patch.object(pipeline, "_run_jona", jona):
+            results = self.core.run_reproduction_cycles(3, data_root=str(self.root))
+        self.assertEqual(overlapped, [True])
+        self.assertEqual(len(alba_calls), 3)
+        self.assertTrue(alba_calls[1].startswith("agiem-prefetch"))
+        self.assertEqual(len(results), 3)
+        self.assertEqual(len({r["cycle_id"] for r in results}), 3)
+        self.assertEqual(results[0]["stages"][0]["total_history"], 5)
+        self.assertEqual([r["stages"][0]["processed_files"] for r in results[1:]], [[], []])
+        self.assertEqual([s["stage"] for s in results[2]["stages"]], ["ALBA", "ALBI", "JONA", "ASI"])
+
+    def test_close_shuts_down_ingest_pool(self):
+        pipeline = self.core.get_pipeline()
+        self.core.run_reproduction_cycle(data_root=str(self.root))
+        self.core.close()
+        with self.assertRaises(RuntimeError):
+            pipeline._ingest_pool.submit(lambda: None)
+        self.assertIsNot(self.core.get_pipeline(), pipeline)
+
+    def test_stage_notes_from_threads_are_not_lost(self):
+        def note(n):
+            for i in range(200):
+                self.core.add_stage_note("ALBA", f"t{n}-{i}")
+                self.core.record_stage_metric("ALBA", f"m{n}", i)
+
+        threads = [threading.Thread(target=note, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        alba = self.core.reproduction_inventory()[0]
+        self.assertEqual(len(alba["notes"]), 800)
+        self.assertEqual({alba["metrics"][f"m{n}"] for n in range(4)}, {199})
+
+
+if __name__ == "__main__":
+    unittest.main()
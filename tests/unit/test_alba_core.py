@@ -0,0 +1,78 @@
+import random
+import statistics
+import unittest
+
+from alba_core import AlbaCore
+
+
+class TestAlbaCoreRingHistory(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        self.alba = AlbaCore(max_history=32)
+        for i in range(100):
+            channels = {f"ch{j}": random.uniform(-50, 50) for j in range(random.randint(1, 4))}
+            self.alba.ingest(channels, timestamp=float(i + 1))
+
+    def test_ring_keeps_last_frames(self):
+        history = self.alba.history()
+        self.assertEqual(len(history), 32)
+        self.assertEqual(history[0].timestamp, 69.0)
+        self.assertEqual(self.alba.last_frame().timestamp, 100.0)
+        self.assertEqual([f.timestamp for f in self.alba.frames_since(98)], [99.0, 100.0])
+
+    def test_running_statistics_match_full_rescan(self):
+        history = self.alba.history()
+        values = {}
+        for frame in history:
+            for name, value in frame.channels.items():
+                values.setdefault(name, []).append(value)
+        expected = {name: statistics.fmean(v) for name, v in values.items()}
+        self.assertEqual(self.alba.average_channel_levels(), expected)
+        self.assertAlmostEqual(
+            self.alba.signal_variance(),
+            statistics.pvariance([frame.band_power() for frame in history]),
+            places=9,
+        )
+
+    def test_ingest_batch_appends_block(self):
+        frames = [{"channels": {"ch0": float(i)}, "timestamp": 200.0 + i} for i in range(40)]
+        self.assertEqual(self.alba.ingest_batch(frames), 40)
+        self.assertEqual(self.alba.average_channel_levels(), {"ch0": statistics.fmean(range(8, 40))})
+        names, rows = self.alba.channel_matrix()
+        self.assertEqual(rows[-1][names.index("ch0")], 39.0)
+
+
+class TestAlbaCoreNonFinite(unittest.TestCase):
+
+    def test_nan_frame_does_not_poison_running_statistics(self):
+        alba = AlbaCore(max_history=4)
+        alba.ingest({"c": float("nan")}, timestamp=1.0)
+        self.assertEqual(alba.non_finite_values, 1)
+        self.assertEqual(alba.average_channel_levels(), {})
+        for i in range(10):
+            alba.ingest({"c": 1.0}, timestamp=2.0 + i)
+        self.assertEqual(alba.average_channel_levels(), {"c": 1.0})
+        self.assertEqual(alba.signal_variance(), 0.0)
+        self.assertEqual(alba.non_finite_values, 0)
+        self.assertEqual(alba.health()["non_finite_values"], 0)
+
+    def test_inf_values_are_counted_but_left_out(self):
+        alba = AlbaCore(max_history=8)
+        alba.ingest({"a": 2.0, "b": float("inf")}, timestamp=1.0)
+        alba.ingest({"a": 4.0, "b": 3.0}, timestamp=2.0)
+        alba.ingest({"a": 6.0, "b": -float("inf")}, timestamp=3.0)
+        self.assertEqual(alba.average_channel_levels(), {"a": 4.0, "b": 3.0})
+        self.assertEqual(alba.non_finite_values, 2)
+        # only the finite band power (frame 2) is in the variance window
+        self.assertEqual(alba.signal_variance(), 0.0)
+        self.assertEqual(len(alba), 3)
+
+    def test_empty_core_is_truthy(self):
+        alba = AlbaCore()
+        self.assertEqual(len(alba), 0)
+        self.assertTrue(alba)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+from alba_telemetry_ring import TelemetryRing
+
+
+class TestTelemetryRing(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = TelemetryRing(capacity=5)
+        for i in range(12):
+            self.ring.append(str(i), "a" if i % 3 else "b", "eeg" if i % 2 else "ecg",
+                             {"value": i}, "ts", ingested_at=float(i))
+
+    def test_tail_keeps_newest_in_order(self):
+        self.assertEqual(len(self.ring), 5)
+        self.assertEqual([e["id"] for e in self.ring.query(3)], ["9", "10", "11"])
+        self.assertEqual([e["id"] for e in self.ring.export()], ["7", "8", "9", "10", "11"])
+
+    def test_source_and_type_indexes_follow_evictions(self):
+        self.assertEqual([e["id"] for e in self.ring.query(10, source="b")], ["9"])
+        self.assertEqual([e["id"] for e in self.ring.query(10, source="a", type_="eeg")], ["7", "11"])
+        self.assertEqual(self.ring.query(10, source="missing"), [])
+
+    def test_since_uses_ingest_time(self):
+        self.assertEqual([e["id"] for e in self.ring.query(10, since=10.0)], ["10", "11"])
+        self.assertEqual(self.ring.query(10, since=100.0), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import scipy.signal
+
+# apps/api/services/__init__ imports every character module; load the processor directly
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'apps' / 'api' / 'services'))
+
+from albi_neural_processor import ALBINeuralProcessor, SpectralPlan  # noqa: E402
+
+try:
+    from fastapi.testclient import TestClient
+    import albi_service_6666
+    HAS_SERVICE = True
+except ImportError:  # tracing needs the OpenTelemetry SDK
+    HAS_SERVICE = False
+
+FS = 256
+
+
+def eeg(samples=2560, channels=6, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(samples) / FS
+    shared = np.sin(2 * np.pi * 10 * t)
+    data = rng.normal(scale=0.5, size=(samples, channels))
+    data += shared[:, None] * rng.uniform(0.2, 1.0, channels)
+    data[:, 1] += 0.3 * np.sin(2 * np.pi * 22 * t)
+    return data
+
+
+class TestSpectralPlan(unittest.TestCase):
+
+    def test_coherence_matches_scipy(self):
+        data = eeg()
+        channels = data.shape[1]
+        plan = SpectralPlan(data, FS)
+        for low, high in ((1, 50), (8, 12)):
+            ours = plan.coherence(low, high, channels)
+            expected = np.ones((channels, channels))
+            for i in range(channels):
+                for j in range(channels):
+                    if i != j:
+                        f, cxy = scipy.signal.coherence(data[:, i], data[:, j], fs=FS, nperseg=256)
+                        expected[i, j] = cxy[(f >= low) & (f <= high)].mean()
+            np.testing.assert_allclose(ours, expected, rtol=1e-9, atol=1e-12)
+
+    def test_band_power_matches_per_channel_fft(self):
+        data = eeg(samples=1001)  # odd length
+        plan = SpectralPlan(data, FS)
+        half = data.shape[0] // 2
+        freqs = np.fft.fftfreq(data.shape[0], 1 / FS)[:half]
+        np.testing.assert_allclose(plan.frequencies, freqs)
+        processor = ALBINeuralProcessor()
+        for low, high in processor.frequency_bands.values():
+            mask = (freqs >= low) & (freqs <= high)
+            expected = [
+                np.sum(np.abs(np.fft.fft(data[:, c])[:half])[mask] ** 2)
+                for c in range(data.shape[1])
+            ]
+            np.testing.assert_allclose(plan.band_power(low, high), expected, rtol=1e-9)
+
+
+class TestCompactResponse(unittest.TestCase):
+
+    def test_compact_only_drops_channel_spectra(self):
+        data = eeg(samples=1024, channels=4)
+        names = ['Fp1', 'Fp2', 'C3', 'C4']
+        full = asyncio.run(ALBINeuralProcessor().process_eeg_signal(data, names))
+        compact = asyncio.run(ALBINeuralProcessor().process_eeg_signal(data, names, compact=True))
+        key = '📊 frequency_analysis'
+        self.assertEqual(set(full[key]['channel_spectra']), set(names))
+        self.assertNotIn('channel_spectra', compact[key])
+        del full[key]['channel_spectra']
+        self.assertEqual(full[key], compact[key])
+
+
+@unittest.skipUnless(HAS_SERVICE, 'albi_service_6666 dependencies not installed')
+class TestEEGEndpoint(unittest.TestCase):
+
+    def test_process_compact_and_full(self):
+        client = TestClient(albi_service_6666.app)
+        body = {'samples': eeg(samples=512, channels=2).tolist(), 'channel_names': ['O1', 'O2']}
+        full = client.post('/eeg/process', json=body)
+        compact = client.post('/eeg/process', json={**body, 'compact': True})
+        self.assertEqual((full.status_code, compact.status_code), (200, 200))
+        self.assertIn('channel_spectra', full.json()['📊 frequency_analysis'])
+        self.assertNotIn('channel_spectra', compact.json()['📊 frequency_analysis'])
+        self.assertEqual(client.post('/eeg/process', json={'samples': [[0.0]] * 8}).status_code, 422)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+from albi_stream_stats import StreamAnalyzer, analyze_batch
+
+
+class TestAnalyzeBatch(unittest.TestCase):
+
+    def test_matches_numpy_reference(self):
+        rng = np.random.default_rng(1)
+        data = {f"ch{i}": rng.normal(i, 1 + i, 500 + 100 * (i % 2)) for i in range(6)}
+        channels = {name: values.tolist() for name, values in data.items()}
+        stats, anomalies = analyze_batch(channels)
+        self.assertEqual(list(stats), list(channels))
+        for name, values in data.items():
+            s = stats[name]
+            self.assertAlmostEqual(s["mean"], values.mean(), places=10)
+            self.assertAlmostEqual(s["std_dev"], values.std(), places=10)
+            self.assertEqual(s["max"], values.max())
+            self.assertEqual(s["min"], values.min())
+            expected_outliers = int((np.abs(values - values.mean()) > 2 * values.std()).sum())
+            self.assertEqual(s["outlier_count"], expected_outliers)
+            self.assertEqual(name in anomalies, expected_outliers > 0)
+
+    def test_keeps_value_types(self):
+        stats, _ = analyze_batch({"ints": [3, 1, 4, 1, 5], "mixed": [1, 2.5, 2], "empty": [], "bad": ["x"]})
+        self.assertEqual(set(stats), {"ints", "mixed"})
+        ints = stats["ints"]
+        self.assertIs(type(ints["max"]), int)
+        self.assertIs(type(ints["min"]), int)
+        self.assertIs(type(ints["outlier_count"]), int)
+        self.assertIs(type(ints["mean"]), float)
+        self.assertEqual((ints["min"], ints["max"]), (1, 5))
+        self.assertEqual(stats["mixed"]["max"], 2.5)
+        self.assertIs(type(stats["mixed"]["min"]), int)
+
+    def test_skips_non_numeric_values_like_the_loop_did(self):
+        channels = {"nested": [[1, 2], [3, 4]], "ragged": [1, [2]], "text": ["1", "2"],
+                    "none": [1, None], "ok": [1.0, 2.0]}
+        stats, _ = analyze_batch(channels)
+        self.assertEqual(list(stats), ["ok"])
+        stats, _ = StreamAnalyzer().update("s", channels)
+        self.assertEqual(list(stats), ["ok"])
+
+
+class TestStreamAnalyzer(unittest.TestCase):
+
+    def test_chan_merge_matches_full_data(self):
+        rng = np.random.default_rng(2)
+        analyzer = StreamAnalyzer()
+        blocks = [rng.normal(5, 3, (2, n)) for n in (1, 7, 250, 33, 1000)]
+        for block in blocks:
+            stats, _ = analyzer.update("s", {"a": block[0].tolist(), "b": block[1].tolist()})
+        full = np.concatenate(blocks, axis=1)
+        for i, name in enumerate(("a", "b")):
+            stream = stats[name]["stream"]
+            self.assertEqual(stream["samples"], full.shape[1])
+            self.assertIs(type(stream["samples"]), int)
+            self.assertAlmostEqual(stream["mean"], full[i].mean(), places=10)
+            self.assertAlmostEqual(stream["std_dev"], full[i].std(), places=10)
+            self.assertEqual(stream["max"], full[i].max())
+            self.assertEqual(stream["min"], full[i].min())
+            # block statistics are the same as the stateless path
+            self.assertAlmostEqual(stats[name]["std_dev"], blocks[-1][i].std(), places=10)
+
+    def test_streams_are_bounded_and_resettable(self):
+        analyzer = StreamAnalyzer(max_streams=2)
+        for stream_id in ("s1", "s2", "s3"):
+            analyzer.update(stream_id, {"a": [1, 2, 3]})
+        self.assertEqual(len(analyzer), 2)
+        analyzer.reset("s3")
+        self.assertEqual(len(analyzer), 1)
+        stats, _ = analyzer.update("s2", {"a": [4]})
+        self.assertEqual(stats["a"]["stream"]["samples"], 4)
+        self.assertIs(type(stats["a"]["stream"]["max"]), int)
+
+
+if __name__ == "__main__":
+    unittest.main()
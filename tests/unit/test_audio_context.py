@@ -0,0 +1,176 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from scipy.io import wavfile
+
+from apps.api.neuro.audio_context import HAS_LIBROSA, AudioContextCache
+
+if HAS_LIBROSA:
+    import librosa
+
+
+def read_wav(path):
+    sr, data = wavfile.read(path)
+    return data.astype(np.float32) / 32768, sr
+
+
+class TestAudioContextCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.loads = []
+
+        def loader(path):
+            self.loads.append(path)
+            return read_wav(path)
+
+        self.loader = loader
+        self.paths = []
+        for name, seed in [("a.wav", 1), ("a_copy.wav", 1), ("b.wav", 2)]:
+            tone = np.random.default_rng(seed).normal(0, 3000, 8000).astype(np.int16)
+            path = os.path.join(self.tmp, name)
+            wavfile.write(path, 8000, tone)
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_same_content_is_decoded_once(self):
+        cache = AudioContextCache(loader=self.loader)
+        first = cache.get(self.paths[0])
+        self.assertIs(cache.get(self.paths[1]), first)  # another temp file, same upload
+        self.assertIsNot(cache.get(self.paths[2]), first)
+        self.assertEqual(len(self.loads), 2)
+        self.assertEqual(cache.get_stats()["hits"], 1)
+
+        calls = []
+        view = first.native
+        for _ in range(3):
+            view.layer("peak", lambda: calls.append(1) or float(np.abs(view.y).max()))
+        self.assertEqual(len(calls), 1)
+
+    def test_duration_view_matches_a_truncated_load(self):
+        context = AudioContextCache(loader=self.loader).get(self.paths[0])
+        head = context.view(duration=0.25)
+        self.assertEqual(head.sr, 8000)
+        np.testing.assert_array_equal(head.y, context.native.y[:2000])
+        self.assertIs(context.view(duration=0.25), head)
+        self.assertIs(context.view(sr=8000, duration=30), context.native)
+
+    def test_bounded_by_entries_and_bytes(self):
+        cache = AudioContextCache(max_entries=1, loader=self.loader)
+        cache.get(self.paths[0])
+        cache.get(self.paths[2])
+        cache.get(self.paths[1])
+        self.assertEqual(len(self.loads), 3)
+        self.assertEqual(cache.get_stats()["evictions"], 2)
+
+        cache = AudioContextCache(max_bytes=40000, loader=self.loader)
+        kept = cache.get(self.paths[0])
+        kept.native.layer("copy", lambda: np.repeat(kept.native.y, 2))
+        cache.get(self.paths[2])
+        self.assertEqual(cache.get_stats()["entries"], 1)
+        self.assertIs(cache.get(self.paths[2]).native, cache.get(self.paths[2]).native)
+
+    def test_layers_count_toward_the_byte_bound(self):
+        cache = AudioContextCache(max_bytes=100000, loader=self.loader)  # each signal is 32000 bytes
+        older = cache.get(self.paths[0])
+        newer = cache.get(self.paths[2])
+        self.assertEqual(cache.get_stats()["entries"], 2)
+
+        newer.native.layer("copy", lambda: np.repeat(newer.native.y, 2))  # 96000 bytes: older goes
+        stats = cache.get_stats()
+        self.assertEqual((stats["entries"], stats["bytes"], stats["evictions"]), (1, 96000, 1))
+        self.assertIs(cache.get(self.paths[2]), newer)
+
+        newer.native.layer("bigger", lambda: np.repeat(newer.native.y, 3))  # alone over the bound
+        self.assertEqual(cache.get_stats()["entries"], 0)
+        self.assertEqual(newer.native.layer("bigger", lambda: None).size, 24000)  # caller keeps it
+        older.native.layer("late", lambda: np.zeros(1))  # evicted contexts no longer touch the cache
+        self.assertEqual(cache.get_stats()["evictions"], 2)
+
+
+def piptrack_loop(pitches, magnitudes):
+    """The per-frame argmax loop the engines ran before ``AudioView.pitch_track``"""
+    strongest = []
+    for t in range(pitches.shape[1]):
+        index = magnitudes[:, t].argmax()
+        strongest.append((pitches[index, t], magnitudes[index, t]))
+    return np.array(strongest).T
+
+
+@unittest.skipUnless(HAS_LIBROSA, "librosa not installed")
+class TestEnginesMatchDirectLoad(unittest.TestCase):
+    """Each engine's view layers against the ``librosa.load`` calls it made before the cache"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        sr = 16000
+        t = np.arange(32 * sr) / sr  # longer than the moodboard's 30 s window
+        rng = np.random.default_rng(3)
+        tone = 0.4 * np.sin(2 * np.pi * 220 * t) + 0.2 * np.sin(2 * np.pi * 330 * t)
+        clicks = (np.mod(t, 0.5) < 0.01) * rng.normal(0, 0.3, t.size)
+        cls.path = os.path.join(cls.tmp, "clip.wav")
+        wavfile.write(cls.path, sr, ((tone + clicks) * 16000).astype(np.int16))
+        cls.context = AudioContextCache().get(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp)
+
+    def assertSame(self, direct, cached):
+        np.testing.assert_allclose(np.asarray(cached), np.asarray(direct), rtol=1e-6, atol=1e-9)
+
+    def test_hps_engine(self):
+        y, sr = librosa.load(self.path, sr=None, mono=True)
+        audio = self.context.native
+        np.testing.assert_array_equal(audio.y, y)
+        self.assertSame(librosa.feature.chroma_cqt(y=y, sr=sr), audio.chroma_cqt())
+        tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
+        self.assertSame(tempo, audio.beat_track()[0])
+        np.testing.assert_array_equal(audio.beat_track()[1], beats)
+        self.assertSame(librosa.onset.onset_strength(y=y, sr=sr), audio.onset_strength())
+        self.assertSame(librosa.feature.spectral_centroid(y=y, sr=sr), audio.spectral_centroid())
+        self.assertSame(librosa.feature.spectral_rolloff(y=y, sr=sr), audio.spectral_rolloff())
+        self.assertSame(librosa.feature.spectral_bandwidth(y=y, sr=sr), audio.spectral_bandwidth())
+        self.assertSame(librosa.feature.zero_crossing_rate(y), audio.zero_crossing_rate())
+
+    def test_energy_engine(self):
+        y, sr = librosa.load(self.path, sr=None, mono=True)
+        audio = self.context.native
+        self.assertSame(piptrack_loop(*librosa.piptrack(y=y, sr=sr)), audio.pitch_track())
+        self.assertSame(librosa.feature.spectral_flatness(y=y), audio.spectral_flatness())
+        self.assertSame(librosa.feature.spectral_rolloff(y=y, sr=sr), audio.spectral_rolloff())
+        self.assertSame(librosa.feature.rms(y=y), audio.rms())
+
+    def test_harmony_engine(self):
+        y, sr = librosa.load(self.path, sr=None, mono=True)
+        audio = self.context.native
+        self.assertSame(piptrack_loop(*librosa.piptrack(y=y, sr=sr)), audio.pitch_track())
+        self.assertSame(librosa.feature.chroma_stft(y=y, sr=sr), audio.chroma_stft())
+
+    def test_moodboard_engine(self):
+        y, sr = librosa.load(self.path, sr=None, duration=30)
+        audio = self.context.view(duration=30)
+        np.testing.assert_array_equal(audio.y, y)
+        self.assertSame(librosa.feature.chroma_stft(y=y, sr=sr), audio.chroma_stft())
+        self.assertSame(librosa.feature.spectral_centroid(y=y, sr=sr), audio.spectral_centroid())
+        self.assertSame(librosa.beat.beat_track(y=y, sr=sr)[0], audio.beat_track()[0])
+        self.assertSame(librosa.feature.rms(y=y), audio.rms())
+
+    def test_midi_engine(self):
+        y, sr = librosa.load(self.path, sr=22050)
+        audio = self.context.view(sr=22050)
+        self.assertEqual(audio.sr, sr)
+        self.assertSame(y, audio.y)
+        self.assertSame(piptrack_loop(*librosa.piptrack(y=y, sr=sr, fmin=50, fmax=2000)),
+                        audio.pitch_track(fmin=50, fmax=2000))
+        self.assertSame(librosa.beat.beat_track(y=y, sr=sr)[0], audio.beat_track()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import sys
+import threading
+import unittest
+
+import numpy as np
+
+from apps.api.neurosonix.audio_synthesizer import AudioSynthesizer, WavetableOscillatorBank
+
+BRAIN_DATA = {
+    "status": "active",
+    "cognitive_state": {"band_powers": {"alpha": 4.0, "beta": 1.0}, "state": "focused", "confidence": 0.5},
+    "brain_symmetry": {"symmetry_index": 0.25},
+}
+
+
+class TestWavetableOscillatorBank(unittest.TestCase):
+
+    def test_blocks_of_any_size_join_into_a_continuous_tone(self):
+        bank = WavetableOscillatorBank(8000, 1, smoothing=0.0)
+        bank.set_voice(0, frequency=440.0, amplitude=0.5, immediate=True)
+        out = np.zeros(8000)
+        start = 0
+        for size in [1, 64, 1000, 333, 4096, 2506]:
+            bank.render(out[start:start + size])
+            start += size
+        expected = 0.5 * np.sin(2 * np.pi * 440.0 * np.arange(8000) / 8000)
+        np.testing.assert_allclose(out, expected, atol=1e-5)
+        self.assertEqual(bank.frames_rendered, 8000)
+
+    def test_amplitude_glides_without_steps(self):
+        bank = WavetableOscillatorBank(8000, 1, smoothing=0.05)
+        bank.set_voice(0, frequency=100.0, immediate=True)
+        bank.set_voice(0, amplitude=1.0)
+        out = np.zeros(4000)
+        for start in range(0, 4000, 256):
+            bank.render(out[start:start + 256])
+        self.assertLess(np.abs(np.diff(out)).max(), 2 * np.pi * 100.0 / 8000 * 1.05)
+        self.assertGreater(np.abs(out[-200:]).max(), 0.95)
+
+    def test_sequence_changes_from_another_thread_do_not_break_render(self):
+        bank = WavetableOscillatorBank(8000, 64, smoothing=0.0)
+        done = threading.Event()
+
+        def toggle():
+            while not done.is_set():
+                for voice in range(64):
+                    bank.set_sequence(voice, np.array([220.0, 330.0]))
+                for voice in range(64):
+                    bank.set_sequence(voice, None)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        thread = threading.Thread(target=toggle)
+        thread.start()
+        try:
+            out = np.zeros(16)
+            for _ in range(20000):
+                bank.render(out)
+        finally:
+            done.set()
+            thread.join()
+            sys.setswitchinterval(interval)
+
+
+class TestAudioSynthesizerOutput(unittest.TestCase):
+
+    def setUp(self):
+        self.synth = AudioSynthesizer(sample_rate=8000, real_audio=False)
+
+    def test_callback_renders_exact_frames_and_continues_clips(self):
+        self.synth.audio_queue.put_nowait(np.full(300, 0.5))
+        outdata = np.zeros((256, 1), dtype=np.float32)
+        self.synth._audio_callback(outdata, 256, None, None)
+        np.testing.assert_allclose(outdata[:, 0], 0.5)
+        self.synth._audio_callback(outdata, 256, None, None)
+        np.testing.assert_allclose(outdata[:44, 0], 0.5)
+        np.testing.assert_allclose(outdata[44:, 0], 0.0)
+
+    def test_offline_render_follows_brain_data(self):
+        self.assertEqual(self.synth.apply_brain_data(BRAIN_DATA, self.synth.create_oscillator_bank()),
+                         ["brain_waves", "musical", "hemisphere_balance"])
+        audio = self.synth.render_offline(BRAIN_DATA, duration=1.0, block_size=500, channels=2)
+        self.assertEqual(audio.shape, (8000, 2))
+        self.assertLessEqual(np.abs(audio).max(), 0.8 + 1e-6)
+        left, right = np.abs(audio[4000:]).mean(axis=0)
+        self.assertGreater(left, right)  # symmetry index 0.25 leans left
+
+        chunks = list(self.synth.iter_pcm_blocks(lambda: BRAIN_DATA, block_size=800, duration=0.5))
+        self.assertEqual([len(chunk) for chunk in chunks], [1600] * 5)
+        silent = self.synth.render_offline({"status": "no_data"}, duration=0.1)
+        self.assertEqual(np.abs(silent).max(), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
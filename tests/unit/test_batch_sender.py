@@ -0,0 +1,78 @@
+import threading
+import unittest
+
+from batch_sender import BatchSender
+
+
+class StubSender(BatchSender):
+    """Answers batches with ``batch_statuses`` (then 200) and items via ``item_status``."""
+
+    def __init__(self, batch_statuses=(), item_status=lambda item: 200, **kwargs):
+        kwargs.setdefault("flush_interval", 0.01)
+        kwargs.setdefault("backoff_max", 0.02)
+        super().__init__("stub", **kwargs)
+        self.batch_statuses = list(batch_statuses)
+        self.item_status = item_status
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def _send_batch(self, batch):
+        with self.lock:
+            self.requests.append(("batch", list(batch)))
+            return self.batch_statuses.pop(0) if self.batch_statuses else 200
+
+    def _send_one(self, item):
+        with self.lock:
+            self.requests.append(("one", item))
+            status = self.item_status(item)
+            return status.pop(0) if isinstance(status, list) else status
+
+
+class TestBatchSender(unittest.TestCase):
+
+    def run_items(self, sender, items):
+        for item in items:
+            sender.submit(item)
+        self.assertTrue(sender.flush(timeout=3.0))
+        sender.close()
+        return sender.snapshot()
+
+    def test_is_abstract(self):
+        with self.assertRaises(TypeError):
+            BatchSender("x")
+
+    def test_permanently_refused_item_does_not_block_the_rest(self):
+        sender = StubSender(batch_statuses=[400], item_status=lambda item: 400 if item == "bad" else 200)
+        snapshot = self.run_items(sender, ["a", "bad", "b"])
+        self.assertEqual((snapshot["sent"], snapshot["rejected"], snapshot["queued"]), (2, 1, 0))
+        self.assertEqual(snapshot["failed_batches"], 0)
+        self.assertTrue(snapshot["batched"])  # a 400 is about the content, not the endpoint
+        self.assertEqual(sender.requests[1:], [("one", "a"), ("one", "bad"), ("one", "b")])
+
+    def test_unauthorized_items_are_dropped_not_retried(self):
+        sender = StubSender(batch_statuses=[401], item_status=lambda item: 401)
+        snapshot = self.run_items(sender, ["a", "b"])
+        self.assertEqual((snapshot["sent"], snapshot["rejected"], snapshot["queued"]), (0, 2, 0))
+        self.assertEqual(len(sender.requests), 3)
+
+    def test_transient_statuses_are_retried(self):
+        sender = StubSender(batch_statuses=[503, 429])
+        snapshot = self.run_items(sender, ["a", "b"])
+        self.assertEqual((snapshot["sent"], snapshot["rejected"], snapshot["failed_batches"]), (2, 0, 2))
+        self.assertEqual([kind for kind, _ in sender.requests], ["batch"] * 3)
+
+    def test_batches_are_reprobed_after_a_fallback(self):
+        sender = StubSender(batch_statuses=[404], batch_reprobe=0.05)
+        self.run_items(sender, ["a", "b"])
+        self.assertEqual([kind for kind, _ in sender.requests], ["batch", "one", "one"])
+        self.assertFalse(sender.snapshot()["batched"])
+
+        sender._reprobe_at = 0.0  # probe interval elapsed
+        snapshot = self.run_items(sender, ["c", "d"])
+        self.assertEqual(sender.requests[3:], [("batch", ["c", "d"])])
+        self.assertTrue(snapshot["batched"])
+        self.assertEqual(snapshot["sent"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+
+from apps.api.clinic_integrations import DeviceRing, StreamMultiplexer
+
+
+async def readings(rate, count, start=100.0, width=1):
+    for i in range(count):
+        yield {"timestamp": (start + i / rate) * 1000, "value": [float(i)] * width if width > 1 else float(i)}
+
+
+class TestDeviceRing(unittest.TestCase):
+
+    def fill(self, policy):
+        ring = DeviceRing('eeg', 8, policy)
+        for i in range(20):
+            ring.push(i * 0.1, [i, -i])
+        return ring
+
+    def test_drop_oldest_keeps_newest(self):
+        ring = self.fill('drop_oldest')
+        self.assertEqual(len(ring), 8)
+        self.assertEqual(ring.stats['dropped'], 12)
+        self.assertEqual(ring.sample(1.25, 1.2, 'hold').tolist(), [12.0, -12.0])
+        self.assertIsNone(ring.sample(0.5, 0.4, 'hold'))
+
+    def test_downsample_keeps_time_span(self):
+        ring = self.fill('downsample')
+        self.assertLessEqual(len(ring), 8)
+        self.assertGreater(ring.stats['downsampled'], 0)
+        self.assertAlmostEqual(ring.last_timestamp, 1.9)
+        self.assertLess(ring.sample(10, 9, 'hold')[0], 20)
+
+    def test_interp_and_mean(self):
+        ring = self.fill('drop_oldest')
+        self.assertAlmostEqual(ring.sample(1.55, 1.5, 'interp')[0], 15.5)
+        self.assertAlmostEqual(ring.sample(1.85, 1.55, 'mean')[0], 17.0)
+
+
+class TestStreamMultiplexer(unittest.TestCase):
+
+    def test_frames_align_streams(self):
+        async def run():
+            mux = StreamMultiplexer(frame_rate=10)
+            mux.add_stream('eeg', readings(256, 512, width=2), capacity=1024, mode='mean')
+            mux.add_stream('spo2', readings(1, 2), capacity=4, mode='hold', stale_after=3)
+            mux.start()
+            await asyncio.gather(*mux._tasks)
+            return mux, [mux.build_frame(100.0 + k / 10) for k in range(1, 16)]
+
+        mux, frames = asyncio.run(run())
+        self.assertEqual(frames[0]['values']['eeg'], [13.0, 13.0])  # mean of samples 1..25
+        self.assertEqual(frames[-1]['values']['spo2'], 1.0)
+        self.assertEqual(frames[4]['values']['spo2'], 0.0)
+        self.assertEqual(frames[-1]['stale'], [])
+        self.assertLess(len(mux.rings['eeg']), 512 - 14 * 25)  # consumed samples are released
+        self.assertEqual(mux.get_metrics()['frames_emitted'], 15)
+
+    def test_block_policy_waits_for_consumer(self):
+        async def run():
+            mux = StreamMultiplexer(frame_rate=10, policy='block')
+            ring = mux.add_stream('ecg', readings(100, 50), capacity=10, mode='interp')
+            mux.start()
+            await asyncio.sleep(0.05)
+            blocked = ring.stats['received']
+            mux.build_frame(100.05)
+            await asyncio.sleep(0.05)
+            await mux.stop()
+            return blocked, ring.stats['received']
+
+        blocked, after = asyncio.run(run())
+        self.assertEqual(blocked, 10)
+        self.assertGreater(after, blocked)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import asyncio
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from cycle_engine import CycleEngine, CycleExecution, CycleStatus, CycleType
+from cycle_history import ExecutionHistory
+
+
+class TestExecutionHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.history = ExecutionHistory(Path(self.tmp.name) / "history.sqlite3", per_cycle=3)
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        for i in range(6):
+            execution = CycleExecution(cycle_id="c1" if i % 2 else "c2", started_at=base + timedelta(minutes=i))
+            self.history.record(execution)
+            if i < 4:
+                execution.status = CycleStatus.COMPLETED if i % 3 else CycleStatus.FAILED
+                execution.completed_at = execution.started_at
+                self.history.update(execution)
+
+    def tearDown(self):
+        self.history.close()
+        self.tmp.cleanup()
+
+    def test_ring_is_bounded_but_disk_keeps_everything(self):
+        self.history.record(CycleExecution(cycle_id="c1"))
+        self.assertEqual(len(self.history.recent("c1")), 3)
+        self.assertEqual(self.history.query(cycle_id="c1")["total"], 4)
+
+    def test_counters_follow_transitions(self):
+        counters = self.history.counters
+        self.assertEqual(counters["executions"], 6)
+        self.assertEqual(counters["active"], 2)
+        self.assertEqual(counters["failed"], 2)
+        self.assertEqual(counters["completed"], 2)
+
+    def test_paginated_filters(self):
+        page = self.history.query(status="completed", limit=1, offset=1)
+        self.assertEqual(page["total"], 2)
+        self.assertEqual(page["items"][0]["started_at"], "2025-01-01T00:01:00+00:00")
+        window = self.history.query(since="2025-01-01T00:02:00Z", until="2025-01-01T00:04:00Z")
+        self.assertEqual([item["status"] for item in window["items"]], ["failed", "completed"])
+
+    def test_rows_are_committed_off_the_calling_thread(self):
+        self.history.flush()
+        self.assertNotEqual(self.history._writer.ident, threading.get_ident())
+        self.history.close()
+        reopened = ExecutionHistory(Path(self.tmp.name) / "history.sqlite3")
+        self.assertEqual(reopened.query()["total"], 6)
+        reopened.close()
+
+
+class TestStopFinishesExecutions(unittest.TestCase):
+
+    def test_stop_cycle_and_stop_all_persist_a_terminal_status(self):
+        async def scenario(root):
+            engine = CycleEngine(data_root=root)
+            first = engine.create_cycle(domain="neuro", cycle_type=CycleType.INTERVAL, interval=60.0)
+            second = engine.create_cycle(domain="audio", cycle_type=CycleType.INTERVAL, interval=60.0)
+            await engine.start_cycle(first.cycle_id)
+            await engine.start_cycle(second.cycle_id)
+            await asyncio.sleep(0.05)
+            engine.stop_cycle(first.cycle_id)
+            engine.stop_cycle(first.cycle_id)  # a second stop must not count twice
+            await engine.stop_all_cycles()
+            counters = dict(engine.history.counters)
+            rows = engine.query_executions()["items"]
+            await engine.shutdown()
+            return counters, rows
+
+        with tempfile.TemporaryDirectory() as root:
+            counters, rows = asyncio.run(scenario(Path(root)))
+        self.assertEqual(counters["active"], 0)
+        self.assertEqual(counters["paused"], 2)
+        self.assertEqual([row["status"] for row in rows], ["paused", "paused"])
+        self.assertTrue(all(row["completed_at"] for row in rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
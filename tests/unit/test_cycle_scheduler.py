@@ -0,0 +1,108 @@
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+from cycle_engine import CycleEngine, CycleExecution, CycleType
+from cycle_scheduler import CycleScheduler, EventBus, parse_trigger
+
+
+class TestEventBus(unittest.TestCase):
+
+    def test_parse_trigger(self):
+        self.assertEqual(parse_trigger("beta>25Hz"), ("beta", ">", 25.0))
+        self.assertEqual(parse_trigger(" Alpha <= 8.5 "), ("alpha", "<=", 8.5))
+        self.assertEqual(parse_trigger("new_paper"), ("new_paper", None, None))
+
+    def test_match_only_satisfied_conditions(self):
+        bus = EventBus()
+        for cycle_id, trigger in [("a", "beta>25Hz"), ("b", "beta>=30"), ("c", "beta<10"),
+                                  ("d", "beta==27"), ("e", "beta!=27"), ("f", "new_paper")]:
+            bus.subscribe(cycle_id, trigger)
+        self.assertEqual(sorted(bus.match("beta", 27.0)), ["a", "d"])
+        self.assertEqual(sorted(bus.match("beta", 30.0)), ["a", "b", "e"])
+        self.assertEqual(sorted(bus.match("beta", 5.0)), ["c", "e"])
+        self.assertEqual(bus.match("new_paper"), ["f"])
+        bus.unsubscribe("a")
+        self.assertEqual(sorted(bus.match("beta", 27.0)), ["d"])
+        self.assertEqual(len(bus), 5)
+
+
+class TestCycleScheduler(unittest.TestCase):
+
+    def test_timers_events_and_coalescing(self):
+        calls = []
+
+        async def handler(cycle_id):
+            calls.append(cycle_id)
+            await asyncio.sleep(0)
+
+        async def scenario():
+            scheduler = CycleScheduler(handler, workers=2)
+            scheduler.schedule("late", 0.05)
+            scheduler.schedule("early", 0.0)
+            scheduler.schedule("cancelled", 0.0)
+            scheduler.cancel("cancelled")
+            scheduler.subscribe("alert", "beta>25Hz")
+            scheduler.publish("beta", 20.0)
+            scheduler.publish("beta", 26.0)
+            scheduler.publish("beta", 27.0)  # still queued -> coalesced
+            await asyncio.sleep(0.1)
+            await scheduler.drain()
+            stats = scheduler.snapshot()
+            await scheduler.close()
+            return stats
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(sorted(calls), ["alert", "early", "late"])
+        self.assertLess(calls.index("early"), calls.index("late"))
+        self.assertEqual(stats["coalesced"], 1)
+        self.assertEqual(stats["timers"], 0)
+
+
+class TestCycleEngineEvents(unittest.TestCase):
+
+    def test_ingested_frames_fire_event_cycles(self):
+        async def scenario(root):
+            engine = CycleEngine(data_root=root)
+            cycle = engine.create_cycle(domain="neuro", agent="ALBA", task="frequency_monitor",
+                                        cycle_type=CycleType.EVENT, event_trigger="beta>25Hz")
+            await engine.start_cycle(cycle.cycle_id)
+            quiet = engine.ingest_frame({"alpha": 10.0, "beta": 15.0})
+            woken = engine.ingest_frame({"alpha": 10.0, "beta": 27.0})
+            await asyncio.sleep(0.05)
+            await engine.scheduler.drain()
+            execution = engine.history.latest(cycle.cycle_id)
+            status = engine.get_status()
+            await engine.shutdown()
+            return cycle.cycle_id, quiet, woken, execution, status
+
+        with tempfile.TemporaryDirectory() as root:
+            cycle_id, quiet, woken, execution, status = asyncio.run(scenario(root))
+        self.assertEqual(quiet, [])
+        self.assertEqual(woken, [cycle_id])
+        self.assertEqual(execution.data_processed, 1)
+        self.assertEqual(status["ALBA"], "ACTIVE")  # frames reached the engine's AlbaCore
+
+    def test_simulated_levels_are_not_published(self):
+        async def scenario(root):
+            engine = CycleEngine(data_root=root)
+            results = []
+            with mock.patch.object(engine.scheduler, "publish_many") as publish:
+                for task in ("frequency_monitor", "eeg_collection"):
+                    cycle = engine.create_cycle(domain="neuro", agent="ALBA", task=task)
+                    results.append(await engine._execute_task(cycle, CycleExecution(cycle_id=cycle.cycle_id)))
+                self.assertEqual(publish.call_count, 0)  # no frames yet: made-up levels stay off the bus
+                engine.alba.ingest({"beta": 27.0})
+                results.append(await engine._execute_task(cycle, CycleExecution(cycle_id=cycle.cycle_id)))
+                publish.assert_called_once_with({"beta": 27.0})
+            await engine.shutdown()
+            return results
+
+        with tempfile.TemporaryDirectory() as root:
+            results = asyncio.run(scenario(root))
+        self.assertEqual([r["frequency_simulated"] for r in results], [True, True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from scipy.signal import welch
+
+from apps.api.edf_stream import EDFReader, StreamingBandpass, WelchAccumulator, analyze_edf_stream
+
+from edf_helpers import write_edf
+
+
+class TestEDFStream(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'rec.edf'
+        rng = np.random.default_rng(0)
+        self.digital = rng.integers(-20000, 20000, size=(3, 128 * 40)).astype(np.int16)
+        write_edf(self.path, self.digital, 128)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_reader_scales_to_volts(self):
+        reader = EDFReader(self.path)
+        self.assertEqual((reader.n_channels, reader.sfreq, reader.n_times), (3, 128.0, 128 * 40))
+        gain = 1000.0 / 65535
+        expected = ((self.digital.astype(np.float64) + 32768) * gain - 500.0) * 1e-6
+        np.testing.assert_allclose(reader.read_records(5, 10), expected[:, 640:1920], atol=1e-12)
+
+    def test_unknown_record_count_uses_file_size(self):
+        write_edf(self.path, self.digital, 128, n_records_field=-1)
+        self.assertEqual(EDFReader(self.path).n_records, 40)
+
+    def test_chunked_welch_matches_whole_signal(self):
+        data = np.random.default_rng(1).normal(size=(2, 10000))
+        acc = WelchAccumulator(2, 100.0, 512)
+        for start in range(0, data.shape[1], 777):
+            acc.update(data[:, start:start + 777])
+        freqs, psd = acc.result()
+        f, expected = welch(data, fs=100.0, nperseg=512, axis=-1)
+        np.testing.assert_allclose(freqs, f)
+        np.testing.assert_allclose(psd, expected, rtol=1e-10)
+
+    def test_chunked_filter_matches_single_pass(self):
+        data = np.random.default_rng(2).normal(size=(2, 3000))
+        whole = StreamingBandpass(2, 128.0)(data)
+        bandpass = StreamingBandpass(2, 128.0)
+        chunked = np.concatenate([bandpass(data[:, s:s + 500]) for s in range(0, 3000, 500)], axis=1)
+        np.testing.assert_allclose(chunked, whole, atol=1e-12)
+
+    def test_analysis_reports_all_bands(self):
+        result = analyze_edf_stream(self.path, chunk_seconds=3)
+        self.assertEqual(result['info']['channels'], 3)
+        self.assertEqual(set(result['bands_psd']), {'delta', 'theta', 'alpha', 'beta', 'gamma'})
+        self.assertTrue(all(band['max'] >= band['mean'] > 0 for band in result['bands_psd'].values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
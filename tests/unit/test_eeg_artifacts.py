@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+
+from apps.api.neurosonix.eeg_processor import (
+    ARTIFACT_BITS, IndustrialEEGProcessor, decode_artifact_mask
+)
+
+from eeg_artifacts_baseline import baseline_report
+
+
+class TestBatchArtifactDetection(unittest.TestCase):
+
+    def setUp(self):
+        self.processor = IndustrialEEGProcessor(sampling_rate=256, max_channels=8)
+        rng = np.random.default_rng(1)
+        t = np.arange(4 * 256) / 256
+        self.data = rng.normal(0, 8, (4, t.size))
+        self.data[1] = 0.1 * rng.normal(size=t.size)  # flat line
+        self.data[2] += np.linspace(0, 300, t.size)   # drift + high amplitude
+        self.data[3, 500] += 200                       # electrode pop
+
+    def assert_matches_baseline(self, data):
+        batch = self.processor.detect_artifacts_batch(data)
+        for row, mask in enumerate(batch['bitmask']):
+            report = baseline_report(self.processor, data[row])
+            detected = [name for name, flag in report['artifacts_detected'].items() if flag]
+            self.assertEqual(decode_artifact_mask(mask), detected)
+            for i, name in enumerate(batch['artifact_types']):
+                self.assertAlmostEqual(batch['scores'][row][i], report['artifact_scores'].get(name, 0.0), places=3)
+
+    def test_batch_matches_baseline_per_channel_detector(self):
+        self.assert_matches_baseline(self.data)
+
+    def test_batch_matches_baseline_across_window_lengths(self):
+        for length in (1, 2, 10, 18, 40, 200, 257, 513):
+            with self.subTest(length=length):
+                self.assert_matches_baseline(self.data[:, :length])
+
+    def test_short_windows_are_analyzed_where_baseline_gave_up(self):
+        # 19-39 samples: the baseline's 50-100 Hz sosfiltfilt raised on padding and
+        # it returned an empty report; the engine skips only that detector
+        for length in (19, 30, 39):
+            with self.subTest(length=length):
+                window = self.data[:, 490:490 + length]  # includes the pop at 500
+                self.assertFalse(any(any(baseline_report(self.processor, row)['artifacts_detected'].values())
+                                     for row in window))
+                mask = self.processor.detect_artifacts_batch(window)['bitmask']
+                self.assertTrue(mask[1] & ARTIFACT_BITS['flat_line'])
+                self.assertTrue(mask[3] & ARTIFACT_BITS['electrode_pop'])
+                self.assertFalse(any(m & ARTIFACT_BITS['high_frequency_noise'] for m in mask))
+
+    def test_bitmask_flags(self):
+        mask = self.processor.detect_artifacts_batch(self.data)['bitmask']
+        self.assertEqual(mask[0], 0)
+        self.assertTrue(mask[1] & ARTIFACT_BITS['flat_line'])
+        self.assertTrue(mask[2] & ARTIFACT_BITS['drift'])
+        self.assertTrue(mask[3] & ARTIFACT_BITS['electrode_pop'])
+
+    def test_channel_count_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.processor.detect_artifacts_batch(self.data, ['a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import warnings
+
+import numpy as np
+
+from apps.api.neurosonix.eeg_processor import ICA_AVAILABLE, IndustrialEEGProcessor
+
+
+def mixed_sources(channels, samples, rate, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(samples) / rate
+    sources = np.stack([np.sin(2 * np.pi * 10 * t), rng.laplace(size=samples)]
+                       + [rng.uniform(-1, 1, samples) for _ in range(channels - 2)])
+    return rng.normal(size=(channels, channels)) @ sources * 20
+
+
+@unittest.skipUnless(ICA_AVAILABLE, "scikit-learn not installed")
+class TestSessionICA(unittest.TestCase):
+
+    def setUp(self):
+        warnings.filterwarnings("ignore", module="sklearn")
+        self.processor = IndustrialEEGProcessor(sampling_rate=64)
+        self.names = ['Fp1', 'Fp2', 'C3', 'C4']
+        self.data = mixed_sources(4, self.processor.ica_buffer_required * 2, 64)
+
+    def windows(self, data, start, count, size=64):
+        for i in range(start, start + count):
+            yield dict(zip(self.names, data[:, i * size:(i + 1) * size]))
+
+    def test_model_is_reused_for_windows(self):
+        minute = self.processor.ica_buffer_required
+        first = self.processor.apply_ica_artifact_removal(dict(zip(self.names, self.data[:, :minute])))
+        self.assertTrue(first['success'])
+        model = self.processor.ica_model
+        for window in self.windows(self.data, 60, 5):
+            result = self.processor.apply_ica_artifact_removal(window)
+            self.assertTrue(result['success'])
+        self.assertIs(self.processor.ica_model, model)
+        self.assertEqual(self.processor.ica.stats['fits'], 1)
+        expected = model.apply(self.data[:, 64 * 64:65 * 64])
+        np.testing.assert_allclose(np.array(list(result['cleaned_data'].values())), expected)
+
+    def test_streamed_windows_fit_in_background(self):
+        results = [self.processor.apply_ica_artifact_removal(w) for w in self.windows(self.data, 0, 60)]
+        self.assertFalse(any(r['success'] for r in results))
+        self.assertEqual(results[0]['ica_info']['status'], 'buffering')
+        self.processor.ica._worker.join(timeout=60)
+        self.assertTrue(self.processor.ica_trained)
+        result = self.processor.apply_ica_artifact_removal(next(self.windows(self.data, 60, 1)))
+        self.assertTrue(result['success'])
+
+    def test_drift_triggers_refit(self):
+        minute = self.processor.ica_buffer_required
+        self.processor.apply_ica_artifact_removal(dict(zip(self.names, self.data[:, :minute])))
+        remixed = mixed_sources(4, minute, 64, seed=1)
+        for window in self.windows(remixed, 0, 40):
+            self.processor.apply_ica_artifact_removal(window)
+        self.assertEqual(self.processor.ica.stats['drift_refits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+from typing import Optional
+
+import numpy as np
+from fastapi import Depends, FastAPI, Header, HTTPException, WebSocket
+from fastapi.testclient import TestClient
+from starlette.testclient import WebSocketDenialResponse
+
+from apps.api.neurosonix.eeg_ingest import FrameError, decode_frame, encode_frame, serve_ingest
+from apps.api.neurosonix.eeg_processor import IndustrialEEGProcessor, SampleRing
+
+
+class TestFrames(unittest.TestCase):
+
+    def test_round_trip(self):
+        block = np.arange(12, dtype=np.float32).reshape(3, 4)
+        frame = decode_frame(encode_frame('dev1', block, 256.0, 7, 1000.5))
+        self.assertEqual((frame.device_id, frame.sample_rate, frame.sequence, frame.timestamp),
+                         ('dev1', 256.0, 7, 1000.5))
+        np.testing.assert_array_equal(frame.samples, block)
+
+    def test_rejects_malformed(self):
+        raw = encode_frame('dev1', np.zeros((2, 8)), 256.0, 0)
+        for bad in (raw[:10], raw[:-4], b'XXXX' + raw[4:]):
+            with self.assertRaises(FrameError):
+                decode_frame(bad)
+
+
+class TestIngestWebSocket(unittest.TestCase):
+
+    def setUp(self):
+        self.processor = IndustrialEEGProcessor(sampling_rate=256)
+        app = FastAPI()
+
+        @app.websocket('/ingest')
+        async def ingest(websocket: WebSocket):
+            await serve_ingest(websocket, self.processor, queue_size=8, ack_every=4)
+
+        self.client = TestClient(app)
+
+    def test_frames_reach_processor(self):
+        data = np.random.default_rng(0).normal(0, 20, (2, 256)).astype(np.float32)
+        with self.client.websocket_connect('/ingest') as ws:
+            ws.send_json({'type': 'hello', 'channel_names': ['Fp1', 'Fp2', 'Xx']})
+            self.assertEqual(ws.receive_json()['rejected'], ['Xx'])
+            ws.send_bytes(encode_frame('dev', np.zeros((2, 4)), 256.0, 0))
+            self.assertEqual(ws.receive_json()['type'], 'error')  # 2 channels, hello announced 3
+
+            ws.send_json({'type': 'hello', 'channel_names': ['Fp1', 'Fp2']})
+            ws.receive_json()
+            for seq in range(8):
+                ws.send_bytes(encode_frame('dev', data[:, seq * 32:(seq + 1) * 32], 256.0, seq, 100.0 + seq / 8))
+            ws.send_json({'type': 'stats'})
+            messages = []
+            while not messages or messages[-1]['type'] != 'stats':
+                messages.append(ws.receive_json())
+        stats = messages[-1]
+        self.assertEqual((stats['frames'], stats['samples'], stats['sequence_gaps']), (8, 256, 0))
+        self.assertIn('ack', [m['type'] for m in messages])
+        np.testing.assert_allclose(list(self.processor.signal_buffers['Fp2']), data[1], rtol=1e-6)
+        self.assertAlmostEqual(self.processor.timestamp_buffers['Fp1'][-1], 100.0 + 255 / 256)
+
+    def test_non_object_control_frames_get_an_error(self):
+        with self.client.websocket_connect('/ingest') as ws:
+            for bad in ('[]', '"hello"', '{"type": "hello", "channel_names": 5}'):
+                ws.send_text(bad)
+                self.assertEqual(ws.receive_json()['type'], 'error')
+            ws.send_json({'type': 'hello', 'channel_names': ['Fp1']})
+            self.assertEqual(ws.receive_json()['accepted'], ['Fp1'])
+
+
+class TestSampleRing(unittest.TestCase):
+
+    def test_matches_a_bounded_deque(self):
+        from collections import deque
+        ring, reference = SampleRing(16), deque(maxlen=16)
+        rng = np.random.default_rng(1)
+        for step in range(200):
+            if step % 3:
+                values = rng.normal(size=int(rng.integers(0, 20)))
+                ring.extend(values)
+                reference.extend(values.tolist())
+            else:
+                value = float(rng.normal())
+                ring.append(value)
+                reference.append(value)
+            self.assertEqual(list(ring), list(reference))
+        self.assertEqual(ring[-1], reference[-1])
+
+
+
+class TestStreamRouterAuth(unittest.TestCase):
+    """main.py mounts eeg_stream_router behind get_current_user_from_api_key"""
+
+    def setUp(self):
+        from apps.api.neurosonix.routes import eeg_stream_router
+
+        def api_key(authorization: Optional[str] = Header(None, alias='Authorization')):
+            if authorization != 'Bearer test-key':
+                raise HTTPException(status_code=401, detail='Authorization header missing')
+            return {'user_id': 'u1'}
+
+        app = FastAPI()
+        app.include_router(eeg_stream_router, dependencies=[Depends(api_key)])
+        self.client = TestClient(app)
+        self.url = eeg_stream_router.prefix + '/eeg/stream'
+        self.paths = [route.path for route in eeg_stream_router.routes]
+
+    def test_only_the_stream_is_mounted(self):
+        self.assertEqual(self.paths, [self.url])
+
+    def test_rejected_before_accept_without_key(self):
+        for headers in ({}, {'Authorization': 'Bearer wrong'}):
+            with self.assertRaises(WebSocketDenialResponse) as ctx:
+                with self.client.websocket_connect(self.url, headers=headers):
+                    pass
+            self.assertEqual(ctx.exception.status_code, 401)
+
+    def test_accepted_with_key(self):
+        with self.client.websocket_connect(self.url, headers={'Authorization': 'Bearer test-key'}) as ws:
+            ws.send_json({'type': 'hello', 'channel_names': ['Fp1']})
+            self.assertEqual(ws.receive_json()['rejected'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from apps.api.edf_stream import EDFReader
+from apps.api.uploads.tiles import TilePyramid, build_tile_pyramid, tiles_path
+
+from edf_helpers import write_edf
+
+
+class TestTilePyramid(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = Path(self.tmp.name) / 'rec.edf'
+        digital = np.random.default_rng(0).integers(-20000, 20000, size=(2, 64 * 100)).astype(np.int16)
+        write_edf(self.source, digital, 64)
+        self.header = build_tile_pyramid(self.source, factor=4, top_bins=4, chunk_seconds=7)
+        self.pyramid = TilePyramid(tiles_path(self.source))
+        self.data = EDFReader(self.source).read_records(0, 100)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_levels_cover_the_recording(self):
+        self.assertEqual([level['n_bins'] for level in self.header['levels']], [100, 25, 7, 2])
+        self.assertEqual(self.pyramid.channels, ['C0', 'C1'])
+
+    def test_envelope_matches_samples_at_every_zoom(self):
+        for start, end, pixels in ((0, 100, 5), (10, 30, 20), (42.5, 43.5, 100)):
+            result = self.pyramid.query(start, end, pixels)
+            self.assertLessEqual(len(result['min'][0]), pixels)
+            first, last = int(result['start'] * 64), int(result['end'] * 64)
+            np.testing.assert_allclose(np.min(result['min'], axis=1), self.data[:, first:last].min(axis=1), rtol=1e-6)
+            np.testing.assert_allclose(np.max(result['max'], axis=1), self.data[:, first:last].max(axis=1), rtol=1e-6)
+
+    def test_query_reads_a_bounded_number_of_bins(self):
+        result = self.pyramid.query(0, 100, 10, channels=['C1'])
+        self.assertEqual((result['level'], result['bins_read']), (1, 25))
+        self.assertEqual(result['channels'], ['C1'])
+        self.assertEqual(set(result['band_power']), {'delta', 'theta', 'alpha', 'beta', 'gamma'})
+        with self.assertRaises(ValueError):
+            self.pyramid.query(channels=['C9'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import threading
+import time
+import unittest
+
+from hq_event_relay import HQEventRelay
+
+
+class FakeResponse:
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeSession:
+    """Records POST bodies; ``statuses`` are answered in order, then 200."""
+
+    def __init__(self, statuses=(), batch_status=None):
+        self.statuses = list(statuses)
+        self.batch_status = batch_status
+        self.bodies = []
+        self.accepted = []
+        self.times = []
+        self.lock = threading.Lock()
+
+    def post(self, url, json=None, timeout=None):
+        with self.lock:
+            self.bodies.append(json)
+            self.times.append(time.monotonic())
+            if self.batch_status is not None and "events" in json:
+                return FakeResponse(self.batch_status)
+            status = self.statuses.pop(0) if self.statuses else 200
+            if isinstance(status, Exception):
+                raise status
+            if status < 400:
+                self.accepted.append(json)
+            return FakeResponse(status)
+
+    def delivered(self):
+        events = []
+        for body in self.accepted:
+            events.extend(body["events"] if "events" in body else [body])
+        return events
+
+
+def make_relay(session, **kwargs):
+    kwargs.setdefault("flush_interval", 0.01)
+    relay = HQEventRelay("http://hq.test/mesh/event", **kwargs)
+    relay._session = session
+    return relay
+
+
+class TestHQEventRelay(unittest.TestCase):
+
+    def test_events_are_batched(self):
+        session = FakeSession()
+        relay = make_relay(session, batch_size=4)
+        for i in range(10):
+            self.assertTrue(relay.submit({"n": i}))
+        self.assertTrue(relay.flush(timeout=2.0))
+        relay.close()
+        self.assertEqual([len(body["events"]) for body in session.bodies], [4, 4, 2])
+        self.assertEqual([e["n"] for e in session.delivered()], list(range(10)))
+        self.assertEqual(relay.snapshot()["sent"], 10)
+
+    def test_full_queue_drops_new_events(self):
+        relay = make_relay(FakeSession(), max_queue=3, batch_size=100, flush_interval=5.0)
+        relay._ensure_started = lambda: None  # keep everything queued
+        results = [relay.submit({"n": i}) for i in range(5)]
+        self.assertEqual(results, [True, True, True, False, False])
+        snapshot = relay.snapshot()
+        self.assertEqual((snapshot["queued"], snapshot["dropped"], snapshot["submitted"]), (3, 2, 3))
+
+    def test_backoff_grows_then_resets_without_losing_events(self):
+        session = FakeSession(statuses=[ConnectionError("down"), 503, 503])
+        relay = make_relay(session, batch_size=10, backoff_max=0.03)
+        for i in range(3):
+            relay.submit({"n": i})
+        self.assertTrue(relay.flush(timeout=3.0))
+        relay.close()
+        gaps = [b - a for a, b in zip(session.times, session.times[1:])]
+        self.assertEqual(len(gaps), 3)
+        self.assertGreaterEqual(gaps[0], 0.01)
+        self.assertGreaterEqual(gaps[1], 0.02)
+        self.assertGreaterEqual(gaps[2], 0.03)  # capped at backoff_max
+        snapshot = relay.snapshot()
+        self.assertEqual(snapshot["failed_batches"], 3)
+        self.assertEqual(snapshot["backoff_seconds"], 0.0)
+        self.assertEqual([e["n"] for e in session.delivered()], [0, 1, 2])
+
+    def test_falls_back_to_single_events(self):
+        session = FakeSession(statuses=[200, 500], batch_status=404)
+        relay = make_relay(session, batch_size=10, backoff_max=0.02)
+        for i in range(3):
+            relay.submit({"n": i})
+        self.assertTrue(relay.flush(timeout=3.0))
+        relay.close()
+        self.assertFalse(relay.snapshot()["batched"])
+        single = [body for body in session.bodies if "events" not in body]
+        # event 1 failed once and was retried; event 0 was not resent
+        self.assertEqual([body["n"] for body in single], [0, 1, 1, 2])
+        self.assertEqual(relay.snapshot()["sent"], 3)
+
+
+class TestMeshEventReceiver(unittest.TestCase):
+
+    def test_accepts_batches_and_single_events(self):
+        from fastapi.testclient import TestClient
+        from backend.mesh import server
+
+        server.events.clear()
+        client = TestClient(server.app)
+        batch = client.post("/mesh/event", json={"events": [{"n": 0}, {"n": 1}, "junk"]})
+        self.assertEqual(batch.json()["accepted"], 2)
+        self.assertEqual(client.post("/mesh/event", json={"n": 2}).json()["accepted"], 1)
+        self.assertEqual(client.post("/mesh/event", json={"events": {"n": 3}}).status_code, 422)
+        recent = client.get("/mesh/events", params={"limit": 2}).json()
+        self.assertEqual([e["n"] for e in recent], [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
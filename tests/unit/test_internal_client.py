@@ -0,0 +1,132 @@
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from apps.api.internal_client import HTTPClientPool, InternalAPIClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def finish(self):
+        super().finish()
+        self.server.disconnected.set()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHTTPClientPool(unittest.TestCase):
+
+    def test_same_loop_reuses_one_client_per_origin(self):
+        pool = HTTPClientPool()
+
+        async def main():
+            a = pool.get("http://a.local/x", 5.0)
+            b = pool.get("http://a.local/y?z=1", 5.0)
+            c = pool.get("http://b.local/x", 5.0)
+            await pool.aclose()
+            return a, b, c
+
+        a, b, c = asyncio.run(main())
+        self.assertIs(a, b)
+        self.assertIsNot(a, c)
+        self.assertTrue(a.is_closed and c.is_closed)
+        self.assertEqual(len(pool), 0)
+
+    def test_cap_evicts_least_recently_used_and_closes_it(self):
+        pool = HTTPClientPool(max_clients=2)
+
+        async def main():
+            a = pool.get("http://a.local", 5.0)
+            b = pool.get("http://b.local", 5.0)
+            pool.get("http://a.local", 5.0)  # a is now the most recent
+            c = pool.get("http://c.local", 5.0)
+            await asyncio.sleep(0)
+            state = (len(pool), a.is_closed, b.is_closed, c.is_closed)
+            await pool.aclose()
+            return state
+
+        self.assertEqual(asyncio.run(main()), (2, False, True, False))
+
+    def test_client_of_a_finished_loop_is_replaced_and_closed(self):
+        pool = HTTPClientPool()
+
+        async def get():
+            client = pool.get("http://a.local", 5.0)
+            await asyncio.sleep(0)
+            return client
+
+        first = asyncio.run(get())
+        second = asyncio.run(get())
+        self.assertIsNot(first, second)
+        self.assertTrue(first.is_closed)
+        self.assertEqual(len(pool), 1)
+
+    def test_aclose_closes_clients_owned_by_a_loop_in_another_thread(self):
+        pool = HTTPClientPool()
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            async def make():
+                return pool.get("http://a.local", 5.0)
+
+            foreign = asyncio.run_coroutine_threadsafe(make(), loop).result(5)
+            asyncio.run(pool.aclose())
+            self.assertTrue(foreign.is_closed)
+            self.assertEqual(len(pool), 0)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5)
+            loop.close()
+
+    def test_connections_of_a_closed_loop_are_shut_down(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        server.disconnected = threading.Event()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/status"
+        pool = HTTPClientPool()
+        try:
+            async def request():
+                client = pool.get(url, 5.0)
+                response = await client.get(url)
+                return client, response.status_code
+
+            client, status = asyncio.run(request())  # still referenced
+            self.assertEqual(status, 200)
+            self.assertFalse(server.disconnected.is_set())  # kept alive
+            asyncio.run(pool.aclose())
+            self.assertTrue(server.disconnected.wait(5))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestInternalAPIClient(unittest.TestCase):
+
+    def test_aclose_clears_cache_and_pool(self):
+        client = InternalAPIClient(base_url="http://a.local")
+        client.pool = HTTPClientPool()
+
+        async def main():
+            client._set_cache("/x", {"ok": True})
+            client.pool.get("http://a.local/x", client.timeout)
+            await client.aclose()
+
+        asyncio.run(main())
+        stats = client.get_stats()
+        self.assertEqual(stats["cache_size"], 0)
+        self.assertEqual(stats["pooled_clients"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import struct
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from jona_audio_stream import HEADER_SIZE, ClipCache, ToneSpec, parse_range
+
+try:
+    from fastapi.testclient import TestClient
+    import jona_service_7777
+    HAS_SERVICE = True
+except ImportError:  # tracing needs the OpenTelemetry SDK
+    HAS_SERVICE = False
+
+
+def legacy_wav(duration, frequency, amplitude, sample_rate=44100):
+    """The whole-file generator /synthesize/{id}/audio used before streaming"""
+    t = np.linspace(0, duration, int(sample_rate * duration), endpoint=False)
+    audio = np.int16(amplitude * np.sin(2 * np.pi * frequency * t) * 32767)
+    header = b''.join([
+        b'RIFF', struct.pack('<I', 36 + len(audio) * 2), b'WAVE',
+        b'fmt ', struct.pack('<I', 16), struct.pack('<H', 1), struct.pack('<H', 1),
+        struct.pack('<I', sample_rate), struct.pack('<I', sample_rate * 2),
+        struct.pack('<H', 2), struct.pack('<H', 16),
+        b'data', struct.pack('<I', len(audio) * 2),
+    ])
+    return header + audio.tobytes()
+
+
+class TestToneSpec(unittest.TestCase):
+
+    def test_matches_legacy_generator(self):
+        # 0.3333 s and 1.00001 s give a fractional sample_rate * duration
+        for duration, frequency in ((1.0, 440.0), (0.3333, 10.5), (1.00001, 997.0), (2.5, 40.0)):
+            spec = ToneSpec('alpha', frequency, duration, 0.8)
+            streamed = b''.join(spec.iter_bytes(block_samples=1000))
+            self.assertEqual(streamed, legacy_wav(duration, frequency, 0.8), (duration, frequency))
+            self.assertEqual(len(streamed), spec.total_bytes)
+
+    def test_iter_bytes_slices_like_the_full_file(self):
+        spec = ToneSpec('beta', 123.4, 0.05, 0.5)
+        full = b''.join(spec.iter_bytes())
+        total = spec.total_bytes
+        for first, last in ((0, 0), (0, 43), (10, 60), (HEADER_SIZE, HEADER_SIZE), (45, 46),
+                            (45, 2000), (47, total - 1), (total - 1, total - 1), (0, total - 1)):
+            for block in (1, 7, 64):
+                got = b''.join(spec.iter_bytes(first, last, block_samples=block))
+                self.assertEqual(got, full[first:last + 1], (first, last, block))
+
+
+class TestParseRange(unittest.TestCase):
+
+    def test_absent_or_unknown_means_whole_file(self):
+        for header in (None, '', 'bytes=-', 'items=0-5', 'bytes=0-1,4-5'):
+            self.assertIsNone(parse_range(header, 100))
+
+    def test_explicit_and_open_ended(self):
+        self.assertEqual(parse_range('bytes=0-9', 100), (0, 9))
+        self.assertEqual(parse_range(' bytes=90-500 ', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=50-', 100), (50, 99))
+
+    def test_suffix(self):
+        self.assertEqual(parse_range('bytes=-10', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=-1000', 100), (0, 99))
+
+    def test_unsatisfiable(self):
+        for header in ('bytes=100-', 'bytes=150-200', 'bytes=9-3', 'bytes=-0'):
+            with self.assertRaises(ValueError, msg=header):
+                parse_range(header, 100)
+
+
+class TestClipCache(unittest.TestCase):
+
+    def test_lru_by_bytes(self):
+        specs = [ToneSpec('alpha', f, 0.01, 0.5) for f in (100.0, 200.0, 300.0)]
+        cache = ClipCache(max_bytes=2 * specs[0].total_bytes, max_clip_bytes=specs[0].total_bytes)
+        for spec in specs:
+            cache.get_or_render(spec)
+        cache.get_or_render(specs[2])
+        stats = cache.stats()
+        self.assertEqual((stats['clips'], stats['hits'], stats['misses']), (2, 1, 3))
+        self.assertFalse(cache.cacheable(ToneSpec('alpha', 100.0, 1.0, 0.5)))
+
+
+@unittest.skipUnless(HAS_SERVICE, 'jona_service_7777 dependencies not installed')
+class TestAudioEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(jona_service_7777.app)
+        synthesis = self.client.post('/synthesize', json={'mode': 'alpha', 'frequency': 10.5, 'duration': 0.3333})
+        self.url = f"/synthesize/{synthesis.json()['synthesis_id']}/audio"
+        self.full = self.client.get(self.url).content
+
+    def test_ranges(self):
+        total = len(self.full)
+        partial = self.client.get(self.url, headers={'Range': 'bytes=-100'})
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial.content, self.full[-100:])
+        self.assertEqual(partial.headers['content-range'], f'bytes {total - 100}-{total - 1}/{total}')
+        self.assertEqual(self.client.get(self.url, headers={'Range': 'bytes=40-'}).content, self.full[40:])
+        rejected = self.client.get(self.url, headers={'Range': f'bytes={total}-'})
+        self.assertEqual(rejected.status_code, 416)
+        self.assertEqual(rejected.headers['content-range'], f'bytes */{total}')
+
+
+@unittest.skipUnless(HAS_SERVICE, 'jona_service_7777 dependencies not installed')
+class TestMetrics(unittest.TestCase):
+
+    def test_totals_outlive_the_bounded_history(self):
+        service = jona_service_7777
+        client = TestClient(service.app)
+        before = client.get('/metrics').json()
+        with mock.patch.object(service, 'generated_files', service.OrderedDict()), \
+                mock.patch.object(service, 'MAX_SYNTHESES', 2), \
+                mock.patch.object(service, 'coordination_log', service.deque(maxlen=2)):
+            for _ in range(3):
+                client.post('/synthesize', json={'mode': 'relax'})
+            client.post('/api/coordination/event/batch', json=[{'agent': 'a'}] * 3)
+            self.assertEqual(len(service.generated_files), 2)
+            self.assertEqual(len(service.coordination_log), 2)
+        after = client.get('/metrics').json()
+        self.assertEqual(after['total_syntheses'] - before['total_syntheses'], 3)
+        self.assertEqual(after['coordination_events'] - before['coordination_events'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from apps.api.local_index import LocalSearchIndex, tokenize
+
+
+class TestLocalSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.docs = self.root / 'docs'
+        self.docs.mkdir()
+        (self.docs / 'eeg.md').write_text('EEG alpha waves. Alpha power rises when eyes close.', encoding='utf-8')
+        (self.docs / 'audio.md').write_text('Audio synthesis with alpha binaural beats.', encoding='utf-8')
+        (self.docs / 'notes.txt').write_text('Nothing relevant here.', encoding='utf-8')
+        self.index_path = self.root / '.cache' / 'index.json'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _index(self):
+        return LocalSearchIndex(self.root, {'docs': self.docs}, index_path=self.index_path, refresh_interval=0)
+
+    def test_tokenize_splits_identifiers(self):
+        self.assertEqual(tokenize('neural_patterns v2'), ['neural', 'patterns', 'v2'])
+
+    def test_bm25_ranks_by_term_frequency(self):
+        ranked = self._index().search('alpha power', category='docs')
+        self.assertEqual([doc for doc, _ in ranked], ['docs/eeg.md', 'docs/audio.md'])
+        only_md = self._index().search('relevant', file_pattern='*.md')
+        self.assertEqual(only_md, [])
+
+    def test_refresh_picks_up_changes_and_persists(self):
+        index = self._index()
+        index.search('alpha')
+        (self.docs / 'audio.md').unlink()
+        new_file = self.docs / 'sleep.md'
+        new_file.write_text('Delta waves during deep sleep.', encoding='utf-8')
+        os.utime(new_file, ns=(1, 1))
+        self.assertEqual([doc for doc, _ in index.search('alpha')], ['docs/eeg.md'])
+        self.assertEqual(index.search('delta')[0][0], 'docs/sleep.md')
+
+        reloaded = LocalSearchIndex(self.root, {'docs': self.docs}, index_path=self.index_path,
+                                    refresh_interval=3600)
+        reloaded._last_refresh['docs'] = time.monotonic()  # no rescan: served from disk
+        self.assertEqual(len(reloaded.docs), 3)
+        self.assertEqual(reloaded.search('delta')[0][0], 'docs/sleep.md')
+        self.assertIn('Delta waves', reloaded.snippet('docs/sleep.md', 'delta'))
+
+
+if __name__ == '__main__':
+    unittest.main()
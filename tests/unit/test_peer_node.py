@@ -0,0 +1,173 @@
+import asyncio
+import json
+import time
+import unittest
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from research import peer_node
+from research.peer_node import MemoryShard, PeerNode, PeerOutbox, approx_size
+
+
+class TestPeerOutbox(unittest.TestCase):
+
+    def setUp(self):
+        self.box = PeerOutbox("127.0.0.1:9", None, "node-a")
+
+    def test_coalesces_by_key_keeping_newest_version(self):
+        self.box.enqueue("k", "v1", [1, "a"])
+        self.box.enqueue("k", "v3", [3, "a"])
+        self.box.enqueue("k", "v2", [2, "a"])  # stale, ignored
+        self.assertEqual(self.box.pending, {"k": ("v3", [3, "a"], None)})
+        self.assertEqual(self.box.stats["coalesced"], 1)
+
+    def test_version_ties_break_on_node_id(self):
+        self.box.enqueue("k", "from-a", [5, "a"])
+        self.box.enqueue("k", "from-b", [5, "b"])
+        self.box.enqueue("k", "from-a-again", [5, "a"])
+        self.assertEqual(self.box.pending["k"][0], "from-b")
+
+    def test_take_batch_is_bounded_and_fifo(self):
+        for i in range(10):
+            self.box.enqueue(f"k{i}", i, [i, "a"], ttl=30 if i == 0 else None)
+        with mock.patch.object(peer_node, "REPL_BATCH_MAX", 4):
+            batch = self.box._take_batch()
+        self.assertEqual([item["key"] for item in batch], ["k0", "k1", "k2", "k3"])
+        self.assertEqual(batch[0]["ttl"], 30)
+        self.assertNotIn("ttl", batch[1])
+        self.assertEqual(list(self.box.pending), [f"k{i}" for i in range(4, 10)])
+
+    def test_requeue_never_overwrites_newer_writes(self):
+        self.box.enqueue("a", "old-a", [1, "a"])
+        self.box.enqueue("b", "old-b", [1, "a"])
+        batch = self.box._take_batch()
+        self.box.enqueue("a", "new-a", [2, "a"])
+        self.box._requeue(batch)
+        self.assertEqual(self.box.pending["a"], ("new-a", [2, "a"], None))
+        self.assertEqual(self.box.pending["b"], ("old-b", [1, "a"], None))
+
+    def test_drops_new_keys_when_full(self):
+        with mock.patch.object(peer_node, "REPL_MAX_PENDING", 2):
+            for i in range(3):
+                self.box.enqueue(f"k{i}", i, [i, "a"])
+            self.box.enqueue("k0", "newer", [9, "a"])  # updates to queued keys still coalesce
+        self.assertEqual(list(self.box.pending), ["k0", "k1"])
+        self.assertEqual(self.box.stats["dropped"], 1)
+
+    def test_failed_batch_is_retried(self):
+        sent = []
+
+        async def flaky_post(batch):
+            sent.append([item["key"] for item in batch])
+            return len(sent) > 1
+
+        async def scenario():
+            self.box._post = flaky_post
+            with mock.patch.object(peer_node, "REPL_FLUSH_INTERVAL", 0):
+                self.box.start()
+                self.box.enqueue("x", 1, [1, "a"])
+                self.box.enqueue("y", 2, [1, "a"])
+                for _ in range(100):
+                    await asyncio.sleep(0.01)
+                    if self.box.stats["batches"]:
+                        break
+                await self.box.close()
+
+        asyncio.run(scenario())
+        self.assertEqual(sent, [["x", "y"], ["x", "y"]])
+        self.assertEqual(self.box.stats["failures"], 1)
+        self.assertEqual(self.box.stats["updates"], 2)
+        self.assertEqual(self.box.pending, {})
+
+
+class TestMemoryShard(unittest.TestCase):
+
+    def test_unbounded_by_default(self):
+        async def scenario():
+            shard = MemoryShard(stripes=1)
+            for i in range(1000):
+                await shard.set(f"k{i}", "x" * 100)
+            return shard.stats()
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(stats["keys"], 1000)
+        self.assertEqual(stats["max_bytes"], 0)
+        self.assertEqual(stats["evictions"], 0)
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        size = approx_size("k0", "x" * 100)
+
+        async def scenario():
+            shard = MemoryShard(stripes=1, max_bytes=3 * size)
+            for i in range(3):
+                await shard.set(f"k{i}", "x" * 100)
+            await shard.get("k0")  # k1 is now the oldest
+            await shard.set("k3", "x" * 100)
+            return shard, [await shard.get(f"k{i}") is not None for i in range(4)]
+
+        shard, alive = asyncio.run(scenario())
+        self.assertEqual(alive, [True, False, True, True])
+        self.assertEqual(shard.stats()["bytes"], 3 * size)
+        self.assertEqual(shard.evictions, 1)
+
+    def test_timer_wheel_expires_only_due_keys(self):
+        async def scenario():
+            shard = MemoryShard(stripes=2)
+            await shard.set("short", 1, ttl=1.5)
+            await shard.set("long", 2, ttl=600)  # beyond one wheel rotation
+            await shard.set("forever", 3)
+            return shard
+
+        shard = asyncio.run(scenario())
+        now = time.monotonic()
+        self.assertEqual(shard.expire(now + 0.5), 0)
+        self.assertEqual(shard.expire(now + 3), 1)
+        self.assertIsNone(asyncio.run(shard.get("short")))
+        self.assertEqual(shard.expire(now + 520), 0)  # "long" rescheduled, not dropped
+        self.assertEqual(asyncio.run(shard.get("long")), 2)
+        self.assertEqual(shard.expire(now + 601), 1)
+        self.assertEqual(asyncio.run(shard.get("forever")), 3)
+        self.assertEqual(shard.expirations, 2)
+
+    def test_timer_wheel_expires_sub_tick_ttls_on_the_next_tick(self):
+        shard = MemoryShard(stripes=2)
+        asyncio.run(shard.set("blink", 1, ttl=0.01))  # lands in the bucket the hand is on
+        self.assertEqual(shard.expire(time.monotonic() + 2), 1)
+        self.assertEqual(shard.expirations, 1)
+
+
+class TestDumpEndpoint(unittest.TestCase):
+
+    def test_streamed_dump_is_one_json_document(self):
+        async def scenario():
+            node = PeerNode("127.0.0.1", 0)
+            for i in range(25):
+                await node.memory.set(f"k{i}", {"n": i})
+            await node.memory.set("gone", 0, ttl=0.01)
+            await asyncio.sleep(0.02)
+            app = web.Application()
+            app.router.add_get("/dump", node.handle_dump)
+            with mock.patch.object(peer_node, "DUMP_CHUNK", 4):
+                async with TestClient(TestServer(app)) as client:
+                    resp = await client.get("/dump")
+                    return node, json.loads(await resp.read())
+
+        node, body = asyncio.run(scenario())
+        self.assertEqual(body["node"], node.id)
+        self.assertEqual(body["data"], {f"k{i}": {"n": i} for i in range(25)})
+        self.assertEqual(body["memory"]["keys"], 26)  # expired key not yet reaped, but not dumped
+
+    def test_empty_dump(self):
+        async def scenario():
+            app = web.Application()
+            app.router.add_get("/dump", PeerNode("127.0.0.1", 0).handle_dump)
+            async with TestClient(TestServer(app)) as client:
+                return json.loads(await (await client.get("/dump")).read())
+
+        self.assertEqual(asyncio.run(scenario())["data"], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+
+from apps.api.neuro.audio_context import AudioAnalysisContext
+from apps.api.neuro.pitch_engine import yin_track
+
+
+class TestYinTrack(unittest.TestCase):
+
+    def test_tracks_harmonic_tones_across_the_range(self):
+        sr = 22050
+        t = np.arange(sr) / sr
+        for f0 in [70.0, 220.0, 440.0, 1000.0]:
+            y = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 5))
+            estimate, voiced, probability = yin_track(y, sr)
+            self.assertEqual(estimate.size, 1 + len(y) // 512)  # librosa's centred framing
+            cents = 1200 * np.abs(np.log2(estimate[voiced] / f0))
+            self.assertGreater(voiced.mean(), 0.9)
+            self.assertLess(np.median(cents), 5)
+            self.assertTrue(np.all(probability[voiced] > 0.8))
+
+    def test_silence_and_noise_are_unvoiced(self):
+        rng = np.random.default_rng(0)
+        for y in (np.zeros(8000), rng.normal(size=8000)):
+            estimate, voiced, probability = yin_track(y, 8000)
+            self.assertFalse(voiced.any())
+            self.assertTrue(np.isnan(estimate).all())
+            self.assertEqual(probability.max(), 0.0)
+
+    def test_fast_mode_through_audio_view(self):
+        sr = 16000
+        y = np.sin(2 * np.pi * 300 * np.arange(sr) / sr).astype(np.float32)
+        view = AudioAnalysisContext("digest", y, sr).native
+        f0, voiced, _ = view.f0("fast", 65.0, 2000.0)
+        self.assertAlmostEqual(float(np.median(f0[voiced])), 300.0, delta=1.0)
+        self.assertIs(view.f0("fast", 65.0, 2000.0), view.yin(65.0, 2000.0))
+        with self.assertRaises(ValueError):
+            view.f0("turbo", 65.0, 2000.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
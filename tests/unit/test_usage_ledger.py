@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from usage_ledger import GENERATION_KEY, UsageLedger
+
+
+class TestUsageLedger(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "api_usage.json")
+        # ledgers flush at exit while deltas are pending; keep the hooks out of atexit
+        hooks = mock.patch("usage_ledger.atexit")
+        self.atexit = hooks.start()
+        self.addCleanup(hooks.stop)
+
+    def test_workers_converge_through_the_ledger(self):
+        a = UsageLedger(self.path, flush_interval=60)
+        b = UsageLedger(self.path, flush_interval=60)
+        for _ in range(3):
+            a.increment("k1", "2025-01-01")
+        b.increment("k1", "2025-01-01")
+        a.flush()
+        b.flush()
+        self.assertEqual(b.get("k1", "2025-01-01"), 4)
+        self.assertEqual(UsageLedger(self.path).get("k1", "2025-01-01"), 4)
+
+    def test_compaction_folds_ledger_into_snapshot(self):
+        ledger = UsageLedger(self.path, flush_interval=0, compact_bytes=200)
+        for i in range(20):
+            ledger.increment(f"k{i % 4}", "2025-01-01")
+        with open(self.path) as f:
+            snapshot = json.load(f)
+        self.assertGreater(snapshot[GENERATION_KEY], 0)
+        self.assertLess(os.path.getsize(self.path + ".ledger"), 200)
+        self.assertEqual(sum(UsageLedger(self.path).snapshot()[f"k{i}"]["2025-01-01"] for i in range(4)), 20)
+
+    def test_torn_tail_is_ignored_and_terminated(self):
+        ledger = UsageLedger(self.path)
+        ledger.increment("k1", "2025-01-01")
+        ledger.flush()
+        with open(self.path + ".ledger", "ab") as f:
+            f.write(b'{"t":1,"d":{"k1":{"2025')
+        recovered = UsageLedger(self.path)
+        self.assertEqual(recovered.increment("k1", "2025-01-01"), 2)
+        recovered.flush()
+        self.assertEqual(UsageLedger(self.path).get("k1", "2025-01-01"), 2)
+
+    def test_ledger_older_than_snapshot_is_not_replayed(self):
+        ledger = UsageLedger(self.path)
+        ledger.increment("k1", "2025-01-01")
+        ledger.flush()
+        # crash after the snapshot was replaced but before the ledger was reset
+        with open(self.path, "w") as f:
+            json.dump({"k1": {"2025-01-01": 1}, GENERATION_KEY: 1}, f)
+        self.assertEqual(UsageLedger(self.path).get("k1", "2025-01-01"), 1)
+
+    def test_exit_hook_only_while_deltas_are_pending(self):
+        ledger = UsageLedger(self.path, flush_interval=60)
+        ledger.get("k1", "2025-01-01")  # loads, nothing pending
+        self.atexit.register.assert_not_called()
+        ledger.increment("k1", "2025-01-01")
+        ledger.increment("k1", "2025-01-02")
+        self.atexit.register.assert_called_once_with(ledger.flush)
+        ledger.close()
+        self.atexit.unregister.assert_called_once_with(ledger.flush)
+        self.assertEqual(UsageLedger(self.path).get("k1", "2025-01-02"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
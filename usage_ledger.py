@@ -0,0 +1,219 @@
+"""Append-only usage ledger for the file fallback of ``usage_tracker``.
+
+Counts are incremented in memory and flushed as deltas, at most every
+``flush_interval`` seconds, as one JSON line appended to ``<snapshot>.ledger``.
+Every flush also reads the lines other workers appended since the last read, so
+all processes converge on the same totals without rewriting the whole file on
+each request.
+
+Once the ledger grows past ``compact_bytes`` it is folded into the snapshot
+(``config/api_usage.json``, same ``{api_key: {day: count}}`` layout as before)
+and truncated. All file access happens under an exclusive ``flock`` on
+``<snapshot>.lock``.
+
+Crash safety:
+* the snapshot is replaced atomically (write temp file + ``os.replace``);
+* the snapshot and the ledger header carry a generation number, so a ledger that
+  was already folded into a newer snapshot is never replayed twice;
+* a torn last line (crash mid-append) is ignored and newline-terminated before
+  the next append.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process locking only
+    fcntl = None
+
+GENERATION_KEY = "__ledger_generation__"
+
+
+class UsageLedger:
+    def __init__(self, snapshot_path: str, flush_interval: float = 1.0,
+                 compact_bytes: int = 1024 * 1024):
+        self.snapshot_path = snapshot_path
+        self.ledger_path = snapshot_path + ".ledger"
+        self.lock_path = snapshot_path + ".lock"
+        self.flush_interval = flush_interval
+        self.compact_bytes = compact_bytes
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._pending: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._generation = 0
+        self._offset = 0
+        self._last_flush = 0.0
+        self._thread_lock = threading.RLock()
+        self._loaded = False
+        self._exit_hook = False
+
+    # ------------------------------------------------------------------
+    # public API
+    # ------------------------------------------------------------------
+    def increment(self, api_key: str, day: str, amount: int = 1) -> int:
+        with self._thread_lock:
+            self._pending[(api_key, day)] += amount
+            self._maybe_flush()
+            self._track_exit_hook()
+            return self._counts.get(api_key, {}).get(day, 0) + self._pending.get((api_key, day), 0)
+
+    def get(self, api_key: str, day: str) -> int:
+        with self._thread_lock:
+            self._maybe_flush()
+            return self._counts.get(api_key, {}).get(day, 0) + self._pending.get((api_key, day), 0)
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._thread_lock:
+            self.flush()
+            return {key: dict(days) for key, days in self._counts.items()}
+
+    def replace(self, data: Dict[str, Dict[str, int]]) -> None:
+        """Overwrite all totals with ``data`` (a new snapshot generation)."""
+        with self._thread_lock, self._file_lock():
+            if not self._loaded:
+                self._reload()
+            self._pending.clear()
+            self._counts = defaultdict(dict)
+            for api_key, days in data.items():
+                self._counts[api_key].update(days)
+            self._compact()
+            self._last_flush = time.monotonic()
+            self._track_exit_hook()
+
+    def flush(self) -> None:
+        """Append pending deltas and pick up other workers' appends."""
+        with self._thread_lock, self._file_lock():
+            if not self._loaded or self._ledger_generation() != self._generation:
+                self._reload()
+            if self._pending:
+                deltas: Dict[str, Dict[str, int]] = {}
+                for (api_key, day), amount in self._pending.items():
+                    deltas.setdefault(api_key, {})[day] = amount
+                self._append({"t": time.time(), "d": deltas})
+                self._pending.clear()
+            self._replay_from(self._offset)
+            if self._offset >= self.compact_bytes:
+                self._compact()
+            self._last_flush = time.monotonic()
+            self._track_exit_hook()
+
+    def close(self) -> None:
+        """Flush pending deltas and drop the exit hook."""
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # internals (called with both locks held)
+    # ------------------------------------------------------------------
+    def _track_exit_hook(self) -> None:
+        # flush at exit only while there are deltas to lose; an idle ledger is
+        # not kept alive by atexit
+        if bool(self._pending) != self._exit_hook:
+            if self._pending:
+                atexit.register(self.flush)
+            else:
+                atexit.unregister(self.flush)
+            self._exit_hook = bool(self._pending)
+
+    def _maybe_flush(self) -> None:
+        if not self._loaded or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    @contextmanager
+    def _file_lock(self):
+        directory = os.path.dirname(self.lock_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.lock_path, "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _ledger_generation(self) -> int:
+        try:
+            with open(self.ledger_path, "r") as f:
+                header = json.loads(f.readline() or "{}")
+            return int(header.get("generation", -1))
+        except (OSError, ValueError):
+            return -1
+
+    def _reload(self) -> None:
+        self._counts = defaultdict(dict)
+        snapshot = {}
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, "r") as f:
+                    snapshot = json.load(f)
+            except ValueError:
+                snapshot = {}
+        self._generation = int(snapshot.pop(GENERATION_KEY, 0))
+        for api_key, days in snapshot.items():
+            if isinstance(days, dict):
+                self._counts[api_key].update({d: int(c) for d, c in days.items()})
+        if self._ledger_generation() == self._generation:
+            with open(self.ledger_path, "rb") as f:
+                self._offset = len(f.readline())
+            self._replay_from(self._offset)
+        else:
+            # missing ledger, or one already folded into this snapshot
+            self._write_ledger_header()
+        self._loaded = True
+
+    def _write_ledger_header(self) -> None:
+        with open(self.ledger_path, "w") as f:
+            f.write(json.dumps({"generation": self._generation}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._offset = os.path.getsize(self.ledger_path)
+
+    def _append(self, record: dict) -> None:
+        with open(self.ledger_path, "ab+") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")  # terminate a torn line from a crashed writer
+            f.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _replay_from(self, offset: int) -> None:
+        try:
+            with open(self.ledger_path, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # incomplete tail, re-read next time
+                    offset += len(line)
+                    try:
+                        deltas = json.loads(line)["d"]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    for api_key, days in deltas.items():
+                        counts = self._counts[api_key]
+                        for day, amount in days.items():
+                            counts[day] = counts.get(day, 0) + int(amount)
+        except OSError:
+            return
+        self._offset = offset
+
+    def _compact(self) -> None:
+        self._generation += 1
+        data = {key: dict(days) for key, days in self._counts.items()}
+        data[GENERATION_KEY] = self._generation
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        self._write_ledger_header()
@@ -1,5 +1,6 @@
-import os, json, datetime
+import os, datetime
 import redis
+from usage_ledger import UsageLedger
 from fastapi import Request, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
 
@@ -11,37 +12,40 @@ except Exception:
     REDIS_AVAILABLE = False
 
 USAGE_FILE = "config/api_usage.json"
+USAGE_FLUSH_SECONDS = float(os.getenv("USAGE_FLUSH_SECONDS", "1.0"))
+USAGE_COMPACT_BYTES = int(os.getenv("USAGE_COMPACT_BYTES", str(1024 * 1024)))
+
+# file fallback: counts in memory, deltas appended to config/api_usage.json.ledger
+usage_ledger = UsageLedger(USAGE_FILE, flush_interval=USAGE_FLUSH_SECONDS,
+                           compact_bytes=USAGE_COMPACT_BYTES)
 
 def load_usage():
-    if not os.path.exists(USAGE_FILE):
-        return {}
-    with open(USAGE_FILE, "r") as f:
-        return json.load(f)
+    return usage_ledger.snapshot()
 
 def save_usage(data):
-    os.makedirs("config", exist_ok=True)
-    with open(USAGE_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    usage_ledger.replace(data)
 
 def increment_usage(api_key: str) -> int:
     today = datetime.date.today().isoformat()
     key = f"usage:{api_key}:{today}"
     if REDIS_AVAILABLE:
-        count = redis_client.incr(key)
-        redis_client.expire(key, 86400)
-        return int(count)
-    else:
-        data = load_usage()
-        data.setdefault(api_key, {}).setdefault(today, 0)
-        data[api_key][today] += 1
-        save_usage(data)
-        return data[api_key][today]
+        try:
+            pipe = redis_client.pipeline()
+            pipe.incr(key)
+            pipe.expire(key, 86400)
+            count, _ = pipe.execute()
+            return int(count)
+        except redis.RedisError:
+            pass
+    return usage_ledger.increment(api_key, today)
 
 def get_usage(api_key: str):
     today = datetime.date.today().isoformat()
     if REDIS_AVAILABLE:
-        val = redis_client.get(f"usage:{api_key}:{today}")
-        return int(val or 0)
-    data = load_usage()
-    return data.get(api_key, {}).get(today, 0)
+        try:
+            val = redis_client.get(f"usage:{api_key}:{today}")
+            return int(val or 0)
+        except redis.RedisError:
+            pass
+    return usage_ledger.get(api_key, today)
 